@@ -12,6 +12,7 @@ Usage:
     python launch.py ui collaborate      # Launch Collaborative Multi-Agent System (RECOMMENDED)
     python launch.py ui interface        # Launch Agent Chat Interface
     python launch.py status              # Check platform status
+    python launch.py api --workers 4     # Run the data API (production mode)
 """
 
 import sys
@@ -127,6 +128,47 @@ class APEXLauncher:
         cmd = ['streamlit', 'run', str(script)]
         return subprocess.call(cmd)
 
+    def run_api(self, host: str, port: int, workers: int, warm: bool = True):
+        """
+        Run the data API with uvicorn worker processes.
+
+        Workers share the pipelines snapshot and source metadata through the
+        SQLite cache in src/api/shared_cache.py; with warm=True they are built
+        once here before the workers start.
+        """
+        try:
+            import uvicorn
+        except ImportError:
+            print("[ERROR] uvicorn is not installed (pip install uvicorn)")
+            return 1
+
+        from src.api.data_service import warm_caches
+        from src.api.shared_cache import shared_cache
+
+        print("\n" + "="*70)
+        print("APEX EOR DATA API")
+        print("="*70)
+        print(f"  Workers:      {workers}")
+        print(f"  Shared cache: {shared_cache.path if shared_cache.enabled else 'disabled'}")
+
+        if warm:
+            print("\nWarming shared caches...")
+            summary = warm_caches()
+            if summary['pipelines'] is None:
+                print("  [WARNING] Pipelines snapshot failed (workers will retry)")
+            else:
+                print(f"  [OK] Pipelines snapshot ({summary['pipelines']} pipelines)")
+            print(f"  [OK] Source metadata ({summary['sources']} sources)")
+            if summary['failed']:
+                print(f"  [WARNING] No parsed data: {', '.join(summary['failed'])}")
+
+        print(f"\n   URL: http://{host}:{port}")
+        print(f"   Docs: http://{host}:{port}/docs")
+        print(f"   Press Ctrl+C to stop\n")
+
+        uvicorn.run("src.api.data_service:app", host=host, port=port, workers=workers)
+        return 0
+
     def interactive_menu(self):
         """Show interactive menu"""
         while True:
@@ -202,6 +244,7 @@ Examples:
   python launch.py ui studio                # Launch Agent Studio
   python launch.py ui runner                # Launch automated runner
   python launch.py ui interface             # Launch debug interface
+  python launch.py api --workers 4          # Data API with 4 worker processes
         """
     )
 
@@ -218,6 +261,14 @@ Examples:
     ui_parser.add_argument('tool', choices=['studio', 'runner', 'interface'],
                           help='UI tool to launch')
 
+    # Data API command
+    api_parser = subparsers.add_parser('api', help='Run the data API')
+    api_parser.add_argument('--host', default='0.0.0.0', help='Bind address (default 0.0.0.0)')
+    api_parser.add_argument('--port', type=int, default=8000, help='Port (default 8000)')
+    api_parser.add_argument('--workers', type=int, default=1, help='Worker processes (default 1)')
+    api_parser.add_argument('--no-warm', action='store_true',
+                            help='Skip building shared caches before the workers start')
+
     # Parse known args, allow unknown for ingest command
     args, unknown = parser.parse_known_args()
 
@@ -230,6 +281,8 @@ Examples:
         return launcher.run_ingestion(unknown or ['--help'])
     elif args.command == 'ui':
         return launcher.launch_ui(args.tool)
+    elif args.command == 'api':
+        return launcher.run_api(args.host, args.port, args.workers, warm=not args.no_warm)
     else:
         # No command - show interactive menu
         return launcher.interactive_menu()
@@ -0,0 +1,202 @@
+"""
+Data API Concurrency Benchmark
+
+Simulates parallel dashboard clients against the data API and reports
+latency percentiles. Each client mixes light requests (health check,
+cached source info) with heavy ones (filtered, sorted queries that miss
+the result cache), which is what a dashboard render looks like.
+
+With blocking work on the event loop, one heavy query stalls every light
+request queued behind it; the p99 of light requests shows it.
+
+Usage:
+    # Local server on synthetic data, offloaded vs inline
+    python scripts/benchmarks/api_concurrency.py --compare
+
+    # Against a running server and real data
+    python scripts/benchmarks/api_concurrency.py --url http://localhost:8000 \
+        --source rrc --data-type production --filter-column CYCLE_YEAR_MONTH
+"""
+
+import sys
+import time
+import random
+import asyncio
+import argparse
+import tempfile
+from pathlib import Path
+from typing import Dict, List
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[rank]
+
+
+def make_synthetic_data(root: Path, rows: int) -> Dict[str, str]:
+    """Write a synthetic production-like parquet file under root/raw/bench/parsed"""
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(0)
+    parsed = root / 'raw' / 'bench' / 'parsed'
+    parsed.mkdir(parents=True)
+    pd.DataFrame({
+        'LEASE_NO': rng.integers(1, 200_000, rows),
+        'CYCLE_YEAR_MONTH': rng.integers(1993, 2025, rows) * 100 + rng.integers(1, 13, rows),
+        'LEASE_OIL_PROD_VOL': rng.gamma(2.0, 500.0, rows).round(1),
+        'OPERATOR_NAME': rng.choice([f'OPERATOR {i}' for i in range(500)], rows),
+    }).to_parquet(parsed / 'production.parquet', row_group_size=100_000)
+    return {'source': 'bench', 'data_type': None, 'filter_column': 'CYCLE_YEAR_MONTH',
+            'sort_column': 'LEASE_OIL_PROD_VOL'}
+
+
+async def client(http, workload: Dict, requests: int, heavy_ratio: float,
+                 results: Dict[str, List[float]], seed: int):
+    """One dashboard client issuing a mix of light and heavy requests"""
+    rng = random.Random(seed)
+    for _ in range(requests):
+        if rng.random() < heavy_ratio:
+            low = rng.randint(199301, 202312)
+            body = {
+                'source': workload['source'],
+                'data_type': workload['data_type'],
+                'filters': {workload['filter_column']: {'gte': low, 'lt': low + rng.randint(1, 300)}},
+                'limit': 100,
+            }
+            if workload.get('sort_column'):
+                body['order_by'] = ['-' + workload['sort_column']]
+            kind, request = 'heavy', http.post('/api/query', json=body)
+        elif rng.random() < 0.5:
+            kind, request = 'light', http.get('/')
+        else:
+            kind, request = 'light', http.get(f"/api/sources/{workload['source']}/info")
+
+        start = time.perf_counter()
+        response = await request
+        elapsed = (time.perf_counter() - start) * 1000
+        if response.status_code != 200:
+            raise RuntimeError(f"{kind} request failed: {response.status_code} {response.text[:200]}")
+        results[kind].append(elapsed)
+
+
+class ServerThread:
+    """
+    Run the API with uvicorn on its own thread and event loop.
+
+    Clients must not share the server's loop: if they did, a blocked loop
+    would also pause the clients' timers and hide the stall.
+    """
+
+    def __init__(self):
+        import socket
+        import uvicorn
+        from src.api.data_service import app
+
+        with socket.socket() as sock:
+            sock.bind(('127.0.0.1', 0))
+            self.port = sock.getsockname()[1]
+        self.server = uvicorn.Server(uvicorn.Config(app, host='127.0.0.1', port=self.port,
+                                                    log_level='warning', lifespan='on'))
+        self.thread = None
+
+    def __enter__(self) -> str:
+        import threading
+
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+        self.thread.start()
+        while not self.server.started:
+            time.sleep(0.05)
+        return f'http://127.0.0.1:{self.port}'
+
+    def __exit__(self, *exc):
+        self.server.should_exit = True
+        self.thread.join(timeout=10)
+
+
+async def run(workload: Dict, clients: int, requests: int, heavy_ratio: float,
+              url: str) -> Dict[str, List[float]]:
+    import httpx
+
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+    results: Dict[str, List[float]] = {'light': [], 'heavy': []}
+    async with httpx.AsyncClient(base_url=url, timeout=600, limits=limits) as http:
+        await http.get(f"/api/sources/{workload['source']}/info")  # warm the info cache
+        started = time.perf_counter()
+        await asyncio.gather(*(
+            client(http, workload, requests, heavy_ratio, results, seed=i) for i in range(clients)
+        ))
+        results['wall'] = [time.perf_counter() - started]
+    return results
+
+
+def report(label: str, results: Dict[str, List[float]]):
+    print(f"\n{label}")
+    print("-" * 70)
+    print(f"{'requests':<10}{'count':>8}{'p50 ms':>12}{'p95 ms':>12}{'p99 ms':>12}{'max ms':>12}")
+    for kind in ('light', 'heavy'):
+        values = results[kind]
+        print(f"{kind:<10}{len(values):>8}{percentile(values, 50):>12.1f}{percentile(values, 95):>12.1f}"
+              f"{percentile(values, 99):>12.1f}{max(values, default=0):>12.1f}")
+    total = len(results['light']) + len(results['heavy'])
+    wall = results['wall'][0]
+    print(f"wall time: {wall:.2f}s, throughput: {total / wall:.1f} req/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Data API concurrency benchmark')
+    parser.add_argument('--clients', type=int, default=50, help='Parallel clients (default 50)')
+    parser.add_argument('--requests', type=int, default=20, help='Requests per client (default 20)')
+    parser.add_argument('--heavy-ratio', type=float, default=0.2, help='Share of heavy queries (default 0.2)')
+    parser.add_argument('--rows', type=int, default=2_000_000, help='Synthetic dataset rows')
+    parser.add_argument('--url', help='Benchmark a running server instead of a local one')
+    parser.add_argument('--source', help='Source to query (default: synthetic data)')
+    parser.add_argument('--data-type', help='Data type of --source')
+    parser.add_argument('--filter-column', default='CYCLE_YEAR_MONTH', help='Numeric yyyymm column to range-filter')
+    parser.add_argument('--sort-column', help='Column for order_by in heavy queries')
+    parser.add_argument('--compare', action='store_true',
+                        help='Also run with blocking work inline on the event loop (local server only)')
+    args = parser.parse_args()
+
+    from src.api import concurrency
+    import src.api.data_service as data_service
+
+    with tempfile.TemporaryDirectory(prefix='apex_bench_') as tmp:
+        if args.source:
+            workload = {'source': args.source, 'data_type': args.data_type,
+                        'filter_column': args.filter_column, 'sort_column': args.sort_column}
+        else:
+            if args.url:
+                parser.error('--url needs --source (synthetic data only exists locally)')
+            print(f"Generating {args.rows:,} synthetic rows...")
+            workload = make_synthetic_data(Path(tmp), args.rows)
+            data_service.DATA_ROOT = Path(tmp) / 'raw'
+
+        print(f"{args.clients} clients x {args.requests} requests, {args.heavy_ratio:.0%} heavy")
+
+        def measure():
+            if args.url:
+                return asyncio.run(run(workload, args.clients, args.requests, args.heavy_ratio, args.url))
+            data_service.result_cache.clear()
+            with ServerThread() as url:
+                return asyncio.run(run(workload, args.clients, args.requests, args.heavy_ratio, url))
+
+        workers = concurrency.IO_WORKERS
+        label = f"offloaded (pool={workers}, per-source limit={concurrency.SOURCE_CONCURRENCY})"
+        report(label, measure())
+
+        if args.compare and not args.url:
+            concurrency.IO_WORKERS = 0
+            report("inline (blocking on the event loop)", measure())
+            concurrency.IO_WORKERS = workers
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,156 @@
+"""
+Query Page Serialization Benchmark
+
+Compares the previous /api/query encoding path
+
+    df.to_json(orient='records') -> json.loads() -> FastAPI response encoding
+    (jsonable_encoder + json.dumps over every cell)
+
+against the Arrow encoder in src/api/serialization.py, on a synthetic
+FracFocus-like page (wide, string-heavy, with NaNs and timestamps).
+Both outputs are decoded and compared before timing.
+
+It then compares response shapes (records, columnar, columnar with
+dictionary encoding): payload size, gzip size and client-side parse time.
+
+Usage:
+    python scripts/benchmarks/serialization.py
+    python scripts/benchmarks/serialization.py --rows 10000 --columns 40 --repeat 5
+    python scripts/benchmarks/serialization.py --parquet data/raw/FracFocus/.../parsed/x.parquet
+"""
+
+import sys
+import json
+import math
+import time
+import argparse
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import numpy as np
+import pandas as pd
+
+
+def make_page(rows: int, columns: int) -> pd.DataFrame:
+    """Synthetic FracFocus-like page: ~1/2 strings, 1/3 floats (with NaN), ints, dates"""
+    rng = np.random.default_rng(0)
+    data = {
+        'APINumber': [f'42{n:012d}' for n in rng.integers(0, 10**12, rows)],
+        'JobStartDate': pd.to_datetime('2015-01-01') + pd.to_timedelta(rng.integers(0, 3000, rows), unit='D'),
+        'StateName': rng.choice(['Texas', 'New Mexico', 'Oklahoma', 'North Dakota'], rows),
+        'OperatorName': rng.choice([f'Operator "{i}" LLC' for i in range(300)], rows),
+        'TotalBaseWaterVolume': np.where(rng.random(rows) < 0.1, np.nan, rng.gamma(2.0, 4e6, rows)),
+    }
+    i = 0
+    while len(data) < columns:
+        kind = i % 3
+        if kind == 0:
+            data[f'IngredientName_{i}'] = rng.choice(
+                ['Water', 'Hydrochloric Acid', 'Guar Gum', 'Crystalline silica, quartz', None], rows)
+        elif kind == 1:
+            data[f'PercentHFJob_{i}'] = np.where(rng.random(rows) < 0.2, np.nan, rng.random(rows) * 100)
+        else:
+            data[f'CASNumber_{i}'] = rng.integers(10_000, 999_999, rows)
+        i += 1
+    return pd.DataFrame(data)
+
+
+def legacy_encode(df: pd.DataFrame) -> bytes:
+    """What the endpoint used to do for one page"""
+    from fastapi.encoders import jsonable_encoder
+
+    records = json.loads(df.to_json(orient='records', date_format='iso'))
+    body = {'data': records, 'total': len(records), 'returned': len(records), 'offset': 0}
+    return json.dumps(jsonable_encoder(body), ensure_ascii=False, allow_nan=False,
+                      separators=(',', ':')).encode('utf-8')
+
+
+def arrow_encode(df: pd.DataFrame) -> bytes:
+    from src.api.serialization import encode_dataframe, json_body
+
+    fields = {'total': len(df), 'returned': len(df), 'offset': 0}
+    return json_body(encode_dataframe(df, 'iso'), fields)
+
+
+def check(df: pd.DataFrame):
+    """Both encoders must produce the same records (pandas rounds floats to 10 decimals)"""
+    old = json.loads(legacy_encode(df))['data']
+    new = json.loads(arrow_encode(df))['data']
+    assert len(old) == len(new), (len(old), len(new))
+    for row_old, row_new in zip(old, new):
+        assert row_old.keys() == row_new.keys()
+        for key in row_old:
+            a, b = row_old[key], row_new[key]
+            if a == b:
+                continue
+            if (isinstance(a, float) and isinstance(b, (int, float))
+                    and math.isclose(a, b, rel_tol=1e-9, abs_tol=1e-10)):
+                continue
+            raise AssertionError(f"{key}: {a!r} != {b!r}")
+
+
+def columnar_encode(df: pd.DataFrame, dictionary: bool = False) -> bytes:
+    from src.api.serialization import encode_dataframe_columns, json_body
+
+    data, encoded = encode_dataframe_columns(df, 'iso', dictionary)
+    return json_body(data, {'columns': list(df.columns), 'dictionary_encoded': encoded})
+
+
+def compare_shapes(df: pd.DataFrame, repeat: int):
+    """Payload size and json.loads time per response shape"""
+    import gzip
+
+    print("\n" + "-" * 70)
+    print(f"{'shape':<32}{'MB':>10}{'gzip MB':>10}{'parse ms':>12}")
+    for label, body in (('records', arrow_encode(df)),
+                        ('columnar', columnar_encode(df)),
+                        ('columnar + dictionary', columnar_encode(df, dictionary=True))):
+        parse, _ = bench(lambda b: json.loads(b), body, repeat)
+        print(f"{label:<32}{len(body) / 1e6:>10.2f}{len(gzip.compress(body, 6)) / 1e6:>10.2f}{parse * 1000:>12.1f}")
+    print("-" * 70)
+
+
+def bench(func, df: pd.DataFrame, repeat: int):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = func(df)
+        timings.append(time.perf_counter() - start)
+    return min(timings), len(body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Query page serialization benchmark')
+    parser.add_argument('--rows', type=int, default=10_000, help='Rows per page (default 10000)')
+    parser.add_argument('--columns', type=int, default=35, help='Columns (default 35)')
+    parser.add_argument('--repeat', type=int, default=5, help='Repetitions, best is reported (default 5)')
+    parser.add_argument('--parquet', help='Use the first --rows rows of a real parquet file instead')
+    args = parser.parse_args()
+
+    if args.parquet:
+        df = pd.read_parquet(args.parquet).head(args.rows)
+    else:
+        df = make_page(args.rows, args.columns)
+
+    print(f"Page: {len(df):,} rows x {len(df.columns)} columns")
+    check(df)
+    print("[OK] Outputs decode to the same records")
+
+    print("\n" + "-" * 70)
+    print(f"{'encoder':<32}{'best ms':>12}{'MB':>10}{'MB/s':>12}")
+    results = {}
+    for label, func in (('to_json -> json.loads -> dumps', legacy_encode), ('arrow', arrow_encode)):
+        seconds, size = bench(func, df, args.repeat)
+        results[label] = seconds
+        print(f"{label:<32}{seconds * 1000:>12.1f}{size / 1e6:>10.2f}{size / 1e6 / seconds:>12.1f}")
+    print("-" * 70)
+    legacy, arrow = results.values()
+    print(f"speedup: {legacy / arrow:.1f}x")
+
+    compare_shapes(df, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
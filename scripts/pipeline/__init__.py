@@ -5,9 +5,12 @@ This package contains the main pipeline orchestration logic for:
 - Extraction (unzipping, decompressing archives)
 - Parsing (converting to structured formats)
 - Validation (data quality checks)
+- Loading (bulk load into the DuckDB analytical store)
 """
 
 from .extract import ExtractionOrchestrator
 from .parse import ParsingOrchestrator
+from .validate import ValidationOrchestrator
+from .load import LoadOrchestrator
 
-__all__ = ['ExtractionOrchestrator', 'ParsingOrchestrator']
+__all__ = ['ExtractionOrchestrator', 'ParsingOrchestrator', 'ValidationOrchestrator', 'LoadOrchestrator']
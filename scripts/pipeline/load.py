@@ -0,0 +1,463 @@
+"""
+Load Orchestrator
+
+Bulk-loads parsed datasets into a local DuckDB analytical store so the data
+API can answer filters, sorts and aggregations without re-reading flat files.
+
+- Files of the same table (FracFocusRegistry_1..14.csv) become one table
+- Loading uses DuckDB's bulk readers (read_parquet / read_csv), never
+  row-by-row inserts
+- Tables are clustered on their common filter columns so DuckDB's zone maps
+  prune row groups, and lookup columns (API numbers) get an index
+- Partitioned production datasets (district=/year= directories) are read
+  with hive_partitioning, so the partition keys become table columns
+- An `apex_catalog` table maps (source, data_type) to table names for the API
+- Rollups over the loaded tables (rollups.yaml) are refreshed afterwards,
+  and each loaded table gets a sample and sketches (src/sketches.py) for
+  the API's approximate aggregations
+- Well-level datasets get an API-number index (src/well_index.py) for the
+  API's /api/wells lookups and joins, a spatial index of well locations
+  (src/spatial_index.py) for its map queries, and a name search index
+  (src/search_index.py) for /api/search
+
+Usage:
+    orchestrator = LoadOrchestrator()
+    orchestrator.load_all()
+"""
+
+import re
+import sys
+import json
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, List, Optional
+
+# Add project root for shared src modules
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.partitioning import is_partitioned_dataset
+from src.rollups import materialize_all
+from src.search_index import build_index as build_search_index
+from src.sketches import build_sketches
+from src.spatial_index import build_index as build_spatial_index
+from src.well_index import WELL_DATASETS, build_index
+
+
+# Default store location (processed layer, next to other derived products)
+DEFAULT_STORE_PATH = 'data/processed/apex.duckdb'
+
+# Catalog table read by src/api/analytical_store.py
+CATALOG_TABLE = 'apex_catalog'
+
+# Dataset load targets. Column names are matched case-insensitively and
+# only columns present in a table are used.
+LOAD_TARGETS = {
+    'rrc_production': {
+        'path': 'rrc/production',
+        'source': 'rrc',
+        'data_type': 'production',
+        'cluster_by': ['CYCLE_YEAR_MONTH', 'DISTRICT_NO'],
+        'index_columns': ['API_NO', 'LEASE_NO'],
+    },
+    'rrc_permits': {
+        'path': 'rrc/horizontal_drilling_permits',
+        'source': 'rrc',
+        'data_type': 'horizontal_drilling_permits',
+        'index_columns': ['api_number', 'API_NUMBER'],
+    },
+    'rrc_completions': {
+        'path': 'rrc/completions_data',
+        'source': 'rrc',
+        'data_type': 'completions_data',
+        'index_columns': ['API_NUMBER', 'api_number'],
+    },
+    'fracfocus': {
+        'path': 'fracfocus',
+        'source': 'fracfocus',
+        'data_type': None,
+        'cluster_by': ['JobStartDate'],
+        'index_columns': ['APINumber', 'DisclosureId'],
+    },
+}
+
+
+def _quote(identifier: str) -> str:
+    """Quote a SQL identifier"""
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def table_name_for(dataset: str, file_stem: str) -> str:
+    """
+    Build the store table name for a parsed file.
+
+    Numbered splits share a table: FracFocusRegistry_3 -> fracfocus__fracfocusregistry
+    """
+    stem = re.sub(r'_\d+$', '', file_stem)
+    return re.sub(r'[^a-z0-9_]+', '_', f"{dataset}__{stem}".lower())
+
+
+class LoadOrchestrator:
+    """Orchestrates bulk loading of parsed data into the analytical store"""
+
+    def __init__(self, base_data_dir: str = 'data/raw', store_path: str = DEFAULT_STORE_PATH):
+        """
+        Initialize load orchestrator
+
+        Args:
+            base_data_dir: Base directory containing raw data
+            store_path: DuckDB database file to load into
+        """
+        self.base_data_dir = Path(base_data_dir)
+        self.store_path = Path(store_path)
+
+    def _connect(self):
+        """Open the store for writing"""
+        import duckdb
+
+        self.store_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = duckdb.connect(str(self.store_path))
+        conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {CATALOG_TABLE} (
+                table_name VARCHAR PRIMARY KEY,
+                dataset VARCHAR,
+                source VARCHAR,
+                data_type VARCHAR,
+                files VARCHAR,
+                row_count BIGINT,
+                loaded_at TIMESTAMP
+            )
+        """)
+        return conn
+
+    def _update_metadata(self, dataset_path: Path, status: str, tables: Dict[str, int]):
+        """Update metadata.json with loading status"""
+        metadata_file = dataset_path / 'metadata.json'
+
+        if metadata_file.exists():
+            with open(metadata_file, 'r') as f:
+                metadata = json.load(f)
+        else:
+            metadata = {}
+
+        if 'processing_state' not in metadata:
+            metadata['processing_state'] = {}
+
+        metadata['processing_state']['loading'] = status
+        metadata['processing_state']['loading_date'] = datetime.now().isoformat()
+        metadata['loaded'] = {
+            'store': str(self.store_path),
+            'tables': tables,
+            'total_rows': sum(tables.values())
+        }
+
+        with open(metadata_file, 'w') as f:
+            json.dump(metadata, f, indent=2)
+
+    def _group_files(self, dataset: str, parsed_dir: Path) -> Dict[str, List[Path]]:
+        """Group parsed files into store tables (parquet preferred over CSV)"""
+        files = sorted(d for d in parsed_dir.iterdir() if is_partitioned_dataset(d))
+        files += sorted(parsed_dir.glob('*.parquet')) or sorted(parsed_dir.glob('*.csv'))
+        groups: Dict[str, List[Path]] = {}
+        for file_path in files:
+            groups.setdefault(table_name_for(dataset, file_path.stem), []).append(file_path)
+        return groups
+
+    def _load_table(self, conn, table: str, files: List[Path], target: Dict) -> int:
+        """
+        Bulk-load one table and swap it in atomically.
+
+        Returns:
+            Number of rows loaded
+        """
+        file_list = '[' + ', '.join("'" + str(f).replace("'", "''") + "'" for f in files) + ']'
+        if files[0].is_dir():
+            # Partitioned dataset: district/year come from the directory names
+            patterns = '[' + ', '.join("'" + str(f / '**' / '*.parquet').replace("'", "''") + "'"
+                                       for f in files) + ']'
+            readers = [
+                f"read_parquet({patterns}, hive_partitioning = true, union_by_name = true, "
+                f"hive_types = {{'district': VARCHAR, 'year': INTEGER}})"
+            ]
+        elif files[0].suffix == '.parquet':
+            readers = [f"read_parquet({file_list}, union_by_name = true)"]
+        else:
+            # Retried as all-VARCHAR if a value past the sniffed sample doesn't convert
+            readers = [
+                f"read_csv({file_list}, union_by_name = true, sample_size = 200000)",
+                f"read_csv({file_list}, union_by_name = true, all_varchar = true)",
+            ]
+
+        import duckdb
+
+        staging = f"{table}__staging"
+        for i, reader in enumerate(readers):
+            # Staging is created inside the transaction, so a failed load leaves nothing behind
+            conn.execute("BEGIN TRANSACTION")
+            try:
+                row_count = self._swap_in(conn, table, staging, reader, files, target)
+                conn.execute("COMMIT")
+                return row_count
+            except (duckdb.ConversionException, duckdb.InvalidInputException) as e:
+                conn.execute("ROLLBACK")
+                if i == len(readers) - 1:
+                    raise
+                print(f"  ! Type conversion failed ({e}); loading as text")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    def _swap_in(self, conn, table: str, staging: str, reader: str, files: List[Path], target: Dict) -> int:
+        """Fill staging from `reader` and replace `table` with it (in the caller's transaction)"""
+        conn.execute(f"CREATE OR REPLACE TABLE {_quote(staging)} AS SELECT * FROM {reader} LIMIT 0")
+
+        columns = [row[0] for row in conn.execute(f"DESCRIBE {_quote(staging)}").fetchall()]
+        lookup = {c.lower(): c for c in columns}
+        cluster_by = [lookup[c.lower()] for c in target.get('cluster_by', []) if c.lower() in lookup]
+        order_clause = f" ORDER BY {', '.join(_quote(c) for c in cluster_by)}" if cluster_by else ""
+
+        conn.execute(f"INSERT INTO {_quote(staging)} SELECT * FROM {reader}{order_clause}")
+        conn.execute(f"DROP TABLE IF EXISTS {_quote(table)}")
+        conn.execute(f"ALTER TABLE {_quote(staging)} RENAME TO {_quote(table)}")
+
+        for column in dict.fromkeys(lookup[c.lower()] for c in target.get('index_columns', [])
+                                    if c.lower() in lookup):
+            index = re.sub(r'[^a-z0-9_]+', '_', f"idx_{table}_{column}".lower())
+            conn.execute(f"CREATE INDEX {_quote(index)} ON {_quote(table)} ({_quote(column)})")
+
+        row_count = conn.execute(f"SELECT COUNT(*) FROM {_quote(table)}").fetchone()[0]
+        conn.execute(f"DELETE FROM {CATALOG_TABLE} WHERE table_name = ?", [table])
+        conn.execute(
+            f"INSERT INTO {CATALOG_TABLE} VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [table, target['path'], target['source'], target['data_type'],
+             json.dumps([f.name for f in files]), row_count, datetime.now()]
+        )
+        return row_count
+
+    def load_dataset(self, name: str) -> bool:
+        """
+        Load one dataset's parsed files into the store
+
+        Args:
+            name: Key in LOAD_TARGETS (e.g. 'rrc_production')
+
+        Returns:
+            True if at least one table was loaded, False otherwise
+        """
+        target = LOAD_TARGETS[name]
+        dataset_path = self.base_data_dir / target['path']
+        parsed_dir = dataset_path / 'parsed'
+
+        if not parsed_dir.exists():
+            print(f"Parsed directory not found: {parsed_dir}")
+            return False
+
+        groups = self._group_files(name, parsed_dir)
+        if not groups:
+            print(f"No parsed files found in {parsed_dir}")
+            return False
+
+        if name in WELL_DATASETS:
+            self.build_well_index(name)
+            self.build_spatial_index(name)
+            self.build_search_index(name)
+
+        try:
+            conn = self._connect()
+        except ImportError:
+            print("✗ duckdb is not installed (pip install duckdb)")
+            return False
+
+        tables = {}
+        try:
+            for table, files in groups.items():
+                print(f"  Loading {len(files)} file(s) into {table}...")
+                try:
+                    tables[table] = self._load_table(conn, table, files, target)
+                    print(f"  ✓ {table}: {tables[table]:,} rows")
+                except Exception as e:
+                    print(f"  ✗ Failed to load {table}: {e}")
+            conn.execute("CHECKPOINT")
+        finally:
+            conn.close()
+
+        if tables:
+            self._update_metadata(dataset_path, 'complete', tables)
+            self.refresh_rollups(list(tables))
+            self.build_sketches(list(tables))
+        print(f"\n✓ Loaded {len(tables)}/{len(groups)} tables into {self.store_path}")
+
+        return len(tables) > 0
+
+    def build_well_index(self, name: str) -> bool:
+        """
+        Rebuild a dataset's API-number index from its parsed files
+
+        Args:
+            name: Key in WELL_DATASETS (e.g. 'fracfocus')
+
+        Returns:
+            True if the index was built, False otherwise
+        """
+        try:
+            manifest = build_index(name, self.base_data_dir, self.store_path.parent / 'well_index')
+        except Exception as e:
+            print(f"  ✗ Failed to build well index for {name}: {e}")
+            return False
+        print(f"  ✓ Well index {name}: {manifest['wells']:,} wells, {manifest['entries']:,} rows")
+        return True
+
+    def build_spatial_index(self, name: str) -> bool:
+        """
+        Rebuild a dataset's well-location index from its parsed files
+
+        Args:
+            name: Key in WELL_DATASETS (e.g. 'fracfocus')
+
+        Returns:
+            True if the index was built, False otherwise
+        """
+        try:
+            manifest = build_spatial_index(name, self.base_data_dir, self.store_path.parent / 'spatial')
+        except Exception as e:
+            print(f"  ✗ Failed to build spatial index for {name}: {e}")
+            return False
+        if manifest['points']:
+            print(f"  ✓ Spatial index {name}: {manifest['points']:,} located wells")
+        return True
+
+    def build_search_index(self, name: str) -> bool:
+        """
+        Rebuild a dataset's name search index from its parsed files
+
+        Args:
+            name: Key in WELL_DATASETS (e.g. 'fracfocus')
+
+        Returns:
+            True if the index was built, False otherwise
+        """
+        try:
+            manifest = build_search_index(name, self.base_data_dir, self.store_path.parent / 'search')
+        except Exception as e:
+            print(f"  ✗ Failed to build search index for {name}: {e}")
+            return False
+        if manifest['terms']:
+            print(f"  ✓ Search index {name}: {manifest['terms']:,} names, {manifest['postings']:,} row locators")
+        return True
+
+    def refresh_rollups(self, tables: Optional[List[str]] = None, full: bool = False) -> Dict[str, Dict]:
+        """
+        Build or incrementally refresh precomputed rollups (rollups.yaml)
+
+        Args:
+            tables: Only rollups over these store tables (None = all)
+            full: Rebuild from scratch instead of refreshing recent periods
+
+        Returns:
+            Dictionary with the refresh result for each rollup
+        """
+        if not self.store_path.exists():
+            print(f"Analytical store not found: {self.store_path}")
+            return {}
+
+        try:
+            conn = self._connect()
+        except ImportError:
+            print("✗ duckdb is not installed (pip install duckdb)")
+            return {}
+
+        try:
+            results = materialize_all(conn, tables, self.store_path.parent / 'rollups', full)
+        finally:
+            conn.close()
+
+        for name, result in results.items():
+            status = result['status']
+            if status in ('built', 'refreshed'):
+                detail = f"{result['rows']:,} rows"
+                if result.get('refreshed_from') is not None:
+                    detail += f" (from {result['refreshed_from']})"
+                print(f"  ✓ Rollup {name}: {status}, {detail}")
+            elif status == 'current':
+                print(f"  - Rollup {name}: up to date")
+            elif status == 'skipped':
+                print(f"  - Rollup {name}: skipped ({result['reason']})")
+            else:
+                print(f"  ✗ Rollup {name}: {status} ({result.get('reason')})")
+        return results
+
+    def build_sketches(self, tables: List[str]) -> Dict[str, bool]:
+        """
+        Rebuild the samples and sketches behind approximate aggregations
+
+        Args:
+            tables: Store tables to sketch
+
+        Returns:
+            Dictionary mapping table name to success status
+        """
+        try:
+            conn = self._connect()
+        except ImportError:
+            print("✗ duckdb is not installed (pip install duckdb)")
+            return {}
+
+        results = {}
+        try:
+            for table in tables:
+                try:
+                    manifest = build_sketches(conn, table, self.store_path.parent / 'sketches')
+                except Exception as e:
+                    print(f"  ✗ Failed to build sketches for {table}: {e}")
+                    results[table] = False
+                    continue
+                print(f"  ✓ Sketches {table}: {manifest['sample_rows']:,} of {manifest['rows']:,} rows sampled")
+                results[table] = True
+        finally:
+            conn.close()
+        return results
+
+    def load_rrc_production(self) -> bool:
+        """Load RRC production data"""
+        return self.load_dataset('rrc_production')
+
+    def load_rrc_permits(self) -> bool:
+        """Load RRC horizontal drilling permits"""
+        return self.load_dataset('rrc_permits')
+
+    def load_rrc_completions(self) -> bool:
+        """Load RRC completion packets"""
+        return self.load_dataset('rrc_completions')
+
+    def load_fracfocus(self) -> bool:
+        """Load FracFocus chemical disclosures"""
+        return self.load_dataset('fracfocus')
+
+    def load_all(self) -> Dict[str, bool]:
+        """
+        Load all parsed datasets
+
+        Returns:
+            Dictionary with load status for each dataset
+        """
+        print("\n" + "="*70)
+        print("LOAD ORCHESTRATOR")
+        print("="*70)
+
+        results = {name: self.load_dataset(name) for name in LOAD_TARGETS}
+
+        print("\n" + "="*70)
+        print("LOAD SUMMARY")
+        print("="*70)
+        for dataset, success in results.items():
+            status = "✓" if success else "✗"
+            print(f"{status} {dataset}: {'Loaded' if success else 'Failed/Skipped'}")
+        print("="*70)
+
+        return results
+
+
+if __name__ == '__main__':
+    # Example usage
+    orchestrator = LoadOrchestrator()
+    orchestrator.load_all()
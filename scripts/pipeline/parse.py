@@ -2,7 +2,8 @@
 Parsing Orchestrator
 
 Handles parsing of all extracted data sources into structured formats:
-- DSV to CSV conversion (RRC production)
+- DSV to CSV conversion (RRC production), with lease/well cycle tables
+  written as district=/year= partitioned Parquet datasets
 - Fixed-width parsing (RRC permits)
 - Delimited file parsing (RRC completions)
 - CSV consolidation (FracFocus)
@@ -26,6 +27,12 @@ from tqdm import tqdm
 SCRIPTS_DIR = Path(__file__).parent.parent
 sys.path.insert(0, str(SCRIPTS_DIR))
 
+# Add project root for shared src modules
+PROJECT_ROOT = SCRIPTS_DIR.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.partitioning import partition_spec, write_partitioned_csv
+
 
 class ParsingOrchestrator:
     """Orchestrates parsing of all extracted data"""
@@ -66,9 +73,15 @@ class ParsingOrchestrator:
 
     def parse_rrc_production(self) -> bool:
         """
-        Parse RRC production data (DSV to CSV)
+        Parse RRC production data (DSV to CSV / partitioned Parquet)
+
+        Converts pipe/delimiter-separated files to standard CSV format.
+        Tables with DISTRICT_NO and CYCLE_YEAR (or CYCLE_YEAR_MONTH) columns
+        are streamed into a Hive-style Parquet dataset instead:
 
-        Converts pipe/delimiter-separated files to standard CSV format
+            parsed/<TABLE>/district=08/year=2021/part-0.parquet
+
+        so readers filtering on district or year only open those partitions.
         """
         extracted_dir = self.rrc_dir / 'production' / 'extracted'
         parsed_dir = self.rrc_dir / 'production' / 'parsed'
@@ -112,6 +125,18 @@ class ParsingOrchestrator:
 
                 print(f"  Detected delimiter: '{delimiter}'")
 
+                spec = partition_spec(c.strip() for c in first_line.rstrip('\r\n').split(delimiter))
+                if spec:
+                    dataset_dir = parsed_dir / dsv_file.stem
+                    rows = write_partitioned_csv(dsv_file, delimiter, dataset_dir, spec)
+                    # Drop a flat CSV left by earlier runs so readers see one copy
+                    if output_file.exists():
+                        output_file.unlink()
+                    print(f"  ✓ Wrote {rows:,} rows to {dataset_dir.name}/ "
+                          f"(partitioned by district/{spec['year']})")
+                    parsed_count += 1
+                    continue
+
                 # Read and convert
                 df = pd.read_csv(
                     dsv_file,
@@ -3,17 +3,19 @@ Data Ingestion Pipeline Runner
 
 Main orchestration script for the complete data ingestion pipeline.
 
-Runs three main phases:
+Runs five main phases:
 1. DOWNLOAD - Fetch data from external sources
 2. EXTRACT - Uncompress and extract archives
 3. PARSE - Convert to structured formats (CSV/Parquet)
+4. VALIDATE - Vectorized data quality checks on parsed files
+5. LOAD - Bulk-load parsed data into the DuckDB analytical store
 
 Usage:
     # Run all phases for all datasets
     python scripts/pipeline/run_ingestion.py --all
 
     # Run specific phases
-    python scripts/pipeline/run_ingestion.py --download --extract --parse
+    python scripts/pipeline/run_ingestion.py --download --extract --parse --validate --load
 
     # Run for specific datasets
     python scripts/pipeline/run_ingestion.py --datasets rrc_production fracfocus
@@ -49,6 +51,8 @@ from downloaders.rrc_downloader import RRCDownloader
 from downloaders.fracfocus_downloader import FracFocusDownloader
 from pipeline.extract import ExtractionOrchestrator
 from pipeline.parse import ParsingOrchestrator
+from pipeline.validate import ValidationOrchestrator
+from pipeline.load import LoadOrchestrator
 from shared_state import PipelineState
 
 
@@ -74,11 +78,15 @@ class IngestionPipeline:
         self.fracfocus_downloader = FracFocusDownloader(str(self.base_data_dir / 'fracfocus'))
         self.extractor = ExtractionOrchestrator(str(self.base_data_dir))
         self.parser = ParsingOrchestrator(str(self.base_data_dir))
+        self.validator = ValidationOrchestrator(str(self.base_data_dir))
+        self.loader = LoadOrchestrator(str(self.base_data_dir))
 
         self.results = {
             'download': {},
             'extract': {},
-            'parse': {}
+            'parse': {},
+            'validate': {},
+            'load': {}
         }
 
     def discover_datasets(self, include_unprocessed: bool = True) -> List[Dict[str, str]]:
@@ -357,6 +365,125 @@ class IngestionPipeline:
         self.results['parse'] = results
         return results
 
+    def run_validate(self, datasets: Optional[List[str]] = None) -> Dict[str, bool]:
+        """
+        Run validation phase
+
+        Args:
+            datasets: List of datasets to validate (None = all)
+
+        Returns:
+            Dictionary with validation results
+        """
+        print("\n" + "="*70)
+        print("PHASE 4: VALIDATE")
+        print("="*70)
+
+        if self.dry_run:
+            print("[DRY RUN] Would validate the following datasets:")
+            discovered = [d['name'] for d in self.discover_datasets()]
+            for dataset in (datasets or discovered):
+                print(f"  - {dataset}")
+            return {}
+
+        results = {}
+
+        # Determine which datasets to validate
+        validate_all = datasets is None or len(datasets) == 0
+
+        # RRC Production
+        if validate_all or 'rrc_production' in datasets:
+            print("\n--- Validating RRC Production ---")
+            results['rrc_production'] = self.validator.validate_rrc_production()
+
+        # RRC Permits
+        if validate_all or 'rrc_permits' in datasets:
+            print("\n--- Validating RRC Permits ---")
+            results['rrc_permits'] = self.validator.validate_rrc_permits()
+
+        # RRC Completions
+        if validate_all or 'rrc_completions' in datasets:
+            print("\n--- Validating RRC Completions ---")
+            results['rrc_completions'] = self.validator.validate_rrc_completions()
+
+        # FracFocus
+        if validate_all or 'fracfocus' in datasets:
+            print("\n--- Validating FracFocus ---")
+            results['fracfocus'] = self.validator.validate_fracfocus()
+
+        self.results['validate'] = results
+        return results
+
+    def run_load(self, datasets: Optional[List[str]] = None) -> Dict[str, bool]:
+        """
+        Run load phase
+
+        Args:
+            datasets: List of datasets to load (None = all)
+
+        Returns:
+            Dictionary with load results
+        """
+        print("\n" + "="*70)
+        print("PHASE 5: LOAD")
+        print("="*70)
+
+        if self.dry_run:
+            print(f"[DRY RUN] Would load the following datasets into {self.loader.store_path}:")
+            discovered = [d['name'] for d in self.discover_datasets()]
+            for dataset in (datasets or discovered):
+                print(f"  - {dataset}")
+            return {}
+
+        results = {}
+
+        # Determine which datasets to load
+        load_all = datasets is None or len(datasets) == 0
+
+        # RRC Production
+        if load_all or 'rrc_production' in datasets:
+            print("\n--- Loading RRC Production ---")
+            results['rrc_production'] = self.loader.load_rrc_production()
+
+        # RRC Permits
+        if load_all or 'rrc_permits' in datasets:
+            print("\n--- Loading RRC Permits ---")
+            results['rrc_permits'] = self.loader.load_rrc_permits()
+
+        # RRC Completions
+        if load_all or 'rrc_completions' in datasets:
+            print("\n--- Loading RRC Completions ---")
+            results['rrc_completions'] = self.loader.load_rrc_completions()
+
+        # FracFocus
+        if load_all or 'fracfocus' in datasets:
+            print("\n--- Loading FracFocus ---")
+            results['fracfocus'] = self.loader.load_fracfocus()
+
+        self.results['load'] = results
+        return results
+
+    def run_rollups(self, full: bool = False) -> Dict[str, Dict]:
+        """
+        Refresh precomputed rollups (rollups.yaml) from the analytical store
+
+        Args:
+            full: Rebuild every rollup instead of refreshing recent periods
+
+        Returns:
+            Dictionary with the refresh result for each rollup
+        """
+        print("\n" + "="*70)
+        print("ROLLUPS")
+        print("="*70)
+
+        if self.dry_run:
+            print(f"[DRY RUN] Would {'rebuild' if full else 'refresh'} rollups in "
+                  f"{self.loader.store_path.parent / 'rollups'}")
+            return {}
+
+        return self.loader.refresh_rollups(full=full)
+
     def run_all(self, datasets: Optional[List[str]] = None, force: bool = False,
                 launch_ui: Optional[str] = None) -> Dict[str, Dict[str, bool]]:
         """
@@ -374,7 +501,7 @@ class IngestionPipeline:
         print("COMPLETE DATA INGESTION PIPELINE")
         print("="*70)
         print(f"Starting at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        print("Phases: Download -> Extract -> Parse")
+        print("Phases: Download -> Extract -> Parse -> Validate -> Load")
         if datasets:
             print(f"Datasets: {', '.join(datasets)}")
         else:
@@ -387,6 +514,8 @@ class IngestionPipeline:
         download_results = self.run_download(datasets, force)
         extract_results = self.run_extract(datasets)
         parse_results = self.run_parse(datasets)
+        validate_results = self.run_validate(datasets)
+        load_results = self.run_load(datasets)
 
         # Print summary
         print("\n" + "="*70)
@@ -398,7 +527,9 @@ class IngestionPipeline:
 
         for phase, results in [('Download', download_results),
                                ('Extract', extract_results),
-                               ('Parse', parse_results)]:
+                               ('Parse', parse_results),
+                               ('Validate', validate_results),
+                               ('Load', load_results)]:
             success = sum(1 for v in results.values() if v)
             failed = len(results) - success
             total_success += success
@@ -421,7 +552,9 @@ class IngestionPipeline:
         return {
             'download': download_results,
             'extract': extract_results,
-            'parse': parse_results
+            'parse': parse_results,
+            'validate': validate_results,
+            'load': load_results
         }
 
     def generate_context(self) -> Dict:
@@ -442,7 +575,9 @@ class IngestionPipeline:
             'pipeline_status': {
                 'download': self.results.get('download', {}),
                 'extract': self.results.get('extract', {}),
-                'parse': self.results.get('parse', {})
+                'parse': self.results.get('parse', {}),
+                'validate': self.results.get('validate', {}),
+                'load': self.results.get('load', {})
             },
             'statistics': {
                 'total_datasets': len(discovered_datasets),
@@ -678,6 +813,15 @@ Examples:
   # Run only download and extract phases
   python run_ingestion.py --download --extract
 
+  # Re-run data quality checks on parsed files
+  python run_ingestion.py --validate
+
+  # (Re)load parsed files into the DuckDB analytical store
+  python run_ingestion.py --load
+
+  # Refresh precomputed rollups (rollups.yaml) without reloading
+  python run_ingestion.py --rollups
+
   # Run for specific datasets
   python run_ingestion.py --all --datasets rrc_production fracfocus
 
@@ -700,13 +844,19 @@ Examples:
 
     # Phase selection
     parser.add_argument('--all', action='store_true',
-                        help='Run all phases (download, extract, parse)')
+                        help='Run all phases (download, extract, parse, validate, load)')
     parser.add_argument('--download', action='store_true',
                         help='Run download phase')
     parser.add_argument('--extract', action='store_true',
                         help='Run extract phase')
     parser.add_argument('--parse', action='store_true',
                         help='Run parse phase')
+    parser.add_argument('--validate', action='store_true',
+                        help='Run validate phase (data quality checks)')
+    parser.add_argument('--load', action='store_true',
+                        help='Run load phase (bulk-load into the analytical store)')
+    parser.add_argument('--rollups', action='store_true',
+                        help='Refresh precomputed rollups (also done after --load)')
     parser.add_argument('--generate-context', action='store_true',
                         help='Generate context for UI tools')
 
@@ -717,6 +867,8 @@ Examples:
     # Options
     parser.add_argument('--force', action='store_true',
                         help='Force re-download even if files exist')
+    parser.add_argument('--full-rollups', action='store_true',
+                        help='With --rollups: rebuild rollups instead of refreshing recent periods')
     parser.add_argument('--dry-run', action='store_true',
                         help='Show what would be done without executing')
     parser.add_argument('--base-dir', default='data/raw',
@@ -744,8 +896,9 @@ Examples:
         return
 
     # Validate arguments
-    if not (args.all or args.download or args.extract or args.parse):
-        parser.error('Must specify at least one phase: --all, --download, --extract, --parse, or --generate-context')
+    if not (args.all or args.download or args.extract or args.parse or args.validate or args.load
+            or args.rollups):
+        parser.error('Must specify at least one phase: --all, --download, --extract, --parse, --validate, --load, --rollups, or --generate-context')
 
     # Run requested phases
     if args.all:
@@ -757,6 +910,12 @@ Examples:
             pipeline.run_extract(args.datasets)
         if args.parse:
             pipeline.run_parse(args.datasets)
+        if args.validate:
+            pipeline.run_validate(args.datasets)
+        if args.load:
+            pipeline.run_load(args.datasets)
+        if args.rollups:
+            pipeline.run_rollups(full=args.full_rollups)
 
         # Generate context after individual phase runs
         pipeline.generate_and_save_context()
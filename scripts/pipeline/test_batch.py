@@ -0,0 +1,87 @@
+"""
+Tests for request batching (src/api/batch.py, POST /api/batch)
+
+Run: python -m pytest scripts/pipeline/test_batch.py
+"""
+
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Add project root for shared src modules
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from src.api import data_service
+from src.api.batch import run_batch, shared
+from src.api.concurrency import run_blocking
+
+
+class _Item:
+    """Minimal BatchItem"""
+
+    def __init__(self, path, id=None, method='GET', params=None, body=None, headers=None):
+        self.id, self.method, self.path = id, method, path
+        self.params, self.body, self.headers = params, body, headers
+
+
+def _app():
+    """App whose endpoint resolves a source through a counted @shared lookup"""
+    app = FastAPI()
+    calls = []
+    lock = threading.Lock()
+
+    @shared
+    def resolve(source: str):
+        with lock:
+            calls.append(source)
+        time.sleep(0.05)  # Long enough for concurrent sub-requests to overlap
+        return source.upper()
+
+    @app.get('/api/sources/{source}')
+    async def source_info(source: str):
+        if source == 'missing':
+            raise HTTPException(status_code=404, detail='Source not found')
+        return {'name': await run_blocking(None, resolve, source)}
+
+    return app, calls
+
+
+def test_shared_lookup_runs_once_per_batch():
+    app, calls = _app()
+    items = [_Item('/api/sources/rrc') for _ in range(5)] + [_Item('/api/sources/fracfocus', id='ff')]
+
+    body = asyncio.run(run_batch(app, items))
+
+    assert sorted(calls) == ['fracfocus', 'rrc']
+    assert b'"id": "ff", "status": 200' in body
+    assert body.count(b'"body": {"name":"RRC"}') == 5
+
+
+def test_lookup_is_not_shared_outside_a_batch():
+    app, calls = _app()
+    client = TestClient(app)
+    for _ in range(3):
+        assert client.get('/api/sources/rrc').json() == {'name': 'RRC'}
+    assert calls == ['rrc'] * 3
+
+
+def test_failing_sub_request_only_fails_itself():
+    app, _ = _app()
+    body = asyncio.run(run_batch(app, [_Item('/api/sources/missing'), _Item('/api/sources/rrc')]))
+    assert body.startswith(b'{"responses": [{"id": "0", "status": 404')
+    assert b'{"id": "1", "status": 200' in body
+
+
+@pytest.mark.parametrize('path', ['/api/batch', '/api/pipelines/events/', '/health'])
+def test_batch_rejects_nested_and_streaming_paths(path):
+    client = TestClient(data_service.app)
+    response = client.post('/api/batch', json={'requests': [{'path': path}]})
+    assert response.status_code == 400
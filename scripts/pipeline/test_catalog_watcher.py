@@ -0,0 +1,129 @@
+"""
+Tests for the data/ catalog watcher (src/catalog_watcher.py)
+
+Run: python -m pytest scripts/pipeline/test_catalog_watcher.py
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Add project root for shared src modules
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.catalog_watcher import CatalogVersion, CatalogWatcher, source_for_path
+from src.shared_state import PipelineState
+
+
+class _Batches:
+    """Listener recording each applied batch"""
+
+    def __init__(self):
+        self.batches = []
+        self._event = threading.Event()
+
+    def __call__(self, paths, sources):
+        self.batches.append((set(paths), set(sources)))
+        self._event.set()
+
+    def wait(self, timeout: float = 10.0):
+        assert self._event.wait(timeout), "watcher applied no batch"
+        self._event.clear()
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    source = tmp_path / 'raw' / 'FracFocus' / 'Chemical_Data' / 'parsed'
+    source.mkdir(parents=True)
+    (source / 'existing.csv').write_text('a\n1\n')
+    (tmp_path / 'interim').mkdir()
+    return tmp_path
+
+
+@pytest.fixture
+def context_updates(monkeypatch):
+    calls = []
+    monkeypatch.setattr(PipelineState, 'apply_path_changes', lambda paths: calls.append(set(paths)))
+    return calls
+
+
+def test_source_for_path(tmp_path):
+    assert source_for_path(tmp_path / 'raw' / 'rrc' / 'production' / 'x.dsv', tmp_path) == 'rrc'
+    assert source_for_path(tmp_path / 'interim' / 'fracfocus_clean.parquet', tmp_path) == 'fracfocus_clean.parquet'
+    assert source_for_path(tmp_path / 'raw', tmp_path) is None
+    assert source_for_path(tmp_path / 'logs' / 'run' / 'x.log', tmp_path) is None
+    assert source_for_path(tmp_path.parent / 'elsewhere' / 'x', tmp_path) is None
+
+
+def test_polling_debounces_changes_into_one_batch(data_dir, context_updates):
+    batches = _Batches()
+    watcher = CatalogWatcher(data_dir=data_dir, poll_interval=0.1, debounce=0.6, force_polling=True)
+    watcher.add_listener(batches)
+    before = CatalogVersion.current()
+    assert watcher.start()
+    try:
+        parsed = data_dir / 'raw' / 'FracFocus' / 'Chemical_Data' / 'parsed'
+        written = []
+        for i in range(4):
+            written.append(parsed / f'registry_{i}.csv')
+            written[-1].write_text('a\n1\n')
+            time.sleep(0.1)  # Spread over several polls
+        written.append(data_dir / 'interim' / 'fracfocus_clean.parquet')
+        written[-1].write_bytes(b'PAR1')
+        (parsed / 'download.tmp').write_text('partial')   # Ignored
+        (parsed / '.registry_0.csv.swp').write_text('x')  # Ignored
+
+        batches.wait()
+        time.sleep(1.0)  # No second batch for the same changes
+    finally:
+        watcher.stop()
+
+    assert len(batches.batches) == 1
+    paths, sources = batches.batches[0]
+    assert paths == set(written)
+    assert sources == {'FracFocus', 'fracfocus_clean.parquet'}
+    assert context_updates == [set(written)]
+
+    version = CatalogVersion.current()
+    assert version == before + 1
+    assert CatalogVersion.source_version('FracFocus') == version
+    assert CatalogVersion.source_version('fracfocus_clean.parquet') == version
+
+
+def test_polling_reports_deletions(data_dir, context_updates):
+    batches = _Batches()
+    watcher = CatalogWatcher(data_dir=data_dir, poll_interval=0.1, debounce=0.2, force_polling=True)
+    watcher.add_listener(batches)
+    assert watcher.start()
+    try:
+        existing = data_dir / 'raw' / 'FracFocus' / 'Chemical_Data' / 'parsed' / 'existing.csv'
+        existing.unlink()
+        batches.wait()
+    finally:
+        watcher.stop()
+
+    assert batches.batches == [({existing}, {'FracFocus'})]
+    assert context_updates == [{existing}]
+
+
+def test_failing_listener_does_not_stop_others(tmp_path, context_updates):
+    batches = _Batches()
+    watcher = CatalogWatcher(data_dir=tmp_path, force_polling=True)
+    watcher.add_listener(lambda paths, sources: 1 / 0)
+    watcher.add_listener(batches)
+
+    path = tmp_path / 'processed' / 'decline' / 'x.parquet'
+    version = watcher.apply_changes({path})
+
+    assert batches.batches == [({path}, {'decline'})]
+    assert CatalogVersion.source_version('decline') == version
+
+
+def test_context_update_can_be_disabled(tmp_path, context_updates):
+    watcher = CatalogWatcher(data_dir=tmp_path, update_context=False, force_polling=True)
+    watcher.apply_changes({tmp_path / 'raw' / 'rrc' / 'x.csv'})
+    assert context_updates == []
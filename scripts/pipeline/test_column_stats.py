@@ -0,0 +1,127 @@
+"""
+Tests for per-column profiles (src/api/column_stats.py)
+
+Run: python -m pytest scripts/pipeline/test_column_stats.py
+"""
+
+import sys
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+import pytest
+
+# Add project root for shared src modules
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.api import column_stats
+from src.api.column_stats import footer_stats, select_columns, sketch_stats
+
+
+def _production(rows=1_000, seed=3):
+    rng = np.random.default_rng(seed)
+    oil = rng.gamma(2.0, 50.0, rows)
+    oil[::10] = np.nan
+    return pa.table({
+        'LEASE_NO': pa.array([f'{i % 37:05d}' for i in range(rows)]),
+        'OIL': pa.array(oil, from_pandas=True),
+        'WELLS': pa.array(rng.integers(1, 9, rows)),
+        'FIRST_REPORTED': pa.array([date(2020, 1, 1 + i % 28) for i in range(rows)], pa.date32()),
+    })
+
+
+@pytest.fixture
+def partitioned(tmp_path):
+    """Production split into district partitions, several row groups per file"""
+    table = _production()
+    for district in ('08', '7C'):
+        path = tmp_path / f'DISTRICT={district}' / 'part-0.parquet'
+        path.parent.mkdir()
+        pq.write_table(table, path, row_group_size=128)
+    return table, ds.dataset(tmp_path, format='parquet', partitioning='hive')
+
+
+def test_footer_stats_merge_row_groups_and_partitions(partitioned):
+    table, dataset = partitioned
+    stats = footer_stats(dataset)
+
+    assert stats['row_count'] == 2 * table.num_rows
+    assert stats['row_groups'] == 2 * 8
+    oil = stats['columns']['OIL']
+    assert oil['null_count'] == 2 * table.column('OIL').null_count
+    assert oil['min'] == pytest.approx(np.nanmin(table.column('OIL').to_numpy(zero_copy_only=False)))
+    assert oil['max'] == pytest.approx(np.nanmax(table.column('OIL').to_numpy(zero_copy_only=False)))
+    assert (stats['columns']['LEASE_NO']['min'], stats['columns']['LEASE_NO']['max']) == ('00000', '00036')
+    assert stats['columns']['FIRST_REPORTED']['max'] == '2020-01-28'
+    # Partition values come from the paths
+    assert (stats['columns']['DISTRICT']['min'], stats['columns']['DISTRICT']['max']) == ('08', '7C')
+
+
+def test_footer_stats_need_parquet_statistics(tmp_path):
+    path = tmp_path / 'production.parquet'
+    pq.write_table(_production(100), path, write_statistics=False)
+    oil = footer_stats(ds.dataset(path))['columns']['OIL']
+    assert (oil['min'], oil['max'], oil['null_count']) == (None, None, None)
+
+    csv = tmp_path / 'production.csv'
+    csv.write_text('OIL\n1.5\n')
+    assert footer_stats(ds.dataset(csv, format='csv')) is None
+
+
+def test_sketch_stats_exact_below_sample_size(partitioned):
+    table, dataset = partitioned
+    stats = sketch_stats(dataset, footer_stats(dataset))
+    oil = table.column('OIL').to_numpy(zero_copy_only=False)
+    oil = np.concatenate([oil, oil])
+    oil = oil[~np.isnan(oil)]
+
+    entry = stats['columns']['OIL']
+    assert stats['row_count'] == stats['sample_rows'] == 2 * table.num_rows
+    assert entry['histogram']['exact']
+    assert entry['histogram']['counts'] == np.histogram(oil, bins=column_stats.HISTOGRAM_BINS,
+                                                        range=(oil.min(), oil.max()))[0].tolist()
+    assert entry['quantiles']['0.5'] == pytest.approx(np.quantile(oil, 0.5))
+    assert abs(stats['columns']['LEASE_NO']['distinct']['estimate'] - 37) <= 2
+    assert stats['columns']['DISTRICT']['distinct']['estimate'] == 2
+    assert stats['columns']['FIRST_REPORTED']['quantiles']['0.01'].startswith('2020-01-01')
+    assert 'quantiles' not in stats['columns']['LEASE_NO']
+
+
+def test_sketch_stats_sample_large_datasets(partitioned, monkeypatch):
+    """Above the reservoir size the histogram is scaled to the non-null count, deterministically"""
+    monkeypatch.setattr(column_stats, 'SAMPLE_ROWS', 300)
+    table, dataset = partitioned
+    footer = footer_stats(dataset)
+    stats = sketch_stats(dataset, footer, seed=1)
+
+    histogram = stats['columns']['OIL']['histogram']
+    non_null = footer['row_count'] - footer['columns']['OIL']['null_count']
+    assert stats['sample_rows'] == 300
+    assert not histogram['exact']
+    assert abs(sum(histogram['counts']) - non_null) <= column_stats.HISTOGRAM_BINS
+    # Footer bounds fix the histogram range
+    assert histogram['edges'][0] == pytest.approx(footer['columns']['OIL']['min'])
+    assert histogram['edges'][-1] == pytest.approx(footer['columns']['OIL']['max'])
+    assert sketch_stats(dataset, footer, seed=1) == stats
+
+
+def test_sketch_stats_without_footer(tmp_path):
+    """CSV/JSON get min/max/null counts from the scan"""
+    path = tmp_path / 'permits.csv'
+    path.write_text('API_NUMBER,DEPTH\n4231740186,9500\n4231740187,\n4231740186,12000\n')
+    stats = sketch_stats(ds.dataset(path, format='csv'))
+
+    depth = stats['columns']['DEPTH']
+    assert (depth['min'], depth['max'], depth['null_count']) == (9500, 12000, 1)
+    assert depth['histogram']['counts'][0] + depth['histogram']['counts'][-1] == 2
+    assert stats['columns']['API_NUMBER']['distinct']['estimate'] == 2
+
+
+def test_select_columns():
+    stats = {'row_count': 3, 'columns': {'A': {}, 'B': {}}}
+    assert select_columns(stats, None) is stats
+    assert select_columns(stats, ['B', 'missing']) == {'row_count': 3, 'columns': {'B': {}}}
@@ -0,0 +1,140 @@
+"""
+Tests for response compression and conditional GETs
+(src/api/compression.py, src/api/conditional.py)
+
+Run: python -m pytest scripts/pipeline/test_compression.py
+"""
+
+import gzip
+import json
+import sys
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI, Response
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+# Add project root for shared src modules
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.api import data_service
+from src.api.analytical_store import AnalyticalStore
+from src.api.compression import CompressionMiddleware, choose_encoding
+from src.api.conditional import is_not_modified, make_validators
+
+PAGE = json.dumps([{'LEASE_NO': f'{i:05d}', 'OPERATOR': 'PIONEER'} for i in range(200)]).encode('utf-8')
+
+
+def _client():
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, encodings=['gzip'])
+
+    @app.get('/page')
+    def page():
+        return Response(PAGE, media_type='application/json')
+
+    @app.get('/small')
+    def small():
+        return Response(b'[]', media_type='application/json')
+
+    @app.get('/events')
+    def events():
+        return StreamingResponse(iter([b'data: ' + PAGE + b'\n\n'] * 2), media_type='text/event-stream')
+
+    @app.get('/lines')
+    def lines():
+        return StreamingResponse(iter([PAGE + b'\n'] * 3), media_type='application/x-ndjson')
+
+    @app.get('/unchanged')
+    def unchanged():
+        return Response(status_code=304, headers={'ETag': 'W/"abc"'})
+
+    return TestClient(app)
+
+
+def _raw(client, path, **headers):
+    """Response with its body left encoded"""
+    with client.stream('GET', path, headers=headers) as response:
+        return response, b''.join(response.iter_raw())
+
+
+def test_choose_encoding():
+    assert choose_encoding('gzip, br;q=0.9', ['zstd', 'br', 'gzip']) == 'gzip'
+    assert choose_encoding('gzip, br', ['zstd', 'br', 'gzip']) == 'br'
+    assert choose_encoding('*;q=0.5, gzip;q=0', ['br', 'gzip']) == 'br'
+    assert choose_encoding('identity', ['gzip']) is None
+
+
+def test_large_json_is_compressed():
+    response, body = _raw(_client(), '/page', **{'Accept-Encoding': 'gzip'})
+    assert response.headers['content-encoding'] == 'gzip'
+    assert response.headers['vary'] == 'Accept-Encoding'
+    assert int(response.headers['content-length']) == len(body) < len(PAGE)
+    assert gzip.decompress(body) == PAGE
+
+
+def test_streams_are_compressed_chunk_by_chunk():
+    response, body = _raw(_client(), '/lines', **{'Accept-Encoding': 'gzip'})
+    assert response.headers['content-encoding'] == 'gzip'
+    assert 'content-length' not in response.headers
+    assert gzip.decompress(body) == (PAGE + b'\n') * 3
+
+
+@pytest.mark.parametrize('path', ['/small', '/events', '/unchanged'])
+def test_passthrough(path):
+    """Small bodies, event streams and 304s are sent as they are"""
+    client = _client()
+    response, body = _raw(client, path, **{'Accept-Encoding': 'gzip'})
+    assert 'content-encoding' not in response.headers
+    assert body == _raw(client, path, **{'Accept-Encoding': 'identity'})[1]
+
+
+def test_not_modified(tmp_path):
+    path = tmp_path / 'production.parquet'
+    path.write_bytes(b'x')
+    etag, last_modified = make_validators(path, (1, 1), 'key')
+
+    assert etag != make_validators(path, (2, 1), 'key')[0]
+    assert etag != make_validators(path, (1, 1), 'other')[0]
+    assert is_not_modified({'if-none-match': f'"nope", {etag[2:]}'}, etag, last_modified)
+    assert is_not_modified({'if-none-match': '*'}, etag, last_modified)
+    # If-None-Match wins over a matching If-Modified-Since
+    assert not is_not_modified({'if-none-match': '"nope"',
+                                'if-modified-since': 'Fri, 01 Jan 2100 00:00:00 GMT'}, etag, last_modified)
+    assert is_not_modified({'if-modified-since': 'Fri, 01 Jan 2100 00:00:00 GMT'}, etag, last_modified)
+    assert not is_not_modified({'if-modified-since': 'Thu, 01 Jan 1970 00:00:00 GMT'}, etag, last_modified)
+    assert not is_not_modified({'if-modified-since': 'garbage'}, etag, last_modified)
+
+
+def test_data_endpoint_answers_304(tmp_path, monkeypatch):
+    """A reload with the page's ETag gets an empty, uncompressed 304 until the data changes"""
+    raw = tmp_path / 'raw'
+    parsed = raw / 'fracfocus' / 'parsed' / 'registry.csv'
+    parsed.parent.mkdir(parents=True)
+    parsed.write_text('API_NUMBER,OPERATOR\n' + ''.join(f'42{i:08d},PIONEER\n' for i in range(200)))
+    monkeypatch.setattr(data_service, 'DATA_ROOT', raw)
+    monkeypatch.setattr(data_service, 'store', AnalyticalStore(tmp_path / 'missing.duckdb'))
+    client = TestClient(data_service.app)
+    url = '/api/sources/fracfocus/data?limit=100'
+
+    first = client.get(url, headers={'Accept-Encoding': 'gzip'})
+    assert first.status_code == 200
+    assert first.headers['content-encoding'] == 'gzip'
+    assert len(first.json()['data']) == 100
+    etag = first.headers['etag']
+
+    response, body = _raw(client, url, **{'Accept-Encoding': 'gzip', 'If-None-Match': etag})
+    assert response.status_code == 304
+    assert (body, response.headers['etag']) == (b'', etag)
+    assert 'content-encoding' not in response.headers
+
+    # Other pages have their own ETag
+    assert client.get(url + '&offset=100', headers={'If-None-Match': etag}).status_code == 200
+
+    with parsed.open('a') as f:
+        f.write('4299999999,EXXON\n')
+    changed = client.get(url, headers={'If-None-Match': etag})
+    assert changed.status_code == 200
+    assert changed.headers['etag'] != etag
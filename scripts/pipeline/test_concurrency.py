@@ -0,0 +1,121 @@
+"""
+Tests for blocking-work dispatch (src/api/concurrency.py)
+
+Run: python -m pytest scripts/pipeline/test_concurrency.py
+"""
+
+import asyncio
+import contextvars
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+# Add project root for shared src modules
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.api import concurrency
+from src.api.concurrency import run_blocking
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    executor = ThreadPoolExecutor(max_workers=8)
+    monkeypatch.setattr(concurrency, '_pool', executor)
+    monkeypatch.setattr(concurrency, 'IO_WORKERS', 8)
+    monkeypatch.setattr(concurrency, 'SOURCE_CONCURRENCY', 2)
+    yield executor
+    executor.shutdown(wait=True)
+
+
+class _Work:
+    """Blocking job that records how many copies run at once"""
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.running = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, source):
+        with self.lock:
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        time.sleep(self.seconds)
+        with self.lock:
+            self.running -= 1
+        return source
+
+
+def test_per_source_limit(pool):
+    work = _Work(0.1)
+
+    async def main():
+        return await asyncio.gather(*(run_blocking(s, work, s) for s in ['rrc'] * 6 + ['fracfocus'] * 2))
+
+    started = time.monotonic()
+    assert asyncio.run(main()) == ['rrc'] * 6 + ['fracfocus'] * 2
+    # Three rounds of two rrc jobs; fracfocus runs alongside
+    assert 0.3 <= time.monotonic() - started < 0.5
+    assert work.peak == 4
+
+
+def test_limit_holds_when_requests_are_cancelled(pool):
+    """Cancelled requests keep their slot until their thread finishes"""
+    work = _Work(0.3)
+
+    async def main():
+        first = [asyncio.ensure_future(run_blocking('rrc', work, 'rrc')) for _ in range(2)]
+        await asyncio.sleep(0.05)
+        for task in first:
+            task.cancel()
+        await asyncio.gather(*first, return_exceptions=True)
+        # Clients disconnected, but both threads are still running
+        await asyncio.gather(*(run_blocking('rrc', work, 'rrc') for _ in range(4)))
+        return concurrency.stats()
+
+    stats = asyncio.run(main())
+    assert work.peak == 2
+    assert stats['running'] == 0 and stats['waiting'] == 0
+
+
+def test_queued_request_cancelled_before_it_runs(pool):
+    work = _Work(0.2)
+
+    async def main():
+        running = [asyncio.ensure_future(run_blocking('rrc', work, 'rrc')) for _ in range(2)]
+        queued = asyncio.ensure_future(run_blocking('rrc', work, 'rrc'))
+        await asyncio.sleep(0.05)
+        queued.cancel()
+        await asyncio.gather(*running)
+        await run_blocking('rrc', work, 'rrc')  # The queued request didn't keep a slot
+
+    asyncio.run(main())
+    assert work.peak == 2
+
+
+def test_context_reaches_the_worker_thread(pool):
+    variable = contextvars.ContextVar('variable', default=None)
+
+    async def main():
+        variable.set('batch')
+        return await run_blocking(None, variable.get)
+
+    assert asyncio.run(main()) == 'batch'
+
+
+def test_exceptions_propagate_and_free_the_slot(pool):
+    def fail():
+        raise ValueError('bad file')
+
+    async def main():
+        for _ in range(3):
+            with pytest.raises(ValueError):
+                await run_blocking('rrc', fail)
+        return await asyncio.wait_for(run_blocking('rrc', lambda: 'ok'), 1.0)
+
+    assert asyncio.run(main()) == 'ok'
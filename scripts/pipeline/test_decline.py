@@ -0,0 +1,111 @@
+"""
+Tests for vectorized Arps decline fits (src/decline.py)
+
+Run: python -m pytest scripts/pipeline/test_decline.py
+"""
+
+import sys
+from pathlib import Path
+
+import duckdb
+import numpy as np
+
+# Add project root for shared src modules
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src import decline
+from src.decline import arps_rate, fit_groups, get_fits
+
+
+def _periods(months: int) -> np.ndarray:
+    """YYYYMM of `months` consecutive months from January 2015"""
+    index = np.arange(2015 * 12, 2015 * 12 + months)
+    return (index // 12) * 100 + index % 12 + 1
+
+
+def _leases(*volumes):
+    group = np.concatenate([np.full(len(v), i) for i, v in enumerate(volumes)])
+    periods = np.concatenate([_periods(len(v)) for v in volumes])
+    return group, periods, np.concatenate(volumes).astype(np.float64), len(volumes)
+
+
+def test_declining_lease_is_fitted():
+    t = np.arange(60, dtype=np.float64)
+    volume = arps_rate(np.array(5000.0), np.array(0.08), np.array(0.9), t)
+    fits = fit_groups(*_leases(volume))
+
+    assert fits['model'][0] == 'hyperbolic'
+    assert abs(fits['qi'][0] - 5000) / 5000 < 0.02
+    assert abs(fits['di'][0] - 0.08) / 0.08 < 0.05
+    assert fits['r2'][0] > 0.99
+    assert fits['remaining'][0] > 0
+    assert fits['eur'][0] == fits['cumulative'][0] + fits['remaining'][0]
+
+
+def test_flat_noisy_lease_is_rejected():
+    """No decline and r2 near 0: no curve, nothing forecast beyond cumulative"""
+    rng = np.random.default_rng(3)
+    noisy = 1000 * rng.lognormal(0.0, 0.5, 120)
+    flat = np.full(120, 800.0) * (1 - 0.00001 * np.arange(120))
+    fits = fit_groups(*_leases(noisy, flat))
+
+    for i in range(2):
+        assert fits['model'][i] is None
+        assert np.isnan(fits['qi'][i]) and np.isnan(fits['di'][i]) and np.isnan(fits['r2'][i])
+        assert fits['remaining'][i] == 0
+        assert fits['eur'][i] == fits['cumulative'][i]
+
+
+def test_short_history_is_not_fitted():
+    volume = np.array([900.0, 800.0, 700.0, 600.0])
+    fits = fit_groups(*_leases(volume))
+    assert fits['model'][0] is None
+    assert fits['months'][0] == 4
+    assert fits['cumulative'][0] == volume.sum()
+
+
+class _Store:
+    """Analytical store stand-in counting connections (one per fit)"""
+
+    def __init__(self, path):
+        self.path = path
+        self.connects = 0
+
+    def connect(self):
+        self.connects += 1
+        return duckdb.connect(str(self.path))
+
+
+def test_economic_limit_reuses_cached_fits(tmp_path, monkeypatch):
+    """Fits are cached per rate/grouping/model; each economic limit only changes the forecast"""
+    monkeypatch.setattr(decline, '_loaded', {})
+    t = np.arange(48, dtype=np.float64)
+    volume = arps_rate(np.array(3000.0), np.array(0.06), np.array(0.8), t)
+    conn = duckdb.connect(str(tmp_path / 'apex.duckdb'))
+    conn.execute("CREATE TABLE production (LEASE_NO VARCHAR, CYCLE_YEAR_MONTH INTEGER, LEASE_OIL_PROD_VOL DOUBLE)")
+    conn.executemany("INSERT INTO production VALUES ('00001', ?, ?)",
+                     [(int(p), float(v)) for p, v in zip(_periods(len(volume)), volume)])
+    conn.close()
+    store = _Store(tmp_path / 'apex.duckdb')
+
+    def fits(limit, loaded_at='2024-01-01'):
+        return get_fits(store, 'production', loaded_at, group_by=['LEASE_NO'], economic_limit=limit,
+                        decline_dir=tmp_path / 'decline').to_pylist()[0]
+
+    low, high = fits(5.0), fits(100.0)
+    assert store.connects == 1
+    assert low['qi'] == high['qi'] and low['cumulative'] == high['cumulative']
+    assert low['remaining'] > high['remaining'] > 0
+    assert low['eur'] == low['cumulative'] + low['remaining']
+
+    # Same as fitting with the limit directly
+    direct = fit_groups(*_leases(volume), economic_limit=100.0)
+    assert high['remaining'] == direct['remaining'][0]
+
+    # Read back from Parquet in a fresh process; a reload refits
+    monkeypatch.setattr(decline, '_loaded', {})
+    assert fits(5.0) == low
+    assert store.connects == 1
+    fits(5.0, loaded_at='2024-02-01')
+    assert store.connects == 2
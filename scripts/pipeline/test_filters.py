@@ -0,0 +1,69 @@
+"""
+Tests for the data API filter language (src/api/filters.py)
+
+Run: python -m pytest scripts/pipeline/test_filters.py
+"""
+
+import sys
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pytest
+from fastapi import HTTPException
+
+# Add project root for shared src modules
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.api.filters import check_filter_columns, parse_filters, to_expression
+
+
+TABLE = pa.table({
+    'DISTRICT_NO': ['08', '8A', '01', None],
+    'CYCLE_YEAR_MONTH': [202001, 202006, 202101, 201912],
+    'OPERATOR_NAME': ['PIONEER NATURAL', 'EXXON', 'PIONEER WEST', 'OXY'],
+    'OIL': [10.0, None, 5.0, 1.0],
+})
+
+
+def _rows(filters):
+    expression = to_expression(parse_filters(filters), TABLE.schema)
+    return ds.dataset(TABLE).to_table(filter=expression, columns=['OPERATOR_NAME'])['OPERATOR_NAME'].to_pylist()
+
+
+@pytest.mark.parametrize('filters, expected', [
+    ({'DISTRICT_NO': '08'}, ['PIONEER NATURAL']),
+    ({'DISTRICT_NO': None}, ['OXY']),
+    ({'DISTRICT_NO': ['08', '01']}, ['PIONEER NATURAL', 'PIONEER WEST']),
+    ({'CYCLE_YEAR_MONTH': {'gte': 202001, 'lt': 202101}}, ['PIONEER NATURAL', 'EXXON']),
+    ({'CYCLE_YEAR_MONTH': {'between': ['202001', '202006']}}, ['PIONEER NATURAL', 'EXXON']),
+    ({'OPERATOR_NAME': {'prefix': 'PIONEER'}}, ['PIONEER NATURAL', 'PIONEER WEST']),
+    ({'OPERATOR_NAME': {'contains': 'X'}}, ['EXXON', 'OXY']),
+    ({'OIL': {'is_null': True}}, ['EXXON']),
+    ({'$or': [{'DISTRICT_NO': '8A'}, {'OIL': {'lt': 2}}]}, ['EXXON', 'OXY']),
+    ({'$not': {'OPERATOR_NAME': {'prefix': 'PIONEER'}}}, ['EXXON', 'OXY']),
+])
+def test_filters_select_rows(filters, expected):
+    assert _rows(filters) == expected
+
+
+@pytest.mark.parametrize('filters', [
+    {'OIL': {'near': 3}},
+    {'OIL': {'between': [1]}},
+    {'OIL': {'eq': None}},
+    {'$or': []},
+    {'$xor': [{'OIL': 1}]},
+    {'OIL': {}},
+])
+def test_malformed_filters_are_400(filters):
+    with pytest.raises(HTTPException) as error:
+        parse_filters(filters)
+    assert error.value.status_code == 400
+
+
+def test_unknown_filter_columns_are_400():
+    with pytest.raises(HTTPException) as error:
+        check_filter_columns(parse_filters({'GAS': 1, 'OIL': 2}), TABLE.column_names)
+    assert error.value.status_code == 400
+    assert "['GAS']" in error.value.detail
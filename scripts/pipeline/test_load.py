@@ -0,0 +1,67 @@
+"""
+Tests for the analytical store loader (load.py)
+
+Run: python -m pytest scripts/pipeline/test_load.py
+"""
+
+import sys
+from pathlib import Path
+
+# Add scripts directory to path
+SCRIPTS_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+from pipeline.load import LOAD_TARGETS, LoadOrchestrator
+
+
+def _write_csv(path: Path, rows: int, last: str):
+    """Integer column whose last value is `last` (past the type-sniffing sample)"""
+    with open(path, 'w') as f:
+        f.write('API_NUMBER,OPERATOR\n')
+        for i in range(rows):
+            f.write(f'{i},op{i % 7}\n')
+        f.write(f'{last},op\n')
+
+
+def _tables(conn):
+    return {row[0] for row in conn.execute("SELECT table_name FROM information_schema.tables").fetchall()}
+
+
+def test_late_bad_value_loads_as_text(tmp_path):
+    """A value past the sniffed sample that doesn't convert -> retried as all-VARCHAR"""
+    csv = tmp_path / 'permits.csv'
+    _write_csv(csv, 250_000, 'N/A')
+    orchestrator = LoadOrchestrator(base_data_dir=str(tmp_path), store_path=str(tmp_path / 'apex.duckdb'))
+    conn = orchestrator._connect()
+    try:
+        rows = orchestrator._load_table(conn, 'rrc_permits__permits', [csv], LOAD_TARGETS['rrc_permits'])
+        assert rows == 250_001
+        column_type = conn.execute(
+            "SELECT data_type FROM information_schema.columns "
+            "WHERE table_name = 'rrc_permits__permits' AND column_name = 'API_NUMBER'"
+        ).fetchone()[0]
+        assert column_type == 'VARCHAR'
+        assert 'rrc_permits__permits__staging' not in _tables(conn)
+    finally:
+        conn.close()
+
+
+def test_failed_load_leaves_no_staging(tmp_path):
+    """A load that fails with every reader keeps the previous table and no staging table"""
+    good = tmp_path / 'good.csv'
+    _write_csv(good, 10, '10')
+    orchestrator = LoadOrchestrator(base_data_dir=str(tmp_path), store_path=str(tmp_path / 'apex.duckdb'))
+    conn = orchestrator._connect()
+    try:
+        orchestrator._load_table(conn, 'rrc_permits__permits', [good], LOAD_TARGETS['rrc_permits'])
+        try:
+            orchestrator._load_table(conn, 'rrc_permits__permits', [tmp_path / 'missing.csv'],
+                                     LOAD_TARGETS['rrc_permits'])
+        except Exception:
+            pass
+        else:
+            raise AssertionError("loading a missing file should fail")
+        assert 'rrc_permits__permits__staging' not in _tables(conn)
+        assert conn.execute('SELECT COUNT(*) FROM rrc_permits__permits').fetchone()[0] == 11
+    finally:
+        conn.close()
@@ -0,0 +1,26 @@
+"""
+Tests for district/year partitioned datasets (src/partitioning.py)
+
+Run: python -m pytest scripts/pipeline/test_partitioning.py
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root for shared src modules
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.partitioning import list_partitions, partition_spec, write_partitioned_csv
+
+
+def test_null_year_partition_is_listed(tmp_path):
+    """Rows with a null year land in the default partition, listed as year None"""
+    source = tmp_path / 'production.dsv'
+    source.write_text('DISTRICT_NO}CYCLE_YEAR}OIL\n8}2021}10\n8}}5\n9}2020}3\n')
+    spec = partition_spec(['DISTRICT_NO', 'CYCLE_YEAR', 'OIL'])
+
+    rows = write_partitioned_csv(source, '}', tmp_path / 'dataset', spec)
+
+    assert rows == 3
+    assert list_partitions(tmp_path / 'dataset') == [('08', 2021), ('08', None), ('09', 2020)]
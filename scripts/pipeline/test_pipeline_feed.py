@@ -0,0 +1,156 @@
+"""
+Tests for the pipeline status event stream (src/api/pipeline_feed.py)
+
+Run: python -m pytest scripts/pipeline/test_pipeline_feed.py
+"""
+
+import asyncio
+import copy
+import json
+import sys
+import threading
+from pathlib import Path
+
+# Add project root for shared src modules
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.api.pipeline_feed import PipelineFeed, merge_patch
+
+
+SNAPSHOT = {
+    'pipelines': [
+        {'id': 'rrc', 'status': 'raw', 'stages': [{'name': 'download', 'status': 'complete'}]},
+        {'id': 'fracfocus', 'status': 'processed', 'stages': []},
+    ],
+    'summary': {'total': 2},
+}
+
+
+class _Source:
+    """Stands in for build_pipelines / pipelines_version"""
+
+    def __init__(self, snapshot):
+        self.snapshot = copy.deepcopy(snapshot)
+        self.inputs = 1
+
+    def feed(self) -> PipelineFeed:
+        return PipelineFeed(lambda: copy.deepcopy(self.snapshot), lambda: self.inputs)
+
+
+def _parse(chunk: bytes):
+    """(event, id, data) of a server-sent event; None for comments and retry fields"""
+    lines = dict(line.split(': ', 1) for line in chunk.decode('utf-8').strip().split('\n'))
+    if 'event' not in lines:
+        return None
+    return lines['event'], lines['id'], json.loads(lines['data'])
+
+
+class _Reader:
+    """Reads a stream in a background task (timing out __anext__ would cancel the stream)"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.events: asyncio.Queue = asyncio.Queue()
+        self.task = asyncio.get_running_loop().create_task(self._read())
+
+    async def _read(self):
+        async for chunk in self.stream:
+            event = _parse(chunk)
+            if event is not None:
+                self.events.put_nowait(event)
+
+    async def next(self, timeout: float = 2.0):
+        return await asyncio.wait_for(self.events.get(), timeout)
+
+    async def idle(self, timeout: float = 0.3) -> bool:
+        """True if no event arrives within `timeout`"""
+        await asyncio.sleep(timeout)
+        return self.events.empty()
+
+    async def close(self):
+        self.task.cancel()
+        try:
+            await self.task
+        except asyncio.CancelledError:
+            pass
+        await self.stream.aclose()
+
+
+def test_merge_patch():
+    old = {'a': 1, 'b': {'c': 2, 'd': 3}, 'l': [1]}
+    new = {'a': 1, 'b': {'c': 5}, 'l': [1, 2], 'e': None}
+    assert merge_patch(old, new) == {'b': {'c': 5, 'd': None}, 'l': [1, 2], 'e': None}
+
+
+def test_snapshot_then_patches():
+    source = _Source(SNAPSHOT)
+    feed = source.feed()
+
+    async def run():
+        stream = _Reader(await feed.open())
+        event, version, data = await stream.next()
+        assert event == 'snapshot' and data['version'] == version
+        assert set(data['pipelines']) == {'rrc', 'fracfocus'}
+
+        # Nothing changed: no rebuild pushes anything
+        assert not await asyncio.to_thread(feed.refresh)
+        assert await stream.idle()
+
+        source.snapshot['pipelines'][0]['status'] = 'processed'
+        del source.snapshot['pipelines'][1]
+        threading.Thread(target=feed.on_catalog_change, args=(set(), set())).start()
+        event, new_version, data = await stream.next()
+        assert event == 'patch'
+        assert data['base'] == version and data['version'] == new_version != version
+        assert data['patch'] == {'pipelines': {'rrc': {'status': 'processed'}, 'fracfocus': None}}
+        await stream.close()
+        assert feed.clients == 0
+
+    asyncio.run(run())
+
+
+def test_reconnect_to_another_worker():
+    """Event ids are content hashes: resuming elsewhere skips the snapshot only for the same state"""
+    first, second = _Source(SNAPSHOT), _Source(SNAPSHOT)
+
+    async def run():
+        stream = _Reader(await first.feed().open())
+        _, last_id, _ = await stream.next()
+        await stream.close()
+
+        # Same state in another worker (or after a restart): no snapshot resent
+        same = _Reader(await second.feed().open(last_id))
+        assert await same.idle()
+        await same.close()
+
+        # Different state, even with the same number of changes behind it: snapshot resent
+        changed = _Source(SNAPSHOT)
+        changed.snapshot['summary'] = {'total': 3}
+        other = _Reader(await changed.feed().open(last_id))
+        event, version, data = await other.next()
+        assert event == 'snapshot' and version != last_id
+        assert data['summary'] == {'total': 3}
+        await other.close()
+
+    asyncio.run(run())
+
+
+def test_stale_resume_gets_snapshot_after_inputs_change():
+    """A feed with no clients rebuilds on the next connect when its inputs changed"""
+    source = _Source(SNAPSHOT)
+    feed = source.feed()
+
+    async def run():
+        stream = _Reader(await feed.open())
+        _, last_id, _ = await stream.next()
+        await stream.close()
+
+        source.snapshot['summary'] = {'total': 1}
+        source.inputs = 2
+        resumed = _Reader(await feed.open(last_id))
+        event, _, data = await resumed.next()
+        assert event == 'snapshot' and data['summary'] == {'total': 1}
+        await resumed.close()
+
+    asyncio.run(run())
@@ -0,0 +1,98 @@
+"""
+Tests for the query result cache (src/api/result_cache.py)
+
+Run: python -m pytest scripts/pipeline/test_result_cache.py
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import pyarrow as pa
+
+# Add project root for shared src modules
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.api import data_service
+from src.api.result_cache import ResultCache, make_key
+from src.catalog_watcher import CatalogVersion
+
+
+def test_make_key_ignores_field_order():
+    assert make_key('query', {'a': 1, 'b': [2]}) == make_key('query', {'b': [2], 'a': 1})
+    assert make_key('query', {'a': 1}) != make_key('info', {'a': 1})
+
+
+def test_changed_dataset_version_invalidates():
+    versions = {'rrc.parquet': 1}
+    cache = ResultCache()
+    cache.put('k', 'page', 'rrc.parquet', 1)
+
+    assert cache.get('k', versions.get) == 'page'
+    versions['rrc.parquet'] = 2
+    assert cache.get('k', versions.get) is None
+    versions['rrc.parquet'] = 1
+    assert cache.get('k', versions.get) is None  # Dropped, not just skipped
+
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['invalidations'], stats['entries']) == (1, 2, 1, 0)
+
+
+def test_vanished_dataset_is_a_miss():
+    def missing(path):
+        raise FileNotFoundError(path)
+
+    cache = ResultCache()
+    cache.put('k', 'page', 'gone.parquet', ('file', 1, 1))
+    assert cache.get('k', missing) is None
+
+
+def test_file_version_invalidation(tmp_path):
+    path = tmp_path / 'production.parquet'
+    path.write_bytes(b'v1')
+    cache = ResultCache()
+    cache.put('k', 'page', path, data_service.dataset_version(path))
+    assert cache.get('k', data_service.dataset_version) == 'page'
+
+    stat = path.stat()
+    path.write_bytes(b'v2')
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert cache.get('k', data_service.dataset_version) is None
+
+
+def test_catalog_version_invalidation(tmp_path, monkeypatch):
+    """With the watcher running, a source's catalog bump invalidates without a stat"""
+    class Running:
+        is_running = True
+
+    monkeypatch.setattr(data_service, '_catalog_watcher', Running())
+    monkeypatch.setattr(data_service, 'DATA_BASE', tmp_path)
+    path = tmp_path / 'raw' / 'rrc' / 'production' / 'parsed' / 'production.parquet'  # Never created
+    cache = ResultCache()
+    cache.put('k', 'page', path, data_service.dataset_version(path))
+
+    assert cache.get('k', data_service.dataset_version) == 'page'
+    CatalogVersion.bump(['fracfocus'])
+    assert cache.get('k', data_service.dataset_version) == 'page'
+    CatalogVersion.bump(['rrc'])
+    assert cache.get('k', data_service.dataset_version) is None
+
+
+def test_lru_eviction_by_entries_and_bytes():
+    cache = ResultCache(max_bytes=10_000, max_entries=2)
+    for key in ('a', 'b'):
+        cache.put(key, key, 'x', 1)
+    cache.get('a', lambda path: 1)  # 'b' is now least recently used
+    cache.put('c', 'c', 'x', 1)
+    assert [cache.get(k, lambda path: 1) for k in ('a', 'b', 'c')] == ['a', None, 'c']
+
+    page = pa.table({'v': pa.array(range(1000), pa.int64())})  # 8000 bytes
+    cache.put('page', page, 'x', 1)
+    assert cache.stats()['bytes'] <= 10_000
+    assert cache.get('page', lambda path: 1) is page
+    assert cache.stats()['evictions'] == 2
+
+    cache.put('huge', pa.table({'v': pa.array(range(5000), pa.int64())}), 'x', 1)
+    assert cache.get('huge', lambda path: 1) is None
+    assert cache.get('page', lambda path: 1) is page  # Not evicted for a value that can't fit
@@ -0,0 +1,190 @@
+"""
+Tests for precomputed rollups (src/rollups.py)
+
+Run: python -m pytest scripts/pipeline/test_rollups.py
+"""
+
+import sys
+from pathlib import Path
+
+import duckdb
+import pyarrow.parquet as pq
+import pytest
+
+# Add project root for shared src modules
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src import rollups
+from src.api.analytical_store import AnalyticalStore
+
+TABLE = 'rrc_production__og_lease_cycle_data_table'
+
+CONFIG = f"""
+rollups:
+  monthly:
+    table: {TABLE}
+    group_by: [CYCLE_YEAR_MONTH, DISTRICT_NO]
+    metrics:
+      LEASE_OIL_PROD_VOL: [sum, avg]
+      LEASE_NO: [count_distinct]
+      "*": [count]
+    time_column: CYCLE_YEAR_MONTH
+    refresh_periods: 2
+  by_district:
+    table: {TABLE}
+    group_by: [DISTRICT_NO]
+    metrics:
+      LEASE_OIL_PROD_VOL: [sum]
+"""
+
+MONTHS = [202001, 202002, 202003, 202004]
+
+
+def _load(conn, loaded_at, rows):
+    """(Re)load the production table and its catalog entry"""
+    conn.execute(f"CREATE OR REPLACE TABLE {TABLE} (LEASE_NO VARCHAR, DISTRICT_NO VARCHAR, "
+                 "CYCLE_YEAR_MONTH INTEGER, LEASE_OIL_PROD_VOL DOUBLE)")
+    conn.executemany(f"INSERT INTO {TABLE} VALUES (?, ?, ?, ?)", rows)
+    conn.execute("CREATE TABLE IF NOT EXISTS apex_catalog "
+                 "(table_name VARCHAR, loaded_at VARCHAR, row_count BIGINT)")
+    conn.execute("DELETE FROM apex_catalog")
+    conn.execute("INSERT INTO apex_catalog VALUES (?, ?, ?)", [TABLE, loaded_at, len(rows)])
+
+
+def _rows(months, scale=1.0):
+    return [(f'{lease:05d}', district, month, scale * (lease + 1) * (month % 100))
+            for month in months for lease in range(6) for district in ('08', '7C') if lease % 2 == (district == '08')]
+
+
+def _monthly(path):
+    """{(month, district): sum} of a materialized rollup"""
+    table = pq.read_table(path).to_pylist()
+    return {(r['CYCLE_YEAR_MONTH'], r['DISTRICT_NO']): r['sum_LEASE_OIL_PROD_VOL'] for r in table}
+
+
+def _expected(conn):
+    return {(m, d): s for m, d, s in conn.execute(
+        f"SELECT CYCLE_YEAR_MONTH, DISTRICT_NO, SUM(LEASE_OIL_PROD_VOL) FROM {TABLE} GROUP BY 1, 2"
+    ).fetchall()}
+
+
+@pytest.fixture
+def setup(tmp_path, monkeypatch):
+    config = tmp_path / 'rollups.yaml'
+    config.write_text(CONFIG)
+    monkeypatch.setattr(rollups, '_definitions_cache', {'signature': None, 'definitions': {}})
+    monkeypatch.setattr(rollups, '_manifest_cache', {})
+    definitions = rollups.load_definitions(config)
+    monkeypatch.setattr(rollups, 'load_definitions', lambda path=config: definitions)
+    conn = duckdb.connect()
+    yield conn, tmp_path / 'rollups', definitions
+    conn.close()
+
+
+def test_invalid_definitions_are_skipped(tmp_path, monkeypatch):
+    monkeypatch.setattr(rollups, '_definitions_cache', {'signature': None, 'definitions': {}})
+    config = tmp_path / 'rollups.yaml'
+    config.write_text(CONFIG + f"""
+  median:
+    table: {TABLE}
+    group_by: [DISTRICT_NO]
+    metrics: {{LEASE_OIL_PROD_VOL: [median]}}
+  time_outside_grain:
+    table: {TABLE}
+    group_by: [DISTRICT_NO]
+    metrics: {{LEASE_OIL_PROD_VOL: sum}}
+    time_column: CYCLE_YEAR_MONTH
+""")
+    assert sorted(rollups.load_definitions(config)) == ['by_district', 'monthly']
+
+
+def test_incremental_refresh_recomputes_trailing_periods(setup):
+    conn, rollup_dir, definitions = setup
+    definition = definitions['monthly']
+    _load(conn, '2024-01-01 00:00:00', _rows(MONTHS))
+
+    assert rollups.materialize(conn, 'monthly', definition, rollup_dir)['status'] == 'built'
+    path = rollup_dir / 'monthly.parquet'
+    assert _monthly(path) == _expected(conn)
+    assert rollups.materialize(conn, 'monthly', definition, rollup_dir)['status'] == 'current'
+
+    # Reload: every month revised, plus a new month
+    _load(conn, '2024-02-01 00:00:00', _rows(MONTHS + [202005], scale=2.0))
+    result = rollups.materialize(conn, 'monthly', definition, rollup_dir)
+    assert (result['status'], result['refreshed_from']) == ('refreshed', 202003)
+
+    before, after = _monthly(path), _expected(conn)
+    for (month, district), total in after.items():
+        if month >= 202003:
+            assert before[(month, district)] == total
+        else:
+            # Periods before the refresh window are kept as they were
+            assert before[(month, district)] == total / 2
+    manifest = rollups.read_manifest('monthly', rollup_dir)
+    assert (manifest['source_loaded_at'], manifest['rows'], manifest['refreshed_from']) == \
+        ('2024-02-01 00:00:00', len(after), 202003)
+
+    assert rollups.materialize(conn, 'monthly', definition, rollup_dir, full=True)['status'] == 'built'
+    assert _monthly(path) == _expected(conn)
+
+
+def test_changed_definition_rebuilds(setup):
+    conn, rollup_dir, definitions = setup
+    _load(conn, '2024-01-01 00:00:00', _rows(MONTHS))
+    rollups.materialize(conn, 'monthly', definitions['monthly'], rollup_dir)
+
+    changed = {**definitions['monthly'], 'metrics': {'LEASE_OIL_PROD_VOL': ['sum', 'max']}}
+    assert rollups.materialize(conn, 'monthly', changed, rollup_dir)['status'] == 'built'
+    assert 'max_LEASE_OIL_PROD_VOL' in pq.read_schema(rollup_dir / 'monthly.parquet').names
+
+    missing = {**definitions['monthly'], 'group_by': ['CYCLE_YEAR_MONTH', 'COUNTY_NO']}
+    assert rollups.materialize(conn, 'monthly', missing, rollup_dir)['status'] == 'skipped'
+
+
+def test_routing_requires_matching_loaded_at(setup):
+    conn, rollup_dir, definitions = setup
+    _load(conn, '2024-01-01 00:00:00', _rows(MONTHS))
+    rollups.materialize_all(conn, rollup_dir=rollup_dir)
+
+    def route(loaded_at, group_by, metrics, filters=()):
+        return rollups.route_aggregate(TABLE, loaded_at, group_by, metrics, set(filters), rollup_dir)
+
+    # The smallest rollup that covers the request wins
+    assert route('2024-01-01 00:00:00', ['DISTRICT_NO'], {'LEASE_OIL_PROD_VOL': 'sum'})['name'] == 'by_district'
+    assert route('2024-01-01 00:00:00', ['DISTRICT_NO'], {'LEASE_OIL_PROD_VOL': 'avg'})['name'] == 'monthly'
+    # A table loaded since the rollup was built isn't answered from it
+    assert route('2024-02-01 00:00:00', ['DISTRICT_NO'], {'LEASE_OIL_PROD_VOL': 'sum'}) is None
+    assert route(None, ['DISTRICT_NO'], {'LEASE_OIL_PROD_VOL': 'sum'}) is None
+    # Grouping or filtering outside the grain, or distinct counts below it
+    assert route('2024-01-01 00:00:00', ['LEASE_NO'], {'LEASE_OIL_PROD_VOL': 'sum'}) is None
+    assert route('2024-01-01 00:00:00', ['DISTRICT_NO'], {'LEASE_OIL_PROD_VOL': 'sum'}, ['LEASE_NO']) is None
+    assert route('2024-01-01 00:00:00', ['DISTRICT_NO'], {'LEASE_NO': 'count_distinct'}) is None
+    assert route('2024-01-01 00:00:00', ['CYCLE_YEAR_MONTH', 'DISTRICT_NO'],
+                 {'LEASE_NO': 'count_distinct'})['name'] == 'monthly'
+
+    _load(conn, '2024-02-01 00:00:00', _rows(MONTHS, scale=2.0))
+    rollups.materialize_all(conn, rollup_dir=rollup_dir)
+    assert route('2024-02-01 00:00:00', ['DISTRICT_NO'], {'LEASE_OIL_PROD_VOL': 'sum'})['name'] == 'by_district'
+    assert route('2024-01-01 00:00:00', ['DISTRICT_NO'], {'LEASE_OIL_PROD_VOL': 'sum'}) is None
+
+
+def test_rollup_answers_match_the_table(setup):
+    conn, rollup_dir, _ = setup
+    _load(conn, '2024-01-01 00:00:00', _rows(MONTHS))
+    rollups.materialize_all(conn, rollup_dir=rollup_dir)
+
+    metrics = {'LEASE_OIL_PROD_VOL': 'avg', '*': 'count'}
+    route = rollups.route_aggregate(TABLE, '2024-01-01 00:00:00', ['DISTRICT_NO'], metrics,
+                                    {'CYCLE_YEAR_MONTH'}, rollup_dir)
+    answer = AnalyticalStore(rollup_dir / 'none.duckdb').aggregate_rollup(
+        route['path'], ['DISTRICT_NO'], route['select'], filters={'CYCLE_YEAR_MONTH': {'gte': 202002}},
+        order_by=['DISTRICT_NO']
+    )
+    expected = conn.execute(
+        f"SELECT DISTRICT_NO, AVG(LEASE_OIL_PROD_VOL), COUNT(*) FROM {TABLE} "
+        "WHERE CYCLE_YEAR_MONTH >= 202002 GROUP BY 1 ORDER BY 1"
+    ).fetchall()
+    assert [tuple(r) for r in answer.itertuples(index=False)] == [
+        (d, pytest.approx(avg), count) for d, avg, count in expected
+    ]
@@ -0,0 +1,91 @@
+"""
+Tests for filtered row counts (src/api/row_count.py)
+
+Run: python -m pytest scripts/pipeline/test_row_count.py
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+import pytest
+
+# Add project root for shared src modules
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.api import row_count
+from src.api.row_count import APPROX_SAMPLE_ROW_GROUPS, count_matching_rows
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    row_count.clear_cache()
+    yield
+    row_count.clear_cache()
+
+
+def _write(path: Path, row_groups: int, seed: int = 0) -> pa.Table:
+    """Row groups whose match rate drifts from group to group"""
+    rng = np.random.default_rng(seed)
+    rates = rng.uniform(0.1, 0.6, row_groups)
+    oil = np.concatenate([np.where(rng.random(1000) < rate, 1.0, 500.0) for rate in rates])
+    table = pa.table({'OIL': oil, 'LEASE_NO': np.arange(len(oil))})
+    pq.write_table(table, path, row_group_size=1000)
+    return table
+
+
+def test_exact_count(tmp_path):
+    path = tmp_path / 'production.parquet'
+    table = _write(path, 10)
+    result = count_matching_rows(ds.dataset(path), path, ds.field('OIL') < 10, 'oil<10')
+    assert result == {'total': int((table['OIL'].to_numpy() < 10).sum()), 'exact': True, 'error': 0}
+
+
+def test_approximate_count_is_within_its_error(tmp_path):
+    path = tmp_path / 'production.parquet'
+    table = _write(path, 200)
+    truth = int((table['OIL'].to_numpy() < 10).sum())
+
+    result = count_matching_rows(ds.dataset(path), path, ds.field('OIL') < 10, 'oil<10', approximate=True)
+
+    assert not result['exact']
+    assert (result['sampled_row_groups'], result['row_groups']) == (APPROX_SAMPLE_ROW_GROUPS, 200)
+    assert 0 < result['error'] < 0.25 * truth
+    assert abs(result['total'] - truth) <= result['error']
+
+
+def test_pruned_row_groups_leave_exact_count(tmp_path):
+    """Statistics drop all but a few row groups: counting those is cheaper than sampling"""
+    path = tmp_path / 'production.parquet'
+    _write(path, 200)
+    expression = (ds.field('LEASE_NO') < 5_000) & (ds.field('OIL') < 10)
+    exact = count_matching_rows(ds.dataset(path), path, expression, 'early')
+    approximate = count_matching_rows(ds.dataset(path), path, expression, 'early', approximate=True)
+    assert approximate == exact
+
+
+def test_csv_is_counted_exactly(tmp_path):
+    path = tmp_path / 'permits.csv'
+    path.write_text('API_NUMBER,OIL\n' + ''.join(f'{i},{i % 4}\n' for i in range(400)))
+    result = count_matching_rows(ds.dataset(path, format='csv'), path, ds.field('OIL') == 0, 'oil=0',
+                                 approximate=True)
+    assert result == {'total': 100, 'exact': True, 'error': 0}
+
+
+def test_cache_is_dropped_when_the_file_changes(tmp_path):
+    path = tmp_path / 'production.parquet'
+    _write(path, 2)
+    first = count_matching_rows(ds.dataset(path), path, ds.field('OIL') < 10, 'oil<10')
+    first['total'] = -1  # Callers get copies
+    assert count_matching_rows(ds.dataset(path), path, ds.field('OIL') < 10, 'oil<10')['total'] > 0
+
+    stat = path.stat()
+    table = _write(path, 3, seed=1)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    result = count_matching_rows(ds.dataset(path), path, ds.field('OIL') < 10, 'oil<10')
+    assert result['total'] == int((table['OIL'].to_numpy() < 10).sum())
@@ -0,0 +1,77 @@
+"""
+Tests for row-group-level sampling (src/sampling.py)
+
+Run: python -m pytest scripts/pipeline/test_sampling.py
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+# Add project root for shared src modules
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.sampling import sample_rows
+
+
+def _uneven_groups(path: Path) -> ds.Dataset:
+    """
+    40 row groups alternating 2,000 and 200 rows; 'big' marks rows of the
+    large groups, 'half' the first or second half of the file
+    """
+    schema = pa.schema([('row', pa.int64()), ('big', pa.bool_()), ('half', pa.string())])
+    with pq.ParquetWriter(path, schema) as writer:
+        start = 0
+        for g in range(40):
+            size = 2000 if g % 2 == 0 else 200
+            writer.write_table(pa.table({'row': pa.array(np.arange(start, start + size)),
+                                         'big': pa.array([size == 2000] * size),
+                                         'half': pa.array(['first' if g < 20 else 'second'] * size)},
+                                        schema=schema))
+            start += size
+    return ds.dataset(path)
+
+
+def test_uniform_sample_is_unbiased_across_group_sizes(tmp_path):
+    """With PPS group selection, rows of large and small groups are equally likely"""
+    dataset = _uneven_groups(tmp_path / 'uneven.parquet')
+    big_share = 2000 / 2200
+
+    drawn, big = 0, 0
+    for seed in range(200):
+        sample, info = sample_rows(dataset, 100, seed=seed, max_row_groups=8)
+        assert info['row_groups_read'] <= 8
+        assert sample.num_rows == 100
+        drawn += sample.num_rows
+        big += sum(sample['big'].to_pylist())
+
+    # 20,000 draws: the binomial standard error of the share is ~0.002
+    assert abs(big / drawn - big_share) < 0.01
+
+
+def test_stratified_sample_is_unbiased_across_group_sizes(tmp_path):
+    """Stratified draws after PPS selection are reweighted the same way"""
+    dataset = _uneven_groups(tmp_path / 'uneven.parquet')
+    big_share = 2000 / 2200
+
+    drawn, big = 0, 0
+    for seed in range(200):
+        sample, info = sample_rows(dataset, 100, seed=seed, by='half', max_row_groups=8)
+        assert set(info['strata']) <= {'first', 'second'}
+        drawn += sample.num_rows
+        big += sum(sample['big'].to_pylist())
+
+    assert abs(big / drawn - big_share) < 0.01
+
+
+def test_sample_is_reproducible(tmp_path):
+    dataset = _uneven_groups(tmp_path / 'uneven.parquet')
+    a, _ = sample_rows(dataset, 50, seed=7, max_row_groups=8)
+    b, _ = sample_rows(dataset, 50, seed=7, max_row_groups=8)
+    assert a.equals(b)
+    assert a['row'].to_pylist() == sorted(a['row'].to_pylist())
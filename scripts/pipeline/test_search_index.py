@@ -0,0 +1,65 @@
+"""
+Tests for the name search index (src/search_index.py)
+
+Run: python -m pytest scripts/pipeline/test_search_index.py
+"""
+
+import sys
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Add project root for shared src modules
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src import search_index
+
+
+def _dataset(data_root: Path):
+    """FracFocus-like file: one operator on most rows, over several row groups"""
+    parsed = data_root / 'fracfocus' / 'parsed'
+    parsed.mkdir(parents=True)
+    operators = ['PIONEER NATURAL RES. USA, INC.'] * 2500 + ['Exxon Mobil Corp'] * 30
+    pq.write_table(pa.table({'APINumber': [f'42{i:08d}' for i in range(len(operators))],
+                             'OperatorName': operators}),
+                   parsed / 'FracFocusRegistry_1.parquet', row_group_size=1000)
+
+
+def _term(index, value):
+    return [i for i in range(len(index)) if index.values[i] == value][0]
+
+
+def test_postings_are_capped_per_term(tmp_path, monkeypatch):
+    """A frequent value keeps its exact row count but only the first locators"""
+    monkeypatch.setattr(search_index, 'MAX_TERM_POSTINGS', 100)
+    _dataset(tmp_path / 'raw')
+
+    manifest = search_index.build_index('fracfocus', tmp_path / 'raw', tmp_path / 'search')
+    assert manifest['terms'] == 2
+    assert manifest['postings'] == 130
+
+    index = search_index.get_index('fracfocus', 'v1', tmp_path / 'raw', tmp_path / 'search')
+    pioneer = _term(index, 'PIONEER NATURAL RES. USA, INC.')
+    assert index.rows[pioneer] == 2500
+    locators = index.locators(pioneer, 1000)
+    assert [(l['row_group'], l['rows'][0], len(l['rows'])) for l in locators] == [(0, 0, 100)]
+
+    exxon = _term(index, 'Exxon Mobil Corp')
+    assert index.rows[exxon] == 30
+    assert index.locators(exxon, 1000) == [
+        {'file': 'parsed/FracFocusRegistry_1.parquet', 'table': 'FracFocusRegistry',
+         'row_group': 2, 'rows': list(range(500, 530))}
+    ]
+
+
+def test_prefix_and_fuzzy_search(tmp_path):
+    _dataset(tmp_path / 'raw')
+    search_index.build_index('fracfocus', tmp_path / 'raw', tmp_path / 'search')
+    index = search_index.get_index('fracfocus', 'v2', tmp_path / 'raw', tmp_path / 'search')
+
+    found, _ = index.prefix('pio nat')
+    assert [index.values[i] for i in found] == ['PIONEER NATURAL RES. USA, INC.']
+    found, _ = index.fuzzy('exon mobil')
+    assert [index.values[i] for i in found] == ['Exxon Mobil Corp']
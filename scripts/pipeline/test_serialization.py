@@ -0,0 +1,110 @@
+"""
+Tests for JSON encoding of query pages (src/api/serialization.py)
+
+Run: python -m pytest scripts/pipeline/test_serialization.py
+"""
+
+import datetime
+import decimal
+import json
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+# Add project root for shared src modules
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.api import serialization
+
+
+def _table():
+    return pa.table({
+        'price': pa.array([decimal.Decimal('1.25'), None, decimal.Decimal('-3.50')], pa.decimal128(10, 2)),
+        'elapsed': pa.array([datetime.timedelta(days=1, seconds=5), None, datetime.timedelta(0)], pa.duration('s')),
+        'nested': pa.array([[decimal.Decimal('2.5')], None, []], pa.list_(pa.decimal128(5, 1))),
+    })
+
+
+@pytest.mark.parametrize('use_orjson', [True, False])
+def test_decimal_and_duration_columns(monkeypatch, use_orjson):
+    """Decimals encode as numbers, durations (and nested decimals) as strings, on either JSON backend"""
+    if not use_orjson:
+        monkeypatch.setattr(serialization, 'orjson', None)
+    elif serialization.orjson is None:
+        pytest.skip('orjson is not installed')
+
+    records = json.loads(serialization.encode_records(_table()))
+
+    assert [r['price'] for r in records] == [1.25, None, -3.5]
+    assert [r['elapsed'] for r in records] == ['1 day, 0:00:05', None, '0:00:00']
+    assert [r['nested'] for r in records] == [['2.5'], None, []]
+
+
+def test_lines_match_records():
+    """NDJSON carries the same records as the JSON array"""
+    table = _table()
+    lines = serialization.encode_lines(table).decode('utf-8').splitlines()
+    assert [json.loads(line) for line in lines] == json.loads(serialization.encode_records(table))
+
+
+def _decode(column):
+    """Plain values of a columnar column, dictionary-encoded or not"""
+    if isinstance(column, dict):
+        return [None if i is None else column['dictionary'][i] for i in column['indices']]
+    return column
+
+
+def test_columnar_dictionary_encoding():
+    """Low-cardinality strings (plain or dictionary-typed) are encoded; others stay plain"""
+    operators = ['PIONEER', 'EXXON "XTO"', None, 'PIONEER', 'EXXON "XTO"', 'PIONEER']
+    table = pa.table({
+        'operator': operators,
+        'lease': ['L1', 'L2', 'L3', 'L4', 'L5', 'L6'],                                     # All distinct
+        'county': pa.array(['MIDLAND'] * 5 + ['MARTIN']).dictionary_encode(),
+        'district': pa.array([8, 8, 8, 8, 8, 8]),                                          # Not a string
+    })
+
+    body, encoded = serialization.encode_columns(table, dictionary=True)
+    data = json.loads(body)
+
+    assert encoded == ['operator', 'county']
+    assert data['operator']['dictionary'] == ['PIONEER', 'EXXON "XTO"']
+    assert data['operator']['indices'] == [0, 1, None, 0, 1, 0]
+    assert {name: _decode(values) for name, values in data.items()} == table.to_pydict()
+
+
+def test_columnar_without_dictionary_matches_records():
+    """Plain columnar pages hold the same values as records"""
+    table = pa.table({'operator': ['A', 'A', None], 'oil': [1.5, float('nan'), 3.0]})
+    body, encoded = serialization.encode_columns(table)
+    assert encoded == []
+    columns = json.loads(body)
+    records = json.loads(serialization.encode_records(table))
+    assert [dict(zip(columns, row)) for row in zip(*columns.values())] == records
+    assert columns['oil'] == [1.5, None, 3.0]
+
+
+def test_dictionary_ratio_and_empty_pages():
+    """max_ratio bounds distinct/rows; empty columns are never dictionary-encoded"""
+    table = pa.table({'operator': ['A', 'B', 'C', 'A']})
+    assert serialization.encode_columns(table, dictionary=True, max_ratio=0.5)[1] == []
+    assert serialization.encode_columns(table, dictionary=True, max_ratio=0.75)[1] == ['operator']
+
+    body, encoded = serialization.encode_columns(table.slice(0, 0), dictionary=True)
+    assert (json.loads(body), encoded) == ({'operator': []}, [])
+
+
+def test_dataframe_columns():
+    """DataFrames go through Arrow, or pandas' encoder for mixed-type columns"""
+    df = pd.DataFrame({'operator': ['A', 'A', 'B', 'A'], 'oil': [1.0, 2.0, None, 4.0]})
+    body, encoded = serialization.encode_dataframe_columns(df, dictionary=True)
+    assert encoded == ['operator']
+    assert _decode(json.loads(body)['operator']) == ['A', 'A', 'B', 'A']
+
+    mixed = pd.DataFrame({'value': ['A', 1, 'A', 'A']})
+    body, encoded = serialization.encode_dataframe_columns(mixed, dictionary=True)
+    assert (json.loads(body), encoded) == ({'value': ['A', 1, 'A', 'A']}, [])
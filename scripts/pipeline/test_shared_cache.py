@@ -0,0 +1,86 @@
+"""
+Tests for the cross-process API cache (src/api/shared_cache.py)
+
+Run: python -m pytest scripts/pipeline/test_shared_cache.py
+"""
+
+import multiprocessing
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add project root for shared src modules
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.api.shared_cache import SharedCache
+
+
+def test_values_are_versioned_and_shared(tmp_path):
+    path = str(tmp_path / 'api_cache.db')
+    worker1, worker2 = SharedCache(path), SharedCache(path)
+
+    worker1.put('pipelines', ('file', 1, 10), {'pipelines': [{'id': 'rrc'}]})
+    assert worker2.get('pipelines', ('file', 1, 10)) == {'pipelines': [{'id': 'rrc'}]}
+    assert worker2.get('pipelines', ('file', 2, 10)) is None
+    assert worker2.stats()['entries'] == 1
+
+
+def test_oldest_entries_are_evicted_over_budget(tmp_path):
+    cache = SharedCache(str(tmp_path / 'api_cache.db'), max_bytes=3000)
+    noise = lambda seed: [(seed * 7919 + i * 104729) % 1000003 for i in range(250)]  # Barely compressible
+    for key in range(4):
+        cache.put(f'k{key}', 1, noise(key))
+        time.sleep(0.01)
+    assert cache.stats()['bytes'] <= 3000
+    assert cache.get('k0', 1) is None
+    assert cache.get('k3', 1) == noise(3)
+
+
+def test_disabled_cache_always_builds(tmp_path):
+    cache = SharedCache('off')
+    cache.put('k', 1, 'v')
+    assert cache.get('k', 1) is None
+    assert cache.get_or_build('k', 1, lambda: 'built') == 'built'
+    assert cache.stats()['enabled'] is False
+
+
+def test_failed_build_is_not_cached(tmp_path):
+    cache = SharedCache(str(tmp_path / 'api_cache.db'))
+
+    def fail():
+        raise ValueError('scan failed')
+
+    with pytest.raises(ValueError):
+        cache.get_or_build('k', 1, fail)
+    # The lease was released: the next caller builds at once
+    assert cache.get_or_build('k', 1, lambda: 'built') == 'built'
+    assert cache.get('k', 1) == 'built'
+
+
+def _build_in_worker(path: str, log: str, results):
+    def build():
+        with open(log, 'a') as f:
+            f.write('built\n')
+        time.sleep(0.5)
+        return {'rows': 42}
+
+    results.put(SharedCache(path).get_or_build('meta', ('file', 1, 1), build))
+
+
+def test_concurrent_workers_build_once(tmp_path):
+    context = multiprocessing.get_context('spawn')
+    results = context.Queue()
+    path, log = str(tmp_path / 'api_cache.db'), str(tmp_path / 'builds.log')
+    SharedCache(path).clear()  # Create the schema before the race
+    workers = [context.Process(target=_build_in_worker, args=(path, log, results)) for _ in range(3)]
+    for worker in workers:
+        worker.start()
+    values = [results.get(timeout=30) for _ in workers]
+    for worker in workers:
+        worker.join(timeout=10)
+
+    assert values == [{'rows': 42}] * 3
+    assert Path(log).read_text() == 'built\n'
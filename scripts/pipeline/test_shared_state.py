@@ -0,0 +1,178 @@
+"""
+Tests for the pipeline context store (src/shared_state.py)
+
+Run: python -m pytest scripts/pipeline/test_shared_state.py
+"""
+
+import json
+import multiprocessing
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+# Add project root for shared src modules
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.shared_state import PipelineState
+
+
+CONTEXT = {
+    'summary': {'datasets_available': 2},
+    'data_sources': {
+        'rrc': {'display_name': 'RRC', 'path': 'data/raw/rrc', 'rows': 12_000_000},
+        'fracfocus': {'display_name': 'FracFocus', 'path': 'data/raw/fracfocus', 'columns': ['APINumber']},
+    },
+}
+
+
+@pytest.fixture
+def state_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(PipelineState, 'STATE_DIR', tmp_path)
+    monkeypatch.setattr(PipelineState, 'STORE_FILE', tmp_path / 'pipeline_context.db')
+    monkeypatch.setattr(PipelineState, 'STATE_FILE', tmp_path / 'pipeline_state.json')
+    monkeypatch.setattr(PipelineState, 'CONTEXT_FILE', tmp_path / 'pipeline_context.json')
+    monkeypatch.setattr(PipelineState, '_store_cache', {})
+    return tmp_path
+
+
+@pytest.fixture
+def connections(monkeypatch):
+    """Count store connections"""
+    opened = []
+    connect = PipelineState._connect_store.__func__
+
+    def counting(cls):
+        opened.append(1)
+        return connect(cls)
+
+    monkeypatch.setattr(PipelineState, '_connect_store', classmethod(counting))
+    return opened
+
+
+def test_round_trip(state_dir):
+    assert PipelineState.save_context(CONTEXT)
+    assert PipelineState.load_context(check_freshness=False) == CONTEXT
+    assert PipelineState.list_sources() == ['rrc', 'fracfocus']
+    assert PipelineState.get_context_age().total_seconds() < 60
+    assert not list(state_dir.glob('*.tmp'))
+
+
+def test_source_is_read_lazily_and_memoized(state_dir, connections):
+    PipelineState.save_context(CONTEXT)
+
+    assert PipelineState.load_source('fracfocus') == CONTEXT['data_sources']['fracfocus']
+    assert set(PipelineState._store_cache['sources']) == {'fracfocus'}
+    assert PipelineState.load_source('missing') is None
+
+    opened = len(connections)
+    assert PipelineState.load_source('fracfocus') == CONTEXT['data_sources']['fracfocus']
+    assert PipelineState.list_sources() == ['rrc', 'fracfocus']
+    assert len(connections) == opened
+
+
+def test_resave_invalidates_memo(state_dir):
+    PipelineState.save_context(CONTEXT)
+    assert PipelineState.load_source('rrc')['rows'] == 12_000_000
+    stat = PipelineState.STORE_FILE.stat()
+
+    updated = json.loads(json.dumps(CONTEXT))
+    updated['data_sources']['rrc']['rows'] = 13_000_000
+    PipelineState.save_context(updated)
+    # Same size and a coarse clock: the mtime still has to differ
+    os.utime(PipelineState.STORE_FILE, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert PipelineState.load_source('rrc')['rows'] == 13_000_000
+
+
+def test_legacy_json_is_read_without_a_store(state_dir):
+    with open(PipelineState.STATE_FILE, 'w') as f:
+        json.dump({'context': CONTEXT, 'timestamp': datetime.now().isoformat()}, f)
+
+    assert not PipelineState.STORE_FILE.exists()
+    assert PipelineState.has_context()
+    assert PipelineState.load_context(check_freshness=False) == CONTEXT
+    assert PipelineState.list_sources() == ['rrc', 'fracfocus']
+    assert PipelineState.load_source('rrc') == CONTEXT['data_sources']['rrc']
+    assert PipelineState.get_context_age().total_seconds() < 60
+
+
+def test_oldest_legacy_context_file(state_dir):
+    with open(PipelineState.CONTEXT_FILE, 'w') as f:
+        json.dump(CONTEXT, f)
+    assert PipelineState.load_context(check_freshness=False) == CONTEXT
+    assert PipelineState.get_context_age() is None
+
+
+def test_store_wins_over_legacy_json(state_dir):
+    with open(PipelineState.CONTEXT_FILE, 'w') as f:
+        json.dump({'data_sources': {'old': {}}}, f)
+    PipelineState.save_context(CONTEXT)
+    assert PipelineState.list_sources() == ['rrc', 'fracfocus']
+
+
+def _use_state_dir(state_dir: Path):
+    PipelineState.STATE_DIR = state_dir
+    PipelineState.STORE_FILE = state_dir / 'pipeline_context.db'
+    PipelineState.STATE_FILE = state_dir / 'pipeline_state.json'
+    PipelineState.CONTEXT_FILE = state_dir / 'pipeline_context.json'
+
+
+def _save_repeatedly(state_dir: str, worker: int, saves: int, results):
+    _use_state_dir(Path(state_dir))
+    context = {'worker': worker, 'data_sources': {f'source_{i}': {'rows': i} for i in range(200)}}
+    results.put([PipelineState.save_context(context) for _ in range(saves)])
+
+
+def test_concurrent_saves_do_not_clobber_each_other(state_dir):
+    """Two processes saving at once (e.g. two API workers' catalog watchers)"""
+    context = multiprocessing.get_context('spawn')
+    results = context.Queue()
+    workers = [context.Process(target=_save_repeatedly, args=(str(state_dir), i, 25, results))
+               for i in range(2)]
+    for worker in workers:
+        worker.start()
+    saved = [results.get(timeout=60) for _ in workers]
+    for worker in workers:
+        worker.join(timeout=10)
+
+    assert saved == [[True] * 25] * 2
+    assert not list(state_dir.glob('*.tmp'))
+    stored = PipelineState.load_context(check_freshness=False)
+    assert stored['worker'] in (0, 1)
+    assert len(stored['data_sources']) == 200
+
+
+def _apply_change(state_dir: str, path: str, results):
+    _use_state_dir(Path(state_dir))
+    results.put(PipelineState.apply_path_changes([Path(path)]))
+
+
+def test_concurrent_changes_are_all_kept(state_dir, tmp_path_factory):
+    """Read-modify-write under the lock: neither process loses the other's change"""
+    source_dir = tmp_path_factory.mktemp('rrc')
+    PipelineState.save_context({'data_sources': {'rrc': {
+        'path': str(source_dir),
+        'directory_structure': {'subdirs': {}, 'files': [], 'file_count': 0, 'dir_count': 0},
+    }}})
+    names = [f'production_{i}.csv' for i in range(6)]
+    for name in names:
+        (source_dir / name).write_text('a\n')
+
+    context = multiprocessing.get_context('spawn')
+    results = context.Queue()
+    workers = [context.Process(target=_apply_change, args=(str(state_dir), str(source_dir / name), results))
+               for name in names]
+    for worker in workers:
+        worker.start()
+    applied = [results.get(timeout=60) for _ in workers]
+    for worker in workers:
+        worker.join(timeout=10)
+
+    assert applied == [True] * len(names)
+    tree = PipelineState.load_source('rrc')['directory_structure']
+    assert sorted(f['name'] for f in tree['files']) == names
+    assert tree['file_count'] == len(names)
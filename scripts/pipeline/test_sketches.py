@@ -0,0 +1,47 @@
+"""
+Tests for the approximate-query sketches (src/sketches.py)
+
+Run: python -m pytest scripts/pipeline/test_sketches.py
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pyarrow as pa
+
+# Add project root for shared src modules
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.sketches import CountMin, HyperLogLog, hash_values, value_counts
+
+
+def test_hll_estimate_within_error():
+    """Distinct counts across the small- and large-range regimes stay within 4 sigma"""
+    for distinct in (0, 1, 50, 5_000, 300_000):
+        sketch = HyperLogLog()
+        values = pa.array([f'42-{i:08d}' for i in range(distinct)] * 2, type=pa.string())
+        sketch.add(values)
+        assert abs(sketch.estimate() - distinct) <= 4 * sketch.relative_error * distinct + 1
+
+
+def test_hll_ignores_nulls_and_duplicates():
+    sketch = HyperLogLog()
+    sketch.add(pa.array([1, 1, None, 2, 2, None]))
+    sketch.add(pa.array([2, 3]))
+    assert sketch.estimate() == 3
+
+
+def test_countmin_never_undercounts():
+    rng = np.random.default_rng(7)
+    values = pa.array(rng.zipf(1.5, 200_000) % 50_000)
+    distinct, counts = value_counts(values)
+    sketch = CountMin(width=2_000, depth=4)
+    sketch.add_hashes(hash_values(distinct), counts)
+
+    estimates = sketch.estimate(hash_values(distinct))
+    assert sketch.total == len(values)
+    assert (estimates >= counts).all()
+    # Bound holds per value with probability 1 - e**-depth
+    assert np.mean(estimates - counts <= sketch.error) > 0.95
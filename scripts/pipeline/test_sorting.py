@@ -0,0 +1,65 @@
+"""
+Tests for server-side sorting of file-backed queries (src/api/sorting.py)
+
+Run: python -m pytest scripts/pipeline/test_sorting.py
+"""
+
+import math
+import sys
+from pathlib import Path
+
+import pyarrow as pa
+
+# Add project root for shared src modules
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.api import sorting
+
+
+def _rows(n: int):
+    """Float keys, mostly NaN, with some nulls and a few values"""
+    keys = []
+    for i in range(n):
+        if i % 10 == 0:
+            keys.append(float(i % 97))
+        elif i % 10 == 1:
+            keys.append(None)
+        else:
+            keys.append(float('nan'))
+    return pa.table({'key': pa.array(keys, pa.float64()), 'row': pa.array(range(n))})
+
+
+def _expected(table: pa.Table, desc: bool):
+    values = [v for v in table['key'].to_pylist() if v is not None and not math.isnan(v)]
+    values.sort(reverse=desc)
+    nans = sum(1 for v in table['key'].to_pylist() if v is not None and math.isnan(v))
+    nulls = table['key'].null_count
+    return values + ['nan'] * nans + [None] * nulls
+
+
+def _normalize(values):
+    return ['nan' if v is not None and math.isnan(v) else v for v in values]
+
+
+def test_external_sort_with_nan_keys(monkeypatch):
+    """The run merge finishes and orders values, then NaNs, then nulls"""
+    monkeypatch.setattr(sorting, 'RUN_ROWS', 1000)
+    monkeypatch.setattr(sorting, 'MERGE_BLOCK_ROWS', 100)
+    table = _rows(5000)
+
+    for desc in (False, True):
+        result = sorting.external_sort(table.to_batches(max_chunksize=500), [('key', desc)], 0, 5000)
+        assert _normalize(result['key'].to_pylist()) == _expected(table, desc)
+
+
+def test_external_sort_page_matches_top_k(monkeypatch):
+    """A deep page from the merge equals the same slice of a full sort"""
+    monkeypatch.setattr(sorting, 'RUN_ROWS', 1000)
+    monkeypatch.setattr(sorting, 'MERGE_BLOCK_ROWS', 100)
+    table = _rows(5000)
+    keys = [('key', False), ('row', True)]
+
+    page = sorting.external_sort(table.to_batches(max_chunksize=500), keys, 450, 100)
+    full = sorting.top_k(table.to_batches(), keys, 5000).slice(450, 100)
+    assert page['row'].to_pylist() == full['row'].to_pylist()
@@ -0,0 +1,82 @@
+"""
+Tests for the grid spatial index (src/spatial_index.py)
+
+Bounding-box and radius queries are compared against brute force over
+random points, including high latitudes and boxes across the antimeridian.
+
+Run: python -m pytest scripts/pipeline/test_spatial_index.py
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pyarrow as pa
+import pytest
+
+# Add project root for shared src modules
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.spatial_index import SpatialIndex, grid_cells, haversine_km
+
+# Query centres (lat, lon): Permian, near the antimeridian, high latitudes, a pole
+CENTRES = [(31.9, -102.1), (-16.5, 179.8), (65.0, -179.9), (78.0, 15.0), (84.5, 120.0), (-89.5, 0.0)]
+
+
+@pytest.fixture(scope='module')
+def index():
+    rng = np.random.default_rng(11)
+    # Uniform over the sphere plus dense clouds around each centre
+    lat = [np.degrees(np.arcsin(rng.uniform(-1, 1, 50_000)))]
+    lon = [rng.uniform(-180, 180, 50_000)]
+    for centre_lat, centre_lon in CENTRES:
+        lat.append(np.clip(centre_lat + rng.normal(0, 4, 20_000), -90, 90))
+        lon.append((centre_lon + rng.normal(0, 25, 20_000) + 180) % 360 - 180)
+    lat, lon = np.concatenate(lat), np.concatenate(lon)
+
+    cells = grid_cells(lat, lon)
+    order = np.lexsort((lon, lat, cells))
+    points = pa.table({'lat': lat[order], 'lon': lon[order], 'cell': cells[order]})
+    return SpatialIndex(points), lat[order], lon[order]
+
+
+@pytest.mark.parametrize('box', [
+    (-103.5, 31.0, -101.0, 33.0),
+    (170.0, -20.0, -170.0, -10.0),      # Across the antimeridian
+    (179.5, 60.0, -179.5, 70.0),
+    (-180.0, -90.0, 180.0, 90.0),
+    (10.0, 75.0, 20.0, 90.0),
+    (-1.0, -1.0, 1.0, 1.0),
+])
+def test_bbox_matches_brute_force(index, box):
+    spatial, lat, lon = index
+    min_lon, min_lat, max_lon, max_lat = box
+    in_lon = ((lon >= min_lon) | (lon <= max_lon)) if min_lon > max_lon else ((lon >= min_lon) & (lon <= max_lon))
+    expected = np.flatnonzero(in_lon & (lat >= min_lat) & (lat <= max_lat))
+
+    found = spatial.bbox(*box)
+    assert len(found) == len(set(found.tolist()))
+    assert sorted(found.tolist()) == expected.tolist()
+
+
+@pytest.mark.parametrize('centre', CENTRES)
+@pytest.mark.parametrize('radius_km', [25.0, 300.0, 1_500.0])
+def test_radius_matches_brute_force(index, centre, radius_km):
+    spatial, lat, lon = index
+    distance = haversine_km(centre[0], centre[1], lat, lon)
+    expected = np.flatnonzero(distance <= radius_km)
+    assert len(expected) > 0
+
+    found, distances = spatial.radius(centre[0], centre[1], radius_km)
+    assert sorted(found.tolist()) == expected.tolist()
+    assert np.all(np.diff(distances) >= 0)
+    np.testing.assert_allclose(distances, distance[found])
+
+
+def test_radius_reaching_a_pole_spans_every_longitude(index):
+    spatial, lat, lon = index
+    found, _ = spatial.radius(88.0, -60.0, 400.0)
+    expected = np.flatnonzero(haversine_km(88.0, -60.0, lat, lon) <= 400.0)
+    assert sorted(found.tolist()) == expected.tolist()
+    assert lon[found].min() < -170 and lon[found].max() > 170
@@ -0,0 +1,66 @@
+"""
+Tests for the validation orchestrator (validate.py)
+
+Run: python -m pytest scripts/pipeline/test_validate.py
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add scripts directory to path
+SCRIPTS_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+from pipeline.validate import DATASET_RULES, ValidationOrchestrator, _validate_file
+
+
+HEADER = 'DisclosureId,IngredientsId,APINumber,JobStartDate,TotalBaseWaterVolume\n'
+
+
+@pytest.fixture
+def fracfocus(tmp_path):
+    """Two registry splits: one in-file duplicate, one key repeated across the split"""
+    parsed = tmp_path / 'fracfocus' / 'parsed'
+    parsed.mkdir(parents=True)
+    (parsed / 'FracFocusRegistry_1.csv').write_text(
+        HEADER
+        + 'd1,i1,42317401860000,2019-01-05,1000\n'
+        + 'd1,i2,42317401860000,2019-01-05,1000\n'
+        + 'd1,i2,42317401860000,2019-01-05,1000\n'   # Duplicate within the file
+    )
+    (parsed / 'FracFocusRegistry_2.csv').write_text(
+        HEADER
+        + 'd1,i1,42317401860000,2019-01-05,1000\n'   # Duplicate of a row in the first split
+        + 'd2,i1,123,1850-02-01,-5\n'
+    )
+    return tmp_path
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_duplicates_counted_within_and_across_files(fracfocus, workers):
+    orchestrator = ValidationOrchestrator(base_data_dir=str(fracfocus), max_workers=workers)
+    assert orchestrator.validate_dataset('fracfocus')
+
+    with open(fracfocus / 'fracfocus' / 'metadata.json') as f:
+        report = json.load(f)['validation']
+
+    assert report['duplicate_keys'] == {'keys': ['DisclosureId', 'IngredientsId'], 'duplicates': 2}
+    assert report['issues'] == ['2 duplicate rows on (DisclosureId, IngredientsId)']
+    assert report['status'] == 'warnings'
+    assert report['total_rows'] == 5
+
+    second = report['files'][1]
+    assert second['api_format']['invalid'] == 1
+    assert second['negative_volumes'] == {'TotalBaseWaterVolume': 1}
+    assert second['date_ranges']['JobStartDate']['out_of_range'] == 1
+    assert report['issue_count'] == 1 + sum(len(r['issues']) for r in report['files'])
+
+
+def test_single_file_counts_its_own_duplicates(fracfocus):
+    path = fracfocus / 'fracfocus' / 'parsed' / 'FracFocusRegistry_1.csv'
+    report = _validate_file(str(path), DATASET_RULES['fracfocus'], chunk_rows=2)
+    assert report['duplicate_keys']['duplicates'] == 1
+    assert report['rows'] == 3
@@ -0,0 +1,45 @@
+"""
+Tests for cross-dataset well joins (POST /api/wells/join)
+
+Run: python -m pytest scripts/pipeline/test_wells_join.py
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add project root for shared src modules
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from fastapi.testclient import TestClient
+
+from src.api import data_service
+
+
+APIS = ['42-317-40186-00-00', '4231740187']
+
+
+@pytest.fixture
+def client():
+    return TestClient(data_service.app)
+
+
+@pytest.mark.parametrize('how', ['inner', 'outer'])
+def test_join_without_indexes_matches_nothing(monkeypatch, client, how):
+    """No requested dataset has an index: no well is reported as matched"""
+    monkeypatch.setattr(data_service, 'well_index', lambda name: None)
+
+    response = client.post('/api/wells/join', json={'apis': APIS, 'how': how})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body['wells'] == []
+    assert body['data'] == {}
+    assert body['unmatched'] == ['4231740186', '4231740187']
+
+
+def test_join_rejects_unknown_mode(client):
+    response = client.post('/api/wells/join', json={'apis': APIS, 'how': 'left'})
+    assert response.status_code == 400
@@ -0,0 +1,469 @@
+"""
+Validation Orchestrator
+
+Runs data quality checks over parsed datasets:
+- Null rates per column
+- API number format (8/10/12/14 digits)
+- Date ranges and unparseable dates
+- Negative production/injection volumes
+- Duplicate keys (e.g. lease + month for RRC production), counted across
+  all files of a dataset so numbered splits (FracFocusRegistry_1..N) are
+  checked against each other
+
+Checks are columnar and vectorized, run chunk-wise so memory stays bounded
+regardless of file size, and run in parallel across files. A compact
+quality report is written to each dataset's metadata.json under
+'validation', where the data API serves it from /api/sources/{source}/quality.
+
+Usage:
+    orchestrator = ValidationOrchestrator()
+    orchestrator.validate_all()
+"""
+
+import os
+import re
+import sys
+import json
+import tempfile
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+# Add project root for shared src modules
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.partitioning import is_partitioned_dataset, open_dataset
+
+
+# Rows per chunk - bounds memory per worker
+DEFAULT_CHUNK_ROWS = 500_000
+
+# Columns with more nulls than this are reported as issues
+NULL_RATE_WARN = 0.5
+
+# Valid API number lengths after stripping punctuation
+API_DIGIT_LENGTHS = (8, 10, 12, 14)
+
+# Dates outside this window are counted as out of range
+MIN_VALID_DATE = pd.Timestamp('1900-01-01')
+
+# Dataset check rules. Column names are matched case-insensitively and
+# only columns present in a given file are checked.
+DATASET_RULES = {
+    'rrc_production': {
+        'path': 'rrc/production',
+        'api_columns': ['API_NO', 'API_NUMBER'],
+        'date_columns': {'CYCLE_YEAR_MONTH': '%Y%m'},
+        'volume_pattern': r'_VOL$',
+        # (lease, month) plus the qualifiers RRC needs to make a lease unique
+        'duplicate_keys': ['LEASE_NO', 'CYCLE_YEAR_MONTH'],
+        'key_qualifiers': ['OIL_GAS_CODE', 'DISTRICT_NO', 'COUNTY_NO'],
+    },
+    'rrc_permits': {
+        'path': 'rrc/horizontal_drilling_permits',
+        'api_columns': ['api_number', 'API_NUMBER', 'API_NO'],
+        'date_pattern': r'date',
+    },
+    'rrc_completions': {
+        'path': 'rrc/completions_data',
+        'api_columns': ['API_NUMBER', 'api_number', 'API_NO'],
+        'date_pattern': r'date',
+    },
+    'fracfocus': {
+        'path': 'fracfocus',
+        'api_columns': ['APINumber'],
+        'date_columns': {'JobStartDate': None, 'JobEndDate': None},
+        'volume_columns': ['TotalBaseWaterVolume', 'TotalBaseNonWaterVolume', 'MassIngredient'],
+        'duplicate_keys': ['DisclosureId', 'IngredientsId'],
+    },
+}
+
+
+class _DuplicateCounter:
+    """
+    Count duplicate row keys with bounded memory.
+
+    Row keys are hashed to uint64 per chunk and spilled to bucket files on
+    disk by hash value; each bucket is then de-duplicated on its own with
+    np.unique, so peak memory is one bucket rather than the whole key set.
+
+    Several processes can add to one shared directory (each appends to its
+    own bucket files), so the keys of all files of a dataset are counted
+    together.
+    """
+
+    NUM_BUCKETS = 64
+
+    def __init__(self, directory: Optional[str] = None):
+        """
+        Args:
+            directory: Shared bucket directory (default: a private temporary one)
+        """
+        self._tmpdir = None if directory else tempfile.TemporaryDirectory(prefix='apex_validate_')
+        self.directory = Path(directory or self._tmpdir.name)
+
+    def add(self, hashes: np.ndarray):
+        buckets = hashes % self.NUM_BUCKETS
+        for bucket in np.unique(buckets):
+            with open(self.directory / f'bucket_{bucket}.{os.getpid()}.u64', 'ab') as f:
+                hashes[buckets == bucket].tofile(f)
+
+    def count(self) -> int:
+        duplicates = 0
+        for bucket in range(self.NUM_BUCKETS):
+            parts = sorted(self.directory.glob(f'bucket_{bucket}.*.u64'))
+            if parts:
+                hashes = np.concatenate([np.fromfile(path, dtype=np.uint64) for path in parts])
+                _, counts = np.unique(hashes, return_counts=True)
+                duplicates += int((counts - 1).sum())
+        if self._tmpdir is not None:
+            self._tmpdir.cleanup()
+        return duplicates
+
+
+def _match_columns(columns: List[str], names: List[str]) -> List[str]:
+    """Return the actual column names matching `names` (case-insensitive)"""
+    lookup = {c.lower(): c for c in columns}
+    return [lookup[n.lower()] for n in names if n.lower() in lookup]
+
+
+def _resolve_checks(columns: List[str], rules: Dict) -> Dict:
+    """Map dataset rules onto the columns of one file"""
+    api_columns = _match_columns(columns, rules.get('api_columns', []))
+
+    date_columns = {}
+    for name, fmt in rules.get('date_columns', {}).items():
+        for col in _match_columns(columns, [name]):
+            date_columns[col] = fmt
+    if rules.get('date_pattern'):
+        pattern = re.compile(rules['date_pattern'], re.IGNORECASE)
+        for col in columns:
+            if pattern.search(col):
+                date_columns.setdefault(col, None)
+
+    volume_columns = _match_columns(columns, rules.get('volume_columns', []))
+    if rules.get('volume_pattern'):
+        pattern = re.compile(rules['volume_pattern'], re.IGNORECASE)
+        volume_columns += [c for c in columns if pattern.search(c) and c not in volume_columns]
+
+    key_columns = _match_columns(columns, rules.get('duplicate_keys', []))
+    if len(key_columns) != len(rules.get('duplicate_keys', [])):
+        key_columns = []
+    elif key_columns:
+        key_columns += _match_columns(columns, rules.get('key_qualifiers', []))
+
+    return {
+        'api': api_columns[:1],
+        'dates': date_columns,
+        'volumes': volume_columns,
+        'keys': key_columns,
+    }
+
+
+def _iter_chunks(file_path: Path, chunk_rows: int):
+    """Yield DataFrame chunks of a parsed file or partitioned dataset"""
+    if is_partitioned_dataset(file_path):
+        for batch in open_dataset(file_path).to_batches(batch_size=chunk_rows):
+            yield batch.to_pandas()
+    elif file_path.suffix == '.parquet':
+        import pyarrow.parquet as pq
+
+        parquet_file = pq.ParquetFile(file_path)
+        for batch in parquet_file.iter_batches(batch_size=chunk_rows):
+            yield batch.to_pandas()
+    else:
+        # Read as strings so mixed-type columns don't fail mid-file
+        yield from pd.read_csv(file_path, chunksize=chunk_rows, dtype=str, low_memory=False)
+
+
+def _api_digits(series: pd.Series) -> pd.Series:
+    """Normalize an API number column to a digit-only string series"""
+    series = series.dropna()
+    if pd.api.types.is_numeric_dtype(series):
+        return series.astype('int64').astype(str)
+    return series.astype(str).str.replace(r'\D', '', regex=True)
+
+
+def _validate_file(file_path: str, rules: Dict, chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                   key_dir: Optional[str] = None) -> Dict:
+    """
+    Validate one parsed file chunk by chunk.
+
+    Module-level so it can run in a ProcessPoolExecutor worker.
+
+    Args:
+        key_dir: Bucket directory shared by a dataset's files; row keys are
+                 added there and counted by the caller. Without one,
+                 duplicates are counted within this file.
+
+    Returns:
+        Compact per-file quality report
+    """
+    file_path = Path(file_path)
+    report = {'file': file_path.name, 'rows': 0}
+
+    try:
+        checks = None
+        null_counts = None
+        api_invalid, api_samples = 0, []
+        dates = {}
+        negatives = {}
+        duplicates = None
+        max_date = pd.Timestamp.now() + pd.DateOffset(years=1)
+
+        for chunk in _iter_chunks(file_path, chunk_rows):
+            if checks is None:
+                checks = _resolve_checks(list(chunk.columns), rules)
+                null_counts = pd.Series(0, index=chunk.columns, dtype='int64')
+                dates = {col: {'min': None, 'max': None, 'unparseable': 0, 'out_of_range': 0}
+                         for col in checks['dates']}
+                negatives = {col: 0 for col in checks['volumes']}
+                duplicates = _DuplicateCounter(key_dir) if checks['keys'] else None
+
+            report['rows'] += len(chunk)
+            null_counts = null_counts.add(chunk.isna().sum(), fill_value=0).astype('int64')
+
+            for col in checks['api']:
+                digits = _api_digits(chunk[col])
+                invalid = digits[~digits.str.len().isin(API_DIGIT_LENGTHS)]
+                api_invalid += len(invalid)
+                if len(api_samples) < 5:
+                    api_samples += invalid.head(5 - len(api_samples)).tolist()
+
+            for col, fmt in checks['dates'].items():
+                raw = chunk[col].dropna()
+                if fmt:
+                    raw = raw.astype(str).str.replace(r'\.0$', '', regex=True)
+                parsed = pd.to_datetime(raw, format=fmt, errors='coerce')
+                stats = dates[col]
+                stats['unparseable'] += int(parsed.isna().sum())
+                parsed = parsed.dropna()
+                if len(parsed):
+                    lo, hi = parsed.min(), parsed.max()
+                    stats['min'] = lo if stats['min'] is None else min(stats['min'], lo)
+                    stats['max'] = hi if stats['max'] is None else max(stats['max'], hi)
+                    stats['out_of_range'] += int(((parsed < MIN_VALID_DATE) | (parsed > max_date)).sum())
+
+            for col in checks['volumes']:
+                values = pd.to_numeric(chunk[col], errors='coerce')
+                negatives[col] += int((values < 0).sum())
+
+            if duplicates is not None:
+                keyed = chunk[checks['keys']].dropna()
+                if len(keyed):
+                    hashes = pd.util.hash_pandas_object(keyed, index=False).to_numpy(dtype=np.uint64)
+                    duplicates.add(hashes)
+
+        if checks is None:
+            report['issues'] = ['File is empty']
+            return report
+
+        rows = max(report['rows'], 1)
+        issues = []
+
+        null_rates = {col: round(int(n) / rows, 4) for col, n in null_counts.items() if n}
+        report['null_rates'] = null_rates
+        issues += [f"{col}: {rate:.0%} null" for col, rate in null_rates.items() if rate > NULL_RATE_WARN]
+
+        if checks['api']:
+            report['api_format'] = {
+                'column': checks['api'][0],
+                'invalid': api_invalid,
+                'samples': [str(s) for s in api_samples]
+            }
+            if api_invalid:
+                issues.append(f"{checks['api'][0]}: {api_invalid:,} malformed API numbers")
+
+        if dates:
+            report['date_ranges'] = {
+                col: {
+                    'min': stats['min'].date().isoformat() if stats['min'] is not None else None,
+                    'max': stats['max'].date().isoformat() if stats['max'] is not None else None,
+                    'unparseable': stats['unparseable'],
+                    'out_of_range': stats['out_of_range']
+                }
+                for col, stats in dates.items()
+            }
+            issues += [f"{col}: {stats['out_of_range']:,} dates out of range"
+                       for col, stats in dates.items() if stats['out_of_range']]
+
+        negatives = {col: n for col, n in negatives.items() if n}
+        if negatives:
+            report['negative_volumes'] = negatives
+            issues += [f"{col}: {n:,} negative values" for col, n in negatives.items()]
+
+        if duplicates is not None and key_dir is None:
+            duplicate_count = duplicates.count()
+            report['duplicate_keys'] = {'keys': checks['keys'], 'duplicates': duplicate_count}
+            if duplicate_count:
+                issues.append(f"{duplicate_count:,} duplicate rows on ({', '.join(checks['keys'])})")
+        elif duplicates is not None:
+            report['duplicate_keys'] = {'keys': checks['keys']}
+
+        report['issues'] = issues
+
+    except Exception as e:
+        report['error'] = str(e)
+        report['issues'] = [f"Validation failed: {e}"]
+
+    return report
+
+
+class ValidationOrchestrator:
+    """Orchestrates data quality validation of all parsed data"""
+
+    def __init__(self, base_data_dir: str = 'data/raw', max_workers: Optional[int] = None,
+                 chunk_rows: int = DEFAULT_CHUNK_ROWS):
+        """
+        Initialize validation orchestrator
+
+        Args:
+            base_data_dir: Base directory containing raw data
+            max_workers: Parallel file workers (default: CPU count)
+            chunk_rows: Rows per chunk (bounds memory per worker)
+        """
+        self.base_data_dir = Path(base_data_dir)
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.chunk_rows = chunk_rows
+
+    def _update_metadata(self, dataset_path: Path, report: Dict):
+        """Write the quality report and validation state to metadata.json"""
+        metadata_file = dataset_path / 'metadata.json'
+
+        if metadata_file.exists():
+            with open(metadata_file, 'r') as f:
+                metadata = json.load(f)
+        else:
+            metadata = {}
+
+        if 'processing_state' not in metadata:
+            metadata['processing_state'] = {}
+
+        metadata['validation'] = report
+        metadata['processing_state']['validation'] = report['status']
+        metadata['processing_state']['validation_date'] = report['validated_at']
+
+        with open(metadata_file, 'w') as f:
+            json.dump(metadata, f, indent=2)
+
+    def validate_dataset(self, name: str) -> bool:
+        """
+        Validate one dataset's parsed files
+
+        Args:
+            name: Key in DATASET_RULES (e.g. 'rrc_production')
+
+        Returns:
+            True if validation ran (even with warnings), False otherwise
+        """
+        rules = DATASET_RULES[name]
+        dataset_path = self.base_data_dir / rules['path']
+        parsed_dir = dataset_path / 'parsed'
+
+        if not parsed_dir.exists():
+            print(f"Parsed directory not found: {parsed_dir}")
+            return False
+
+        # Partitioned datasets (district=/year= directories) plus flat files
+        files = sorted(d for d in parsed_dir.iterdir() if is_partitioned_dataset(d))
+        files += sorted(parsed_dir.glob('*.parquet')) or sorted(parsed_dir.glob('*.csv'))
+        if not files:
+            print(f"No parsed files found in {parsed_dir}")
+            return False
+
+        print(f"Validating {len(files)} files from {parsed_dir}")
+
+        workers = min(self.max_workers, len(files))
+        with tempfile.TemporaryDirectory(prefix='apex_validate_') as key_dir:
+            # Row keys of every file go to one bucket directory, so duplicates
+            # across split files count as well as those within one
+            if workers > 1:
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    file_reports = list(pool.map(
+                        _validate_file, [str(f) for f in files],
+                        [rules] * len(files), [self.chunk_rows] * len(files), [key_dir] * len(files)
+                    ))
+            else:
+                file_reports = [_validate_file(str(f), rules, self.chunk_rows, key_dir) for f in files]
+            duplicate_count = _DuplicateCounter(key_dir).count()
+
+        issues = []
+        keys = next((r['duplicate_keys']['keys'] for r in file_reports if 'duplicate_keys' in r), None)
+        if keys and duplicate_count:
+            issues.append(f"{duplicate_count:,} duplicate rows on ({', '.join(keys)})")
+
+        issue_count = len(issues) + sum(len(r.get('issues', [])) for r in file_reports)
+        failed = [r['file'] for r in file_reports if 'error' in r]
+        report = {
+            'status': 'failed' if failed else ('warnings' if issue_count else 'passed'),
+            'validated_at': datetime.now().isoformat(),
+            'total_rows': sum(r['rows'] for r in file_reports),
+            'total_files': len(file_reports),
+            'issue_count': issue_count,
+            'issues': issues,
+            'files': file_reports
+        }
+        if keys:
+            report['duplicate_keys'] = {'keys': keys, 'duplicates': duplicate_count}
+
+        for file_report in file_reports:
+            status = "✓" if not file_report.get('issues') else "!"
+            print(f"  {status} {file_report['file']}: {file_report['rows']:,} rows")
+            for issue in file_report.get('issues', []):
+                print(f"      - {issue}")
+        for issue in issues:
+            print(f"  ! {issue}")
+
+        self._update_metadata(dataset_path, report)
+        print(f"✓ Validation {report['status']}: {report['total_rows']:,} rows, {issue_count} issues")
+
+        return not failed
+
+    def validate_rrc_production(self) -> bool:
+        """Validate RRC production data"""
+        return self.validate_dataset('rrc_production')
+
+    def validate_rrc_permits(self) -> bool:
+        """Validate RRC horizontal drilling permits"""
+        return self.validate_dataset('rrc_permits')
+
+    def validate_rrc_completions(self) -> bool:
+        """Validate RRC completion packets"""
+        return self.validate_dataset('rrc_completions')
+
+    def validate_fracfocus(self) -> bool:
+        """Validate FracFocus chemical disclosures"""
+        return self.validate_dataset('fracfocus')
+
+    def validate_all(self) -> Dict[str, bool]:
+        """
+        Validate all parsed datasets
+
+        Returns:
+            Dictionary with validation status for each dataset
+        """
+        print("\n" + "="*70)
+        print("VALIDATION ORCHESTRATOR")
+        print("="*70)
+
+        results = {name: self.validate_dataset(name) for name in DATASET_RULES}
+
+        print("\n" + "="*70)
+        print("VALIDATION SUMMARY")
+        print("="*70)
+        for dataset, success in results.items():
+            status = "✓" if success else "✗"
+            print(f"{status} {dataset}: {'Validated' if success else 'Failed/Skipped'}")
+        print("="*70)
+
+        return results
+
+
+if __name__ == '__main__':
+    # Example usage
+    orchestrator = ValidationOrchestrator()
+    orchestrator.validate_all()
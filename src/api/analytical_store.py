@@ -0,0 +1,385 @@
+"""
+Analytical Store Access
+
+Read-side access to the DuckDB store built by the pipeline's load phase
+(scripts/pipeline/load.py). Lets the data API answer filters, sorts and
+aggregations with SQL instead of scanning parsed files.
+
+The store is optional: when it doesn't exist (or duckdb isn't installed)
+`available()` is False and the API keeps reading parsed files directly.
+"""
+
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import pandas as pd
+import pyarrow as pa
+from fastapi import HTTPException
+
+from src.api.filters import filter_columns, parse_filters
+
+
+STORE_PATH = Path(__file__).parent.parent.parent / "data" / "processed" / "apex.duckdb"
+
+# Catalog table written by LoadOrchestrator
+CATALOG_TABLE = "apex_catalog"
+
+# Aggregate functions exposed through /api/aggregate
+AGGREGATES = {
+    'sum': 'SUM({})',
+    'avg': 'AVG({})',
+    'min': 'MIN({})',
+    'max': 'MAX({})',
+    'count': 'COUNT({})',
+    'count_distinct': 'COUNT(DISTINCT {})',
+}
+
+
+def quote_identifier(identifier: str) -> str:
+    """Quote a SQL identifier"""
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def metric_name(column: str, func: str) -> str:
+    """Output column name for an aggregate ("sum_LEASE_OIL_PROD_VOL", "count")"""
+    return func if column == '*' else f"{func}_{column}"
+
+
+def parse_order_by(order_by: Optional[List[str]]) -> List[Tuple[str, bool]]:
+    """
+    Parse order_by entries into (column, descending) pairs.
+
+    "CYCLE_YEAR_MONTH" sorts ascending, "-LEASE_OIL_PROD_VOL" descending.
+    """
+    keys = []
+    for entry in order_by or []:
+        entry = entry.strip()
+        if entry.startswith('-'):
+            keys.append((entry[1:], True))
+        else:
+            keys.append((entry.lstrip('+'), False))
+    return keys
+
+
+# SQL for comparison operators of src/api/filters.py
+_SQL_COMPARISONS = {'eq': '=', 'ne': '<>', 'gt': '>', 'gte': '>=', 'lt': '<', 'lte': '<='}
+
+
+def _compile_sql(node: tuple, params: List[Any]) -> str:
+    """Compile a filter expression tree to SQL, appending bind values to params"""
+    kind = node[0]
+    if kind in ('and', 'or'):
+        return "(" + f" {kind.upper()} ".join(_compile_sql(child, params) for child in node[1]) + ")"
+    if kind == 'not':
+        return f"(NOT {_compile_sql(node[1], params)})"
+
+    _, column, op, value = node
+    target = quote_identifier(column)
+    if op == 'is_null':
+        return f"{target} IS {'' if value else 'NOT '}NULL"
+    if op in ('prefix', 'contains'):
+        params.append(value)
+        func = 'starts_with' if op == 'prefix' else 'contains'
+        return f"{func}(CAST({target} AS VARCHAR), ?)"
+    if op in ('in', 'not_in'):
+        if not value:
+            return "FALSE" if op == 'in' else "TRUE"
+        params.extend(value)
+        return f"{target} {'NOT ' if op == 'not_in' else ''}IN ({', '.join('?' * len(value))})"
+    if op == 'between':
+        params.extend(value)
+        return f"{target} BETWEEN ? AND ?"
+    params.append(value)
+    return f"{target} {_SQL_COMPARISONS[op]} ?"
+
+
+def _aggregate_sql(relation: str, group_by: List[str], select: Dict[str, str], where: str,
+                   params: List[Any], order_by: Optional[List[str]],
+                   limit: Optional[int]) -> Tuple[str, List[Any]]:
+    """Build a GROUP BY query over `relation` with {output column: SQL} measures"""
+    columns = [quote_identifier(c) for c in group_by]
+    columns += [f"{sql} AS {quote_identifier(name)}" for name, sql in select.items()]
+    group = f" GROUP BY {', '.join(quote_identifier(c) for c in group_by)}" if group_by else ""
+
+    order = ""
+    keys = parse_order_by(order_by)
+    if keys:
+        missing = {c for c, _ in keys} - (set(group_by) | set(select))
+        if missing:
+            raise HTTPException(status_code=400, detail=f"Sort columns not in output: {sorted(missing)}")
+        order = " ORDER BY " + ", ".join(
+            f"{quote_identifier(c)} {'DESC' if desc else 'ASC'} NULLS LAST" for c, desc in keys
+        )
+
+    sql = f"SELECT {', '.join(columns)} FROM {relation}{where}{group}{order}"
+    if limit is not None:
+        sql += " LIMIT ?"
+        params = params + [limit]
+    return sql, params
+
+
+class AnalyticalStore:
+    """
+    Query the DuckDB analytical store.
+
+    Connections are opened read-only per call, so the pipeline's load phase
+    can still take the write lock between API requests.
+    """
+
+    def __init__(self, path: Path = STORE_PATH):
+        self.path = Path(path)
+        self._catalog_signature = None
+        self._catalog: List[Dict[str, Any]] = []
+        self._columns: Dict[str, List[str]] = {}
+
+    def available(self) -> bool:
+        """True if the store file exists and duckdb is importable"""
+        if not self.path.exists():
+            return False
+        try:
+            import duckdb  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    def connect(self):
+        """Open a read-only connection"""
+        import duckdb
+        return duckdb.connect(str(self.path), read_only=True)
+
+    # ------------------------------------------------------------------
+    # Catalog
+    # ------------------------------------------------------------------
+
+    def _load_catalog(self):
+        """Re-read the catalog when the store file changes"""
+        stat = self.path.stat()
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if signature == self._catalog_signature:
+            return
+
+        conn = self.connect()
+        try:
+            rows = conn.execute(
+                f"SELECT table_name, dataset, source, data_type, row_count, loaded_at "
+                f"FROM {CATALOG_TABLE} ORDER BY loaded_at, table_name"
+            ).fetchall()
+            columns = conn.execute(
+                "SELECT table_name, column_name FROM information_schema.columns "
+                "ORDER BY table_name, ordinal_position"
+            ).fetchall()
+        finally:
+            conn.close()
+
+        self._catalog = [
+            {'table': r[0], 'dataset': r[1], 'source': r[2], 'data_type': r[3], 'row_count': r[4],
+             'loaded_at': str(r[5])}
+            for r in rows
+        ]
+        self._columns = {}
+        for table, column in columns:
+            self._columns.setdefault(table, []).append(column)
+        self._catalog_signature = signature
+
+    def find_table(self, source: str, data_type: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Find the store table for a source (and optional data type).
+
+        Args:
+            source: Source name, matched case-insensitively
+            data_type: Optional data type / dataset subdirectory
+
+        Returns:
+            Catalog entry {'table', 'source', 'data_type', 'row_count', 'loaded_at', ...} or None
+
+        Raises:
+            HTTPException: 400 if the source has several tables and no data_type is given
+        """
+        if not self.available():
+            return None
+
+        try:
+            self._load_catalog()
+        except Exception:
+            return None
+
+        source = source.lower()
+        candidates = [e for e in self._catalog if (e['source'] or '').lower() == source]
+        if data_type:
+            data_type = data_type.lower()
+            candidates = [
+                e for e in candidates
+                if (e['data_type'] or '').lower() == data_type or e['table'] == data_type
+            ]
+        elif len(candidates) > 1:
+            # Picking one would depend on load order
+            raise HTTPException(
+                status_code=400,
+                detail=f"Source '{source}' has several loaded tables; pass data_type "
+                       f"(one of {sorted(e['data_type'] or e['table'] for e in candidates)})"
+            )
+        return candidates[0] if candidates else None
+
+    def table_columns(self, table: str) -> List[str]:
+        """Column names of a store table"""
+        self._load_catalog()
+        return self._columns.get(table, [])
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def _check_columns(self, table: str, columns: List[str], role: str):
+        missing = set(columns) - set(self.table_columns(table))
+        if missing:
+            raise HTTPException(status_code=400, detail=f"{role} not found: {sorted(missing)}")
+
+    def _where(self, table: str, filters: Optional[Dict[str, Any]]) -> Tuple[str, List[Any]]:
+        """Build a parameterized WHERE clause from a filters object"""
+        node = parse_filters(filters)
+        if node is None:
+            return "", []
+
+        self._check_columns(table, sorted(filter_columns(node)), "Filter columns")
+        params: List[Any] = []
+        return " WHERE " + _compile_sql(node, params), params
+
+    def _order(self, table: str, order_by: Optional[List[str]]) -> str:
+        keys = parse_order_by(order_by)
+        if not keys:
+            return ""
+        self._check_columns(table, [c for c, _ in keys], "Sort columns")
+        return " ORDER BY " + ", ".join(
+            f"{quote_identifier(c)} {'DESC' if desc else 'ASC'} NULLS LAST" for c, desc in keys
+        )
+
+    def query(self, table: str, columns: Optional[List[str]] = None,
+              filters: Optional[Dict[str, Any]] = None, order_by: Optional[List[str]] = None,
+              limit: int = 1000, offset: int = 0) -> Tuple[pd.DataFrame, int]:
+        """
+        Select a page of rows.
+
+        Returns:
+            (page DataFrame, total matching rows)
+        """
+        if columns:
+            self._check_columns(table, columns, "Columns")
+        select = ", ".join(quote_identifier(c) for c in columns) if columns else "*"
+        where, params = self._where(table, filters)
+        order = self._order(table, order_by)
+
+        conn = self.connect()
+        try:
+            total = conn.execute(f"SELECT COUNT(*) FROM {quote_identifier(table)}{where}", params).fetchone()[0]
+            df = conn.execute(
+                f"SELECT {select} FROM {quote_identifier(table)}{where}{order} LIMIT ? OFFSET ?",
+                params + [limit, offset]
+            ).fetch_df()
+        finally:
+            conn.close()
+
+        return df, total
+
+    def aggregate(self, table: str, group_by: List[str], metrics: Dict[str, str],
+                  filters: Optional[Dict[str, Any]] = None, order_by: Optional[List[str]] = None,
+                  limit: Optional[int] = None) -> pd.DataFrame:
+        """
+        Group and aggregate.
+
+        Args:
+            group_by: Columns to group by (empty = whole table)
+            metrics: {column: function} with functions from AGGREGATES;
+                     output columns are named "{function}_{column}"
+                     ("*" counts rows and is named "count")
+            order_by: Sort keys over group and output columns
+
+        Returns:
+            Aggregated DataFrame
+        """
+        unknown = {f for f in metrics.values() if f not in AGGREGATES}
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unsupported aggregates: {sorted(unknown)}")
+        self._check_columns(table, list(group_by) + [c for c in metrics if c != '*'], "Columns")
+
+        select = {}
+        for column, func in metrics.items():
+            target = '*' if column == '*' else quote_identifier(column)
+            select[metric_name(column, func)] = AGGREGATES[func].format(target)
+
+        where, params = self._where(table, filters)
+        sql, params = _aggregate_sql(quote_identifier(table), group_by, select, where, params,
+                                     order_by, limit)
+
+        conn = self.connect()
+        try:
+            return conn.execute(sql, params).fetch_df()
+        finally:
+            conn.close()
+
+    def aggregate_batches(self, table: str, group_by: List[str], select: Dict[str, str],
+                          filters: Optional[Dict[str, Any]] = None, derived: Optional[Dict[str, str]] = None,
+                          batch_rows: int = 1_000_000) -> Iterator[pa.RecordBatch]:
+        """
+        Group and aggregate, streamed as Arrow record batches sorted by group.
+
+        DuckDB aggregates while scanning, so only the grouped result is
+        materialized, and it is handed over batch by batch.
+
+        Args:
+            select: {output column: SQL aggregate}
+            derived: {column: SQL expression} computed per row before
+                     grouping (may appear in group_by)
+            filters: Over the table's columns
+
+        Yields:
+            Record batches ordered by group_by
+        """
+        derived = derived or {}
+        self._check_columns(table, [c for c in group_by if c not in derived], "Columns")
+        where, params = self._where(table, filters)
+        relation = quote_identifier(table)
+        if derived:
+            columns = ", ".join(f"{sql} AS {quote_identifier(name)}" for name, sql in derived.items())
+            relation = f"(SELECT *, {columns} FROM {quote_identifier(table)}{where})"
+            where = ""
+        sql, params = _aggregate_sql(relation, group_by, select, where, params, group_by, None)
+
+        conn = self.connect()
+        try:
+            reader = conn.execute(sql, params).fetch_record_batch(batch_rows)
+            for batch in reader:
+                yield batch
+        finally:
+            conn.close()
+
+    def aggregate_rollup(self, path: Path, group_by: List[str], select: Dict[str, str],
+                         filters: Optional[Dict[str, Any]] = None, order_by: Optional[List[str]] = None,
+                         limit: Optional[int] = None) -> pd.DataFrame:
+        """
+        Group and aggregate a materialized rollup (see src/rollups.py) or a
+        table's sample (see src/sketches.py).
+
+        Args:
+            path: Rollup or sample Parquet file
+            select: {output column: SQL} from route_aggregate() or approximate_select()
+
+        Returns:
+            Aggregated DataFrame, shaped like aggregate()
+        """
+        import duckdb
+
+        node = parse_filters(filters)
+        params: List[Any] = []
+        where = " WHERE " + _compile_sql(node, params) if node is not None else ""
+        relation = "read_parquet('" + str(path).replace("'", "''") + "')"
+        sql, params = _aggregate_sql(relation, group_by, select, where, params, order_by, limit)
+
+        conn = duckdb.connect()
+        try:
+            return conn.execute(sql, params).fetch_df()
+        finally:
+            conn.close()
+
+
+# Shared instance used by the API
+store = AnalyticalStore()
@@ -0,0 +1,194 @@
+"""
+Request Batching
+
+A generated dashboard's startup fan-out (/api/pipelines, /info for each
+source, /data for several sources) as one POST /api/batch round trip:
+
+- Sub-requests run concurrently through the app itself, so they get the
+  same routes, validation, caching and errors as separate calls, and their
+  blocking work overlaps on the I/O pool under the usual per-source limits
+- Lookups decorated with @shared (parsed-file resolution, file metadata,
+  opened datasets) run once per batch for each distinct argument, and
+  every sub-request that needs them, concurrent ones included, gets that
+  one result
+- JSON sub-responses are spliced into the combined body as produced,
+  without parsing and re-encoding them
+
+Sub-requests may carry their own headers (If-None-Match for a cached
+page); the validators of each sub-response come back with it.
+"""
+
+import asyncio
+import functools
+import inspect
+import json
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlencode
+
+
+# Sub-requests per batch at most
+MAX_BATCH_REQUESTS = 50
+
+# Sub-response headers returned with each result
+PASSED_HEADERS = ('etag', 'last-modified', 'cache-control')
+
+# Sub-request headers dropped: the combined response is compressed once
+DROPPED_HEADERS = ('accept-encoding', 'content-length', 'content-type', 'host')
+
+# Lookups shared within the current batch: {'lock', 'entries': {key: entry}}
+_memo: ContextVar[Optional[Dict[str, Any]]] = ContextVar('apex_batch_memo', default=None)
+
+
+def shared(func: Callable) -> Callable:
+    """
+    Share a lookup's results among the sub-requests of one batch.
+
+    Outside a batch the function runs as usual. Inside one, the first call
+    for given (hashable) arguments runs it and concurrent callers wait for
+    that result (failures aren't kept, so a later call retries).
+    """
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        memo = _memo.get()
+        if memo is None:
+            return func(*args, **kwargs)
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        key = (func.__qualname__,) + tuple(bound.arguments.items())
+        try:
+            hash(key)
+        except TypeError:
+            return func(*args, **kwargs)
+        with memo['lock']:
+            entry = memo['entries'].setdefault(key, {'lock': threading.Lock()})
+        with entry['lock']:
+            if 'value' not in entry:
+                entry['value'] = func(*args, **kwargs)
+        return entry['value']
+    return wrapper
+
+
+@contextmanager
+def batch_scope():
+    """Scope in which @shared lookups are shared (blocking work inherits it)"""
+    token = _memo.set({'lock': threading.Lock(), 'entries': {}})
+    try:
+        yield
+    finally:
+        _memo.reset(token)
+
+
+def _query_value(value: Any) -> Any:
+    """Query parameter value as sent by a browser"""
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, (list, tuple)):
+        return [_query_value(v) for v in value]
+    return value
+
+
+async def dispatch(app, method: str, path: str, params: Optional[Dict[str, Any]] = None,
+                   body: Any = None, headers: Optional[Dict[str, str]] = None) -> Tuple[int, Dict[str, str], bytes]:
+    """
+    Run one request through an ASGI app in-process.
+
+    Returns:
+        (status, response headers with lower-case names, body)
+    """
+    path, _, query = path.partition('?')
+    pairs = [(k, _query_value(v)) for k, v in (params or {}).items() if v is not None]
+    query_string = '&'.join(part for part in (query, urlencode(pairs, doseq=True)) if part)
+
+    payload = b'' if body is None else json.dumps(body).encode('utf-8')
+    raw_headers = [(k.lower().encode('latin-1'), str(v).encode('latin-1')) for k, v in (headers or {}).items()
+                   if k.lower() not in DROPPED_HEADERS]
+    if body is not None:
+        raw_headers += [(b'content-type', b'application/json'), (b'content-length', str(len(payload)).encode())]
+
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0', 'spec_version': '2.3'},
+        'http_version': '1.1',
+        'method': method.upper(),
+        'scheme': 'http',
+        'path': path,
+        'raw_path': path.encode('utf-8'),
+        'query_string': query_string.encode('latin-1'),
+        'root_path': '',
+        'headers': raw_headers,
+        'client': None,
+        'server': None,
+    }
+
+    finished = asyncio.Event()
+    delivered = False
+    status, response_headers, chunks = 500, [], []
+
+    async def receive():
+        nonlocal delivered
+        if not delivered:
+            delivered = True
+            return {'type': 'http.request', 'body': payload, 'more_body': False}
+        # Streaming responses listen for a disconnect until they are done
+        await finished.wait()
+        return {'type': 'http.disconnect'}
+
+    async def send(message):
+        nonlocal status, response_headers
+        if message['type'] == 'http.response.start':
+            status, response_headers = message['status'], message.get('headers', [])
+        elif message['type'] == 'http.response.body':
+            chunks.append(message.get('body', b''))
+
+    try:
+        await app(scope, receive, send)
+    finally:
+        finished.set()
+    names = {k.decode('latin-1').lower(): v.decode('latin-1') for k, v in response_headers}
+    return status, names, b''.join(chunks)
+
+
+async def _run_item(app, index: int, item) -> Dict[str, Any]:
+    """Dispatch one sub-request; failures become that result's error"""
+    result: Dict[str, Any] = {'id': item.id if item.id is not None else str(index)}
+    try:
+        status, headers, body = await dispatch(app, item.method, item.path, item.params, item.body, item.headers)
+    except Exception as e:
+        status, headers = 500, {'content-type': 'application/json'}
+        body = json.dumps({'detail': f"Error running sub-request: {str(e)}"}).encode('utf-8')
+    result['status'] = status
+    result['headers'] = {k: headers[k] for k in PASSED_HEADERS if k in headers}
+    if not body:
+        result['body'] = b'null'
+    elif headers.get('content-type', '').startswith('application/json'):
+        result['body'] = body
+    else:
+        result['body'] = json.dumps(body.decode('utf-8', errors='replace')).encode('utf-8')
+    return result
+
+
+async def run_batch(app, items: List[Any]) -> bytes:
+    """
+    Run sub-requests concurrently and combine their responses.
+
+    Args:
+        app: ASGI app the sub-requests are dispatched to
+        items: Objects with id, method, path, params, body and headers
+
+    Returns:
+        JSON: {"responses": [{"id", "status", "headers", "body"}, ...], "count": n},
+        in request order
+    """
+    with batch_scope():
+        results = await asyncio.gather(*(_run_item(app, i, item) for i, item in enumerate(items)))
+
+    parts = []
+    for result in results:
+        head = json.dumps({k: result[k] for k in ('id', 'status', 'headers')})
+        parts.append(head[:-1].encode('utf-8') + b', "body": ' + result['body'] + b'}')
+    return b'{"responses": [' + b', '.join(parts) + b'], "count": ' + str(len(parts)).encode() + b'}'
@@ -0,0 +1,296 @@
+"""
+Column Statistics
+
+Per-column profiles for dashboards choosing chart scales and filter
+widgets, in two tiers:
+
+- Footer statistics (parquet): row count, min/max and null counts merged
+  from row-group statistics in the file footers. No data is read;
+  partition columns come from the partition paths.
+- Sketches (one scan): distinct counts from a HyperLogLog sketch
+  (src/sketches.py), quantiles and an equal-width histogram from a seeded
+  uniform row reservoir. Formats without footers (CSV, JSON) get min/max/null counts
+  from the same scan.
+
+Both tiers are deterministic for a given dataset, so callers cache them
+per dataset version.
+"""
+
+import math
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from src.sketches import HyperLogLog
+
+
+# Rows kept by the reservoir behind quantiles and histograms
+SAMPLE_ROWS = 65_536
+
+HISTOGRAM_BINS = 20
+QUANTILES = (0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99)
+
+SCAN_BATCH_ROWS = 131_072
+
+
+def _json_value(value: Any) -> Any:
+    """Statistics values as JSON-safe scalars"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, bytes):
+        return value.decode('utf-8', errors='replace')
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def _is_numeric(kind: pa.DataType) -> bool:
+    return pa.types.is_integer(kind) or pa.types.is_floating(kind) or pa.types.is_decimal(kind)
+
+
+def _is_temporal(kind: pa.DataType) -> bool:
+    return pa.types.is_timestamp(kind) or pa.types.is_date(kind)
+
+
+def _is_orderable(kind: pa.DataType) -> bool:
+    return (_is_numeric(kind) or _is_temporal(kind) or pa.types.is_string(kind)
+            or pa.types.is_large_string(kind) or pa.types.is_boolean(kind))
+
+
+# ----------------------------------------------------------------------
+# Footer statistics
+# ----------------------------------------------------------------------
+
+def footer_stats(dataset) -> Optional[Dict[str, Any]]:
+    """
+    Row count and per-column min/max/null_count from parquet footers.
+
+    Returns:
+        {'row_count', 'row_groups', 'columns': {name: {...}}}, or None when
+        the dataset isn't parquet. A column's min/max is None when some row
+        group has values but no statistics.
+    """
+    import pyarrow.dataset as ds
+
+    if not isinstance(getattr(dataset, 'format', None), ds.ParquetFileFormat):
+        return None
+
+    schema = dataset.schema
+    columns = {field.name: {'type': str(field.type), 'min': None, 'max': None, 'null_count': 0,
+                            'complete': True} for field in schema}
+    row_count, row_groups = 0, 0
+
+    for fragment in dataset.get_fragments():
+        metadata = fragment.metadata
+        partition_keys = ds.get_partition_keys(fragment.partition_expression)
+        row_count += metadata.num_rows
+        row_groups += metadata.num_row_groups
+
+        for name, value in partition_keys.items():
+            if name in columns:
+                _merge_bounds(columns[name], value, value)
+
+        for i in range(metadata.num_row_groups):
+            row_group = metadata.row_group(i)
+            for j in range(row_group.num_columns):
+                chunk = row_group.column(j)
+                entry = columns.get(chunk.path_in_schema)
+                if entry is None or chunk.path_in_schema in partition_keys:
+                    continue
+                stats = chunk.statistics
+                if stats is None or not stats.has_null_count:
+                    entry['complete'] = False
+                    entry['null_count'] = None
+                    continue
+                if entry['null_count'] is not None:
+                    entry['null_count'] += stats.null_count
+                if stats.has_min_max:
+                    _merge_bounds(entry, stats.min, stats.max)
+                elif stats.null_count < row_group.num_rows:
+                    entry['complete'] = False
+
+    result = {}
+    for name, entry in columns.items():
+        if not entry.pop('complete'):
+            entry['min'] = entry['max'] = None
+        entry['min'], entry['max'] = _json_value(entry['min']), _json_value(entry['max'])
+        result[name] = entry
+    return {'row_count': row_count, 'row_groups': row_groups, 'columns': result}
+
+
+def _merge_bounds(entry: Dict[str, Any], low, high):
+    if low is not None and (entry['min'] is None or low < entry['min']):
+        entry['min'] = low
+    if high is not None and (entry['max'] is None or high > entry['max']):
+        entry['max'] = high
+
+
+# ----------------------------------------------------------------------
+# Sketch scan
+# ----------------------------------------------------------------------
+
+class _Reservoir:
+    """Uniform row sample: keeps the rows with the smallest random keys"""
+
+    def __init__(self, size: int, seed: int):
+        self.size = size
+        self.rng = np.random.default_rng(seed)
+        self.keys = np.empty(0)
+        self.table: Optional[pa.Table] = None
+
+    def add(self, batch: pa.RecordBatch):
+        keys = self.rng.random(batch.num_rows)
+        if self.table is not None and len(self.keys) >= self.size:
+            # Only rows that beat the current threshold can enter
+            keep = np.flatnonzero(keys < self.keys.max())
+            if len(keep) == 0:
+                return
+            batch, keys = batch.take(pa.array(keep)), keys[keep]
+
+        table = pa.Table.from_batches([batch])
+        if self.table is not None:
+            table = pa.concat_tables([self.table, table])
+            keys = np.concatenate([self.keys, keys])
+        if len(keys) > self.size:
+            chosen = np.argpartition(keys, self.size)[:self.size]
+            table, keys = table.take(pa.array(chosen)), keys[chosen]
+        self.table, self.keys = table, keys
+
+
+def _as_float(values: pa.ChunkedArray) -> np.ndarray:
+    """Non-null numeric/temporal values as float64 (temporal -> epoch ms)"""
+    values = values.drop_null()
+    kind = values.type
+    if pa.types.is_date(kind):
+        values = pc.cast(pc.cast(values, pa.date32()), pa.timestamp('ms'))
+        kind = values.type
+    if pa.types.is_timestamp(kind):
+        values = pc.cast(pc.cast(values, pa.timestamp('ms', tz=kind.tz), safe=False), pa.int64())
+    return pc.cast(values, pa.float64()).to_numpy(zero_copy_only=False)
+
+
+def _render(value: float, kind: pa.DataType) -> Any:
+    """Quantile/edge value in the column's terms (temporal -> ISO string)"""
+    if _is_temporal(kind):
+        return pd.Timestamp(int(round(value)), unit='ms').isoformat()
+    if pa.types.is_integer(kind):
+        return float(value) if value != int(value) else int(value)
+    return float(value)
+
+
+def _distribution(sample: np.ndarray, kind: pa.DataType, low: Optional[float], high: Optional[float],
+                  non_null: int, exact: bool) -> Dict[str, Any]:
+    """Quantiles and equal-width histogram from the reservoir sample"""
+    if len(sample) == 0:
+        return {}
+    low = float(sample.min()) if low is None else low
+    high = float(sample.max()) if high is None else high
+    counts, edges = np.histogram(sample, bins=HISTOGRAM_BINS, range=(low, high) if high > low else None)
+    if not exact and len(sample):
+        counts = np.round(counts * (non_null / len(sample))).astype(np.int64)
+    quantiles = np.quantile(sample, QUANTILES)
+    return {
+        'quantiles': {str(q): _render(v, kind) for q, v in zip(QUANTILES, quantiles)},
+        'histogram': {
+            'edges': [_render(e, kind) for e in edges],
+            'counts': [int(c) for c in counts],
+            'exact': exact
+        }
+    }
+
+
+def _bound_as_float(value: Any, kind: pa.DataType) -> Optional[float]:
+    if value is None:
+        return None
+    try:
+        if _is_temporal(kind):
+            timestamp = pd.Timestamp(value)
+            if timestamp.tzinfo is not None:
+                timestamp = timestamp.tz_convert(None)
+            return timestamp.value / 1e6
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def sketch_stats(dataset, footer: Optional[Dict[str, Any]] = None, seed: int = 0) -> Dict[str, Any]:
+    """
+    Scan a dataset once and build per-column sketches.
+
+    Args:
+        dataset: pyarrow dataset
+        footer: footer_stats() result (its min/max bound the histograms);
+                None = also compute min/max/null counts from the scan
+        seed: Reservoir seed (same data + seed -> same result)
+
+    Returns:
+        {'row_count', 'sample_rows', 'columns': {name: {...}}}
+    """
+    schema = dataset.schema
+    sketches = {field.name: HyperLogLog() for field in schema if not pa.types.is_nested(field.type)}
+    bounds = {name: {'min': None, 'max': None, 'null_count': 0} for name in sketches}
+    distributed = [f.name for f in schema if _is_numeric(f.type) or _is_temporal(f.type)]
+    reservoir = _Reservoir(SAMPLE_ROWS, seed)
+    row_count = 0
+
+    for batch in dataset.to_batches(columns=list(sketches), batch_size=SCAN_BATCH_ROWS):
+        if batch.num_rows == 0:
+            continue
+        row_count += batch.num_rows
+        for name, sketch in sketches.items():
+            values = batch.column(name)
+            sketch.add(values)
+            if footer is None:
+                entry = bounds[name]
+                entry['null_count'] += values.null_count
+                if _is_orderable(values.type) and values.null_count < len(values):
+                    low_high = pc.min_max(values)
+                    _merge_bounds(entry, low_high['min'].as_py(), low_high['max'].as_py())
+        if distributed:
+            reservoir.add(batch.select(distributed))
+
+    sample = reservoir.table
+    columns: Dict[str, Dict[str, Any]] = {}
+    for field in schema:
+        if field.name not in sketches:
+            continue
+        sketch = sketches[field.name]
+        entry: Dict[str, Any] = {
+            'distinct': {'estimate': sketch.estimate(), 'relative_error': round(sketch.relative_error, 4)}
+        }
+        if footer is None:
+            bound = bounds[field.name]
+            entry.update(type=str(field.type), min=_json_value(bound['min']), max=_json_value(bound['max']),
+                         null_count=bound['null_count'])
+            low, high, nulls = bound['min'], bound['max'], bound['null_count']
+        else:
+            stats = footer['columns'].get(field.name, {})
+            low, high, nulls = stats.get('min'), stats.get('max'), stats.get('null_count')
+
+        if field.name in distributed and sample is not None:
+            values = _as_float(sample.column(field.name))
+            non_null = row_count - (nulls or 0)
+            entry.update(_distribution(
+                values, field.type, _bound_as_float(low, field.type), _bound_as_float(high, field.type),
+                non_null, exact=row_count <= SAMPLE_ROWS
+            ))
+        columns[field.name] = entry
+
+    return {'row_count': row_count, 'sample_rows': sample.num_rows if sample is not None else 0,
+            'columns': columns}
+
+
+def select_columns(stats: Dict[str, Any], columns: Optional[List[str]]) -> Dict[str, Any]:
+    """Restrict a stats result to the requested columns"""
+    if not columns:
+        return stats
+    return {**stats, 'columns': {c: stats['columns'][c] for c in columns if c in stats['columns']}}
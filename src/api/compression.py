@@ -0,0 +1,186 @@
+"""
+Response Compression Middleware
+
+Data pages are highly repetitive JSON, so they compress 5-10x. This ASGI
+middleware compresses responses with the best encoding the client
+accepts:
+
+- zstd   (needs the `zstandard` package)
+- br     (needs the `brotli` package)
+- gzip   (always available)
+
+Bodies under the size threshold, non-text content types, event streams and
+responses that are already encoded pass through untouched. Streaming
+responses are compressed chunk by chunk and flushed, so clients still
+receive data incrementally.
+
+Configuration (environment):
+    APEX_COMPRESSION            'off', or encodings in preference order
+                                (default 'zstd,br,gzip')
+    APEX_COMPRESSION_MIN_BYTES  size threshold (default 1024)
+"""
+
+import os
+import zlib
+from typing import Dict, List, Optional, Sequence
+
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+MINIMUM_SIZE = int(os.environ.get('APEX_COMPRESSION_MIN_BYTES', '1024'))
+PREFERENCE = [e.strip() for e in os.environ.get('APEX_COMPRESSION', 'zstd,br,gzip').split(',') if e.strip()]
+
+# Levels favour speed: pages are compressed on every cache miss
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+ZSTD_LEVEL = 3
+
+COMPRESSIBLE_TYPES = ('application/json', 'application/javascript', 'application/xml',
+                      'application/x-ndjson', 'image/svg+xml')
+
+
+def available_encodings(preference: Sequence[str] = PREFERENCE) -> List[str]:
+    """Encodings from `preference` whose codec is installed"""
+    installed = {'gzip': True, 'br': brotli is not None, 'zstd': zstandard is not None}
+    return [e for e in preference if installed.get(e)]
+
+
+def choose_encoding(accept_encoding: str, encodings: Sequence[str]) -> Optional[str]:
+    """
+    Pick the response encoding from an Accept-Encoding header.
+
+    Highest q-value wins; ties go to the earlier entry in `encodings`.
+    """
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(','):
+        name, _, params = part.strip().partition(';')
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name] = q
+
+    best, best_q = None, 0.0
+    for encoding in encodings:
+        q = weights.get(encoding, weights.get('*', 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def is_compressible(content_type: str) -> bool:
+    content_type = content_type.split(';')[0].strip().lower()
+    if content_type == 'text/event-stream':
+        return False
+    return (content_type.startswith('text/') or content_type in COMPRESSIBLE_TYPES
+            or content_type.endswith('+json'))
+
+
+class _Compressor:
+    """Incremental compressor with a uniform compress(data, final) call"""
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == 'zstd':
+            self._stream = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+        elif encoding == 'br':
+            self._stream = brotli.Compressor(quality=BROTLI_QUALITY)
+        else:
+            self._stream = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        if self.encoding == 'zstd':
+            mode = zstandard.COMPRESSOBJ_FLUSH_FINISH if final else zstandard.COMPRESSOBJ_FLUSH_BLOCK
+            return self._stream.compress(data) + self._stream.flush(mode)
+        if self.encoding == 'br':
+            return self._stream.process(data) + (self._stream.finish() if final else self._stream.flush())
+        return self._stream.compress(data) + self._stream.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing HTTP responses (see module docstring)"""
+
+    def __init__(self, app, minimum_size: int = MINIMUM_SIZE, encodings: Optional[Sequence[str]] = None):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.encodings = available_encodings(PREFERENCE if encodings is None else encodings)
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or not self.encodings:
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(Headers(scope=scope).get('accept-encoding', ''), self.encodings)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        await self.app(scope, receive, _CompressingSend(send, encoding, self.minimum_size))
+
+
+class _CompressingSend:
+    """Wraps `send` for one response, deciding on the first body chunk"""
+
+    def __init__(self, send, encoding: str, minimum_size: int):
+        self.send = send
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.start = None
+        self.compressor: Optional[_Compressor] = None
+        self.passthrough = False
+
+    async def __call__(self, message):
+        if message['type'] == 'http.response.start':
+            self.start = message
+            return
+        if message['type'] != 'http.response.body':
+            await self.send(message)
+            return
+
+        body = message.get('body', b'')
+        more_body = message.get('more_body', False)
+
+        if self.start is not None:
+            start, self.start = self.start, None
+            headers = MutableHeaders(raw=start['headers'])
+            if (start['status'] in (204, 304) or 'content-encoding' in headers
+                    or not is_compressible(headers.get('content-type', ''))
+                    or (not more_body and len(body) < self.minimum_size)):
+                self.passthrough = True
+                await self.send(start)
+                await self.send(message)
+                return
+
+            self.compressor = _Compressor(self.encoding)
+            body = self.compressor.compress(body, final=not more_body)
+            headers['Content-Encoding'] = self.encoding
+            headers.add_vary_header('Accept-Encoding')
+            if more_body:
+                del headers['Content-Length']
+            else:
+                headers['Content-Length'] = str(len(body))
+            await self.send(start)
+            await self.send({'type': 'http.response.body', 'body': body, 'more_body': more_body})
+            return
+
+        if self.passthrough:
+            await self.send(message)
+            return
+        body = self.compressor.compress(body, final=not more_body)
+        await self.send({'type': 'http.response.body', 'body': body, 'more_body': more_body})
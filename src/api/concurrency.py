@@ -0,0 +1,126 @@
+"""
+Blocking Work Dispatch for the Data API
+
+Endpoints are `async def`, but reading parsed files (pandas, pyarrow,
+globbing, line counting) blocks. Running that on the event loop stalls
+every other client on the worker, so endpoints hand the work to a bounded
+thread pool instead:
+
+- One shared pool caps total concurrent blocking work (pandas/pyarrow
+  release the GIL for the heavy parts, so threads scale)
+- A per-source semaphore caps how much of the pool one source can occupy,
+  so a burst of heavy queries on production data can't starve requests
+  for other sources. A slot is held until the work itself finishes, even
+  if the awaiting request is cancelled (client disconnect, timeout)
+
+Configuration (environment):
+    APEX_IO_WORKERS            pool size (default: min(32, cpus + 4));
+                               0 runs work inline on the event loop
+    APEX_SOURCE_CONCURRENCY    concurrent jobs per source (default 4)
+"""
+
+import asyncio
+import contextvars
+import functools
+import os
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+
+IO_WORKERS = int(os.environ.get('APEX_IO_WORKERS', str(min(32, (os.cpu_count() or 1) + 4))))
+SOURCE_CONCURRENCY = int(os.environ.get('APEX_SOURCE_CONCURRENCY', '4'))
+
+_pool: Optional[ThreadPoolExecutor] = None
+# Semaphores belong to an event loop: {loop: {source: semaphore}}
+_source_limits: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+_stats = {'dispatched': 0, 'waiting': 0, 'running': 0}
+
+
+def _get_pool() -> ThreadPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ThreadPoolExecutor(max_workers=IO_WORKERS, thread_name_prefix='apex-io')
+    return _pool
+
+
+def _source_limit(source: str) -> asyncio.Semaphore:
+    # Only touched from the event loop thread, so no lock needed
+    limits = _source_limits.setdefault(asyncio.get_running_loop(), {})
+    semaphore = limits.get(source)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(SOURCE_CONCURRENCY)
+        limits[source] = semaphore
+    return semaphore
+
+
+async def run_blocking(source: Optional[str], func: Callable, *args, **kwargs) -> Any:
+    """
+    Run blocking work off the event loop.
+
+    Args:
+        source: Source the work reads (per-source limit); None = pool limit only
+        func: Blocking callable
+        *args, **kwargs: Passed to func
+
+    Returns:
+        func's return value (exceptions propagate, including HTTPException)
+    """
+    # Run in the caller's context (like asyncio.to_thread), so context
+    # variables such as a batch's shared lookups reach the worker thread
+    call = functools.partial(contextvars.copy_context().run, func, *args, **kwargs)
+    if IO_WORKERS <= 0:
+        return call()
+
+    limit = _source_limit(source.lower()) if source else None
+    _stats['dispatched'] += 1
+    _stats['waiting'] += 1
+    try:
+        if limit is not None:
+            await limit.acquire()
+    finally:
+        _stats['waiting'] -= 1
+
+    loop = asyncio.get_running_loop()
+    try:
+        future = _get_pool().submit(call)
+    except Exception:
+        if limit is not None:
+            limit.release()
+        raise
+    _stats['running'] += 1
+
+    def finished():
+        _stats['running'] -= 1
+        if limit is not None:
+            limit.release()
+
+    def done(_):
+        # Cancelling the awaiting task doesn't stop a running thread, so
+        # the slot is only given back once the work itself is over
+        try:
+            loop.call_soon_threadsafe(finished)
+        except RuntimeError:
+            pass  # Loop already closed
+
+    future.add_done_callback(done)
+    return await asyncio.wrap_future(future)
+
+
+def shutdown():
+    """Stop the pool (called on API shutdown)"""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def stats() -> Dict[str, Any]:
+    """Pool configuration and current load"""
+    return {
+        'workers': IO_WORKERS,
+        'per_source_limit': SOURCE_CONCURRENCY,
+        'dispatched': _stats['dispatched'],
+        'waiting': _stats['waiting'],
+        'running': _stats['running']
+    }
@@ -0,0 +1,75 @@
+"""
+Conditional GET Support
+
+ETag/Last-Modified validators for data GETs, so dashboards that reload
+an unchanged page get a 304 instead of a re-read and re-download.
+
+The ETag hashes the dataset's filesystem version (mtime/size) together
+with the normalized request, so it changes when either does. Filesystem
+versions are used rather than catalog versions because ETags must mean
+the same thing across worker processes and restarts. ETags are weak
+(W/"...") since compression changes the bytes but not the content.
+"""
+
+import hashlib
+from email.utils import formatdate, parsedate_to_datetime
+from pathlib import Path
+from typing import Any, Dict, Mapping, Tuple
+
+
+def make_validators(path: Path, version: Any, key: str) -> Tuple[str, float]:
+    """
+    Build (etag, last_modified) for a response computed from `path`.
+
+    Args:
+        path: Dataset file/directory (or the store file)
+        version: Filesystem version token of `path`
+        key: Normalized request (e.g. a result cache key plus encoding fields)
+    """
+    digest = hashlib.sha1(f"{version!r}|{key}".encode('utf-8')).hexdigest()[:24]
+    return f'W/"{digest}"', Path(path).stat().st_mtime
+
+
+def validator_headers(etag: str, last_modified: float) -> Dict[str, str]:
+    """Headers to send with 200 and 304 responses"""
+    return {
+        'ETag': etag,
+        'Last-Modified': formatdate(last_modified, usegmt=True),
+        # Cache, but revalidate on every load (data can change any time)
+        'Cache-Control': 'no-cache'
+    }
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison (RFC 7232 2.3.2) against a comma-separated list"""
+    if if_none_match.strip() == '*':
+        return True
+    opaque = etag[2:] if etag.startswith('W/') else etag
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        if candidate.startswith('W/'):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+def is_not_modified(headers: Mapping[str, str], etag: str, last_modified: float) -> bool:
+    """
+    Whether a request's conditional headers match the current validators.
+
+    If-None-Match takes precedence; If-Modified-Since is only consulted
+    without it (second resolution, as in the HTTP date format).
+    """
+    if_none_match = headers.get('if-none-match')
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, etag)
+
+    if_modified_since = headers.get('if-modified-since')
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        return int(last_modified) <= since
+    return False
@@ -5,24 +5,68 @@ Simple REST API for generated dashboards to fetch real data from the repository.
 
 Architecture:
 - Reads parquet/CSV files from data/raw/{source}/{data_type}/parsed/
-- Returns JSON for React dashboards
-- Handles basic queries (filters, limits, pagination)
+- Reads district=/year= partitioned Parquet datasets with partition pruning
+- Uses the DuckDB analytical store (data/processed/apex.duckdb) when the
+  pipeline's load phase has populated it
+- Returns JSON for React dashboards (gzip/br/zstd compressed; data GETs
+  answer If-None-Match/If-Modified-Since with 304)
+- Handles basic queries (filters, sorts, aggregations, limits, pagination)
 
 This is Phase 3A (generic data access). Phase 3B will add APEX attribution integration.
 """
 
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
-from typing import List, Dict, Any, Optional
+from fastapi.responses import Response, StreamingResponse
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 from pathlib import Path
+import numpy as np
 import pandas as pd
+import pyarrow as pa
 import json
+import os
 from pydantic import BaseModel
 import sys
 
 # Add parent directory to path for shared_state import
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+from src.catalog_watcher import CatalogVersion, CatalogWatcher, source_for_path
+from src.api.analytical_store import parse_order_by, store
+from src.api.batch import MAX_BATCH_REQUESTS, run_batch, shared
+from src.api.column_stats import footer_stats, select_columns, sketch_stats
+from src.api import concurrency
+from src.api.compression import CompressionMiddleware
+from src.api.concurrency import run_blocking
+from src.api.conditional import is_not_modified, make_validators, validator_headers
+from src.api.filters import check_filter_columns, filter_columns, parse_filters, to_expression
+from src.api.pipeline_feed import PipelineFeed
+from src.api.result_cache import make_key, result_cache
+from src.api.shared_cache import shared_cache
+from src.api.row_count import count_matching_rows
+from src.api.serialization import (
+    encode_columns, encode_dataframe, encode_dataframe_columns, encode_lines, encode_records, json_body, to_arrow
+)
+from src.api.sorting import sorted_page
+from src.decline import DEFAULT_ECONOMIC_LIMIT, DEFAULT_GROUP_BY, DEFAULT_RATE, MODELS, get_fits
+from src.partitioning import is_partitioned_dataset, list_partitions, open_dataset
+from src.rollups import route_aggregate
+from src.sampling import ALLOCATIONS, MAX_ROW_GROUPS, MAX_SAMPLE_ROWS, sample_rows
+from src.sketches import (
+    APPROXIMATE_FUNCTIONS, CONFIDENCE, QUANTILE_FUNCTIONS, SKETCH_DIR, approximate_select, current_sketches,
+    sample_path, top_values, whole_table_metrics
+)
+from src.search_index import (
+    MAX_TERM_POSTINGS, SEARCH_DIR, SEARCH_FIELDS, SEARCH_MODES, SearchIndex, get_index as get_search_index
+)
+from src.timeseries import (
+    DEFAULT_TABLE, DEFAULT_VALUES, FREQUENCIES, OPERATIONS, PERIOD, PERIOD_COLUMN, resample_column,
+    series_select, stream_series
+)
+from src.spatial_index import SPATIAL_DIR, SpatialIndex, get_index as get_spatial_index
+from src.well_index import INDEX_DIR, WELL_DATASETS, WellIndex, get_index, normalize_api_number
+
 # Initialize FastAPI app
 app = FastAPI(
     title="APEX EOR Data API",
@@ -37,14 +81,23 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "Last-Modified"],
 )
 
+# Compress responses over the size threshold (see src/api/compression.py)
+app.add_middleware(CompressionMiddleware)
+
 # Data root paths
 DATA_ROOT = Path(__file__).parent.parent.parent / "data" / "raw"
 DATA_BASE = Path(__file__).parent.parent.parent / "data"  # For interim/processed access
 
 # Cache for directory structures (avoid re-scanning on every request)
+# Entries are tagged with the source's catalog version and rebuilt when it moves
 _directory_structure_cache: Dict[str, Any] = {}
+_directory_structure_versions: Dict[str, int] = {}
+
+# Optional filesystem watcher (enable with APEX_WATCH_DATA=1)
+_catalog_watcher = None
 
 
 # ========================================
@@ -66,15 +119,108 @@ class QueryRequest(BaseModel):
     source: str
     data_type: Optional[str] = None  # Auto-detect if not specified
     columns: Optional[List[str]] = None  # Return all if None
-    filters: Optional[Dict[str, Any]] = None  # {column: value} exact match
+    filters: Optional[Dict[str, Any]] = None  # {column: value | {op: value}}, $and/$or/$not
+    order_by: Optional[List[str]] = None  # ["col", "-col"] ('-' = descending)
     limit: int = 1000
     offset: int = 0
+    approximate: bool = False  # Estimate filtered totals from sampled row groups
+    shape: str = "records"  # 'records' | 'columnar' ({columns, data: {col: [...]}})
+    dictionary: bool = False  # Columnar only: dictionary-encode low-cardinality strings
+
+
+class AggregateRequest(BaseModel):
+    """Request to group and aggregate a data source"""
+    source: str
+    data_type: Optional[str] = None
+    group_by: List[str] = []
+    metrics: Dict[str, str]  # {column: 'sum'|'avg'|'min'|'max'|'count'|'count_distinct'}
+    filters: Optional[Dict[str, Any]] = None  # {column: value | {op: value}}, $and/$or/$not
+    order_by: Optional[List[str]] = None  # Over group_by and "{func}_{column}" outputs
+    limit: Optional[int] = None
+    approximate: bool = False  # Answer from load-time samples/sketches, with _low/_high bounds
+
+
+class DeclineRequest(BaseModel):
+    """Request for Arps decline fits and EUR per lease/well"""
+    source: str = "rrc"
+    data_type: Optional[str] = None  # Store table (default: RRC lease cycle production)
+    rate: str = DEFAULT_RATE  # Monthly volume column
+    group_by: Optional[List[str]] = None  # Lease/well key (default: district, lease, oil/gas code)
+    model: str = "auto"  # 'auto' | 'exponential' | 'harmonic' | 'hyperbolic'
+    economic_limit: float = DEFAULT_ECONOMIC_LIMIT  # Volume/month where the forecast stops
+    filters: Optional[Dict[str, Any]] = None  # Over group_by and fit columns, e.g. {"eur": {"gte": 1e5}}
+    order_by: Optional[List[str]] = None  # e.g. ["-eur"]
+    limit: int = 1000
+    offset: int = 0
+
+
+class TimeSeriesRequest(BaseModel):
+    """Request for cumulative/rolling/period-over-period production series"""
+    source: str = "rrc"
+    data_type: Optional[str] = None  # Store table (default: RRC lease cycle production)
+    group_by: List[str] = []  # e.g. ["DISTRICT_NO", "LEASE_NO"]; empty = whole state
+    values: List[str] = DEFAULT_VALUES  # Volume columns
+    operations: List[str] = ["cumsum"]  # 'cumsum' | 'rolling' | 'change' | 'pct_change'
+    freq: str = "month"  # 'month' | 'quarter' | 'year'
+    window: int = 3  # Rolling window in periods
+    filters: Optional[Dict[str, Any]] = None  # Over the table's columns
+    limit: int = 10000
+    offset: int = 0
+    stream: bool = False  # Every row as NDJSON, sent chunk by chunk (limit/offset ignored)
+
+
+class BatchItem(BaseModel):
+    """One sub-request of a batch"""
+    id: Optional[str] = None  # Echoed back (default: position in the batch)
+    method: str = "GET"
+    path: str  # e.g. "/api/sources/rrc/info" (may include a query string)
+    params: Optional[Dict[str, Any]] = None  # Query parameters
+    body: Optional[Any] = None  # JSON body for POST endpoints
+    headers: Optional[Dict[str, str]] = None  # e.g. {"If-None-Match": "W/\"...\""}
+
+
+class BatchRequest(BaseModel):
+    """Sub-requests to run together"""
+    requests: List[BatchItem]
+
+
+class WellJoinRequest(BaseModel):
+    """Request to fetch a set of wells' rows across sources"""
+    apis: List[str]  # API numbers in any format (API-10/12/14, dashed, RRC 8-digit)
+    datasets: Optional[List[str]] = None  # Keys of WELL_DATASETS (default: all)
+    columns: Optional[Dict[str, List[str]]] = None  # {table: [columns]} to project
+    how: str = "outer"  # 'outer' | 'inner' (only wells found in every dataset)
+    exact: bool = False  # Match API-14 (sidetrack/event) instead of API-10
+    limit: int = 10000  # Max rows per table
+
+
+# Well join modes for WellJoinRequest.how
+JOIN_MODES = ('outer', 'inner')
+
+# Most wells per join request
+MAX_JOIN_WELLS = 10_000
+
+# Spatial queries: clustered below this zoom, point and radius caps
+CLUSTER_MAX_ZOOM = 10
+MAX_SPATIAL_POINTS = 50_000
+MAX_RADIUS_KM = 500
+
+# Search: most matches per request, most row locators per match
+MAX_SEARCH_MATCHES = 200
+MAX_SEARCH_LOCATORS = MAX_TERM_POSTINGS  # Locators kept per value by the index
+
+# Response shapes for QueryRequest.shape
+RESPONSE_SHAPES = ('records', 'columnar')
+
+# Request fields that only change how a page is encoded (not part of cache keys)
+ENCODING_FIELDS = {'shape', 'dictionary'}
 
 
 # ========================================
 # Helper Functions
 # ========================================
 
+@shared
 def find_parsed_file(source: str, data_type: Optional[str] = None) -> Optional[Path]:
     """
     Find the parsed data file for a data source (any supported format).
@@ -85,19 +231,24 @@ def find_parsed_file(source: str, data_type: Optional[str] = None) -> Optional[P
     3. data/interim/{source}*.*  (for interim processed files)
     4. data/processed/{source}*.*  (for final processed files)
 
-    Supported formats: parquet, csv, json, jsonl
+    Supported formats: parquet, partitioned parquet datasets (directories),
+    csv, json, jsonl
     """
     # Supported file extensions (in priority order)
     SUPPORTED_EXTENSIONS = ['*.parquet', '*.csv', '*.json', '*.jsonl']
 
     def find_in_dir(directory: Path) -> Optional[Path]:
-        """Find first supported file in directory"""
+        """Find first supported file (or partitioned dataset) in directory"""
         if not directory.exists():
             return None
         for ext_pattern in SUPPORTED_EXTENSIONS:
             files = list(directory.glob(ext_pattern))
             if files:
                 return files[0]
+            if ext_pattern == '*.parquet':
+                datasets = sorted(d for d in directory.iterdir() if is_partitioned_dataset(d))
+                if datasets:
+                    return datasets[0]
         return None
 
     def find_by_prefix(directory: Path, prefix: str) -> Optional[Path]:
@@ -150,7 +301,8 @@ def find_parsed_file(source: str, data_type: Optional[str] = None) -> Optional[P
     return None
 
 
-def load_dataframe(source: str, data_type: Optional[str] = None, limit: Optional[int] = None, offset: int = 0) -> pd.DataFrame:
+def load_dataframe(source: str, data_type: Optional[str] = None, limit: Optional[int] = None, offset: int = 0,
+                   filters: Optional[tuple] = None) -> pd.DataFrame:
     """
     Load dataframe from parsed file with optional pagination.
 
@@ -159,6 +311,8 @@ def load_dataframe(source: str, data_type: Optional[str] = None, limit: Optional
         data_type: Optional data type
         limit: Max rows to return (None = all rows, but defaults to 1000 in endpoints)
         offset: Number of rows to skip
+        filters: Parsed filter expression (see src/api/filters.py), evaluated
+                 during the scan with parquet statistics / partition pruning
 
     Returns:
         DataFrame with requested rows
@@ -173,7 +327,16 @@ def load_dataframe(source: str, data_type: Optional[str] = None, limit: Optional
         )
 
     try:
-        if file_path.suffix == '.parquet':
+        if filters is not None or is_partitioned_dataset(file_path):
+            dataset = open_file_dataset(file_path)
+            if limit is None:
+                limit = 1000
+
+            # Stops reading once offset + limit matching rows are found
+            table = dataset.head(offset + limit, filter=to_expression(filters, dataset.schema))
+            return table.slice(offset).to_pandas()
+
+        elif file_path.suffix == '.parquet':
             # Use pyarrow for efficient row-level access (lazy loading)
             import pyarrow.parquet as pq
 
@@ -212,10 +375,154 @@ def load_dataframe(source: str, data_type: Optional[str] = None, limit: Optional
             return df.iloc[offset:offset + limit]
         else:
             raise HTTPException(status_code=500, detail=f"Unsupported file format: {file_path.suffix}")
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error loading data: {str(e)}")
 
 
+@shared
+def open_file_dataset(file_path: Path):
+    """
+    Open a parsed file (or partitioned dataset) as a pyarrow dataset.
+
+    Scans over the dataset evaluate filter expressions vectorized; parquet
+    sources also skip row groups whose min/max statistics can't match.
+    """
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    if is_partitioned_dataset(file_path):
+        return open_dataset(file_path)
+    if file_path.suffix == '.parquet':
+        return ds.dataset(str(file_path), format='parquet')
+    if file_path.suffix == '.csv':
+        return ds.dataset(str(file_path), format='csv')
+    if file_path.suffix in ['.json', '.jsonl']:
+        df = pd.read_json(file_path, lines=(file_path.suffix == '.jsonl'))
+        return ds.dataset(pa.Table.from_pandas(df, preserve_index=False))
+    raise HTTPException(status_code=500, detail=f"Unsupported file format: {file_path.suffix}")
+
+
+def load_sorted_page(source: str, data_type: Optional[str], order_by: List[str],
+                     columns: Optional[List[str]] = None, filters: Optional[tuple] = None,
+                     limit: int = 1000, offset: int = 0) -> pd.DataFrame:
+    """
+    Load one page of a parsed file in sort order.
+
+    Small pages (offset + limit up to sorting.TOPK_MAX_ROWS) stream through a
+    top-k selection; deeper pages use an external merge sort that spills
+    sorted runs to disk. Memory stays bounded either way.
+
+    Args:
+        source: Data source name
+        data_type: Optional data type
+        order_by: Sort keys ("col" ascending, "-col" descending)
+        columns: Columns to return (None = all)
+        filters: Parsed filter expression
+        limit: Max rows to return
+        offset: Number of rows to skip
+
+    Returns:
+        DataFrame with requested rows
+    """
+    file_path = find_parsed_file(source, data_type)
+    if not file_path:
+        raise HTTPException(status_code=404, detail=f"No parsed data found for source '{source}'")
+
+    dataset = open_file_dataset(file_path)
+    keys = parse_order_by(order_by)
+    missing = ({c for c, _ in keys} | set(columns or [])) - set(dataset.schema.names)
+    if missing:
+        raise HTTPException(status_code=400, detail=f"Columns not found: {sorted(missing)}")
+
+    try:
+        table = sorted_page(dataset, keys, columns=columns,
+                            filter_expression=to_expression(filters, dataset.schema),
+                            offset=offset, limit=limit)
+        return table.to_pandas()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error sorting data: {str(e)}")
+
+
+def count_filtered_rows(source: str, data_type: Optional[str], filters: tuple,
+                        approximate: bool = False) -> Dict[str, Any]:
+    """
+    Count rows matching filters without loading them.
+
+    Only the filter columns are read, and partitions / parquet row groups
+    whose statistics can't match are skipped. Counts are cached per
+    (dataset, filter) until the files change.
+
+    Args:
+        source: Data source name
+        data_type: Optional data type
+        filters: Parsed filter expression
+        approximate: Estimate from a sample of row groups (parquet only)
+
+    Returns:
+        {'total': int, 'exact': bool, 'error': int (+/- rows at 95%)}
+    """
+    file_path = find_parsed_file(source, data_type)
+    if not file_path:
+        raise HTTPException(status_code=404, detail=f"No parsed data found for source '{source}'")
+
+    dataset = open_file_dataset(file_path)
+    try:
+        return count_matching_rows(
+            dataset, file_path, to_expression(filters, dataset.schema), repr(filters), approximate
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error counting rows: {str(e)}")
+
+
+def dataset_version(path: Path) -> tuple:
+    """
+    Version token of the dataset at `path`, used to validate cached results.
+
+    While the catalog watcher runs this is the source's catalog version (no
+    filesystem access); otherwise the file's mtime and size. Partitioned
+    datasets are rewritten by swapping the whole directory, so the
+    directory's own stat changes too.
+    """
+    if _catalog_watcher is not None and _catalog_watcher.is_running:
+        source = source_for_path(path, DATA_BASE)
+        if source:
+            return ('catalog', source, CatalogVersion.source_version(source))
+    return file_version(path)
+
+
+def file_version(path: Path) -> tuple:
+    """mtime/size token of a path; unlike catalog versions, valid across worker processes"""
+    stat = Path(path).stat()
+    return ('file', stat.st_mtime_ns, stat.st_size)
+
+
+def tree_signature(directory: Path, depth: int = 2) -> List[int]:
+    """
+    mtimes of `directory` and its subdirectories down to `depth` levels.
+
+    A directory's mtime moves when entries are added, removed or renamed
+    in it, so this detects new files anywhere a depth-limited scan looks.
+    """
+    signature = []
+    pending = [(Path(directory), 0)]
+    while pending:
+        current, level = pending.pop()
+        try:
+            signature.append(current.stat().st_mtime_ns)
+            if level < depth:
+                with os.scandir(current) as entries:
+                    pending.extend(
+                        (Path(entry.path), level + 1)
+                        for entry in sorted(entries, key=lambda e: e.name)
+                        if entry.is_dir(follow_symlinks=False)
+                    )
+        except OSError:
+            signature.append(None)
+    return signature
+
+
 def get_data_types(source: str) -> List[str]:
     """Get list of data types for a source"""
     source_path = DATA_ROOT / source
@@ -233,6 +540,7 @@ def get_data_types(source: str) -> List[str]:
     return data_types
 
 
+@shared
 def get_file_metadata(source: str, data_type: Optional[str] = None) -> dict:
     """
     Get metadata (row count, columns, schema) WITHOUT loading full dataset.
@@ -251,7 +559,19 @@ def get_file_metadata(source: str, data_type: Optional[str] = None) -> dict:
         )
 
     try:
-        if file_path.suffix == '.parquet':
+        if is_partitioned_dataset(file_path):
+            # Row counts come from the parquet footers of each partition
+            dataset = open_dataset(file_path)
+            schema = dataset.schema
+
+            return {
+                'row_count': dataset.count_rows(),
+                'columns': schema.names,
+                'schema': {name: str(schema.field(name).type) for name in schema.names},
+                'partitioned_by': ['district', 'year'],
+                'partitions': len(list_partitions(file_path))
+            }
+        elif file_path.suffix == '.parquet':
             import pyarrow.parquet as pq
 
             # Read only metadata (super fast!)
@@ -294,6 +614,22 @@ def get_file_metadata(source: str, data_type: Optional[str] = None) -> dict:
         raise HTTPException(status_code=500, detail=f"Error reading metadata: {str(e)}")
 
 
+def find_metadata_files(source: str) -> List[Path]:
+    """
+    Find metadata.json files for a source.
+
+    Pipeline metadata lives at the dataset root, which is either the source
+    itself (data/raw/fracfocus/) or one level below (data/raw/rrc/production/).
+    """
+    source_path = DATA_ROOT / source
+    if not source_path.exists():
+        return []
+
+    candidates = [source_path / 'metadata.json']
+    candidates += [subdir / 'metadata.json' for subdir in sorted(source_path.iterdir()) if subdir.is_dir()]
+    return [path for path in candidates if path.exists()]
+
+
 def transform_dir_structure_to_file_nodes(dir_structure: dict, source_id: str) -> list:
     """
     Transform backend directory structure to FileNode[] format for React.
@@ -435,6 +771,39 @@ def transform_dir_structure_to_file_nodes(dir_structure: dict, source_id: str) -
     return file_nodes
 
 
+# ========================================
+# Lifecycle
+# ========================================
+
+@app.on_event("startup")
+async def start_catalog_watcher():
+    """
+    Start the data/ watcher when APEX_WATCH_DATA=1.
+
+    Each worker process runs its own (its caches and event streams follow
+    the events); their context updates take turns under PipelineState's
+    write lock.
+    """
+    global _catalog_watcher
+
+    if os.getenv('APEX_WATCH_DATA', '0') != '1':
+        return
+
+    _catalog_watcher = CatalogWatcher(data_dir=DATA_BASE)
+    if _catalog_watcher.start():
+        # Pipeline status changes are pushed as the watcher sees them
+        _catalog_watcher.add_listener(pipeline_feed.on_catalog_change)
+        pipeline_feed.watching = True
+
+
+@app.on_event("shutdown")
+async def stop_catalog_watcher():
+    """Stop the data/ watcher if it was started, and the blocking-work pool"""
+    if _catalog_watcher is not None:
+        _catalog_watcher.stop()
+    concurrency.shutdown()
+
+
 # ========================================
 # API Endpoints
 # ========================================
@@ -446,7 +815,10 @@ async def root():
         "service": "APEX EOR Data API",
         "version": "3.0.0",
         "phase": "3A - Generic Data Access",
-        "status": "running"
+        "status": "running",
+        "catalog_version": CatalogVersion.current(),
+        "watcher": _catalog_watcher.backend if _catalog_watcher and _catalog_watcher.is_running else None,
+        "io_pool": concurrency.stats()
     }
 
 
@@ -458,6 +830,11 @@ async def list_sources():
     Returns:
         List of source names (e.g., ['fracfocus', 'rrc', 'usgs'])
     """
+    return await run_blocking(None, scan_sources)
+
+
+def scan_sources() -> List[str]:
+    """List source directories under data/raw"""
     if not DATA_ROOT.exists():
         return []
 
@@ -470,7 +847,7 @@ async def list_sources():
 
 
 @app.get("/api/sources/{source}/info", response_model=DataSourceInfo)
-async def get_source_info(source: str):
+async def get_source_info(source: str, http_request: Request, response: Response):
     """
     Get metadata about a specific data source.
 
@@ -479,7 +856,52 @@ async def get_source_info(source: str):
 
     Returns:
         Metadata including columns, row count, available data types
+        (304 when If-None-Match/If-Modified-Since still match)
     """
+    validators = await run_blocking(None, info_validators, source)
+    if validators and is_not_modified(http_request.headers, *validators):
+        return Response(status_code=304, headers=validator_headers(*validators))
+
+    # Cache hits skip the per-source limit so they never queue behind scans
+    info = await run_blocking(None, cached_source_info, source)
+    if info is None:
+        info = await run_blocking(source, source_info, source)
+    if validators:
+        response.headers.update(validator_headers(*validators))
+    return DataSourceInfo(**info)
+
+
+def info_validators(source: str) -> Optional[Tuple[str, float]]:
+    """(ETag, Last-Modified) of a source's info, or None if it has no data"""
+    file_path = find_parsed_file(source)
+    if not file_path:
+        return None
+    try:
+        return make_validators(file_path, file_version(file_path), make_key('info', source))
+    except OSError:
+        return None
+
+
+def cached_source_info(source: str) -> Optional[Dict[str, Any]]:
+    """Serve source info from the result cache (None on a miss)"""
+    return result_cache.get(make_key('info', source), dataset_version)
+
+
+def source_info(source: str) -> Dict[str, Any]:
+    """Build the info for a source and cache it"""
+    key = make_key('info', source)
+    file_path = find_parsed_file(source)
+    if not file_path:
+        raise HTTPException(status_code=404, detail=f"No parsed data found for source '{source}'")
+    version = dataset_version(file_path)
+
+    # Another worker may already have built it for this file version
+    shared_version = file_version(file_path)
+    info = shared_cache.get(key, shared_version)
+    if info is not None:
+        result_cache.put(key, info, file_path, version)
+        return info
+
     # Get metadata WITHOUT loading full dataset (fast!)
     try:
         metadata = get_file_metadata(source)
@@ -489,7 +911,7 @@ async def get_source_info(source: str):
     # Get data types
     data_types = get_data_types(source)
 
-    return DataSourceInfo(
+    info = dict(
         name=source,
         data_types=data_types if data_types else ["default"],
         stages=["parsed"],  # Only exposing parsed data for now
@@ -497,24 +919,253 @@ async def get_source_info(source: str):
         columns=metadata['columns'],
         schema=metadata['schema']
     )
+    result_cache.put(key, info, file_path, version)
+    shared_cache.put(key, shared_version, info)
 
+    return info
 
-@app.post("/api/query")
-async def query_data(request: QueryRequest):
+
+@app.get("/api/sources/{source}/stats")
+async def get_source_stats(
+    source: str,
+    data_type: Optional[str] = None,
+    columns: Optional[str] = Query(None, description="Comma-separated column names"),
+    sketches: bool = Query(True, description="Include distinct counts, quantiles and histograms")
+):
     """
-    Query data from a source with filters and pagination.
+    Column statistics for chart scales and filter widgets.
+
+    Parquet min/max/null counts come from the file footers (no scan).
+    Sketches (HyperLogLog distinct counts, quantiles, histograms) take one
+    scan per dataset version and are then served from the caches, shared
+    across workers. CSV/JSON sources always need that scan.
+
+    Returns:
+        {
+            "source": "rrc",
+            "row_count": 1000000,
+            "sketches": true,
+            "columns": {
+                "LEASE_OIL_PROD_VOL": {
+                    "type": "double", "min": 0.0, "max": 91234.0, "null_count": 12,
+                    "distinct": {"estimate": 40211, "relative_error": 0.0081},
+                    "quantiles": {"0.5": 412.0, ...},
+                    "histogram": {"edges": [...], "counts": [...], "exact": false}
+                }
+            }
+        }
+    """
+    column_list = [c.strip() for c in columns.split(",")] if columns else None
+    stats = await run_blocking(source, source_stats, source, data_type, sketches)
+    missing = [c for c in column_list or [] if c not in stats['columns']]
+    if missing:
+        raise HTTPException(status_code=400, detail=f"Columns not found: {missing}")
+    return select_columns(stats, column_list)
+
+
+def source_stats(source: str, data_type: Optional[str], sketches: bool) -> Dict[str, Any]:
+    """Build (or fetch) column statistics for a source's parsed data"""
+    file_path = find_parsed_file(source, data_type)
+    if not file_path:
+        raise HTTPException(status_code=404, detail=f"No parsed data found for source '{source}'")
+
+    key = make_key('stats', {'path': str(file_path), 'sketches': sketches})
+    cached = result_cache.get(key, dataset_version)
+    if cached is not None:
+        return cached
+    version = dataset_version(file_path)
+
+    # Footers and sketches are versioned by mtime/size so all workers share them
+    shared_version = file_version(file_path)
+    try:
+        footer = shared_cache.get_or_build(
+            make_key('stats-footer', str(file_path)), shared_version,
+            lambda: footer_stats(open_file_dataset(file_path)) or {}
+        ) or None
+
+        sketch = None
+        if sketches or footer is None:
+            sketch = shared_cache.get_or_build(
+                make_key('stats-sketch', str(file_path)), shared_version,
+                lambda: sketch_stats(open_file_dataset(file_path), footer)
+            )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error computing statistics: {str(e)}")
+
+    columns = {name: dict(entry) for name, entry in (footer or {}).get('columns', {}).items()}
+    if sketch is not None:
+        for name, entry in sketch['columns'].items():
+            columns.setdefault(name, {}).update(entry)
+    if not sketches:
+        # Scan-derived bounds only (CSV/JSON): drop the sketch fields
+        for entry in columns.values():
+            for field in ('distinct', 'quantiles', 'histogram'):
+                entry.pop(field, None)
+
+    stats = {
+        "source": source,
+        "data_type": data_type,
+        "row_count": footer['row_count'] if footer else sketch['row_count'],
+        "sketches": sketches,
+        "columns": columns
+    }
+    if sketch is not None and sketches:
+        stats["sample_rows"] = sketch['sample_rows']
+    result_cache.put(key, stats, file_path, version)
+    return stats
+
+
+@app.get("/api/sources/{source}/sample")
+async def get_source_sample(
+    source: str,
+    data_type: Optional[str] = None,
+    n: int = Query(1000, ge=1, le=MAX_SAMPLE_ROWS, description="Rows to draw"),
+    seed: int = Query(0, description="Random seed (same seed -> same rows)"),
+    by: Optional[str] = Query(None, description="Stratify by this column"),
+    allocation: str = Query("proportional", description="'proportional' or 'equal' rows per stratum"),
+    columns: Optional[str] = Query(None, description="Comma-separated column names"),
+    max_row_groups: int = Query(MAX_ROW_GROUPS, ge=1, description="Row groups to sample from at most"),
+    shape: str = Query("records", description="'records' or 'columnar'"),
+    dictionary: bool = Query(False, description="Columnar only: dictionary-encode low-cardinality strings")
+):
+    """
+    Representative sample of a source for previews and charts.
+
+    Rows are drawn uniformly, or stratified by a column, from up to
+    max_row_groups parquet row groups spread over the whole dataset; only
+    row groups holding drawn rows are decoded (see src/sampling.py).
+    Results are in file order and reproducible by seed.
+
+    Returns:
+        {
+            "data": [...],
+            "total": 1000000,          # Rows in the dataset
+            "returned": 1000,
+            "offset": 0,
+            "sample": {"method": "uniform", "seed": 0, "pool_rows": ...,
+                       "row_groups_total": 120, "row_groups_read": 64,
+                       "strata": {...}}  # Stratified only: rows per value
+        }
+    """
+    if allocation not in ALLOCATIONS:
+        raise HTTPException(status_code=400,
+                            detail=f"Invalid allocation '{allocation}' (expected one of {list(ALLOCATIONS)})")
+    if shape not in RESPONSE_SHAPES:
+        raise HTTPException(status_code=400,
+                            detail=f"Invalid shape '{shape}' (expected one of {list(RESPONSE_SHAPES)})")
+    column_list = [c.strip() for c in columns.split(",")] if columns else None
+    table, meta = await run_blocking(source, source_sample, source, data_type, n, seed, by, allocation,
+                                     column_list, max_row_groups)
+    return build_query_response(table, meta, shape, dictionary, extra={"sample": meta["sample"]})
+
+
+def source_sample(source: str, data_type: Optional[str], n: int, seed: int, by: Optional[str],
+                  allocation: str, columns: Optional[List[str]], max_row_groups: int) -> Tuple[pa.Table, Dict]:
+    """Draw (or fetch from the result cache) a sample of a source's parsed data"""
+    file_path = find_parsed_file(source, data_type)
+    if not file_path:
+        raise HTTPException(status_code=404, detail=f"No parsed data found for source '{source}'")
+
+    key = make_key('sample', dict(path=str(file_path), n=n, seed=seed, by=by, allocation=allocation,
+                                  columns=columns, max_row_groups=max_row_groups))
+    cached = result_cache.get(key, dataset_version)
+    if cached is not None:
+        return cached['table'], cached['meta']
+    version = dataset_version(file_path)
+
+    dataset = open_file_dataset(file_path)
+    missing = [c for c in (columns or []) + ([by] if by else []) if c not in dataset.schema.names]
+    if missing:
+        raise HTTPException(status_code=400, detail=f"Columns not found: {missing}")
+
+    try:
+        table, info = sample_rows(dataset, n, seed=seed, columns=columns, by=by,
+                                  allocation=allocation, max_row_groups=max_row_groups)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error sampling data: {str(e)}")
+
+    sample = {"method": "stratified" if by else "uniform", "seed": seed, **info}
+    if by:
+        sample.update(by=by, allocation=allocation)
+    meta = {"total": sample.pop("population_rows"), "offset": 0, "date_format": "iso", "sample": sample}
+    result_cache.put(key, {'table': table, 'meta': meta}, file_path, version)
+    return table, meta
+
+
+@app.get("/api/sources/{source}/quality")
+async def get_source_quality(source: str):
+    """
+    Get the data quality report written by the pipeline's validate phase.
 
     Args:
-        request: Query parameters (source, columns, filters, limit, offset)
+        source: Source name (e.g., 'rrc')
 
     Returns:
         {
-            "data": [...],  # Array of records
-            "total": 1000,  # Total matching rows
-            "returned": 100,  # Rows in this response
-            "offset": 0
+            "source": "rrc",
+            "datasets": {
+                "production": {"status": "warnings", "total_rows": ..., "files": [...]}
+            }
         }
     """
+    return await run_blocking(source, source_quality, source)
+
+
+def source_quality(source: str) -> Dict[str, Any]:
+    """Collect validation reports from a source's metadata.json files"""
+    metadata_files = find_metadata_files(source)
+    if not metadata_files:
+        raise HTTPException(status_code=404, detail=f"No pipeline metadata found for source '{source}'")
+
+    datasets = {}
+    for metadata_file in metadata_files:
+        try:
+            with open(metadata_file, 'r') as f:
+                metadata = json.load(f)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Error reading {metadata_file.name}: {str(e)}")
+
+        dataset = metadata_file.parent.relative_to(DATA_ROOT / source).as_posix()
+        datasets[dataset if dataset != '.' else source] = metadata.get('validation', {'status': 'not_validated'})
+
+    return {"source": source, "datasets": datasets}
+
+
+def execute_query(request: QueryRequest) -> Tuple[pd.DataFrame, Dict[str, Any], Path, tuple]:
+    """
+    Run a query against the store or the parsed files.
+
+    Returns:
+        (page DataFrame, response fields other than data, dataset path,
+         dataset version the result was computed from)
+    """
+    # Loaded datasets are answered by the analytical store (no file scan)
+    store_table = store.find_table(request.source, request.data_type)
+    if store_table:
+        version = dataset_version(store.path)
+        df, total = store.query(
+            store_table['table'],
+            columns=request.columns,
+            filters=request.filters,
+            order_by=request.order_by,
+            limit=request.limit,
+            offset=request.offset
+        )
+        # Same date encoding as the file path: loading a source doesn't change responses
+        meta = {"total": total, "offset": request.offset, "date_format": "epoch"}
+        if request.approximate:
+            # COUNT(*) in the store is always exact
+            meta["total_exact"] = True
+            meta["total_error"] = 0
+        return df, meta, store.path, version
+
+    file_path = find_parsed_file(request.source, request.data_type)
+    if not file_path:
+        raise HTTPException(status_code=404, detail=f"No parsed data found for source '{request.source}'")
+    version = dataset_version(file_path)
+
     # Get total row count from metadata (fast!)
     try:
         metadata = get_file_metadata(request.source, request.data_type)
@@ -522,9 +1173,19 @@ async def query_data(request: QueryRequest):
     except HTTPException as e:
         raise e
 
+    # Filters compile to a pyarrow expression evaluated during the scan
+    filter_expr = parse_filters(request.filters)
+    check_filter_columns(filter_expr, metadata['columns'])
+
     # Load ONLY the requested rows (lazy loading with limit/offset)
     try:
-        df = load_dataframe(request.source, request.data_type, limit=request.limit, offset=request.offset)
+        if request.order_by:
+            df = load_sorted_page(request.source, request.data_type, request.order_by,
+                                  columns=request.columns, filters=filter_expr,
+                                  limit=request.limit, offset=request.offset)
+        else:
+            df = load_dataframe(request.source, request.data_type, limit=request.limit, offset=request.offset,
+                                filters=filter_expr)
     except HTTPException as e:
         raise e
 
@@ -539,39 +1200,149 @@ async def query_data(request: QueryRequest):
             )
         df = df[request.columns]
 
-    # Note: Filters are applied AFTER loading for now
-    # TODO: Push filters down to parquet reader for even better performance
-    if request.filters:
-        for col, value in request.filters.items():
-            if col not in df.columns:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Filter column not found: {col}"
-                )
-            df = df[df[col] == value]
-        # Adjust total after filtering
-        total = len(df)
-
-    # Convert to JSON-serializable format (pandas handles NaN conversion automatically)
-    import json
-    records_json = df.to_json(orient='records')
-    records = json.loads(records_json)  # This automatically converts NaN to null
+    count = {'exact': True, 'error': 0}
+    if filter_expr is not None:
+        count = count_filtered_rows(request.source, request.data_type, filter_expr, request.approximate)
+        total = count['total']
 
-    return {
-        "data": records,
-        "total": total,
-        "returned": len(records),
-        "offset": request.offset
-    }
+    meta = {"total": total, "offset": request.offset, "date_format": "epoch"}
+    if request.approximate:
+        meta["total_exact"] = count['exact']
+        meta["total_error"] = count['error']
+    return df, meta, file_path, version
+
+
+def build_query_response(page, meta: Dict[str, Any], shape: str = "records",
+                         dictionary: bool = False, extra: Optional[Dict[str, Any]] = None) -> Response:
+    """
+    Serialize a query page (Arrow table or DataFrame) and its response fields.
+
+    Records are encoded straight from Arrow columns to JSON bytes (NaN ->
+    null, ISO or epoch timestamps per meta['date_format']) and returned as
+    a ready Response, so FastAPI doesn't re-walk them cell by cell.
+
+    shape="columnar" returns {"columns": [...], "data": {col: [...]}}, with
+    dictionary=True encoding low-cardinality string columns as
+    {"dictionary": [...], "indices": [...]} (listed in "dictionary_encoded").
+    """
+    is_table = isinstance(page, pa.Table)
+    returned = page.num_rows if is_table else len(page)
+    fields = {}
+    if shape == "columnar":
+        encode = encode_columns if is_table else encode_dataframe_columns
+        data, encoded = encode(page, meta['date_format'], dictionary)
+        fields["columns"] = [str(c) for c in (page.column_names if is_table else page.columns)]
+        if dictionary:
+            fields["dictionary_encoded"] = encoded
+    else:
+        encode = encode_records if is_table else encode_dataframe
+        data = encode(page, meta['date_format'])
+
+    fields.update({
+        "total": meta['total'],
+        "returned": returned,
+        "offset": meta['offset']
+    })
+    for key in ("total_exact", "total_error"):
+        if key in meta:
+            fields[key] = meta[key]
+    fields.update(extra or {})
+    return Response(content=json_body(data, fields), media_type="application/json")
+
+
+@app.post("/api/query")
+async def query_data(request: QueryRequest):
+    """
+    Query data from a source with filters and pagination.
+
+    Identical requests are served from the result cache until the
+    underlying dataset changes.
+
+    Args:
+        request: Query parameters (source, columns, filters, limit, offset).
+                 Filters support ranges, in, is_null, prefix/contains and
+                 $and/$or/$not (see src/api/filters.py).
+
+    Returns:
+        {
+            "data": [...],  # Array of records
+            "total": 1000,  # Total matching rows
+            "returned": 100,  # Rows in this response
+            "offset": 0,
+            "total_exact": false,  # Only with approximate=true
+            "total_error": 250     # +/- rows at 95% confidence
+        }
+
+        With shape="columnar", "data" is {column: [values...]} and
+        "columns" lists the column order (see build_query_response).
+    """
+    if request.shape not in RESPONSE_SHAPES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid shape '{request.shape}' (expected one of {list(RESPONSE_SHAPES)})"
+        )
+
+    # Cache hits skip the per-source limit so they never queue behind scans
+    response = await run_blocking(None, cached_query, request)
+    if response is None:
+        response = await run_blocking(request.source, run_query, request)
+    return response
+
+
+def query_cache_key(request: QueryRequest) -> str:
+    """Cache key of the page a request selects (all response shapes share it)"""
+    return make_key('query', jsonable_encoder(request, exclude=ENCODING_FIELDS))
+
+
+def query_validators(request: QueryRequest) -> Optional[Tuple[str, float]]:
+    """
+    (ETag, Last-Modified) of a query response, or None if the source has
+    no data. Only stats the dataset; nothing is read.
+    """
+    store_table = store.find_table(request.source, request.data_type)
+    path = store.path if store_table else find_parsed_file(request.source, request.data_type)
+    if not path:
+        return None
+    # The body also depends on the encoding fields
+    key = query_cache_key(request) + make_key('encoding', jsonable_encoder(request, include=ENCODING_FIELDS))
+    try:
+        return make_validators(path, file_version(path), key)
+    except OSError:
+        return None
+
+
+def cached_query(request: QueryRequest) -> Optional[Response]:
+    """Serve a query from the result cache (None on a miss)"""
+    cached = result_cache.get(query_cache_key(request), dataset_version)
+    if cached is None:
+        return None
+    return build_query_response(cached['table'], cached['meta'], request.shape, request.dictionary)
+
+
+def run_query(request: QueryRequest) -> Response:
+    """Execute a query and cache its result"""
+    key = query_cache_key(request)
+    df, meta, path, version = execute_query(request)
+    # Mixed-type object columns can't be held as Arrow; those pages aren't cached
+    table = to_arrow(df)
+    if table is None:
+        return build_query_response(df, meta, request.shape, request.dictionary)
+
+    result_cache.put(key, {'table': table, 'meta': meta}, path, version)
+    return build_query_response(table, meta, request.shape, request.dictionary)
 
 
 @app.get("/api/sources/{source}/data")
 async def get_data(
     source: str,
+    http_request: Request,
     data_type: Optional[str] = None,
     limit: int = Query(1000, ge=1, le=10000),
     offset: int = Query(0, ge=0),
-    columns: Optional[str] = Query(None, description="Comma-separated column names")
+    columns: Optional[str] = Query(None, description="Comma-separated column names"),
+    order_by: Optional[str] = Query(None, description="Comma-separated sort keys ('-' prefix = descending)"),
+    shape: str = Query("records", description="'records' or 'columnar'"),
+    dictionary: bool = Query(False, description="Columnar only: dictionary-encode low-cardinality strings")
 ):
     """
     Simple GET endpoint to fetch data (alternative to POST /api/query).
@@ -582,6 +1353,9 @@ async def get_data(
         limit: Max rows to return (default 1000, max 10000)
         offset: Pagination offset (default 0)
         columns: Comma-separated column names to return (optional)
+        order_by: Comma-separated sort keys, e.g. "-LEASE_OIL_PROD_VOL" (optional)
+        shape: 'records' (default) or 'columnar' (see POST /api/query)
+        dictionary: Dictionary-encode low-cardinality string columns (columnar only)
 
     Returns:
         {
@@ -590,6 +1364,10 @@ async def get_data(
             "returned": 100,
             "offset": 0
         }
+
+        Responses carry ETag/Last-Modified; a request whose
+        If-None-Match/If-Modified-Since still match gets a 304 without
+        the data being read.
     """
     # Parse columns
     column_list = None
@@ -602,11 +1380,651 @@ async def get_data(
         data_type=data_type,
         columns=column_list,
         filters=None,
+        order_by=[k.strip() for k in order_by.split(",")] if order_by else None,
         limit=limit,
-        offset=offset
+        offset=offset,
+        shape=shape,
+        dictionary=dictionary
+    )
+
+    validators = await run_blocking(None, query_validators, request)
+    if validators and is_not_modified(http_request.headers, *validators):
+        return Response(status_code=304, headers=validator_headers(*validators))
+
+    response = await query_data(request)
+    if validators:
+        response.headers.update(validator_headers(*validators))
+    return response
+
+
+@app.post("/api/aggregate")
+async def aggregate_data(request: AggregateRequest):
+    """
+    Group and aggregate a loaded data source.
+
+    Requires the dataset to be in the analytical store (run_ingestion.py --load).
+    Requests covered by a precomputed rollup (scripts/pipeline/rollups.yaml)
+    are answered from it, with the same result.
+
+    With approximate=true, other requests are answered from the table's
+    load-time sample and sketches (src/sketches.py) instead of a full scan.
+    Quantile metrics ('median', 'p90', ...) are only available this way.
+    Each metric comes with "{metric}_low" / "{metric}_high" bounds at 95%
+    confidence (null where a side is unbounded). Without current sketches
+    the request is answered exactly.
+
+    Args:
+        request: Aggregation (source, group_by, metrics, filters, order_by, limit, approximate)
+
+    Returns:
+        {
+            "data": [{"OPERATOR_NAME": "...", "sum_LEASE_OIL_PROD_VOL": 12345.0}, ...],
+            "returned": 100,
+            "source": "store" | "rollup" | "sample" | "sketch",
+            "rollup": "production_by_operator",  # When answered from a rollup
+            "approximate": {"rows": 2400000, "sample_rows": 200000,  # Sample/sketch answers
+                            "confidence": 0.95}
+        }
+    """
+    return await run_blocking(request.source, run_aggregate, request)
+
+
+def run_aggregate(request: AggregateRequest) -> Response:
+    """Run an aggregation against the analytical store"""
+    store_table = store.find_table(request.source, request.data_type)
+    if not store_table:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Source '{request.source}' is not loaded in the analytical store "
+                   f"(run_ingestion.py --load)"
+        )
+
+    rollup = route_aggregate(
+        store_table['table'],
+        store_table.get('loaded_at'),
+        request.group_by,
+        request.metrics,
+        filter_columns(parse_filters(request.filters))
     )
+    sketches = None
+    if request.approximate and not rollup:
+        sketches = current_sketches(store_table['table'], store_table.get('loaded_at'), SKETCH_DIR)
+
+    if rollup:
+        df = store.aggregate_rollup(
+            rollup['path'],
+            group_by=request.group_by,
+            select=rollup['select'],
+            filters=request.filters,
+            order_by=request.order_by,
+            limit=request.limit
+        )
+        fields = {"returned": len(df), "source": "rollup", "rollup": rollup['name']}
+    elif sketches:
+        df, fields = approximate_aggregate(request, store_table['table'], sketches)
+    else:
+        quantiles = sorted({f for f in request.metrics.values() if f in QUANTILE_FUNCTIONS})
+        if quantiles:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Quantile aggregates {quantiles} need approximate=true and the table's sketches "
+                       f"(run_ingestion.py --load)"
+            )
+        df = store.aggregate(
+            store_table['table'],
+            group_by=request.group_by,
+            metrics=request.metrics,
+            filters=request.filters,
+            order_by=request.order_by,
+            limit=request.limit
+        )
+        fields = {"returned": len(df), "source": "store"}
+    body = json_body(encode_dataframe(df, 'iso'), fields)
+    return Response(content=body, media_type="application/json")
+
+
+def approximate_aggregate(request: AggregateRequest, table: str,
+                          manifest: Dict[str, Any]) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    """Answer an aggregation from a table's sample and sketches"""
+    unknown = {f for f in request.metrics.values() if f not in APPROXIMATE_FUNCTIONS}
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unsupported aggregates: {sorted(unknown)}")
+    columns = store.table_columns(table)
+    missing = set(request.group_by + [c for c in request.metrics if c != '*']) - set(columns)
+    if missing:
+        raise HTTPException(status_code=400, detail=f"Columns not found: {sorted(missing)}")
+    node = parse_filters(request.filters)
+    check_filter_columns(node, columns)
+
+    info = {"rows": manifest['rows'], "sample_rows": manifest['sample_rows'], "confidence": CONFIDENCE}
+    if node is None:
+        df = top_values(manifest, request.group_by, request.metrics, request.order_by, request.limit)
+        if df is not None:
+            return df, {"returned": len(df), "source": "sketch", "approximate": info}
+
+    df = store.aggregate_rollup(
+        sample_path(table, SKETCH_DIR),
+        group_by=request.group_by,
+        select=approximate_select(request.metrics, manifest['rows'], manifest['sample_rows']),
+        filters=request.filters,
+        order_by=request.order_by,
+        limit=request.limit
+    )
+    if not request.group_by and node is None:
+        # Whole table: row count and distinct counts come from the sketches
+        for name, bounds in whole_table_metrics(manifest, request.metrics).items():
+            for column, value in zip((name, f"{name}_low", f"{name}_high"), bounds):
+                df[column] = df[column].astype(object)
+                df.loc[0, column] = value
+    return df, {"returned": len(df), "source": "sample", "approximate": info}
+
+
+@app.post("/api/decline")
+async def decline_curves(request: DeclineRequest):
+    """
+    Arps decline fits and EUR per lease (or well) of monthly production.
+
+    All groups are fitted at once (see src/decline.py) the first time a
+    parameter set is requested for the loaded data, then served from the
+    cache until the store table is reloaded.
+
+    Returns:
+        {
+            "data": [{"DISTRICT_NO": "08", "LEASE_NO": "12345", "OIL_GAS_CODE": "O",
+                      "model": "hyperbolic", "qi": 5210.4, "di": 0.081, "b": 0.9,
+                      "r2": 0.93, "months": 84, "peak_month": 201403, "last_month": 202112,
+                      "cumulative": 181233.0, "remaining": 40210.5, "eur": 221443.5}],
+            "total": 5120,       # Groups matching the filters
+            "returned": 1000,
+            "model": "auto",
+            "loaded_at": "2024-06-01 12:00:00"
+        }
+        qi is volume/month at the peak month, di the nominal decline per month.
+        Groups without an accepted curve (too few months, a poor fit or no
+        real decline) have null fit columns and remaining 0.
+    """
+    if request.model not in MODELS:
+        raise HTTPException(status_code=400,
+                            detail=f"Invalid model '{request.model}' (expected one of {list(MODELS)})")
+    if request.economic_limit <= 0:
+        raise HTTPException(status_code=400, detail="economic_limit must be positive")
+    return await run_blocking(request.source, run_decline, request)
+
+
+def run_decline(request: DeclineRequest) -> Response:
+    """Fit (or fetch cached fits) and return a filtered, sorted page"""
+    store_table = store.find_table(request.source, request.data_type or DEFAULT_TABLE)
+    if not store_table:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Source '{request.source}' is not loaded in the analytical store "
+                   f"(run_ingestion.py --load)"
+        )
+    group_by = request.group_by or DEFAULT_GROUP_BY
+    missing = set(group_by + [request.rate, PERIOD_COLUMN]) - set(store.table_columns(store_table['table']))
+    if missing:
+        raise HTTPException(status_code=400, detail=f"Columns not found: {sorted(missing)}")
+
+    try:
+        fits = get_fits(store, store_table['table'], store_table.get('loaded_at'), request.rate, group_by,
+                        request.model, request.economic_limit)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fitting decline curves: {str(e)}")
+
+    node = parse_filters(request.filters)
+    check_filter_columns(node, fits.column_names)
+    if node is not None:
+        fits = fits.filter(to_expression(node, fits.schema))
+    keys = parse_order_by(request.order_by)
+    missing = {c for c, _ in keys} - set(fits.column_names)
+    if missing:
+        raise HTTPException(status_code=400, detail=f"Sort columns not found: {sorted(missing)}")
+    if keys:
+        fits = fits.sort_by([(c, 'descending' if desc else 'ascending') for c, desc in keys])
+
+    page = fits.slice(request.offset, request.limit)
+    fields = {"total": fits.num_rows, "returned": page.num_rows, "model": request.model,
+              "loaded_at": store_table.get('loaded_at')}
+    return Response(content=json_body(encode_records(page), fields), media_type="application/json")
+
+
+@app.post("/api/timeseries")
+async def production_timeseries(request: TimeSeriesRequest):
+    """
+    Production series per group with cumulative, rolling and change columns.
+
+    The store sums the value columns per group and period during its scan;
+    the series are then transformed chunk by chunk (see src/timeseries.py),
+    so only as many chunks as the page needs are computed. With
+    stream=true every row is sent as NDJSON while later chunks are still
+    being computed.
+
+    Returns:
+        {
+            "data": [{"DISTRICT_NO": "08", "LEASE_NO": "12345", "period": 202001,
+                      "LEASE_OIL_PROD_VOL": 1200.0, "cum_LEASE_OIL_PROD_VOL": 84211.0,
+                      "rolling_LEASE_OIL_PROD_VOL": 1251.3, ...}],
+            "returned": 1000,
+            "truncated": true,   # More rows after this page
+            "freq": "month"
+        }
+        With stream=true: application/x-ndjson, one row per line.
+    """
+    unknown = [op for op in request.operations if op not in OPERATIONS]
+    if unknown:
+        raise HTTPException(status_code=400,
+                            detail=f"Unsupported operations: {unknown} (expected any of {list(OPERATIONS)})")
+    if request.freq not in FREQUENCIES:
+        raise HTTPException(status_code=400,
+                            detail=f"Invalid freq '{request.freq}' (expected one of {list(FREQUENCIES)})")
+    if request.window < 1:
+        raise HTTPException(status_code=400, detail="window must be at least 1")
+    if not request.values:
+        raise HTTPException(status_code=400, detail="values must name at least one column")
+
+    chunks = await run_blocking(request.source, timeseries_chunks, request)
+    if request.stream:
+        return StreamingResponse(stream_timeseries(request.source, chunks), media_type="application/x-ndjson")
+    return await run_blocking(request.source, timeseries_page, chunks, request)
+
+
+def timeseries_chunks(request: TimeSeriesRequest) -> Iterator[pa.Table]:
+    """Validate a time-series request and start its chunked computation"""
+    store_table = store.find_table(request.source, request.data_type or DEFAULT_TABLE)
+    if not store_table:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Source '{request.source}' is not loaded in the analytical store "
+                   f"(run_ingestion.py --load)"
+        )
+    table = store_table['table']
+    columns = store.table_columns(table)
+    missing = set(request.group_by + request.values + [PERIOD_COLUMN]) - set(columns)
+    if missing:
+        raise HTTPException(status_code=400, detail=f"Columns not found: {sorted(missing)}")
+    check_filter_columns(parse_filters(request.filters), columns)
+
+    batches = store.aggregate_batches(table, request.group_by + [PERIOD], series_select(request.values),
+                                      filters=request.filters, derived=resample_column(request.freq))
+    return stream_series(batches, request.group_by, request.values, request.operations, request.window,
+                         request.freq)
+
+
+def timeseries_page(chunks: Iterator[pa.Table], request: TimeSeriesRequest) -> Response:
+    """Compute chunks until the page is filled"""
+    end = request.offset + request.limit
+    parts, rows, truncated = [], 0, False
+    try:
+        for chunk in chunks:
+            parts.append(chunk)
+            rows += chunk.num_rows
+            if rows > end:
+                truncated = True
+                break
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error computing time series: {str(e)}")
+    finally:
+        chunks.close()
+
+    page = pa.concat_tables(parts).slice(request.offset, request.limit) if parts else pa.table({})
+    fields = {"returned": page.num_rows, "truncated": truncated, "freq": request.freq}
+    return Response(content=json_body(encode_records(page), fields), media_type="application/json")
+
+
+def next_lines(chunks: Iterator[pa.Table]) -> Optional[bytes]:
+    """NDJSON of the next chunk, or None when done"""
+    chunk = next(chunks, None)
+    return None if chunk is None else encode_lines(chunk)
+
+
+async def stream_timeseries(source: str, chunks: Iterator[pa.Table]):
+    """Yield NDJSON chunk by chunk, computing each on the blocking pool"""
+    try:
+        while True:
+            lines = await run_blocking(source, next_lines, chunks)
+            if lines is None:
+                break
+            if lines:
+                yield lines
+    finally:
+        chunks.close()
+
+
+@app.get("/api/wells/{api}")
+async def get_well(
+    api: str,
+    datasets: Optional[str] = Query(None, description="Comma-separated datasets (default: all)"),
+    exact: bool = Query(False, description="Match the full API-14 instead of API-10"),
+    limit: int = Query(1000, ge=1, description="Max rows per table")
+):
+    """
+    All rows for one well across FracFocus and RRC datasets.
+
+    The API number is normalized (see src/well_index.py) and looked up in
+    each dataset's API-number index, so only the row groups holding the
+    well's rows are read.
+
+    Args:
+        api: API number, e.g. 42-317-40186-00-00, 4231740186 or 31740186
+
+    Returns:
+        {
+            "data": {"fracfocus": {"FracFocusRegistry": [{"api10": ..., ...}]},
+                     "rrc_permits": {...}},
+            "api10": "4231740186",
+            "api14": "42317401860000",
+            "counts": {"fracfocus": {"FracFocusRegistry": 31}},
+            "leases": [{"DISTRICT_NO": "08", "LEASE_NO": "12345"}]  # For production queries
+        }
+    """
+    normalized = normalize_api_number(api)
+    if normalized is None:
+        raise HTTPException(status_code=400, detail=f"Invalid API number: {api}")
+    api10, api14 = normalized
+    names = parse_well_datasets(datasets.split(",") if datasets else None)
+
+    data, fields = await run_blocking(None, join_wells, [api10], [api14] if exact else None, names, "outer",
+                                      None, limit)
+    if not fields['wells']:
+        raise HTTPException(status_code=404, detail=f"Well not found: {api}")
+    fields = {"api10": api10, "api14": api14, "counts": fields['counts'], "leases": fields['leases']}
+    return Response(content=json_body(data, fields), media_type="application/json")
+
+
+@app.post("/api/wells/join")
+async def join_wells_endpoint(request: WellJoinRequest):
+    """
+    Rows for a set of wells across datasets, keyed by API-10.
+
+    Every returned row carries an "api10" column to join on. With how="inner"
+    only wells present in every requested dataset are returned.
+
+    Returns:
+        {
+            "data": {"fracfocus": {"FracFocusRegistry": [...]}, "rrc_permits": {...}},
+            "wells": [{"api10": "4231740186", "fracfocus": 31, "rrc_permits": 1}],
+            "unmatched": ["not-an-api", "4200000001"],
+            "counts": {"fracfocus": {"FracFocusRegistry": 31}},
+            "truncated": false,
+            "leases": [...]
+        }
+    """
+    if request.how not in JOIN_MODES:
+        raise HTTPException(status_code=400,
+                            detail=f"Invalid join mode '{request.how}' (expected one of {list(JOIN_MODES)})")
+    if len(request.apis) > MAX_JOIN_WELLS:
+        raise HTTPException(status_code=400, detail=f"Too many wells: {len(request.apis)} (max {MAX_JOIN_WELLS})")
+    names = parse_well_datasets(request.datasets)
+
+    wells: Dict[str, Optional[str]] = {}
+    unmatched = []
+    for api in request.apis:
+        normalized = normalize_api_number(api)
+        if normalized is None:
+            unmatched.append(api)
+        else:
+            wells.setdefault(normalized[0], normalized[1])
+
+    data, fields = await run_blocking(None, join_wells, list(wells),
+                                      list(wells.values()) if request.exact else None,
+                                      names, request.how, request.columns, request.limit)
+    found = {well['api10'] for well in fields['wells']}
+    fields['unmatched'] = unmatched + [api for api in wells if api not in found]
+    return Response(content=json_body(data, fields), media_type="application/json")
+
+
+def parse_well_datasets(names: Optional[List[str]]) -> List[str]:
+    """Validate requested well datasets (None = all)"""
+    if not names:
+        return list(WELL_DATASETS)
+    names = [n.strip() for n in names if n.strip()]
+    unknown = [n for n in names if n not in WELL_DATASETS]
+    if unknown:
+        raise HTTPException(status_code=400,
+                            detail=f"Unknown datasets: {unknown} (expected any of {list(WELL_DATASETS)})")
+    return names
+
+
+def well_index(name: str) -> Optional[WellIndex]:
+    """A dataset's well index, reused while the dataset and index files are unchanged"""
+    parsed_dir = DATA_ROOT / WELL_DATASETS[name]['path'] / 'parsed'
+    if not parsed_dir.exists():
+        return None
+    manifest = INDEX_DIR / f"{name}.json"
+    token = (dataset_version(parsed_dir), file_version(manifest) if manifest.exists() else None)
+    try:
+        return get_index(name, token, data_root=DATA_ROOT)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error loading well index for {name}: {str(e)}")
+
+
+def join_wells(api10s: List[str], api14s: Optional[List[str]], names: List[str], how: str,
+               columns: Optional[Dict[str, List[str]]], limit: int) -> Tuple[bytes, Dict[str, Any]]:
+    """
+    Look up wells in each dataset's index and read their rows.
+
+    Returns:
+        (pre-encoded {dataset: {table: [rows]}}, fields with wells, counts,
+         truncated and leases)
+    """
+    indexes = {name: index for name, index in ((n, well_index(n)) for n in names) if index is not None}
+
+    located = {name: index.locate(api10s, api14s) for name, index in indexes.items()}
+    per_well = {name: index.well_counts(located[name]) for name, index in indexes.items()}
+    if not indexes:
+        # No requested dataset can be searched, so no well matches (all([]) would keep them all)
+        keep = []
+    elif how == 'inner':
+        keep = [api for api in api10s if all(api in per_well[name] for name in indexes)]
+    else:
+        keep = [api for api in api10s if any(api in per_well[name] for name in indexes)]
+    if how == 'inner' and len(keep) < len(api10s):
+        keep_api14 = None if api14s is None else [api14s[api10s.index(api)] for api in keep]
+        located = {name: index.locate(keep, keep_api14) for name, index in indexes.items()}
+
+    parts, counts, leases, truncated = [], {}, {}, False
+    for name, index in indexes.items():
+        if not len(located[name]):
+            continue
+        try:
+            tables = index.read(located[name], columns, limit)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Error reading wells from {name}: {str(e)}")
+
+        encoded = []
+        for table, (rows, total) in tables.items():
+            counts.setdefault(name, {})[table] = total
+            truncated = truncated or rows.num_rows < total
+            encoded.append(json.dumps(table).encode('utf-8') + b':' + encode_records(rows))
+            if 'LEASE_NO' in rows.column_names:
+                keys = [c for c in ('DISTRICT_NO', 'OIL_GAS_CODE', 'LEASE_NO') if c in rows.column_names]
+                for lease in rows.select(keys).group_by(keys).aggregate([]).to_pylist():
+                    leases[tuple(str(lease[k]) for k in keys)] = {k: str(lease[k]) for k in keys}
+        parts.append(json.dumps(name).encode('utf-8') + b':{' + b','.join(encoded) + b'}')
+
+    wells = [{"api10": api, **{name: per_well[name].get(api, 0) for name in indexes}} for api in keep]
+    fields = {"wells": wells, "counts": counts, "truncated": truncated, "leases": list(leases.values())}
+    return b'{' + b','.join(parts) + b'}', fields
+
+
+@app.get("/api/spatial/bbox")
+async def spatial_bbox(
+    min_lon: float = Query(..., ge=-180, le=180),
+    min_lat: float = Query(..., ge=-90, le=90),
+    max_lon: float = Query(..., ge=-180, le=180),
+    max_lat: float = Query(..., ge=-90, le=90),
+    dataset: str = Query("fracfocus", description="Well dataset with locations"),
+    zoom: Optional[int] = Query(None, ge=0, le=22, description="Map zoom; clusters below CLUSTER_MAX_ZOOM"),
+    limit: int = Query(5000, ge=1, le=MAX_SPATIAL_POINTS, description="Max points returned")
+):
+    """
+    Wells inside a map viewport.
+
+    Below zoom CLUSTER_MAX_ZOOM, or when more than `limit` wells are visible
+    and a zoom is given, wells are clustered server-side into
+    {lat, lon, count} bins about a quarter tile wide. min_lon > max_lon
+    crosses the antimeridian.
+
+    Returns:
+        {
+            "data": [{"api10": ..., "lat": 31.9, "lon": -102.1, "OperatorName": ...}]
+                    or [{"lat": ..., "lon": ..., "count": 412}],
+            "total": 1234,        # Wells in the box
+            "returned": 1000,
+            "clustered": false,
+            "truncated": false
+        }
+    """
+    if min_lat > max_lat:
+        raise HTTPException(status_code=400, detail="min_lat must not exceed max_lat")
+    index = await run_blocking(None, spatial_index, dataset)
+    return await run_blocking(None, spatial_bbox_response, index, (min_lon, min_lat, max_lon, max_lat),
+                              zoom, limit)
+
+
+@app.get("/api/spatial/radius")
+async def spatial_radius(
+    lat: float = Query(..., ge=-90, le=90),
+    lon: float = Query(..., ge=-180, le=180),
+    radius_km: float = Query(..., gt=0, le=MAX_RADIUS_KM),
+    dataset: str = Query("fracfocus", description="Well dataset with locations"),
+    limit: int = Query(1000, ge=1, le=MAX_SPATIAL_POINTS, description="Max points returned")
+):
+    """
+    Wells within a radius of a point, nearest first.
 
-    return await query_data(request)
+    Returns:
+        {
+            "data": [{"api10": ..., "lat": ..., "lon": ..., "distance_km": 0.8, ...}],
+            "total": 57,
+            "returned": 57,
+            "truncated": false
+        }
+    """
+    index = await run_blocking(None, spatial_index, dataset)
+    return await run_blocking(None, spatial_radius_response, index, lat, lon, radius_km, limit)
+
+
+def spatial_index(dataset: str) -> SpatialIndex:
+    """A dataset's spatial index, reused while the dataset and index files are unchanged"""
+    if dataset not in WELL_DATASETS:
+        raise HTTPException(status_code=400,
+                            detail=f"Unknown dataset '{dataset}' (expected one of {list(WELL_DATASETS)})")
+    parsed_dir = DATA_ROOT / WELL_DATASETS[dataset]['path'] / 'parsed'
+    if not parsed_dir.exists():
+        raise HTTPException(status_code=404, detail=f"No parsed data found for dataset '{dataset}'")
+    manifest = SPATIAL_DIR / f"{dataset}.json"
+    token = (dataset_version(parsed_dir), file_version(manifest) if manifest.exists() else None)
+    try:
+        index = get_spatial_index(dataset, token, data_root=DATA_ROOT)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error loading spatial index for {dataset}: {str(e)}")
+    if index is None:
+        raise HTTPException(status_code=404, detail=f"No parsed data found for dataset '{dataset}'")
+    return index
+
+
+def spatial_bbox_response(index: SpatialIndex, box: Tuple[float, float, float, float],
+                          zoom: Optional[int], limit: int) -> Response:
+    """Points (or clusters) inside a box as a JSON response"""
+    positions = index.bbox(*box)
+    total = len(positions)
+    if zoom is not None and (zoom < CLUSTER_MAX_ZOOM or total > limit):
+        clusters = index.cluster(positions, zoom)
+        fields = {"total": total, "returned": clusters.num_rows, "clustered": True,
+                  "truncated": clusters.num_rows > limit}
+        return Response(content=json_body(encode_records(clusters.slice(0, limit)), fields),
+                        media_type="application/json")
+
+    rows = index.points.take(pa.array(positions[:limit])).drop_columns(['cell'])
+    fields = {"total": total, "returned": rows.num_rows, "clustered": False, "truncated": total > limit}
+    return Response(content=json_body(encode_records(rows), fields), media_type="application/json")
+
+
+def spatial_radius_response(index: SpatialIndex, lat: float, lon: float, radius_km: float,
+                            limit: int) -> Response:
+    """Points within a radius, nearest first, as a JSON response"""
+    positions, distances = index.radius(lat, lon, radius_km)
+    rows = index.points.take(pa.array(positions[:limit])).drop_columns(['cell'])
+    rows = rows.append_column('distance_km', pa.array(np.round(distances[:limit], 3)))
+    fields = {"total": len(positions), "returned": rows.num_rows, "truncated": len(positions) > limit}
+    return Response(content=json_body(encode_records(rows), fields), media_type="application/json")
+
+
+@app.get("/api/search")
+async def search(
+    q: str = Query(..., min_length=1, description="Search text"),
+    mode: str = Query("prefix", description="'prefix' or 'fuzzy' (typo-tolerant)"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields, e.g. operator,lease (default: all)"),
+    datasets: Optional[str] = Query(None, description="Comma-separated datasets (default: all)"),
+    limit: int = Query(20, ge=1, le=MAX_SEARCH_MATCHES, description="Max matching values"),
+    locators: int = Query(100, ge=0, le=MAX_SEARCH_LOCATORS, description="Max row locators per value")
+):
+    """
+    Operator, lease, well and chemical names matching a search.
+
+    Served from each dataset's search index (see src/search_index.py):
+    prefix mode matches values with a word starting with every query word,
+    fuzzy mode matches by shared trigrams. Best matches first, then the
+    most frequent values.
+
+    Returns:
+        {
+            "data": [{"dataset": "fracfocus", "field": "operator",
+                      "value": "Pioneer Natural Resources", "score": 0.9, "rows": 1204,
+                      "locators": [{"file": "parsed/FracFocusRegistry_3.csv",
+                                    "table": "FracFocusRegistry", "row_group": 0,
+                                    "rows": [17, 18, 19]}]}],
+            "total": 3,          # Matching values
+            "returned": 3,
+            "truncated": false
+        }
+    """
+    if mode not in SEARCH_MODES:
+        raise HTTPException(status_code=400,
+                            detail=f"Invalid search mode '{mode}' (expected one of {list(SEARCH_MODES)})")
+    field_names = [f.strip() for f in fields.split(",") if f.strip()] if fields else None
+    unknown = [f for f in field_names or [] if f not in SEARCH_FIELDS]
+    if unknown:
+        raise HTTPException(status_code=400,
+                            detail=f"Unknown fields: {unknown} (expected any of {list(SEARCH_FIELDS)})")
+    names = parse_well_datasets(datasets.split(",") if datasets else None)
+    return await run_blocking(None, run_search, q, mode, field_names, names, limit, locators)
+
+
+def search_index(name: str) -> Optional[SearchIndex]:
+    """A dataset's search index, reused while the dataset and index files are unchanged"""
+    parsed_dir = DATA_ROOT / WELL_DATASETS[name]['path'] / 'parsed'
+    if not parsed_dir.exists():
+        return None
+    manifest = SEARCH_DIR / f"{name}.json"
+    token = (dataset_version(parsed_dir), file_version(manifest) if manifest.exists() else None)
+    try:
+        return get_search_index(name, token, data_root=DATA_ROOT)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error loading search index for {name}: {str(e)}")
+
+
+def run_search(query: str, mode: str, fields: Optional[List[str]], names: List[str], limit: int,
+               locators: int) -> Response:
+    """Match a query against each dataset's search index as a JSON response"""
+    matches = []
+    for name in names:
+        index = search_index(name)
+        if index is None:
+            continue
+        found, scores = index.prefix(query, fields) if mode == 'prefix' else index.fuzzy(query, fields)
+        matches += [(float(score), int(index.rows[term]), name, index, int(term))
+                    for term, score in zip(found, scores)]
+
+    matches.sort(key=lambda m: (-m[0], -m[1], m[2]))
+    data = [{"dataset": name, "field": index.fields[term], "value": index.values[term],
+             "score": round(score, 3), "rows": rows, "locators": index.locators(term, locators)}
+            for score, rows, name, index, term in matches[:limit]]
+    fields = {"total": len(matches), "returned": len(data), "truncated": len(matches) > limit}
+    return Response(content=json_body(json.dumps(data).encode('utf-8'), fields), media_type="application/json")
 
 
 def parse_size_string(size_str: str) -> int:
@@ -646,8 +2064,165 @@ def parse_size_string(size_str: str) -> int:
         return 0
 
 
+@app.post("/api/batch")
+async def batch_requests(request: BatchRequest):
+    """
+    Run many API requests in one round trip.
+
+    Sub-requests run concurrently through the regular endpoints and share
+    parsed-file lookups, file metadata and opened datasets for the duration
+    of the batch (see src/api/batch.py). A failing sub-request only fails
+    its own result.
+
+    Example:
+        {"requests": [
+            {"id": "pipelines", "path": "/api/pipelines"},
+            {"id": "rrc", "path": "/api/sources/rrc/info"},
+            {"id": "rrc-data", "path": "/api/sources/rrc/data", "params": {"limit": 100}},
+            {"id": "ops", "method": "POST", "path": "/api/aggregate",
+             "body": {"source": "rrc", "group_by": ["OPERATOR_NAME"], "metrics": {"*": "count"}}}
+        ]}
+
+    Returns:
+        {
+            "responses": [
+                {"id": "rrc", "status": 200, "headers": {"etag": "W/\"...\""}, "body": {...}},
+                ...
+            ],                   # In request order
+            "count": 4
+        }
+    """
+    if len(request.requests) > MAX_BATCH_REQUESTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many sub-requests: {len(request.requests)} (max {MAX_BATCH_REQUESTS})"
+        )
+    invalid = [item.path for item in request.requests
+               if not item.path.startswith("/api/")
+               or item.path.split("?")[0].rstrip("/") in ("/api/batch", "/api/pipelines/events")]
+    if invalid:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Batch paths must be /api/ endpoints other than /api/batch and /api/pipelines/events: {invalid}"
+        )
+
+    body = await run_batch(app, request.requests)
+    return Response(content=body, media_type="application/json")
+
+
+@app.get("/api/cache/stats")
+async def get_cache_stats():
+    """
+    Result cache statistics.
+
+    Returns:
+        {"entries", "bytes", "max_bytes", "hits", "misses", "hit_ratio",
+         "evictions", "invalidations", ..., "shared": {...}}
+        ("shared" = the cross-worker cache; its hit counters are per process)
+    """
+    return {**result_cache.stats(), 'shared': shared_cache.stats()}
+
+
 @app.get("/api/pipelines")
 async def get_pipelines():
+    """
+    Pipeline metadata (see build_pipelines), scanned off the event loop.
+
+    Dashboards that follow status changes should subscribe to
+    /api/pipelines/events instead of polling this endpoint.
+    """
+    return await run_blocking(None, pipelines_snapshot)
+
+
+@app.get("/api/pipelines/events")
+async def pipeline_events(http_request: Request):
+    """
+    Pipeline status changes as server-sent events (see src/api/pipeline_feed.py).
+
+    The stream starts with the current snapshot (pipelines keyed by id) and
+    then carries JSON merge patches of whatever changed:
+
+        id: 7d793037a0760186
+        event: patch
+        data: {"version": "7d793037a0760186", "base": "5d41402abc4b2a76",
+               "patch": {"pipelines": {"rrc": {"status": "processed", "stages": [...]}}}}
+
+    Versions are content hashes, valid across workers and restarts; a
+    reconnecting client's Last-Event-ID skips the snapshot when it is
+    still current.
+    """
+    stream = await pipeline_feed.open(http_request.headers.get("last-event-id"))
+    return StreamingResponse(
+        stream,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def pipelines_version() -> Dict[str, Any]:
+    """
+    Version of the pipelines snapshot: the context store files plus the
+    directory trees build_pipelines scans (source/data_type/stage).
+    """
+    from src.shared_state import PipelineState
+
+    context_files = {}
+    for path in (PipelineState.STORE_FILE, PipelineState.STATE_FILE, PipelineState.CONTEXT_FILE):
+        try:
+            context_files[path.name] = file_version(path)
+        except OSError:
+            continue
+
+    sources = {}
+    if DATA_ROOT.exists():
+        for source_dir in sorted(DATA_ROOT.iterdir()):
+            if source_dir.is_dir():
+                sources[source_dir.name] = tree_signature(source_dir)
+    return {'context': context_files, 'sources': sources}
+
+
+def pipelines_snapshot() -> Dict[str, Any]:
+    """
+    build_pipelines() through the cross-worker cache.
+
+    The first worker to miss builds the snapshot; the others wait for it
+    and reuse it until the context store or the data tree changes.
+    """
+    return shared_cache.get_or_build('pipelines', pipelines_version(), build_pipelines)
+
+
+# Pushes snapshot changes to /api/pipelines/events subscribers
+pipeline_feed = PipelineFeed(pipelines_snapshot, pipelines_version)
+
+
+def warm_caches() -> Dict[str, Any]:
+    """
+    Build the shared snapshots before workers start serving.
+
+    Called by `launch.py api`; workers then start with warm caches instead
+    of each rebuilding them on their first requests.
+
+    Returns:
+        {"pipelines": n (None if the snapshot failed), "sources": n,
+         "failed": [source, ...]}
+    """
+    try:
+        pipelines = len(pipelines_snapshot().get('pipelines', []))
+    except HTTPException as e:
+        sys.stderr.write(f"[warm_caches] Pipelines snapshot failed: {e.detail}\n")
+        pipelines = None
+
+    warmed, failed = 0, []
+    for source in scan_sources():
+        try:
+            source_info(source)
+            warmed += 1
+        except HTTPException:
+            failed.append(source)
+    return {'pipelines': pipelines, 'sources': warmed, 'failed': failed}
+
+
+def build_pipelines():
     """
     Get pipeline metadata from shared state.
 
@@ -762,9 +2337,13 @@ async def get_pipelines():
             # Get REAL directory structure from file system (not from adapter's meta-structure)
             # Use cache to avoid re-scanning on every request
             real_dir_structure = None
-            if source_id in _directory_structure_cache:
+            source_version = CatalogVersion.source_version(source_id)
+            if (source_id in _directory_structure_cache
+                    and _directory_structure_versions.get(source_id) == source_version):
                 real_dir_structure = _directory_structure_cache[source_id]
             else:
+                _directory_structure_versions[source_id] = source_version
+                _directory_structure_cache.pop(source_id, None)
                 # Only scan if source directory actually exists
                 source_dir = DATA_ROOT / source_id
                 if source_dir.exists() and source_dir.is_dir():
@@ -990,6 +2569,8 @@ if __name__ == "__main__":
     print("  - Get info: GET http://localhost:8000/api/sources/fracfocus/info")
     print("  - Get data: GET http://localhost:8000/api/sources/fracfocus/data?limit=10")
     print()
+    print("Production (multiple workers): python launch.py api --workers 4")
+    print()
 
     uvicorn.run(
         "src.api.data_service:app",
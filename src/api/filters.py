@@ -0,0 +1,300 @@
+"""
+Filter Expressions for the Data API
+
+Parses the `filters` object of /api/query (and /api/aggregate) into a small
+expression tree and compiles it to pyarrow dataset expressions, so filters
+are evaluated vectorized during the scan and pushed down to parquet
+row-group statistics and partition directories.
+
+Filter syntax (JSON):
+
+    {"DISTRICT_NO": "08"}                               equality (unchanged)
+    {"API_NO": null}                                    is null
+    {"COUNTY_NO": ["001", "003"]}                       in
+    {"CYCLE_YEAR_MONTH": {"gte": 202001, "lt": 202101}} range
+    {"OPERATOR_NAME": {"prefix": "PIONEER"}}            string prefix
+    {"LEASE_NAME": {"contains": "UNIT"}}                substring
+    {"$or": [{"DISTRICT_NO": "08"}, {"DISTRICT_NO": "8A"}]}
+    {"$not": {"OIL_GAS_CODE": "G"}}
+
+Operators: eq, ne, gt, gte, lt, lte, in, not_in, between, is_null, prefix,
+contains. Keys at one level are ANDed; "$and" / "$or" take lists of filter
+objects.
+
+The tree is plain tuples:
+    ('and', [nodes]) | ('or', [nodes]) | ('not', node) | ('cmp', column, op, value)
+"""
+
+from typing import Any, Dict, List, Optional, Set
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+from fastapi import HTTPException
+
+from src.partitioning import DISTRICT_COLUMNS, YEAR_COLUMNS, YEAR_MONTH_COLUMNS, normalize_district
+
+
+# Comparison operators accepted in {column: {op: value}} form
+OPERATORS = ('eq', 'ne', 'gt', 'gte', 'lt', 'lte', 'in', 'not_in', 'between', 'is_null', 'prefix', 'contains')
+
+# Boolean combinators (prefixed so they can't collide with column names)
+COMBINATORS = ('$and', '$or', '$not')
+
+
+def _invalid(detail: str) -> HTTPException:
+    return HTTPException(status_code=400, detail=f"Invalid filter: {detail}")
+
+
+def parse_filters(filters: Optional[Dict[str, Any]]) -> Optional[tuple]:
+    """
+    Parse a filters object into an expression tree.
+
+    Args:
+        filters: Filters from the request body (may be None/empty)
+
+    Returns:
+        Expression tree, or None if there is nothing to filter on
+
+    Raises:
+        HTTPException 400 on malformed filters
+    """
+    if not filters:
+        return None
+    if not isinstance(filters, dict):
+        raise _invalid("expected an object of column conditions")
+
+    nodes = []
+    for key, value in filters.items():
+        if key in ('$and', '$or'):
+            if not isinstance(value, list) or not value:
+                raise _invalid(f"'{key}' expects a non-empty list of filter objects")
+            children = [parse_filters(item) for item in value]
+            if any(child is None for child in children):
+                raise _invalid(f"'{key}' contains an empty filter object")
+            nodes.append((key[1:], children))
+        elif key == '$not':
+            child = parse_filters(value)
+            if child is None:
+                raise _invalid("'$not' expects a filter object")
+            nodes.append(('not', child))
+        elif key.startswith('$'):
+            raise _invalid(f"unknown combinator '{key}'")
+        else:
+            nodes.extend(_parse_condition(key, value))
+
+    return nodes[0] if len(nodes) == 1 else ('and', nodes)
+
+
+def _parse_condition(column: str, condition: Any) -> List[tuple]:
+    """Parse the condition for one column into comparison nodes"""
+    if condition is None:
+        return [('cmp', column, 'is_null', True)]
+    if isinstance(condition, list):
+        return [('cmp', column, 'in', condition)]
+    if not isinstance(condition, dict):
+        return [('cmp', column, 'eq', condition)]
+    if not condition:
+        raise _invalid(f"empty condition for '{column}'")
+
+    nodes = []
+    for op, value in condition.items():
+        if op not in OPERATORS:
+            raise _invalid(f"unknown operator '{op}' for '{column}' (supported: {', '.join(OPERATORS)})")
+        if op in ('in', 'not_in') and not isinstance(value, list):
+            raise _invalid(f"'{op}' for '{column}' expects a list")
+        if op == 'between' and (not isinstance(value, list) or len(value) != 2):
+            raise _invalid(f"'between' for '{column}' expects [low, high]")
+        if op in ('prefix', 'contains') and not isinstance(value, str):
+            raise _invalid(f"'{op}' for '{column}' expects a string")
+        if op == 'is_null' and not isinstance(value, bool):
+            raise _invalid(f"'is_null' for '{column}' expects true or false")
+        if op in ('eq', 'ne', 'gt', 'gte', 'lt', 'lte') and value is None:
+            raise _invalid(f"'{op}' for '{column}' needs a value (use is_null)")
+        nodes.append(('cmp', column, op, value))
+    return nodes
+
+
+def filter_columns(node: Optional[tuple]) -> Set[str]:
+    """Columns referenced by an expression tree"""
+    if node is None:
+        return set()
+    if node[0] == 'cmp':
+        return {node[1]}
+    if node[0] == 'not':
+        return filter_columns(node[1])
+    return set().union(*(filter_columns(child) for child in node[1]))
+
+
+def check_filter_columns(node: Optional[tuple], columns: List[str]):
+    """Raise 400 if the filters reference columns the dataset doesn't have"""
+    missing = filter_columns(node) - set(columns)
+    if missing:
+        raise HTTPException(status_code=400, detail=f"Filter columns not found: {sorted(missing)}")
+
+
+# ----------------------------------------------------------------------
+# pyarrow compilation
+# ----------------------------------------------------------------------
+
+def _coerce(value: Any, arrow_type: pa.DataType) -> Any:
+    """Cast a JSON filter value to the column type (202003 vs '202003')"""
+    try:
+        return pa.scalar(str(value) if pa.types.is_string(arrow_type) else value).cast(arrow_type)
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError, pa.ArrowTypeError, TypeError):
+        return value
+
+
+def _coerce_list(values: List[Any], arrow_type: pa.DataType) -> pa.Array:
+    if pa.types.is_string(arrow_type):
+        values = [None if v is None else str(v) for v in values]
+    try:
+        return pa.array(values).cast(arrow_type)
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError, pa.ArrowTypeError):
+        return pa.array(values)
+
+
+def _compare(column: str, op: str, value: Any, arrow_type: pa.DataType) -> ds.Expression:
+    field = ds.field(column)
+    if op == 'is_null':
+        return field.is_null() if value else field.is_valid()
+    if op in ('prefix', 'contains'):
+        text = field if pa.types.is_string(arrow_type) else field.cast(pa.string())
+        if op == 'prefix':
+            return pc.starts_with(text, pattern=value)
+        return pc.match_substring(text, pattern=value)
+    if op in ('in', 'not_in'):
+        expression = field.isin(_coerce_list(value, arrow_type))
+        return ~expression if op == 'not_in' else expression
+    if op == 'between':
+        low, high = (_coerce(v, arrow_type) for v in value)
+        return (field >= low) & (field <= high)
+
+    value = _coerce(value, arrow_type)
+    return {
+        'eq': lambda: field == value,
+        'ne': lambda: field != value,
+        'gt': lambda: field > value,
+        'gte': lambda: field >= value,
+        'lt': lambda: field < value,
+        'lte': lambda: field <= value,
+    }[op]()
+
+
+def _combine(expressions: List[ds.Expression], how: str) -> ds.Expression:
+    result = expressions[0]
+    for expression in expressions[1:]:
+        result = (result & expression) if how == 'and' else (result | expression)
+    return result
+
+
+def _to_arrow(node: tuple, schema: pa.Schema) -> ds.Expression:
+    kind = node[0]
+    if kind == 'cmp':
+        _, column, op, value = node
+        if column in DISTRICT_COLUMNS and 'district' in schema.names and op in ('eq', 'ne', 'in', 'not_in'):
+            # Partitioned data carries a normalized district key (8 == '8' == '08')
+            column = 'district'
+            value = ([None if v is None else normalize_district(v) for v in value]
+                     if isinstance(value, list) else normalize_district(value))
+        return _compare(column, op, value, schema.field(column).type)
+    if kind == 'not':
+        return ~_to_arrow(node[1], schema)
+    return _combine([_to_arrow(child, schema) for child in node[1]], kind)
+
+
+def to_expression(node: Optional[tuple], schema: pa.Schema) -> Optional[ds.Expression]:
+    """
+    Compile an expression tree to a pyarrow dataset expression.
+
+    For partitioned datasets (schema has district/year fields) the matching
+    partition predicate is ANDed in, so the scanner skips directories.
+
+    Returns:
+        Expression, or None if node is None
+    """
+    if node is None:
+        return None
+
+    expression = _to_arrow(node, schema)
+    if 'district' in schema.names and 'year' in schema.names:
+        pruning = partition_predicate(node)
+        if pruning is not None:
+            expression = pruning & expression
+    return expression
+
+
+# ----------------------------------------------------------------------
+# Partition pruning
+# ----------------------------------------------------------------------
+
+def _year_bounds(op: str, value: Any, year_month: bool) -> Optional[ds.Expression]:
+    """Map a comparison on a year (or yyyymm) column to one on the year partition"""
+    def to_year(v):
+        return int(v) // 100 if year_month else int(v)
+
+    year = ds.field('year')
+    if op == 'eq':
+        return year == to_year(value)
+    if op == 'in':
+        return year.isin(pa.array(sorted({to_year(v) for v in value if v is not None}), pa.int32()))
+    if op == 'between':
+        return (year >= to_year(value[0])) & (year <= to_year(value[1]))
+    if year_month:
+        # A yyyymm bound only pins down the year inclusively
+        if op in ('gt', 'gte'):
+            return year >= to_year(value)
+        if op in ('lt', 'lte'):
+            return year <= to_year(value)
+        return None
+    return {
+        'gt': lambda: year > to_year(value),
+        'gte': lambda: year >= to_year(value),
+        'lt': lambda: year < to_year(value),
+        'lte': lambda: year <= to_year(value),
+    }.get(op, lambda: None)()
+
+
+def partition_predicate(node: Optional[tuple]) -> Optional[ds.Expression]:
+    """
+    Derive a predicate on the district/year partition keys.
+
+    The result is implied by the filter (never excludes matching rows), so it
+    is safe to AND in. Comparisons on other columns contribute nothing; an OR
+    only prunes if every branch does; NOT never prunes.
+
+    Returns:
+        Expression over partition keys, or None if nothing can be pruned
+    """
+    if node is None:
+        return None
+
+    kind = node[0]
+    if kind == 'and':
+        predicates = [p for p in map(partition_predicate, node[1]) if p is not None]
+        return _combine(predicates, 'and') if predicates else None
+    if kind == 'or':
+        predicates = [partition_predicate(child) for child in node[1]]
+        if any(p is None for p in predicates):
+            return None
+        return _combine(predicates, 'or')
+    if kind == 'not':
+        return None
+
+    _, column, op, value = node
+    try:
+        if column in DISTRICT_COLUMNS or column == 'district':
+            if op == 'eq':
+                return ds.field('district') == normalize_district(value)
+            if op == 'in':
+                return ds.field('district').isin(
+                    pa.array([normalize_district(v) for v in value if v is not None], pa.string())
+                )
+            return None
+        if column in YEAR_COLUMNS or column == 'year':
+            return _year_bounds(op, value, year_month=False)
+        if column in YEAR_MONTH_COLUMNS:
+            return _year_bounds(op, value, year_month=True)
+    except (TypeError, ValueError):
+        return None
+    return None
@@ -0,0 +1,248 @@
+"""
+Pipeline Status Feed
+
+Server-sent events for pipeline-monitoring dashboards, so they stop
+polling /api/pipelines (GET /api/pipelines/events):
+
+- On connect a client gets the current snapshot, pipelines keyed by id:
+      event: snapshot
+      data: {"version": "5d41402abc4b2a76", "pipelines": {"fracfocus": {...}}, "summary": {...}}
+- After that only changes are sent, as JSON merge patches (RFC 7386:
+  changed keys carry their new value, removed keys are null, lists such
+  as `stages` are replaced whole):
+      event: patch
+      data: {"version": "7d793037a0760186", "base": "5d41402abc4b2a76",
+             "patch": {"pipelines": {"fracfocus": {"status": "processed"}}}}
+- Versions are hashes of the snapshot content, so the same version means
+  the same state in every worker and across restarts. Every event carries
+  `id: <version>` (the state after it); a reconnecting client sends it back
+  as Last-Event-ID and skips the snapshot only if that is still the
+  current state. A patch's `base` is the version it applies to.
+
+Changes to data/ are pushed as soon as the catalog watcher
+(APEX_WATCH_DATA=1) reports them. Other changes (the pipeline context
+store lives outside data/, and the watcher may be off) are found by
+comparing a stat-only version of the snapshot's inputs every
+POLL_SECONDS (WATCHED_POLL_SECONDS with the watcher). Checks only run
+while clients are connected, and each change is computed once and
+shared by all of them; an idle connection costs a keep-alive comment.
+"""
+
+import asyncio
+import hashlib
+import json
+import sys
+import threading
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Set, Tuple
+
+from src.api.concurrency import run_blocking
+
+
+# Comment sent on an otherwise idle connection (keeps proxies from closing it)
+KEEPALIVE_SECONDS = 30.0
+
+# Reconnect delay sent to clients (opens every stream, so headers go out at once)
+RETRY_MILLISECONDS = 3000
+
+# Input version checks while clients are connected (without / with the catalog watcher)
+POLL_SECONDS = 5.0
+WATCHED_POLL_SECONDS = 30.0
+
+# Events buffered per client; one that falls further behind is resent a snapshot
+CLIENT_QUEUE_EVENTS = 32
+
+_UNCHANGED = object()
+_RESYNC = object()
+
+
+def merge_patch(old: Any, new: Any) -> Any:
+    """RFC 7386 merge patch turning `old` into `new` (_UNCHANGED if equal)"""
+    if not isinstance(old, dict) or not isinstance(new, dict):
+        return _UNCHANGED if old == new else new
+    patch = {key: None for key in old.keys() - new.keys()}
+    for key, value in new.items():
+        if key not in old:
+            patch[key] = value
+            continue
+        change = merge_patch(old[key], value)
+        if change is not _UNCHANGED:
+            patch[key] = change
+    return patch if patch else _UNCHANGED
+
+
+def keyed_snapshot(snapshot: Dict[str, Any]) -> Dict[str, Any]:
+    """/api/pipelines response with pipelines keyed by id (stable patch paths)"""
+    state = {key: value for key, value in snapshot.items() if key != 'pipelines'}
+    state['pipelines'] = {str(p.get('id')): p for p in snapshot.get('pipelines', [])}
+    return state
+
+
+def snapshot_version(state: Dict[str, Any]) -> str:
+    """Content hash of a keyed snapshot (stable across processes)"""
+    text = json.dumps(state, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()[:16]
+
+
+def format_event(event: str, version: str, payload: Dict[str, Any]) -> bytes:
+    """One server-sent event"""
+    data = json.dumps(payload, separators=(',', ':'), default=str)
+    return f"id: {version}\nevent: {event}\ndata: {data}\n\n".encode('utf-8')
+
+
+class _Client:
+    """A connected event stream: its loop and pending events"""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=CLIENT_QUEUE_EVENTS)
+
+    def offer(self, message):
+        """Queue an event (on the client's loop); overflow -> resend a snapshot"""
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(_RESYNC)
+
+
+class PipelineFeed:
+    """
+    Pushes pipeline snapshot changes to connected clients.
+
+    Args:
+        build: Blocking; returns the /api/pipelines response
+        inputs_version: Blocking and cheap; changes whenever build's inputs do
+    """
+
+    def __init__(self, build: Callable[[], Dict[str, Any]], inputs_version: Callable[[], Any]):
+        self._build = build
+        self._inputs_version = inputs_version
+        self._lock = threading.Lock()           # Snapshot state, held while building
+        self._clients_lock = threading.Lock()   # Client set only (taken on the event loop)
+        self._clients: Set[_Client] = set()
+        self._state: Optional[Dict[str, Any]] = None
+        self._inputs: Any = None
+        self._poller: Optional[asyncio.Task] = None
+        self.version: Optional[str] = None
+        self.watching = False
+
+    @property
+    def clients(self) -> int:
+        return len(self._clients)
+
+    # ------------------------------------------------------------------
+    # Snapshot state (blocking; worker or watcher threads)
+    # ------------------------------------------------------------------
+
+    def _current(self) -> Tuple[str, Dict[str, Any]]:
+        """(version, state), building the state if there is none (hold _lock)"""
+        if self._state is None:
+            self._inputs = self._inputs_version()
+            self._state = keyed_snapshot(self._build())
+            self.version = snapshot_version(self._state)
+        return self.version, self._state
+
+    def _register(self, client: _Client) -> Tuple[str, Dict[str, Any]]:
+        """Snapshot for a new client; later changes are queued to it"""
+        with self._lock:
+            if not self._clients and self._state is not None and self._inputs_version() != self._inputs:
+                self._state = None  # Went stale while nobody was listening
+            current = self._current()
+            with self._clients_lock:
+                self._clients.add(client)
+            return current
+
+    def _snapshot(self) -> Tuple[str, Dict[str, Any]]:
+        with self._lock:
+            return self._current()
+
+    def refresh(self) -> bool:
+        """
+        Rebuild the snapshot and push the difference to every client.
+
+        Returns:
+            True if the snapshot changed
+        """
+        with self._lock:
+            if not self._clients:
+                # Nobody listening: build lazily for the next client
+                self._state = None
+                return False
+            inputs = self._inputs_version()
+            state = keyed_snapshot(self._build())
+            patch = merge_patch(self._state, state)
+            self._state, self._inputs = state, inputs
+            if patch is _UNCHANGED:
+                return False
+            base, self.version = self.version, snapshot_version(state)
+            message = format_event('patch', self.version, {'version': self.version, 'base': base, 'patch': patch})
+            with self._clients_lock:
+                clients = list(self._clients)
+        for client in clients:
+            try:
+                client.loop.call_soon_threadsafe(client.offer, message)
+            except RuntimeError:
+                pass  # Loop already closed
+        return True
+
+    def refresh_if_changed(self) -> bool:
+        """refresh() when the snapshot's inputs changed since the last build"""
+        if self._state is not None and self._inputs_version() == self._inputs:
+            return False
+        return self.refresh()
+
+    def on_catalog_change(self, paths, sources):
+        """CatalogWatcher listener"""
+        self.refresh()
+
+    # ------------------------------------------------------------------
+    # Event streams (event loop)
+    # ------------------------------------------------------------------
+
+    def _ensure_poller(self):
+        if self._poller is None or self._poller.done():
+            self._poller = asyncio.get_running_loop().create_task(self._poll())
+
+    async def _poll(self):
+        """Input version checks while clients are connected"""
+        while self._clients:
+            await asyncio.sleep(WATCHED_POLL_SECONDS if self.watching else POLL_SECONDS)
+            if not self._clients:
+                break
+            try:
+                await run_blocking(None, self.refresh_if_changed)
+            except Exception as e:
+                sys.stderr.write(f"[WARN] Pipeline feed: refresh failed: {e}\n")
+
+    async def open(self, last_event_id: Optional[str] = None) -> AsyncIterator[bytes]:
+        """
+        Register a client and return its event stream.
+
+        The snapshot is built before returning, so build errors (e.g. an
+        HTTPException) surface as the response instead of a broken stream.
+        """
+        client = _Client(asyncio.get_running_loop())
+        version, state = await run_blocking(None, self._register, client)
+        self._ensure_poller()
+        return self._stream(client, version, state, last_event_id)
+
+    async def _stream(self, client: _Client, version: str, state: Dict[str, Any],
+                      last_event_id: Optional[str]) -> AsyncIterator[bytes]:
+        try:
+            yield f"retry: {RETRY_MILLISECONDS}\n\n".encode('utf-8')
+            if last_event_id != version:
+                yield format_event('snapshot', version, {'version': version, **state})
+            while True:
+                try:
+                    message = await asyncio.wait_for(client.queue.get(), KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield b": keepalive\n\n"
+                    continue
+                if message is _RESYNC:
+                    version, state = await run_blocking(None, self._snapshot)
+                    message = format_event('snapshot', version, {'version': version, **state})
+                yield message
+        finally:
+            with self._clients_lock:
+                self._clients.discard(client)
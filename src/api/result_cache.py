@@ -0,0 +1,145 @@
+"""
+Query Result Cache
+
+Dashboards re-issue identical /api/query and /api/sources/{source}/info
+requests on every render. Results are cached in memory, keyed on the
+normalized request, and tagged with the version of the dataset they were
+computed from:
+
+- While the catalog watcher is running, the version is the source's
+  CatalogVersion, so hits are validated without touching the filesystem
+- Otherwise it is the mtime/size of the parsed file (one stat per hit)
+
+Query pages are held as Arrow tables (compact, columnar) rather than JSON.
+Entries are evicted least-recently-used once the byte or entry budget is
+exceeded.
+"""
+
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+
+# Default budget (override with APEX_RESULT_CACHE_MB / APEX_RESULT_CACHE_ENTRIES)
+DEFAULT_MAX_BYTES = int(os.environ.get('APEX_RESULT_CACHE_MB', '256')) * 1024 * 1024
+DEFAULT_MAX_ENTRIES = int(os.environ.get('APEX_RESULT_CACHE_ENTRIES', '1024'))
+
+
+def make_key(kind: str, payload: Any) -> str:
+    """Normalize a request into a cache key (key order independent)"""
+    return kind + ':' + json.dumps(payload, sort_keys=True, default=str, separators=(',', ':'))
+
+
+def estimate_size(value: Any) -> int:
+    """Approximate bytes held by a cached value"""
+    if isinstance(value, dict):
+        return sum(estimate_size(v) for v in value.values()) + 64
+    nbytes = getattr(value, 'nbytes', None)
+    if nbytes is not None:
+        return int(nbytes)
+    try:
+        return len(json.dumps(value, default=str))
+    except (TypeError, ValueError):
+        return 256
+
+
+class ResultCache:
+    """Thread-safe LRU cache of API results with dataset-version validation"""
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    def get(self, key: str, version_of: Callable[[Path], Any]) -> Optional[Any]:
+        """
+        Look up a cached value.
+
+        Args:
+            key: Key from make_key()
+            version_of: Returns the current version of the entry's dataset path
+
+        Returns:
+            Cached value, or None on a miss or when the dataset changed
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            with self._lock:
+                self._misses += 1
+            return None
+
+        try:
+            current = version_of(entry['path'])
+        except OSError:
+            current = None
+
+        with self._lock:
+            if current != entry['version']:
+                if self._entries.get(key) is entry:
+                    self._remove(key)
+                self._invalidations += 1
+                self._misses += 1
+                return None
+            if key in self._entries:
+                self._entries.move_to_end(key)
+            self._hits += 1
+            return entry['value']
+
+    def put(self, key: str, value: Any, path: Path, version: Any):
+        """
+        Store a value computed from the dataset at `path` at `version`.
+
+        Values larger than the whole budget are not cached.
+        """
+        size = estimate_size(value)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = {'value': value, 'path': path, 'version': version, 'size': size}
+            self._bytes += size
+            while self._entries and (self._bytes > self.max_bytes or len(self._entries) > self.max_entries):
+                self._remove(next(iter(self._entries)))
+                self._evictions += 1
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key)
+        self._bytes -= entry['size']
+
+    def clear(self):
+        """Drop all entries (statistics are kept)"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit ratio, bytes held and eviction counters"""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'max_entries': self.max_entries,
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_ratio': round(self._hits / lookups, 4) if lookups else 0.0,
+                'evictions': self._evictions,
+                'invalidations': self._invalidations
+            }
+
+
+# Shared instance used by the API
+result_cache = ResultCache()
@@ -0,0 +1,146 @@
+"""
+Filtered Row Counts
+
+Computes the `total` of filtered /api/query responses without loading rows:
+
+- Exact: the filter is evaluated over the filter columns only (projection
+  pushdown), after dropping partitions and parquet row groups whose
+  statistics can't match
+- Approximate: for parquet-backed data, a seeded random sample of the
+  surviving row groups is counted and scaled up, with a 95% error bound
+
+Results are cached per (dataset, filter) and invalidated when the dataset's
+files change.
+"""
+
+import math
+import random
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Tuple
+
+
+# Max cached (dataset, filter) counts
+COUNT_CACHE_SIZE = 256
+
+# Row groups counted for an approximate total
+APPROX_SAMPLE_ROW_GROUPS = 32
+
+# z-score for the reported error bound (95% confidence)
+APPROX_Z = 1.96
+
+
+_cache: "OrderedDict[Tuple, Dict[str, Any]]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def dataset_signature(dataset, file_path: Path) -> Tuple[int, int, int]:
+    """(file count, total bytes, newest mtime) of the files behind a dataset"""
+    files = getattr(dataset, 'files', None) or [file_path]
+    size, newest = 0, 0
+    for path in files:
+        stat = Path(path).stat()
+        size += stat.st_size
+        newest = max(newest, stat.st_mtime_ns)
+    return len(files), size, newest
+
+
+def _parquet_row_groups(dataset, expression):
+    """Row-group fragments that survive partition and statistics pruning"""
+    row_groups = []
+    for fragment in dataset.get_fragments(filter=expression):
+        row_groups.extend(fragment.split_by_row_group(filter=expression, schema=dataset.schema))
+    return row_groups
+
+
+def _count_fragment(dataset, fragment, expression) -> int:
+    """Matching rows in one fragment (dataset schema supplies partition fields)"""
+    import pyarrow.dataset as ds
+
+    return ds.Scanner.from_fragment(fragment, schema=dataset.schema, filter=expression).count_rows()
+
+
+def _estimate(dataset, expression, seed: int = 0) -> Dict[str, Any]:
+    """
+    Ratio estimate of matching rows from a sample of row groups.
+
+    Row groups are sampling clusters: the match rate of the sample is applied
+    to the rows of all surviving row groups (known from footers), and the
+    error bound comes from the between-row-group variance of that rate.
+    """
+    row_groups = _parquet_row_groups(dataset, expression)
+    if len(row_groups) <= APPROX_SAMPLE_ROW_GROUPS:
+        # Sampling wouldn't save anything
+        total = sum(_count_fragment(dataset, rg, expression) for rg in row_groups)
+        return {'total': total, 'exact': True, 'error': 0}
+
+    sizes = [rg.row_groups[0].num_rows for rg in row_groups]
+    population_rows = sum(sizes)
+
+    sample = random.Random(seed).sample(range(len(row_groups)), APPROX_SAMPLE_ROW_GROUPS)
+    rows = [sizes[i] for i in sample]
+    matches = [_count_fragment(dataset, row_groups[i], expression) for i in sample]
+
+    k, n = len(sample), len(row_groups)
+    ratio = sum(matches) / sum(rows) if sum(rows) else 0.0
+    mean_rows = sum(rows) / k
+    residual_var = sum((m - ratio * r) ** 2 for m, r in zip(matches, rows)) / (k - 1)
+    std_error = population_rows * math.sqrt((1 - k / n) * residual_var / k) / mean_rows if mean_rows else 0.0
+
+    return {
+        'total': int(round(ratio * population_rows)),
+        'exact': False,
+        'error': int(math.ceil(APPROX_Z * std_error)),
+        'sampled_row_groups': k,
+        'row_groups': n
+    }
+
+
+def count_matching_rows(dataset, file_path: Path, expression, filter_key: str,
+                        approximate: bool = False) -> Dict[str, Any]:
+    """
+    Count rows matching a filter expression.
+
+    Args:
+        dataset: pyarrow dataset over the parsed file(s)
+        file_path: Parsed file or partitioned dataset directory
+        expression: Compiled filter expression (src/api/filters.py)
+        filter_key: Stable identity of the filter (e.g. repr of the tree)
+        approximate: Sample row groups instead of scanning them all
+                     (parquet only; other formats count exactly)
+
+    Returns:
+        {'total': int, 'exact': bool, 'error': int (+/- rows, 95%), ...}
+    """
+    import pyarrow.dataset as ds
+
+    is_parquet = isinstance(getattr(dataset, 'format', None), ds.ParquetFileFormat)
+    approximate = approximate and is_parquet
+    key = (str(file_path), filter_key, approximate, dataset_signature(dataset, file_path))
+
+    with _cache_lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return dict(_cache[key])
+
+    if approximate:
+        result = _estimate(dataset, expression)
+    else:
+        # count_rows projects only the filter columns; parquet row groups and
+        # partitions that can't match are skipped from metadata alone
+        result = {'total': dataset.count_rows(filter=expression), 'exact': True, 'error': 0}
+
+    with _cache_lock:
+        _cache[key] = result
+        _cache.move_to_end(key)
+        while len(_cache) > COUNT_CACHE_SIZE:
+            _cache.popitem(last=False)
+
+    return dict(result)
+
+
+def clear_cache():
+    """Drop all cached counts"""
+    with _cache_lock:
+        _cache.clear()
@@ -0,0 +1,280 @@
+"""
+Cross-Process Cache for the Data API
+
+With several uvicorn workers, every process would otherwise rebuild the
+expensive snapshots on its own (the /api/pipelines snapshot with its
+directory scans, per-source metadata with row counts). This module keeps
+them in one SQLite file that all workers share:
+
+- Values are JSON, zlib-compressed, tagged with a version token
+- Version tokens must mean the same thing in every process, so callers
+  pass filesystem signatures (mtime/size), never in-process counters
+  like CatalogVersion
+- get_or_build() takes a short lease so that when several workers miss
+  the same key at once (typically right after start), one builds it and
+  the others wait for the result
+
+SQLite runs in WAL mode, so readers never block each other or the writer.
+Any SQLite error degrades to a cache miss; the API keeps working without
+the shared file.
+
+Configuration (environment):
+    APEX_SHARED_CACHE       cache file (default ~/.apex_eor/api_cache.db);
+                            'off' disables it
+    APEX_SHARED_CACHE_MB    size budget (default 128)
+"""
+
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+import zlib
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from src.shared_state import PipelineState
+
+
+DEFAULT_PATH = os.environ.get('APEX_SHARED_CACHE', str(PipelineState.STATE_DIR / 'api_cache.db'))
+DEFAULT_MAX_BYTES = int(os.environ.get('APEX_SHARED_CACHE_MB', '128')) * 1024 * 1024
+
+# How long a builder may hold a key before others give up waiting
+LEASE_SECONDS = 60.0
+POLL_SECONDS = 0.1
+
+
+def _encode(value: Any) -> bytes:
+    return zlib.compress(json.dumps(value, default=str, separators=(',', ':')).encode('utf-8'), 6)
+
+
+def _decode(payload: bytes) -> Any:
+    return json.loads(zlib.decompress(payload).decode('utf-8'))
+
+
+def _version_text(version: Any) -> str:
+    return json.dumps(version, sort_keys=True, default=str, separators=(',', ':'))
+
+
+class SharedCache:
+    """Versioned key/value cache in a SQLite file shared by worker processes"""
+
+    def __init__(self, path: Optional[str] = DEFAULT_PATH, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.enabled = bool(path) and path.lower() != 'off'
+        self.path = Path(path) if self.enabled else None
+        self.max_bytes = max_bytes
+        self.owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._builds = 0
+        self._waits = 0
+        self._errors = 0
+
+    # ------------------------------------------------------------------
+    # Connection
+    # ------------------------------------------------------------------
+
+    def _connect(self) -> sqlite3.Connection:
+        """One connection per thread (sqlite3 connections aren't shareable)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), timeout=10, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS entries ('
+                'key TEXT PRIMARY KEY, version TEXT, payload BLOB, size INTEGER, written REAL)'
+            )
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS leases (key TEXT PRIMARY KEY, owner TEXT, expires REAL)'
+            )
+            self._local.conn = conn
+        return conn
+
+    def _failed(self, action: str, error: Exception):
+        with self._lock:
+            self._errors += 1
+        sys.stderr.write(f"[SharedCache] {action} failed: {error}\n")
+        sys.stderr.flush()
+
+    def _count(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    # ------------------------------------------------------------------
+    # Get / put
+    # ------------------------------------------------------------------
+
+    def get(self, key: str, version: Any) -> Optional[Any]:
+        """
+        Look up a value.
+
+        Args:
+            key: Cache key
+            version: Current version token of the data behind the key
+
+        Returns:
+            Cached value, or None on a miss or when the version moved
+        """
+        if not self.enabled:
+            return None
+        try:
+            row = self._connect().execute(
+                'SELECT version, payload FROM entries WHERE key = ?', (key,)
+            ).fetchone()
+        except (sqlite3.Error, OSError) as e:
+            self._failed('read', e)
+            return None
+
+        if row is None or row[0] != _version_text(version):
+            self._count('_misses')
+            return None
+        self._count('_hits')
+        return _decode(row[1])
+
+    def put(self, key: str, version: Any, value: Any):
+        """Store a value computed at `version` (evicts oldest entries over budget)"""
+        if not self.enabled:
+            return
+        payload = _encode(value)
+        if len(payload) > self.max_bytes:
+            return
+        try:
+            conn = self._connect()
+            conn.execute(
+                'INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)',
+                (key, _version_text(version), payload, len(payload), time.time())
+            )
+            total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+            if total > self.max_bytes:
+                self._evict(conn, total)
+        except (sqlite3.Error, OSError) as e:
+            self._failed('write', e)
+
+    def _evict(self, conn: sqlite3.Connection, total: int):
+        rows = conn.execute('SELECT key, size FROM entries ORDER BY written').fetchall()
+        doomed = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            doomed.append((key,))
+            total -= size
+        conn.executemany('DELETE FROM entries WHERE key = ?', doomed)
+
+    # ------------------------------------------------------------------
+    # Build coordination
+    # ------------------------------------------------------------------
+
+    def _acquire_lease(self, key: str) -> bool:
+        conn = self._connect()
+        now = time.time()
+        conn.execute('DELETE FROM leases WHERE key = ? AND expires < ?', (key, now))
+        cursor = conn.execute(
+            'INSERT OR IGNORE INTO leases VALUES (?, ?, ?)', (key, self.owner, now + LEASE_SECONDS)
+        )
+        return cursor.rowcount == 1
+
+    def _release_lease(self, key: str):
+        try:
+            self._connect().execute('DELETE FROM leases WHERE key = ? AND owner = ?', (key, self.owner))
+        except (sqlite3.Error, OSError) as e:
+            self._failed('lease release', e)
+
+    def _lease_held(self, key: str) -> bool:
+        row = self._connect().execute(
+            'SELECT expires FROM leases WHERE key = ?', (key,)
+        ).fetchone()
+        return row is not None and row[0] >= time.time()
+
+    def get_or_build(self, key: str, version: Any, build: Callable[[], Any]) -> Any:
+        """
+        Return the cached value for `key` at `version`, building it once.
+
+        If another process is already building the key, wait for its result
+        (up to LEASE_SECONDS) instead of duplicating the work. Exceptions
+        from `build` propagate and nothing is cached.
+        """
+        value = self.get(key, version)
+        if value is not None or not self.enabled:
+            return value if value is not None else build()
+
+        try:
+            leased = self._acquire_lease(key)
+        except (sqlite3.Error, OSError) as e:
+            self._failed('lease', e)
+            return build()
+
+        if not leased:
+            self._count('_waits')
+            deadline = time.time() + LEASE_SECONDS
+            try:
+                while time.time() < deadline and self._lease_held(key):
+                    time.sleep(POLL_SECONDS)
+            except (sqlite3.Error, OSError) as e:
+                self._failed('lease wait', e)
+            value = self.get(key, version)
+            if value is not None:
+                return value
+
+        try:
+            value = build()
+            self._count('_builds')
+            self.put(key, version, value)
+            return value
+        finally:
+            if leased:
+                self._release_lease(key)
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def clear(self):
+        """Drop all entries (statistics are kept)"""
+        if not self.enabled:
+            return
+        try:
+            conn = self._connect()
+            conn.execute('DELETE FROM entries')
+            conn.execute('DELETE FROM leases')
+        except (sqlite3.Error, OSError) as e:
+            self._failed('clear', e)
+
+    def stats(self) -> Dict[str, Any]:
+        """Shared entries/bytes plus this process's hit counters"""
+        result = {
+            'enabled': self.enabled,
+            'path': str(self.path) if self.path else None,
+            'max_bytes': self.max_bytes,
+            'entries': 0,
+            'bytes': 0
+        }
+        if self.enabled:
+            try:
+                entries, size = self._connect().execute(
+                    'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries'
+                ).fetchone()
+                result.update(entries=entries, bytes=size)
+            except (sqlite3.Error, OSError) as e:
+                self._failed('stats', e)
+
+        with self._lock:
+            lookups = self._hits + self._misses
+            result.update(
+                hits=self._hits,
+                misses=self._misses,
+                hit_ratio=round(self._hits / lookups, 4) if lookups else 0.0,
+                builds=self._builds,
+                waits=self._waits,
+                errors=self._errors
+            )
+        return result
+
+
+# Shared instance used by the API
+shared_cache = SharedCache()
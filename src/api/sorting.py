@@ -0,0 +1,244 @@
+"""
+Server-Side Sorting for File-Backed Queries
+
+Answers `order_by` + `limit`/`offset` over parsed files with bounded memory:
+
+- Top-k: when offset + limit is small, batches are streamed through a
+  bounded candidate set (Arrow's heap-based select_k), so memory is O(k)
+- External merge sort: deeper pages sort fixed-size runs in memory, spill
+  them to temporary Parquet files and merge the runs block by block,
+  stopping as soon as the requested page has been produced
+
+Both paths evaluate filters during the scan and only read the selected
+and sort columns. NaNs, then nulls, sort last in either direction (as in
+the store).
+"""
+
+import tempfile
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+
+# Pages ending within this many rows use the top-k path
+TOPK_MAX_ROWS = 100_000
+
+# Rows buffered before the top-k candidate set is re-selected
+TOPK_FLUSH_ROWS = 250_000
+
+# Rows per sorted run spilled by the external sort
+RUN_ROWS = 1_000_000
+
+# Rows read per run per merge step
+MERGE_BLOCK_ROWS = 65_536
+
+
+def _sort_keys(keys: List[Tuple[str, bool]]) -> List[Tuple[str, str]]:
+    return [(column, 'descending' if desc else 'ascending') for column, desc in keys]
+
+
+def _sort_table(table: pa.Table, keys: List[Tuple[str, bool]]) -> pa.Table:
+    """Stable sort with nulls last"""
+    indices = pc.sort_indices(table, sort_keys=_sort_keys(keys), null_placement='at_end')
+    return table.take(indices)
+
+
+# ----------------------------------------------------------------------
+# Top-k
+# ----------------------------------------------------------------------
+
+def _select(candidates: Optional[pa.Table], batches: List[pa.RecordBatch],
+            keys: List[Tuple[str, bool]], k: int) -> pa.Table:
+    tables = ([candidates] if candidates is not None else []) + [pa.Table.from_batches(batches)]
+    table = pa.concat_tables(tables)
+    if table.num_rows <= k:
+        return table
+    # Heap-based partial selection; nulls count as largest and go last
+    return table.take(pc.select_k_unstable(table, k, sort_keys=_sort_keys(keys)))
+
+
+def top_k(batches, keys: List[Tuple[str, bool]], k: int) -> pa.Table:
+    """
+    First k rows in sort order from a stream of record batches.
+
+    Memory is bounded by k + TOPK_FLUSH_ROWS rows.
+    """
+    candidates, buffered, buffered_rows = None, [], 0
+    for batch in batches:
+        if batch.num_rows == 0:
+            continue
+        buffered.append(batch)
+        buffered_rows += batch.num_rows
+        if buffered_rows >= max(k, TOPK_FLUSH_ROWS):
+            candidates = _select(candidates, buffered, keys, k)
+            buffered, buffered_rows = [], 0
+
+    if buffered:
+        candidates = _select(candidates, buffered, keys, k)
+    if candidates is None:
+        return None
+    return _sort_table(candidates, keys)
+
+
+# ----------------------------------------------------------------------
+# External merge sort
+# ----------------------------------------------------------------------
+
+def _spill_runs(batches, keys: List[Tuple[str, bool]], spill_dir: Path) -> List[Path]:
+    """Sort the stream in RUN_ROWS chunks and write each run to Parquet"""
+    runs, buffered, buffered_rows = [], [], 0
+
+    def flush():
+        run = _sort_table(pa.Table.from_batches(buffered), keys)
+        path = spill_dir / f"run_{len(runs):05d}.parquet"
+        pq.write_table(run, path, row_group_size=MERGE_BLOCK_ROWS)
+        runs.append(path)
+
+    for batch in batches:
+        if batch.num_rows == 0:
+            continue
+        buffered.append(batch)
+        buffered_rows += batch.num_rows
+        if buffered_rows >= RUN_ROWS:
+            flush()
+            buffered, buffered_rows = [], 0
+
+    if buffered:
+        flush()
+    return runs
+
+
+def _placement(values) -> pa.Array:
+    """Sort class of each value: 0 = a value, 1 = NaN, 2 = null (either direction)"""
+    placement = pc.if_else(pc.is_null(values), 2, 0)
+    if pa.types.is_floating(values.type):
+        placement = pc.if_else(pc.fill_null(pc.is_nan(values), False), 1, placement)
+    return placement
+
+
+def _not_after(table: pa.Table, bound: pa.Table, keys: List[Tuple[str, bool]]) -> pa.Array:
+    """
+    Mask of rows that sort at or before the single-row `bound`.
+
+    Lexicographic over the sort keys, honouring direction and the order
+    Arrow sorts in: values, then NaNs, then nulls.
+    """
+    result = None
+    for column, desc in reversed(keys):
+        values = table[column]
+        placement = _placement(values)
+        bound_placement = _placement(bound[column])[0].as_py()
+        if bound_placement:
+            # NaNs and nulls tie among themselves and sort after every value
+            before = pc.less(placement, bound_placement)
+            equal = pc.equal(placement, bound_placement)
+        else:
+            bound_value = bound[column][0]
+            compared = pc.greater(values, bound_value) if desc else pc.less(values, bound_value)
+            before = pc.and_(pc.equal(placement, 0), pc.fill_null(compared, False))
+            equal = pc.and_(pc.equal(placement, 0), pc.fill_null(pc.equal(values, bound_value), False))
+
+        if result is None:
+            result = pc.or_(before, equal)
+        else:
+            result = pc.or_(before, pc.and_(equal, result))
+    return result
+
+
+def _merge_runs(runs: List[Path], keys: List[Tuple[str, bool]], skip: int, take: int) -> pa.Table:
+    """
+    Merge sorted runs and return rows [skip, skip + take).
+
+    Each step holds one block per run. The smallest "last row" across the
+    blocks bounds what can be emitted safely: every buffered row sorting at
+    or before it is emitted in order, which always drains at least one block.
+    """
+    readers = [pq.ParquetFile(path).iter_batches(batch_size=MERGE_BLOCK_ROWS) for path in runs]
+    blocks: List[Optional[pa.Table]] = []
+    for reader in readers:
+        batch = next(reader, None)
+        blocks.append(pa.Table.from_batches([batch]) if batch is not None else None)
+
+    output, produced = [], 0
+    while produced < skip + take and any(b is not None and b.num_rows for b in blocks):
+        live = [i for i, b in enumerate(blocks) if b is not None and b.num_rows]
+
+        # Bound = earliest of the blocks' last rows
+        last_rows = pa.concat_tables([blocks[i].slice(blocks[i].num_rows - 1) for i in live])
+        bound = _sort_table(last_rows, keys).slice(0, 1)
+
+        emit = []
+        for i in live:
+            mask = _not_after(blocks[i], bound, keys)
+            emit.append(blocks[i].filter(mask))
+            remaining = blocks[i].filter(pc.invert(mask))
+            if remaining.num_rows == 0:
+                batch = next(readers[i], None)
+                remaining = pa.Table.from_batches([batch]) if batch is not None else None
+            blocks[i] = remaining
+
+        step = _sort_table(pa.concat_tables(emit), keys)
+        if step.num_rows == 0:
+            # The bound row itself always qualifies; no progress means a broken comparison
+            raise RuntimeError(f"External sort merge made no progress on keys {keys}")
+        start = max(skip - produced, 0)
+        if start < step.num_rows:
+            output.append(step.slice(start, skip + take - produced - start))
+        produced += step.num_rows
+
+    if not output:
+        return None
+    return pa.concat_tables(output).slice(0, take)
+
+
+def external_sort(batches, keys: List[Tuple[str, bool]], skip: int, take: int,
+                  spill_dir: Optional[str] = None) -> Optional[pa.Table]:
+    """
+    Rows [skip, skip + take) of a stream in sort order, spilling sorted runs
+    to a temporary directory (removed afterwards).
+    """
+    with tempfile.TemporaryDirectory(prefix='apex_sort_', dir=spill_dir) as tmp:
+        runs = _spill_runs(batches, keys, Path(tmp))
+        if not runs:
+            return None
+        if len(runs) == 1:
+            return pq.read_table(runs[0]).slice(skip, take)
+        return _merge_runs(runs, keys, skip, take)
+
+
+def sorted_page(dataset, keys: List[Tuple[str, bool]], columns: Optional[List[str]] = None,
+                filter_expression=None, offset: int = 0, limit: int = 1000) -> pa.Table:
+    """
+    One page of a dataset in sort order.
+
+    Args:
+        dataset: pyarrow dataset over the parsed file(s)
+        keys: (column, descending) pairs (see analytical_store.parse_order_by)
+        columns: Columns to return (None = all)
+        filter_expression: Compiled filter evaluated during the scan
+        offset: Rows to skip
+        limit: Rows to return
+
+    Returns:
+        Arrow table with at most `limit` rows
+    """
+    read_columns = None
+    if columns:
+        read_columns = list(dict.fromkeys(list(columns) + [c for c, _ in keys]))
+
+    batches = dataset.to_batches(columns=read_columns, filter=filter_expression)
+    if offset + limit <= TOPK_MAX_ROWS:
+        table = top_k(batches, keys, offset + limit)
+        table = table.slice(offset, limit) if table is not None else None
+    else:
+        table = external_sort(batches, keys, offset, limit)
+
+    schema = dataset.schema
+    if read_columns:
+        schema = pa.schema([schema.field(c) for c in read_columns])
+    if table is None:
+        table = schema.empty_table()
+    return table.select(columns) if columns else table
@@ -0,0 +1,314 @@
+"""
+Catalog Watcher for APEX EOR Platform
+
+Keeps the pipeline context and directory-structure caches in sync with the
+data/ tree without waiting for a full `--generate-context` rescan.
+
+This module handles:
+- Watching data/ for file changes (watchdog/inotify, or a polling fallback)
+- Applying only the changed paths to the saved pipeline context
+- A cheap catalog version counter that consumers compare instead of
+  recomputing on a schedule
+
+Usage:
+    watcher = CatalogWatcher()
+    watcher.start()
+    ...
+    if CatalogVersion.source_version('FracFocus') != my_cached_version:
+        rebuild()
+"""
+
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+    WATCHDOG_AVAILABLE = True
+except ImportError:
+    Observer = None
+    FileSystemEventHandler = object
+    WATCHDOG_AVAILABLE = False
+
+
+PROJECT_ROOT = Path(__file__).parent.parent
+DATA_DIR = PROJECT_ROOT / 'data'
+
+# Data layers whose first-level children are treated as "sources"
+DATA_LAYERS = ('raw', 'interim', 'processed')
+
+
+class CatalogVersion:
+    """
+    Process-wide catalog version counter.
+
+    The global version is bumped once per batch of applied changes; each
+    affected source also gets its own version so consumers can invalidate
+    just the sources that changed.
+    """
+
+    _lock = threading.Lock()
+    _version = 0
+    _source_versions: Dict[str, int] = {}
+
+    @classmethod
+    def current(cls) -> int:
+        """Return the global catalog version"""
+        return cls._version
+
+    @classmethod
+    def source_version(cls, source: str) -> int:
+        """Return the version of a single source (0 if it never changed)"""
+        return cls._source_versions.get(source, 0)
+
+    @classmethod
+    def bump(cls, sources: Iterable[str] = ()) -> int:
+        """
+        Advance the catalog version.
+
+        Args:
+            sources: Source names affected by the change
+
+        Returns:
+            The new global version
+        """
+        with cls._lock:
+            cls._version += 1
+            for source in sources:
+                cls._source_versions[source] = cls._version
+            return cls._version
+
+
+def source_for_path(path: Path, data_dir: Path = DATA_DIR) -> Optional[str]:
+    """
+    Map a path under data/ to its source name.
+
+    data/raw/FracFocus/Chemical_Data/parsed/x.csv -> 'FracFocus'
+    data/interim/fracfocus_clean.parquet         -> 'fracfocus_clean.parquet'
+
+    Returns:
+        Source name, or None if the path is outside a known data layer
+    """
+    try:
+        parts = Path(path).resolve().relative_to(Path(data_dir).resolve()).parts
+    except ValueError:
+        return None
+
+    if len(parts) < 2 or parts[0] not in DATA_LAYERS:
+        return None
+    return parts[1]
+
+
+class _WatchdogHandler(FileSystemEventHandler):
+    """Forward watchdog events to the owning CatalogWatcher"""
+
+    def __init__(self, watcher: 'CatalogWatcher'):
+        super().__init__()
+        self.watcher = watcher
+
+    def on_any_event(self, event):
+        if event.event_type in ('opened', 'closed_no_write'):
+            return
+        self.watcher.notify(event.src_path)
+        dest_path = getattr(event, 'dest_path', None)
+        if dest_path:
+            self.watcher.notify(dest_path)
+
+
+class CatalogWatcher:
+    """
+    Watches data/ and pushes incremental catalog updates.
+
+    Events are collected into a pending set and flushed after a short quiet
+    period (debounce), so a 17-file extraction produces one context update
+    rather than seventeen.
+    """
+
+    def __init__(self, data_dir: Path = DATA_DIR, poll_interval: float = 2.0,
+                 debounce: float = 1.0, update_context: bool = True,
+                 force_polling: bool = False):
+        """
+        Initialize catalog watcher
+
+        Args:
+            data_dir: Directory to watch (default: <project>/data)
+            poll_interval: Seconds between scans in polling mode
+            debounce: Quiet period before a batch of changes is applied
+            update_context: If True, patch the saved pipeline context
+            force_polling: Use the polling backend even if watchdog is installed
+        """
+        self.data_dir = Path(data_dir)
+        self.poll_interval = poll_interval
+        self.debounce = debounce
+        self.update_context = update_context
+        self.backend = 'watchdog' if WATCHDOG_AVAILABLE and not force_polling else 'polling'
+
+        self._listeners: List[Callable[[Set[Path], Set[str]], None]] = []
+        self._pending: Set[Path] = set()
+        self._pending_lock = threading.Lock()
+        self._last_event = 0.0
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._observer = None
+        self._snapshot: Dict[Path, tuple] = {}
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    @property
+    def is_running(self) -> bool:
+        return bool(self._threads) and not self._stop.is_set()
+
+    def start(self) -> bool:
+        """
+        Start watching in background threads.
+
+        Returns:
+            True if started, False if data_dir does not exist
+        """
+        if self.is_running:
+            return True
+
+        if not self.data_dir.exists():
+            print(f"[WARNING] Catalog watcher: {self.data_dir} does not exist")
+            return False
+
+        self._stop.clear()
+
+        if self.backend == 'watchdog':
+            self._observer = Observer()
+            self._observer.schedule(_WatchdogHandler(self), str(self.data_dir), recursive=True)
+            self._observer.daemon = True
+            self._observer.start()
+        else:
+            self._snapshot = self._take_snapshot()
+            self._spawn(self._poll_loop, 'catalog-watcher-poll')
+
+        self._spawn(self._flush_loop, 'catalog-watcher-flush')
+        print(f"[OK] Catalog watcher started ({self.backend}) on {self.data_dir}")
+        return True
+
+    def stop(self):
+        """Stop watching and wait for background threads"""
+        self._stop.set()
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join(timeout=5)
+            self._observer = None
+        for thread in self._threads:
+            thread.join(timeout=5)
+        self._threads = []
+
+    def _spawn(self, target: Callable, name: str):
+        thread = threading.Thread(target=target, name=name, daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    # ------------------------------------------------------------------
+    # Events
+    # ------------------------------------------------------------------
+
+    def add_listener(self, callback: Callable[[Set[Path], Set[str]], None]):
+        """
+        Register a callback invoked after each applied batch.
+
+        Args:
+            callback: Called with (changed_paths, affected_sources)
+        """
+        self._listeners.append(callback)
+
+    def notify(self, path):
+        """Record a changed path (called by the backends)"""
+        path = Path(path)
+        # Ignore editor swap files and in-flight downloads
+        if path.name.startswith('.') or path.suffix in ('.tmp', '.part', '.crdownload'):
+            return
+        with self._pending_lock:
+            self._pending.add(path)
+            self._last_event = time.monotonic()
+
+    def _flush_loop(self):
+        while not self._stop.wait(min(self.debounce, 0.5)):
+            with self._pending_lock:
+                if not self._pending or time.monotonic() - self._last_event < self.debounce:
+                    continue
+                paths, self._pending = self._pending, set()
+            self.apply_changes(paths)
+
+    def apply_changes(self, paths: Set[Path]) -> int:
+        """
+        Apply a batch of changed paths to the catalog.
+
+        Args:
+            paths: Changed file or directory paths
+
+        Returns:
+            The new catalog version
+        """
+        sources = {s for s in (source_for_path(p, self.data_dir) for p in paths) if s}
+        version = CatalogVersion.bump(sources)
+
+        if self.update_context:
+            try:
+                from src.shared_state import PipelineState
+                PipelineState.apply_path_changes(paths)
+            except Exception as e:
+                sys.stderr.write(f"[WARN] Catalog watcher: context update failed: {e}\n")
+
+        for callback in self._listeners:
+            try:
+                callback(paths, sources)
+            except Exception as e:
+                sys.stderr.write(f"[WARN] Catalog watcher listener failed: {e}\n")
+
+        sys.stderr.write(
+            f"[CatalogWatcher] v{version}: {len(paths)} path(s) changed in {sorted(sources)}\n"
+        )
+        sys.stderr.flush()
+        return version
+
+    # ------------------------------------------------------------------
+    # Polling backend
+    # ------------------------------------------------------------------
+
+    def _take_snapshot(self) -> Dict[Path, tuple]:
+        snapshot = {}
+        for root, dirs, files in os.walk(self.data_dir):
+            dirs[:] = [d for d in dirs if not d.startswith('.')]
+            for name in files:
+                path = Path(root) / name
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def _poll_loop(self):
+        while not self._stop.wait(self.poll_interval):
+            current = self._take_snapshot()
+            previous = self._snapshot
+            for path, signature in current.items():
+                if previous.get(path) != signature:
+                    self.notify(path)
+            for path in previous.keys() - current.keys():
+                self.notify(path)
+            self._snapshot = current
+
+
+if __name__ == "__main__":
+    # Run the watcher in the foreground, patching the saved context on change
+    sys.path.insert(0, str(PROJECT_ROOT))
+    watcher = CatalogWatcher()
+    if watcher.start():
+        print("Watching for changes (Ctrl+C to stop)...")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            watcher.stop()
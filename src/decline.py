@@ -0,0 +1,466 @@
+"""
+Decline Curve Analysis
+
+Arps decline fits (exponential, hyperbolic, harmonic) and EUR for every
+lease (or any grouping) of monthly production in the analytical store,
+fitted all at once with numpy instead of one curve_fit per well:
+
+    q(t) = qi / (1 + b Di t)^(1/b)      hyperbolic (0 < b, b != 1)
+    q(t) = qi / (1 + Di t)              harmonic   (b = 1)
+    q(t) = qi exp(-Di t)                exponential (b = 0)
+
+t is months since the group's peak month, q the volume per month; months
+before the peak and months without production are left out of the fit.
+
+Fitting, vectorized over all groups of a chunk (per-group sums are
+np.bincount over the group id of each row):
+
+1. For each b in B_GRID, a linear least-squares fit of the linearized
+   curve (ln q against t for b = 0, q^-b against t otherwise) gives Di,
+   then qi is refitted in log space; the b with the lowest log-space
+   error wins.
+2. A few Gauss-Newton steps on (ln qi, ln Di) at the chosen b refine the
+   fit in log space (so the tail counts as much as the peak).
+3. Fits that explain too little of the data (r2 < MIN_FIT_R2) or barely
+   decline (Di < MIN_DECLINE) are rejected: flat or noisy leases would
+   otherwise be forecast for MAX_FORECAST_MONTHS and inflate EUR.
+
+EUR is the cumulative production to date plus the fitted curve (nothing
+for rejected fits) from the last month until the rate falls below the economic limit (capped at
+MAX_FORECAST_MONTHS).
+
+Production is streamed from the store in record batches sorted by group,
+so memory follows FIT_CHUNK_ROWS rather than the table. Fits are cached
+as Parquet per parameter set and store version (the table's loaded_at):
+
+    data/processed/decline/{table}__{params hash}.parquet
+
+The economic limit only shapes the forecast, not the curves, so it isn't
+part of the cached parameters: remaining volume and EUR are computed per
+request from the cached qi/di/b (see with_forecast).
+"""
+
+import os
+import json
+import hashlib
+import itertools
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pyarrow as pa
+
+from src.timeseries import PERIOD_COLUMN, group_chunks, group_ids, month_period, period_months
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+DECLINE_DIR = PROJECT_ROOT / "data" / "processed" / "decline"
+
+DEFAULT_RATE = 'LEASE_OIL_PROD_VOL'
+DEFAULT_GROUP_BY = ['DISTRICT_NO', 'LEASE_NO', 'OIL_GAS_CODE']
+
+# Arps b exponents tried per model ('auto' picks the best of all)
+B_GRID = np.round(np.arange(0.0, 2.0001, 0.1), 1)
+MODELS = {
+    'auto': B_GRID,
+    'exponential': np.array([0.0]),
+    'harmonic': np.array([1.0]),
+    'hyperbolic': B_GRID[(B_GRID > 0) & (B_GRID != 1.0)],
+}
+
+# Fewest producing months after the peak to fit a curve
+MIN_FIT_MONTHS = 6
+
+# Weakest accepted fit: r2 in log space, nominal decline per month
+MIN_FIT_R2 = 0.3
+MIN_DECLINE = 0.002
+
+# Rate below which a lease is uneconomic (volume per month), forecast horizon cap
+DEFAULT_ECONOMIC_LIMIT = 30.0
+MAX_FORECAST_MONTHS = 600
+
+GAUSS_NEWTON_STEPS = 4
+
+# Rows of production fitted per batch, and processes fitting batches in parallel
+FIT_CHUNK_ROWS = 2_000_000
+FIT_WORKERS = min(4, os.cpu_count() or 1)
+
+_lock = threading.Lock()
+_loaded: Dict[str, Tuple[Any, pa.Table]] = {}
+
+
+def _quote(identifier: str) -> str:
+    """Quote a SQL identifier"""
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def model_name(b: np.ndarray) -> np.ndarray:
+    """Arps model of each b exponent"""
+    return np.where(b == 0, 'exponential', np.where(b == 1, 'harmonic', 'hyperbolic'))
+
+
+# ----------------------------------------------------------------------
+# Curves
+# ----------------------------------------------------------------------
+
+def arps_rate(qi: np.ndarray, di: np.ndarray, b: np.ndarray, t: np.ndarray) -> np.ndarray:
+    """Rate at t months after the peak"""
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        hyperbolic = qi / np.power(1.0 + b * di * t, 1.0 / np.where(b == 0, 1.0, b))
+        return np.where(b == 0, qi * np.exp(-di * t), hyperbolic)
+
+
+def arps_cumulative(qi: np.ndarray, di: np.ndarray, b: np.ndarray, t: np.ndarray) -> np.ndarray:
+    """Volume produced from the peak to t months after it"""
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        exponential = qi / di * (1.0 - np.exp(-di * t))
+        harmonic = qi / di * np.log1p(di * t)
+        safe_b = np.where((b == 0) | (b == 1), 0.5, b)
+        hyperbolic = qi / ((1.0 - safe_b) * di) * (1.0 - np.power(1.0 + safe_b * di * t, (safe_b - 1.0) / safe_b))
+        return np.where(b == 0, exponential, np.where(b == 1, harmonic, hyperbolic))
+
+
+def months_to_rate(qi: np.ndarray, di: np.ndarray, b: np.ndarray, rate: float) -> np.ndarray:
+    """Months after the peak at which the curve reaches `rate` (0 if it starts below)"""
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        ratio = np.maximum(qi / rate, 1.0)
+        hyperbolic = (np.power(ratio, np.where(b == 0, 1.0, b)) - 1.0) / (np.where(b == 0, 1.0, b) * di)
+        return np.where(b == 0, np.log(ratio) / di, hyperbolic)
+
+
+# ----------------------------------------------------------------------
+# Fitting
+# ----------------------------------------------------------------------
+
+def _slope_intercept(n: np.ndarray, sx: np.ndarray, sxx: np.ndarray, sy: np.ndarray,
+                     sxy: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Per-group least-squares (intercept, slope) from sums over the group's rows"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        slope = (n * sxy - sx * sy) / (n * sxx - sx * sx)
+        intercept = (sy - slope * sx) / n
+    return intercept, slope
+
+
+def _log_curve(log_qi: np.ndarray, di: np.ndarray, b: np.ndarray, t: np.ndarray) -> np.ndarray:
+    """ln q(t), elementwise over rows"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(b == 0, log_qi - di * t, log_qi - np.log1p(b * di * t) / np.where(b == 0, 1.0, b))
+
+
+def fit_arps(group: np.ndarray, t: np.ndarray, q: np.ndarray, groups: int,
+             b_values: np.ndarray = B_GRID) -> Dict[str, np.ndarray]:
+    """
+    Fit one Arps curve per group.
+
+    Args:
+        group: Group id (0..groups-1) of each row
+        t: Months since the group's peak (>= 0)
+        q: Rate (> 0)
+        groups: Number of groups
+        b_values: Candidate b exponents
+
+    Returns:
+        {'qi', 'di', 'b', 'r2', 'months'} arrays per group; qi/di/b/r2 are
+        NaN where the group has fewer than MIN_FIT_MONTHS rows, no decline
+        or a rejected fit (r2 < MIN_FIT_R2 or Di < MIN_DECLINE)
+    """
+    y = np.log(q)
+    n = np.bincount(group, minlength=groups).astype(np.float64)
+    sx = np.bincount(group, t, groups)
+    sxx = np.bincount(group, t * t, groups)
+    best_sse = np.full(groups, np.inf)
+    best = {'log_qi': np.full(groups, np.nan), 'di': np.full(groups, np.nan), 'b': np.full(groups, np.nan)}
+
+    for b in b_values:
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            if b == 0:
+                _, slope = _slope_intercept(n, sx, sxx, np.bincount(group, y, groups),
+                                            np.bincount(group, t * y, groups))
+                di = -slope
+            else:
+                linear = np.exp(-b * y)  # q^-b
+                intercept, slope = _slope_intercept(n, sx, sxx, np.bincount(group, linear, groups),
+                                                    np.bincount(group, t * linear, groups))
+                di = np.where(intercept > 0, slope / (b * intercept), np.nan)
+            di = np.where(np.isfinite(di) & (di > 0), di, np.nan)
+
+            # Best qi for this Di in log space: mean residual; error = sum r^2 - (sum r)^2 / n
+            rdi = di[group]
+            residual = y + (rdi * t if b == 0 else np.log1p(b * rdi * t) / b)
+            total = np.bincount(group, residual, groups)
+            log_qi = total / np.maximum(n, 1)
+            sse = np.maximum(np.bincount(group, residual * residual, groups) - total * log_qi, 0.0)
+        better = np.isfinite(sse) & np.isfinite(di) & (sse < best_sse)
+        best_sse = np.where(better, sse, best_sse)
+        for key, value in (('log_qi', log_qi), ('di', di), ('b', np.full(groups, b))):
+            best[key] = np.where(better, value, best[key])
+
+    log_qi, di, b = best['log_qi'], best['di'], best['b']
+    fitted = np.isfinite(best_sse) & (n >= MIN_FIT_MONTHS)
+    sse = best_sse
+    for _ in range(GAUSS_NEWTON_STEPS):
+        # Jacobian of ln q wrt (ln qi, ln Di): (1, -Di t / (1 + b Di t))
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            rb, rdi = b[group], di[group]
+            residual = y - _log_curve(log_qi[group], rdi, rb, t)
+            grad = -rdi * t / (1.0 + rb * rdi * t)
+            s_g = np.bincount(group, grad, groups)
+            s_gg = np.bincount(group, grad * grad, groups)
+            s_r = np.bincount(group, residual, groups)
+            s_gr = np.bincount(group, grad * residual, groups)
+            det = n * s_gg - s_g * s_g
+            step_qi = (s_gg * s_r - s_g * s_gr) / det
+            step_di = (n * s_gr - s_g * s_r) / det
+            new_log_qi = log_qi + step_qi
+            new_di = di * np.exp(np.clip(step_di, -2.0, 2.0))
+            new_sse = np.bincount(group, (y - _log_curve(new_log_qi[group], new_di[group], rb, t)) ** 2, groups)
+        better = fitted & np.isfinite(new_sse) & (new_sse < sse)
+        log_qi = np.where(better, new_log_qi, log_qi)
+        di = np.where(better, new_di, di)
+        sse = np.where(better, new_sse, sse)
+
+    mean = np.bincount(group, y, groups) / np.maximum(n, 1)
+    sst = np.bincount(group, (y - mean[group]) ** 2, groups)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        r2 = np.where(sst > 0, 1.0 - sse / sst, 1.0)
+        fitted &= (r2 >= MIN_FIT_R2) & (di >= MIN_DECLINE)
+    nan = np.full(groups, np.nan)
+    return {
+        'qi': np.where(fitted, np.exp(log_qi), nan),
+        'di': np.where(fitted, di, nan),
+        'b': np.where(fitted, b, nan),
+        'r2': np.where(fitted, r2, nan),
+        'months': n.astype(np.int64),
+    }
+
+
+def forecast(qi: np.ndarray, di: np.ndarray, b: np.ndarray, peak_month: np.ndarray,
+             last_month: np.ndarray, cumulative: np.ndarray,
+             economic_limit: float = DEFAULT_ECONOMIC_LIMIT) -> Dict[str, np.ndarray]:
+    """
+    Remaining volume and EUR of fitted curves.
+
+    Args:
+        qi, di, b: Fitted curves (NaN where there is none)
+        peak_month, last_month: YYYYMM of each group's peak and last month
+        cumulative: Production to date
+        economic_limit: Rate (volume/month) where the forecast stops
+
+    Returns:
+        {'remaining', 'eur'} arrays per group
+    """
+    qi, di, b = (np.asarray(v, dtype=np.float64) for v in (qi, di, b))
+    elapsed = (period_months(np.asarray(last_month)) - period_months(np.asarray(peak_month))).astype(np.float64)
+    fitted = np.isfinite(qi)
+    horizon = np.minimum(months_to_rate(qi, di, b, economic_limit), elapsed + MAX_FORECAST_MONTHS)
+    with np.errstate(invalid='ignore'):
+        remaining = np.where(fitted & (horizon > elapsed),
+                             arps_cumulative(qi, di, b, horizon) - arps_cumulative(qi, di, b, elapsed), 0.0)
+    remaining = np.where(np.isfinite(remaining), np.maximum(remaining, 0.0), 0.0)
+    return {'remaining': remaining, 'eur': np.asarray(cumulative, dtype=np.float64) + remaining}
+
+
+def with_forecast(fits: pa.Table, economic_limit: float = DEFAULT_ECONOMIC_LIMIT) -> pa.Table:
+    """Fits table (see compute_fits) with remaining and eur columns for an economic limit"""
+    if fits.num_rows == 0 or 'qi' not in fits.column_names:
+        return fits
+
+    def values(name):
+        return fits.column(name).to_numpy(zero_copy_only=False)
+
+    result = forecast(values('qi'), values('di'), values('b'), values('peak_month'), values('last_month'),
+                      values('cumulative'), economic_limit)
+    for name, column in result.items():
+        fits = fits.append_column(name, pa.array(column))
+    return fits
+
+
+def fit_groups(group: np.ndarray, periods: np.ndarray, volume: np.ndarray, groups: int,
+               b_values: np.ndarray = B_GRID,
+               economic_limit: Optional[float] = DEFAULT_ECONOMIC_LIMIT) -> Dict[str, np.ndarray]:
+    """
+    Decline fits and EUR for monthly production of sorted groups.
+
+    Args:
+        group: Group id of each row, rows sorted by (group, period)
+        periods: YYYYMM period of each row
+        volume: Production volume of each row (NaN/negative count as 0)
+        economic_limit: Rate where the forecast stops; None = fits only
+
+    Returns:
+        {'model', 'qi', 'di', 'b', 'r2', 'months', 'peak_month', 'last_month',
+         'cumulative', 'remaining', 'eur'} arrays per group (no remaining/eur
+        without an economic limit)
+    """
+    volume = np.nan_to_num(volume.astype(np.float64), nan=0.0)
+    volume = np.maximum(volume, 0.0)
+    months = period_months(periods)
+
+    starts = np.flatnonzero(np.r_[True, group[1:] != group[:-1]])
+    peak_volume = np.maximum.reduceat(volume, starts) if len(volume) else np.empty(0)
+    full = np.full(groups, np.nan)
+    full[group[starts]] = peak_volume
+    at_peak = np.flatnonzero(volume == full[group])
+    first = np.unique(group[at_peak], return_index=True)
+    peak_month = np.zeros(groups, np.int64)
+    peak_month[first[0]] = months[at_peak[first[1]]]
+    last_month = np.zeros(groups, np.int64)
+    ends = np.r_[starts[1:], len(group)] - 1
+    last_month[group[ends]] = months[ends]
+
+    t = (months - peak_month[group]).astype(np.float64)
+    use = (t >= 0) & (volume > 0)
+    fit = fit_arps(group[use], t[use], volume[use], groups, b_values)
+
+    b = fit['b']
+    fits = {
+        'model': np.where(np.isfinite(fit['qi']), model_name(np.nan_to_num(b)), None),
+        'qi': fit['qi'],
+        'di': fit['di'],
+        'b': b,
+        'r2': fit['r2'],
+        'months': fit['months'],
+        'peak_month': month_period(peak_month),
+        'last_month': month_period(last_month),
+        'cumulative': np.bincount(group, volume, groups),
+    }
+    if economic_limit is not None:
+        fits.update(forecast(fits['qi'], fits['di'], b, fits['peak_month'], fits['last_month'],
+                             fits['cumulative'], economic_limit))
+    return fits
+
+
+# ----------------------------------------------------------------------
+# Store
+# ----------------------------------------------------------------------
+
+def _fit_chunk(chunk: pa.Table, group_by: List[str], b_values: np.ndarray) -> pa.Table:
+    """Fits of the groups in one chunk (module-level so it can run in a worker process)"""
+    group = group_ids(chunk.select(group_by))
+    fits = fit_groups(group, chunk.column('period').to_numpy(),
+                      chunk.column('volume').to_numpy(zero_copy_only=False), int(group[-1]) + 1,
+                      b_values, economic_limit=None)
+    first = np.flatnonzero(np.r_[True, group[1:] != group[:-1]])
+    result = chunk.select(group_by).take(pa.array(first))
+    for name, values in fits.items():
+        result = result.append_column(name, pa.array(values, pa.string() if name == 'model' else None,
+                                                     from_pandas=True))
+    return result
+
+
+def compute_fits(conn, table: str, rate: str = DEFAULT_RATE, group_by: Optional[List[str]] = None,
+                 model: str = 'auto', workers: int = FIT_WORKERS) -> pa.Table:
+    """
+    Fit every group of a store table.
+
+    Chunks are fitted in a process pool when there is more than one.
+
+    Args:
+        conn: DuckDB connection to the store
+        table: Table with PERIOD_COLUMN, `rate` and the group columns
+        rate: Monthly volume column
+        group_by: Columns identifying a lease/well (default DEFAULT_GROUP_BY)
+        model: Key in MODELS
+        workers: Worker processes (1 fits in-process)
+
+    Returns:
+        Table of group columns plus fit columns (see fit_groups), without
+        the forecast (see with_forecast)
+    """
+    group_by = list(group_by or DEFAULT_GROUP_BY)
+    keys = ", ".join(_quote(c) for c in group_by)
+    sql = (
+        f"SELECT {keys}, CAST({_quote(PERIOD_COLUMN)} AS BIGINT) AS period, "
+        f"SUM({_quote(rate)})::DOUBLE AS volume FROM {_quote(table)} "
+        f"WHERE {_quote(PERIOD_COLUMN)} IS NOT NULL GROUP BY {keys}, period ORDER BY {keys}, period"
+    )
+    chunks = group_chunks(conn.execute(sql).fetch_record_batch(FIT_CHUNK_ROWS), group_by, FIT_CHUNK_ROWS)
+    args = (group_by, MODELS[model])
+
+    head = list(itertools.islice(chunks, 2))
+    if len(head) < 2 or workers <= 1:
+        parts = [_fit_chunk(chunk, *args) for chunk in itertools.chain(head, chunks)]
+    else:
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        # Spawned workers (forking a threaded server process is unsafe); at
+        # most two chunks per worker in flight so memory stays bounded
+        parts, pending = [], []
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+            for chunk in itertools.chain(head, chunks):
+                if len(pending) >= 2 * workers:
+                    parts.append(pending.pop(0).result())
+                pending.append(pool.submit(_fit_chunk, chunk, *args))
+            parts += [future.result() for future in pending]
+
+    if not parts:
+        return pa.table({c: pa.array([], pa.string()) for c in group_by})
+    return pa.concat_tables(parts)
+
+
+def fits_path(table: str, params: Dict[str, Any], decline_dir: Path = DECLINE_DIR) -> Path:
+    """Cache file of one parameter set"""
+    digest = hashlib.sha1(json.dumps(params, sort_keys=True).encode('utf-8')).hexdigest()[:12]
+    return Path(decline_dir) / f"{table}__{digest}.parquet"
+
+
+def get_fits(store, table: str, loaded_at: Optional[str], rate: str = DEFAULT_RATE,
+             group_by: Optional[List[str]] = None, model: str = 'auto',
+             economic_limit: float = DEFAULT_ECONOMIC_LIMIT, decline_dir: Path = DECLINE_DIR) -> pa.Table:
+    """
+    Fits for a parameter set, computed once per store version, with the
+    forecast for `economic_limit`.
+
+    The fits are cached in memory and as Parquet tagged with the table's
+    loaded_at, so a reload of the table (or a new rate, grouping or model)
+    refits and everything else is served from the cache. Remaining volume
+    and EUR are computed from the cached curves on every call, so changing
+    the economic limit never refits.
+
+    Args:
+        store: AnalyticalStore to read production from
+        loaded_at: Catalog loaded_at of `table` (the data version)
+    """
+    return with_forecast(_cached_fits(store, table, loaded_at, rate, group_by, model, decline_dir),
+                         economic_limit)
+
+
+def _cached_fits(store, table: str, loaded_at: Optional[str], rate: str, group_by: Optional[List[str]],
+                 model: str, decline_dir: Path) -> pa.Table:
+    """Fits without the forecast, from memory, the Parquet cache or a fresh fit"""
+    import pyarrow.parquet as pq
+
+    params = {'rate': rate, 'group_by': list(group_by or DEFAULT_GROUP_BY), 'model': model,
+              'min_r2': MIN_FIT_R2, 'min_decline': MIN_DECLINE}
+    path = fits_path(table, params, decline_dir)
+    version = str(loaded_at)
+    cached = _loaded.get(str(path))
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    with _lock:
+        cached = _loaded.get(str(path))
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        fits = None
+        if path.exists():
+            stored = pq.read_table(path)
+            if (stored.schema.metadata or {}).get(b'loaded_at', b'').decode('utf-8') == version:
+                fits = stored
+        if fits is None:
+            conn = store.connect()
+            try:
+                fits = compute_fits(conn, table, rate, params['group_by'], model)
+            finally:
+                conn.close()
+            fits = fits.replace_schema_metadata({'loaded_at': version, 'params': json.dumps(params)})
+            path.parent.mkdir(parents=True, exist_ok=True)
+            staging = path.with_name(path.name + '.tmp')
+            pq.write_table(fits, staging)
+            os.replace(staging, path)
+
+        _loaded[str(path)] = (version, fits)
+        return fits
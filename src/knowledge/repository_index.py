@@ -483,7 +483,7 @@ Search keywords: {source_path.name} data source pipeline files extraction proces
                 'columns': ['col1', 'col2', ...],
                 'dtypes': {'col1': 'string', 'col2': 'int64', ...},
                 'row_count': N,
-                'sample': [{...}, {...}]  # First 5 rows
+                'sample': [{...}, {...}]  # 5 sampled rows
             }
         """
         import pandas as pd
@@ -532,8 +532,11 @@ Search keywords: {source_path.name} data source pipeline files extraction proces
             if target_file.suffix == '.csv':
                 df = pd.read_csv(target_file, nrows=5)
             elif target_file.suffix == '.parquet':
-                df = pd.read_parquet(target_file)
-                df = df.head(5)
+                # Sample across row groups instead of reading the whole file
+                # for its first rows (which are the oldest in chronological data)
+                import pyarrow.dataset as ds
+                from src.sampling import sample_rows
+                df = sample_rows(ds.dataset(target_file), 5, seed=0)[0].to_pandas()
             else:
                 print(f"[WARNING] Unsupported file type: {target_file.suffix}")
                 return None
@@ -551,14 +554,15 @@ Search keywords: {source_path.name} data source pipeline files extraction proces
             # Get TOTAL row count across ALL files (not just first file!)
             # This is important for sources with multiple parsed files (e.g., RRC with 29 files)
             try:
+                import pyarrow.parquet as pq  # Parquet row counts come from the footers
+
                 if file_path:
                     # If specific file requested, just count that one
                     if target_file.suffix == '.csv':
                         full_df = pd.read_csv(target_file)
                         schema['row_count'] = len(full_df)
                     elif target_file.suffix == '.parquet':
-                        full_df = pd.read_parquet(target_file)
-                        schema['row_count'] = len(full_df)
+                        schema['row_count'] = pq.ParquetFile(target_file).metadata.num_rows
                 else:
                     # No specific file - aggregate ALL parsed files for accurate total
                     total_rows = 0
@@ -571,8 +575,7 @@ Search keywords: {source_path.name} data source pipeline files extraction proces
                                 total_rows += len(count_df)
                                 files_counted += 1
                             elif pf.suffix == '.parquet':
-                                count_df = pd.read_parquet(pf)
-                                total_rows += len(count_df)
+                                total_rows += pq.ParquetFile(pf).metadata.num_rows
                                 files_counted += 1
                         except:
                             continue  # Skip files that can't be read
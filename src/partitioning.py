@@ -0,0 +1,210 @@
+"""
+Partitioned Dataset Layout for APEX EOR Platform
+
+Hive-style partitioning of RRC production data, shared by the parse phase
+(writer) and the data API / analytics consumers (readers):
+
+    parsed/OG_LEASE_CYCLE_DATA_TABLE/district=08/year=2021/part-0.parquet
+
+Readers translate column filters (DISTRICT_NO, CYCLE_YEAR, CYCLE_YEAR_MONTH)
+into predicates on the partition keys (see src/api/filters.py), so a query
+for one district or a few years only opens those directories.
+
+This module handles:
+- Detecting which tables can be partitioned (district + year columns)
+- Streaming a delimited file into a partitioned Parquet dataset
+- Opening partitioned datasets
+"""
+
+import shutil
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+
+
+# Partition keys, in directory order
+PARTITION_SCHEMA = pa.schema([('district', pa.string()), ('year', pa.int32())])
+PARTITIONING = ds.partitioning(PARTITION_SCHEMA, flavor='hive')
+
+# Source columns the partition keys are derived from
+DISTRICT_COLUMNS = ('DISTRICT_NO',)
+YEAR_COLUMNS = ('CYCLE_YEAR',)
+YEAR_MONTH_COLUMNS = ('CYCLE_YEAR_MONTH',)
+
+# Directory name pyarrow writes for a null partition key
+NULL_PARTITION = '__HIVE_DEFAULT_PARTITION__'
+
+# Streaming read block size for delimited sources
+CSV_BLOCK_SIZE = 64 * 1024 * 1024
+
+
+def normalize_district(value: Any) -> str:
+    """
+    Normalize an RRC district code for use as a partition value.
+
+    RRC districts are 01-10 plus 6E, 7B, 7C, 8A; numeric codes may arrive
+    as 8, '8' or '08' and all map to '08'.
+    """
+    text = str(value).strip().upper()
+    if text.endswith('.0'):
+        text = text[:-2]
+    return text.zfill(2) if text.isdigit() else text
+
+
+def partition_spec(columns: Iterable[str]) -> Optional[Dict[str, Any]]:
+    """
+    Work out how to derive partition keys for a table.
+
+    Args:
+        columns: Column names of the table
+
+    Returns:
+        {'district': col, 'year': col, 'year_month': bool} or None if the
+        table has no district/year columns
+    """
+    columns = list(columns)
+    district = next((c for c in DISTRICT_COLUMNS if c in columns), None)
+    year = next((c for c in YEAR_COLUMNS if c in columns), None)
+    year_month = False
+    if year is None:
+        year = next((c for c in YEAR_MONTH_COLUMNS if c in columns), None)
+        year_month = year is not None
+
+    if district is None or year is None:
+        return None
+    return {'district': district, 'year': year, 'year_month': year_month}
+
+
+def add_partition_columns(batch: pa.RecordBatch, spec: Dict[str, Any]) -> pa.RecordBatch:
+    """Append 'district' and 'year' partition columns to a batch"""
+    district = batch.column(batch.schema.get_field_index(spec['district']))
+    if not pa.types.is_string(district.type):
+        district = pc.cast(district, pa.string())
+    district = pc.utf8_upper(pc.utf8_trim_whitespace(district))
+    # Zero-pad single-digit numeric districts ('8' -> '08')
+    district = pc.if_else(
+        pc.equal(pc.utf8_length(district), 1),
+        pc.binary_join_element_wise('0', district, ''),
+        district
+    )
+
+    year = batch.column(batch.schema.get_field_index(spec['year']))
+    if not pa.types.is_integer(year.type):
+        year = pc.cast(year, pa.int64())
+    if spec['year_month']:
+        year = pc.divide(year, 100)
+    year = pc.cast(year, pa.int32())
+
+    return pa.RecordBatch.from_arrays(
+        batch.columns + [district, year],
+        names=batch.schema.names + ['district', 'year']
+    )
+
+
+def is_partitioned_dataset(path: Path) -> bool:
+    """True if `path` is a directory laid out as district=*/year=*"""
+    path = Path(path)
+    return path.is_dir() and any(path.glob('district=*'))
+
+
+def open_dataset(path: Path) -> ds.Dataset:
+    """Open a partitioned dataset with typed partition keys"""
+    return ds.dataset(str(path), format='parquet', partitioning=PARTITIONING)
+
+
+def _read_delimited(source_file: Path, delimiter: str, column_types: Optional[Dict] = None):
+    """Open a streaming CSV reader over a delimited file"""
+    import pyarrow.csv as csv
+
+    return csv.open_csv(
+        str(source_file),
+        read_options=csv.ReadOptions(block_size=CSV_BLOCK_SIZE),
+        parse_options=csv.ParseOptions(delimiter=delimiter, invalid_row_handler=lambda row: 'skip'),
+        convert_options=csv.ConvertOptions(column_types=column_types or {}, strings_can_be_null=True)
+    )
+
+
+def write_partitioned_csv(source_file: Path, delimiter: str, output_dir: Path,
+                          spec: Dict[str, Any]) -> int:
+    """
+    Stream a delimited file into a district=/year= Parquet dataset.
+
+    The file is read in blocks (bounded memory) and written through a single
+    dataset writer so each partition gets a few large files rather than one
+    per block. The dataset is built next to `output_dir` and swapped in.
+
+    Args:
+        source_file: DSV/CSV file to convert
+        delimiter: Field delimiter
+        output_dir: Dataset root to (re)create
+        spec: Result of partition_spec() for the file's columns
+
+    Returns:
+        Number of rows written
+    """
+    output_dir = Path(output_dir)
+    staging_dir = output_dir.with_name(output_dir.name + '.staging')
+    if staging_dir.exists():
+        shutil.rmtree(staging_dir)
+
+    # Districts like '7B' must stay strings even if the first block is numeric
+    column_types = {spec['district']: pa.string()}
+
+    def batches(reader, counter: List[int]):
+        for batch in reader:
+            counter[0] += batch.num_rows
+            yield add_partition_columns(batch, spec)
+
+    for attempt in range(2):
+        reader = _read_delimited(source_file, delimiter, column_types)
+        schema = add_partition_columns(
+            pa.RecordBatch.from_pylist([], schema=reader.schema), spec
+        ).schema
+        counter = [0]
+        try:
+            ds.write_dataset(
+                batches(reader, counter),
+                str(staging_dir),
+                schema=schema,
+                format='parquet',
+                partitioning=PARTITIONING,
+                basename_template='part-{i}.parquet',
+                existing_data_behavior='delete_matching',
+                max_partitions=4096,
+                min_rows_per_group=128 * 1024,
+                max_rows_per_group=1024 * 1024
+            )
+            break
+        except pa.ArrowInvalid:
+            if attempt:
+                raise
+            # A late block contradicted the inferred types - read everything
+            # as text except the year column the partitioning depends on
+            shutil.rmtree(staging_dir, ignore_errors=True)
+            column_types = {name: pa.string() for name in reader.schema.names}
+            column_types[spec['year']] = pa.int64()
+
+    if output_dir.exists():
+        shutil.rmtree(output_dir)
+    staging_dir.rename(output_dir)
+
+    return counter[0]
+
+
+def _partition_value(directory: Path) -> Optional[str]:
+    """Value of a key=value partition directory (None for null keys)"""
+    value = directory.name.split('=', 1)[1]
+    return None if value == NULL_PARTITION else value
+
+
+def list_partitions(path: Path) -> List[Tuple[Optional[str], Optional[int]]]:
+    """List (district, year) partitions present on disk (None = rows with a null key)"""
+    partitions = []
+    for district_dir in sorted(Path(path).glob('district=*')):
+        for year_dir in sorted(district_dir.glob('year=*')):
+            year = _partition_value(year_dir)
+            partitions.append((_partition_value(district_dir), int(year) if year is not None else None))
+    return partitions
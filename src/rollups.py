@@ -0,0 +1,335 @@
+"""
+Precomputed Rollups
+
+Declarative aggregates (scripts/pipeline/rollups.yaml) materialized from
+the analytical store into small Parquet files, shared by the pipeline's
+load phase (which refreshes them) and the data API (which answers
+/api/aggregate from them).
+
+A rollup stores re-aggregatable measures at its grain:
+
+    sum   -> sum_{col}                 re-aggregated with SUM
+    count -> count_{col} / count       re-aggregated with SUM
+    avg   -> sum_{col} + count_{col}   answered as SUM(sum) / SUM(count)
+    min   -> min_{col}, max -> max_{col}
+    count_distinct -> count_distinct_{col} (exact grain only)
+
+so a request grouping by any subset of the rollup's group_by (and
+filtering only on those columns) gives the same answer as the full table.
+
+Refreshes are incremental when a rollup has a `time_column`: groups from
+the last `refresh_periods` periods onward are recomputed and the older
+ones kept. A changed definition, or `full=True`, rebuilds from scratch.
+Each rollup has a manifest ({name}.json) recording the store table's
+loaded_at it was built from; the API only routes to rollups that match
+the table currently loaded.
+"""
+
+import os
+import json
+import hashlib
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+ROLLUPS_CONFIG = PROJECT_ROOT / "scripts" / "pipeline" / "rollups.yaml"
+ROLLUPS_DIR = PROJECT_ROOT / "data" / "processed" / "rollups"
+
+# Functions a rollup can store (same names as /api/aggregate)
+ROLLUP_FUNCTIONS = ('sum', 'avg', 'min', 'max', 'count', 'count_distinct')
+
+_definitions_cache: Dict[str, Any] = {'signature': None, 'definitions': {}}
+_manifest_cache: Dict[Path, Tuple[Any, Optional[Dict[str, Any]]]] = {}
+
+
+def _quote(identifier: str) -> str:
+    """Quote a SQL identifier"""
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def _stored_name(column: str, func: str) -> str:
+    """Stored measure column ("sum_LEASE_OIL_PROD_VOL", "count")"""
+    return func if column == '*' else f"{func}_{column}"
+
+
+def load_definitions(path: Path = ROLLUPS_CONFIG) -> Dict[str, Dict[str, Any]]:
+    """
+    Read rollup definitions (re-read when the file changes).
+
+    Returns:
+        {name: {'table', 'group_by', 'metrics': {column: [functions]},
+                'time_column', 'refresh_periods'}}
+    """
+    path = Path(path)
+    try:
+        stat = path.stat()
+    except OSError:
+        return {}
+    signature = (str(path), stat.st_mtime_ns, stat.st_size)
+    if signature == _definitions_cache['signature']:
+        return _definitions_cache['definitions']
+
+    import yaml
+
+    with open(path, 'r') as f:
+        config = yaml.safe_load(f) or {}
+
+    definitions = {}
+    for name, spec in (config.get('rollups') or {}).items():
+        metrics = {
+            str(column): [funcs] if isinstance(funcs, str) else list(funcs)
+            for column, funcs in (spec.get('metrics') or {}).items()
+        }
+        unknown = {f for funcs in metrics.values() for f in funcs if f not in ROLLUP_FUNCTIONS}
+        time_column = spec.get('time_column')
+        group_by = list(spec.get('group_by') or [])
+        if unknown or not spec.get('table') or (time_column and time_column not in group_by):
+            print(f"[WARNING] Skipping invalid rollup definition: {name}")
+            continue
+        definitions[name] = {
+            'table': spec['table'],
+            'group_by': group_by,
+            'metrics': metrics,
+            'time_column': time_column,
+            'refresh_periods': max(1, int(spec.get('refresh_periods', 1)))
+        }
+
+    _definitions_cache.update(signature=signature, definitions=definitions)
+    return definitions
+
+
+def stored_measures(metrics: Dict[str, List[str]]) -> Dict[str, str]:
+    """{stored column: SQL aggregate over the source table} for a definition"""
+    measures = {}
+    for column, funcs in metrics.items():
+        target = '*' if column == '*' else _quote(column)
+        for func in funcs:
+            if func == 'avg':
+                measures[_stored_name(column, 'sum')] = f"SUM({target})"
+                measures[_stored_name(column, 'count')] = f"COUNT({target})"
+            elif func == 'count_distinct':
+                measures[_stored_name(column, func)] = f"COUNT(DISTINCT {target})"
+            else:
+                measures[_stored_name(column, func)] = f"{func.upper()}({target})"
+    return measures
+
+
+def definition_hash(definition: Dict[str, Any]) -> str:
+    """Digest of the parts of a definition that determine the stored data"""
+    key = {k: definition[k] for k in ('table', 'group_by', 'metrics', 'time_column')}
+    return hashlib.sha1(json.dumps(key, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+
+
+def read_manifest(name: str, rollup_dir: Path = ROLLUPS_DIR) -> Optional[Dict[str, Any]]:
+    """A rollup's manifest, or None if it hasn't been materialized"""
+    path = Path(rollup_dir) / f"{name}.json"
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    signature = (stat.st_mtime_ns, stat.st_size)
+    cached = _manifest_cache.get(path)
+    if cached and cached[0] == signature:
+        return cached[1]
+    try:
+        with open(path, 'r') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = None
+    _manifest_cache[path] = (signature, manifest)
+    return manifest
+
+
+# ----------------------------------------------------------------------
+# Materialization (pipeline side)
+# ----------------------------------------------------------------------
+
+def materialize(conn, name: str, definition: Dict[str, Any], rollup_dir: Path = ROLLUPS_DIR,
+                full: bool = False) -> Dict[str, Any]:
+    """
+    Build or refresh one rollup from an open store connection.
+
+    Args:
+        conn: DuckDB connection to the analytical store
+        name: Rollup name
+        definition: Entry from load_definitions()
+        rollup_dir: Output directory
+        full: Rebuild from scratch even if an incremental refresh is possible
+
+    Returns:
+        {'status': 'built'|'refreshed'|'current'|'skipped', 'rows', 'reason', ...}
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    table = definition['table']
+    row = conn.execute(
+        "SELECT loaded_at, row_count FROM apex_catalog WHERE table_name = ?", [table]
+    ).fetchone()
+    if row is None:
+        return {'status': 'skipped', 'reason': f"table {table} is not loaded"}
+    loaded_at, source_rows = str(row[0]), row[1]
+
+    columns = {r[0] for r in conn.execute(f"DESCRIBE {_quote(table)}").fetchall()}
+    needed = set(definition['group_by']) | {c for c in definition['metrics'] if c != '*'}
+    missing = sorted(needed - columns)
+    if missing:
+        return {'status': 'skipped', 'reason': f"columns not in {table}: {missing}"}
+
+    rollup_dir = Path(rollup_dir)
+    rollup_dir.mkdir(parents=True, exist_ok=True)
+    data_path = rollup_dir / f"{name}.parquet"
+    digest = definition_hash(definition)
+    manifest = read_manifest(name, rollup_dir)
+    reusable = (not full and manifest is not None and data_path.exists()
+                and manifest.get('definition') == digest)
+
+    if reusable and manifest.get('source_loaded_at') == loaded_at:
+        return {'status': 'current', 'rows': manifest.get('rows')}
+
+    group_by = definition['group_by']
+    time_column = definition['time_column']
+    select = [_quote(c) for c in group_by] + [
+        f"{sql} AS {_quote(stored)}" for stored, sql in stored_measures(definition['metrics']).items()
+    ]
+    sql = f"SELECT {', '.join(select)} FROM {_quote(table)}"
+    group = f" GROUP BY {', '.join(_quote(c) for c in group_by)}" if group_by else ""
+
+    start = None
+    if reusable and time_column:
+        # Recompute the trailing periods already in the rollup, plus anything newer
+        periods = pq.read_table(data_path, columns=[time_column]).column(time_column).unique()
+        periods = sorted(p for p in periods.to_pylist() if p is not None)
+        if periods:
+            start = periods[-min(definition['refresh_periods'], len(periods))]
+
+    if start is not None:
+        fresh = conn.execute(f"{sql} WHERE {_quote(time_column)} >= ?{group}", [start]).fetch_arrow_table()
+        kept = pq.read_table(data_path, filters=[(time_column, '<', start)])
+        result = pa.concat_tables([kept, fresh.cast(kept.schema)])
+        status = 'refreshed'
+    else:
+        result = conn.execute(sql + group).fetch_arrow_table()
+        status = 'built'
+
+    if group_by:
+        result = result.sort_by([(c, 'ascending') for c in group_by])
+
+    # Write next to the target and swap, so readers never see a partial file
+    staging = data_path.with_suffix('.parquet.tmp')
+    pq.write_table(result, staging)
+    os.replace(staging, data_path)
+
+    manifest = {
+        'name': name,
+        'table': table,
+        'definition': digest,
+        'group_by': group_by,
+        'measures': list(stored_measures(definition['metrics'])),
+        'source_loaded_at': loaded_at,
+        'source_rows': source_rows,
+        'rows': result.num_rows,
+        'refreshed_from': start,
+        'refreshed_at': datetime.now().isoformat()
+    }
+    staging = data_path.with_suffix('.json.tmp')
+    with open(staging, 'w') as f:
+        json.dump(manifest, f, indent=2, default=str)
+    os.replace(staging, rollup_dir / f"{name}.json")
+
+    return {'status': status, 'rows': result.num_rows, 'refreshed_from': start}
+
+
+def materialize_all(conn, tables: Optional[List[str]] = None, rollup_dir: Path = ROLLUPS_DIR,
+                    full: bool = False, config: Path = ROLLUPS_CONFIG) -> Dict[str, Dict[str, Any]]:
+    """
+    Build or refresh every rollup (or those over `tables`).
+
+    Returns:
+        {name: result of materialize()}
+    """
+    results = {}
+    for name, definition in load_definitions(config).items():
+        if tables is not None and definition['table'] not in tables:
+            continue
+        try:
+            results[name] = materialize(conn, name, definition, rollup_dir, full)
+        except Exception as e:
+            results[name] = {'status': 'failed', 'reason': str(e)}
+    return results
+
+
+# ----------------------------------------------------------------------
+# Routing (API side)
+# ----------------------------------------------------------------------
+
+def _measure_sql(column: str, func: str, group_by: List[str], stored: set,
+                 exact_grain: bool) -> Optional[str]:
+    """SQL answering one requested metric from stored measures, or None"""
+    name = _stored_name(column, func)
+    if func in ('sum', 'min', 'max') and name in stored:
+        return f"{func.upper()}({_quote(name)})"
+    if func == 'count' and name in stored:
+        return f"CAST(SUM({_quote(name)}) AS BIGINT)"
+    if func == 'avg':
+        total, count = _stored_name(column, 'sum'), _stored_name(column, 'count')
+        if total in stored and count in stored:
+            return f"CAST(SUM({_quote(total)}) AS DOUBLE) / NULLIF(SUM({_quote(count)}), 0)"
+    if func == 'count_distinct':
+        if column in group_by:
+            return f"COUNT(DISTINCT {_quote(column)})"
+        if exact_grain and name in stored:
+            # One rollup row per output group
+            return f"MAX({_quote(name)})"
+    if func in ('min', 'max') and column in group_by:
+        return f"{func.upper()}({_quote(column)})"
+    return None
+
+
+def route_aggregate(table: str, loaded_at: Optional[str], group_by: List[str],
+                    metrics: Dict[str, str], filter_columns: set,
+                    rollup_dir: Path = ROLLUPS_DIR) -> Optional[Dict[str, Any]]:
+    """
+    Find the smallest current rollup that can answer an aggregation.
+
+    Args:
+        table: Store table the request resolves to
+        loaded_at: The table's current loaded_at (catalog), as a string
+        group_by: Requested group columns
+        metrics: Requested {column: function}
+        filter_columns: Columns referenced by the request's filters
+
+    Returns:
+        {'name', 'path', 'select': {output column: SQL}} or None
+    """
+    if loaded_at is None:
+        return None
+
+    best = None
+    for name, definition in load_definitions().items():
+        if definition['table'] != table:
+            continue
+        manifest = read_manifest(name, rollup_dir)
+        path = Path(rollup_dir) / f"{name}.parquet"
+        if (manifest is None or manifest.get('source_loaded_at') != loaded_at
+                or manifest.get('definition') != definition_hash(definition) or not path.exists()):
+            continue
+
+        grain = definition['group_by']
+        if not set(group_by) <= set(grain) or not set(filter_columns) <= set(grain):
+            continue
+
+        stored = set(manifest.get('measures', []))
+        exact_grain = set(group_by) == set(grain)
+        select = {}
+        for column, func in metrics.items():
+            sql = _measure_sql(column, func, grain, stored, exact_grain)
+            if sql is None:
+                break
+            select[_stored_name(column, func)] = sql
+        else:
+            if best is None or manifest.get('rows', 0) < best['rows']:
+                best = {'name': name, 'path': path, 'select': select, 'rows': manifest.get('rows', 0)}
+    return best
@@ -0,0 +1,390 @@
+"""
+Search Index
+
+Name search over the string columns dashboards type into (operator, lease
+and well names, chemical ingredients), so `/api/search` answers prefix and
+fuzzy lookups from an index instead of exact-match filters over full scans.
+
+Per dataset (the well datasets of src/well_index.py) each distinct value
+of a searched column becomes a term, keyed by its field:
+
+    SEARCH_FIELDS['operator'] = ['OperatorName', 'OPERATOR_NAME', ...]
+
+Values are matched on a normalized form (lowercase, punctuation as spaces):
+
+    "PIONEER NATURAL RES. USA, INC."  ->  "pioneer natural res usa inc"
+
+- Prefix: every query word must prefix a word of the value, so "pio nat"
+  and "natural" both find it. Words are kept sorted, so each query word is
+  a binary search for a range.
+- Fuzzy: trigrams as in PostgreSQL's pg_trgm (each word padded "  w ").
+  A value matches when it holds at least FUZZY_THRESHOLD of the query's
+  trigrams, which tolerates typos ("halliburtn", "exon mobil").
+
+Every term keeps the locations of its first MAX_TERM_POSTINGS rows as
+(file, row_group, row), the same locators as the well index (its total
+row count is kept exactly). Postings are an uncompressed Arrow file that
+the API memory-maps, so only the slices of matched terms are paged in.
+Persisted alongside the other indexes:
+
+    data/processed/search/{dataset}.postings.arrow    postings (file, row_group, row), by term
+    data/processed/search/{dataset}.terms.parquet     terms (field, value, norm, rows, postings, trigrams)
+    data/processed/search/{dataset}.words.parquet     sorted (word, term)
+    data/processed/search/{dataset}.trigrams.parquet  sorted (trigram, term)
+    data/processed/search/{dataset}.json              manifest: source file versions
+"""
+
+import os
+import re
+import json
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from src.well_index import DATA_ROOT, WELL_DATASETS, dataset_files, dataset_signature, file_columns, scan_columns
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+SEARCH_DIR = PROJECT_ROOT / "data" / "processed" / "search"
+
+# Searchable fields and the columns holding them (every present column is indexed)
+SEARCH_FIELDS = {
+    'operator': ['OperatorName', 'OPERATOR_NAME', 'OPERATOR', 'operator_name'],
+    'lease': ['LEASE_NAME', 'lease_name'],
+    'well': ['WellName', 'WELL_NAME', 'well_name'],
+    'chemical': ['IngredientName', 'TradeName', 'CommonName'],
+    'supplier': ['Supplier'],
+}
+
+SEARCH_MODES = ('prefix', 'fuzzy')
+
+# Row locators kept per term (a value's rows beyond these are only counted)
+MAX_TERM_POSTINGS = 1_000
+
+# Share of the query's trigrams a value must contain to match fuzzily
+FUZZY_THRESHOLD = 0.5
+
+_lock = threading.Lock()
+_loaded: Dict[str, Tuple[Any, 'SearchIndex']] = {}
+
+_SEPARATORS = re.compile(r'[^0-9a-z]+')
+
+
+def normalize_text(value: str) -> str:
+    """Lowercase, punctuation to spaces, whitespace collapsed"""
+    return _SEPARATORS.sub(' ', value.lower()).strip()
+
+
+def trigrams(norm: str) -> List[str]:
+    """Distinct trigrams of a normalized value (pg_trgm padding: '  word ')"""
+    grams = set()
+    for word in norm.split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return sorted(grams)
+
+
+def _paths(name: str, search_dir: Path) -> Dict[str, Path]:
+    base = Path(search_dir)
+    return {
+        'postings': base / f"{name}.postings.arrow",
+        'terms': base / f"{name}.terms.parquet",
+        'words': base / f"{name}.words.parquet",
+        'trigrams': base / f"{name}.trigrams.parquet",
+        'manifest': base / f"{name}.json",
+    }
+
+
+# ----------------------------------------------------------------------
+# Build
+# ----------------------------------------------------------------------
+
+def _searched_columns(names: List[str]) -> List[Tuple[str, str]]:
+    """(field, column) pairs present in a file"""
+    return [(field, column) for field, columns in SEARCH_FIELDS.items() for column in columns if column in names]
+
+
+def _write(table: pa.Table, path: Path):
+    import pyarrow.parquet as pq
+
+    staging = path.with_name(path.name + '.tmp')
+    pq.write_table(table, staging)
+    os.replace(staging, path)
+
+
+def _write_postings(table: pa.Table, path: Path):
+    """Uncompressed Arrow IPC file (memory-mapped by SearchIndex)"""
+    staging = path.with_name(path.name + '.tmp')
+    with pa.OSFile(str(staging), 'wb') as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(staging, path)
+
+
+def _first_postings(term: np.ndarray, kept: np.ndarray, limit: int) -> np.ndarray:
+    """Mask of the rows (in order) that keep each term under `limit` postings"""
+    order = np.argsort(term, kind='stable')
+    ordered = term[order]
+    starts = np.flatnonzero(np.r_[True, ordered[1:] != ordered[:-1]])
+    rank = np.arange(len(ordered)) - np.repeat(starts, np.diff(np.r_[starts, len(ordered)]))
+    mask = np.empty(len(term), dtype=bool)
+    mask[order] = kept[ordered] + rank < limit
+    return mask
+
+
+def build_index(name: str, data_root: Path = DATA_ROOT, search_dir: Path = SEARCH_DIR) -> Dict[str, Any]:
+    """
+    Build a dataset's search index from its parsed files.
+
+    Only the searched columns are read, and at most MAX_TERM_POSTINGS
+    locators are kept per term.
+
+    Returns:
+        Manifest {'dataset', 'files': [{'path', 'table', 'columns'}],
+                  'signature', 'terms', 'postings', 'built_at'}
+    """
+    dataset_dir = Path(data_root) / WELL_DATASETS[name]['path']
+    term_ids: Dict[Tuple[str, str], int] = {}
+    rows = np.zeros(0, np.int64)   # Rows per term
+    kept = np.zeros(0, np.int64)   # Postings kept per term
+    files, parts = [], []
+    for file_id, (path, table) in enumerate(dataset_files(name, data_root)):
+        searched = _searched_columns(file_columns(path))
+        files.append({'path': str(path.relative_to(dataset_dir)), 'table': table,
+                      'columns': {column: field for field, column in searched}})
+        if not searched:
+            continue
+
+        for row_group, start, block in scan_columns(path, [column for _, column in searched]):
+            for field, column in searched:
+                values = block.column(column)
+                if not pa.types.is_string(values.type) and not pa.types.is_large_string(values.type):
+                    values = pc.cast(values, pa.string())
+                encoded = pc.dictionary_encode(pc.utf8_trim_whitespace(values.combine_chunks()))
+                ids = np.array([term_ids.setdefault((field, value), len(term_ids)) if value else -1
+                                for value in encoded.dictionary.to_pylist()], dtype=np.int32)
+                indices = encoded.indices.to_numpy(zero_copy_only=False)
+                valid = np.flatnonzero(pc.is_valid(encoded.indices).to_numpy(zero_copy_only=False))
+                valid = valid[ids[indices[valid]] >= 0]
+                if not len(valid):
+                    continue
+                if len(term_ids) > len(rows):
+                    rows = np.pad(rows, (0, len(term_ids) - len(rows)))
+                    kept = np.pad(kept, (0, len(term_ids) - len(kept)))
+                term = ids[indices[valid]]
+                rows += np.bincount(term, minlength=len(rows))
+                valid = valid[_first_postings(term, kept, MAX_TERM_POSTINGS)]
+                if not len(valid):
+                    continue
+                kept += np.bincount(ids[indices[valid]], minlength=len(kept))
+                parts.append((ids[indices[valid]], np.full(len(valid), file_id, np.int32),
+                              np.full(len(valid), row_group, np.int32), valid.astype(np.int64) + start))
+
+    term = np.concatenate([p[0] for p in parts]) if parts else np.empty(0, np.int32)
+    order = np.argsort(term, kind='stable')
+    postings = pa.table({
+        'file': (np.concatenate([p[1] for p in parts]) if parts else np.empty(0, np.int32))[order],
+        'row_group': (np.concatenate([p[2] for p in parts]) if parts else np.empty(0, np.int32))[order],
+        'row': (np.concatenate([p[3] for p in parts]) if parts else np.empty(0, np.int64))[order],
+    })
+
+    fields, values = [k[0] for k in term_ids], [k[1] for k in term_ids]
+    norms = [normalize_text(v) for v in values]
+    grams = [trigrams(n) for n in norms]
+    terms = pa.table({
+        'field': pa.array(fields, pa.string()),
+        'value': pa.array(values, pa.string()),
+        'norm': pa.array(norms, pa.string()),
+        'rows': pa.array(np.pad(rows, (0, len(term_ids) - len(rows)))),
+        'postings': pa.array(np.pad(kept, (0, len(term_ids) - len(kept)))),
+        'trigrams': pa.array([len(g) for g in grams], pa.int32()),
+    })
+    words = [(word, i) for i, norm in enumerate(norms) for word in set(norm.split())]
+    words = pa.table({'word': pa.array([w for w, _ in words], pa.string()),
+                      'term': pa.array([i for _, i in words], pa.int32())})
+    grams = pa.table({'trigram': pa.array([g for gs in grams for g in gs], pa.string()),
+                      'term': pa.array([i for i, gs in enumerate(grams) for _ in gs], pa.int32())})
+
+    paths = _paths(name, search_dir)
+    paths['manifest'].parent.mkdir(parents=True, exist_ok=True)
+    _write_postings(postings, paths['postings'])
+    _write(terms, paths['terms'])
+    _write(words.sort_by([('word', 'ascending'), ('term', 'ascending')]), paths['words'])
+    _write(grams.sort_by([('trigram', 'ascending'), ('term', 'ascending')]), paths['trigrams'])
+
+    manifest = {
+        'dataset': name,
+        'files': files,
+        'signature': dataset_signature(name, data_root),
+        'terms': terms.num_rows,
+        'postings': postings.num_rows,
+        'built_at': datetime.now().isoformat()
+    }
+    staging = paths['manifest'].with_suffix('.json.tmp')
+    with open(staging, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(staging, paths['manifest'])
+    return manifest
+
+
+def read_manifest(name: str, search_dir: Path = SEARCH_DIR) -> Optional[Dict[str, Any]]:
+    """A dataset's search manifest, or None if it hasn't been built"""
+    try:
+        with open(_paths(name, search_dir)['manifest'], 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def is_current(name: str, data_root: Path = DATA_ROOT, search_dir: Path = SEARCH_DIR) -> bool:
+    """True if the search index exists and covers the dataset's current files"""
+    manifest = read_manifest(name, search_dir)
+    if manifest is None or not all(p.exists() for p in _paths(name, search_dir).values()):
+        return False
+    try:
+        return dataset_signature(name, data_root) == manifest['signature']
+    except OSError:
+        return False
+
+
+# ----------------------------------------------------------------------
+# Queries
+# ----------------------------------------------------------------------
+
+def _ranges(keys: np.ndarray) -> Dict[Any, Tuple[int, int]]:
+    """{key: (start, end)} over a sorted array"""
+    if not len(keys):
+        return {}
+    starts = np.concatenate([[0], np.flatnonzero(keys[1:] != keys[:-1]) + 1])
+    ends = np.append(starts[1:], len(keys))
+    return {keys[s]: (int(s), int(e)) for s, e in zip(starts, ends)}
+
+
+class SearchIndex:
+    """Search index of one dataset (terms in memory, postings memory-mapped)"""
+
+    def __init__(self, name: str, postings: pa.Table, terms: pa.Table, words: pa.Table, grams: pa.Table,
+                 manifest: Dict[str, Any]):
+        self.name = name
+        self.manifest = manifest
+        self.fields = terms.column('field').to_numpy(zero_copy_only=False)
+        self.values = terms.column('value').to_numpy(zero_copy_only=False)
+        self.rows = terms.column('rows').to_numpy()
+        self._norms = terms.column('norm').to_numpy(zero_copy_only=False)
+        self._trigram_counts = terms.column('trigrams').to_numpy()
+
+        self._words = words.column('word').to_numpy(zero_copy_only=False)
+        self._word_terms = words.column('term').to_numpy()
+        self._gram_terms = grams.column('term').to_numpy()
+        self._grams = _ranges(grams.column('trigram').to_numpy(zero_copy_only=False))
+
+        self._offsets = np.concatenate([[0], np.cumsum(terms.column('postings').to_numpy())])
+        self._file = postings.column('file').to_numpy()
+        self._row_group = postings.column('row_group').to_numpy()
+        self._row = postings.column('row').to_numpy()
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def _in_fields(self, found: np.ndarray, fields: Optional[List[str]]) -> np.ndarray:
+        return found if not fields else found[np.isin(self.fields[found], fields)]
+
+    def prefix(self, query: str, fields: Optional[List[str]] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Terms with a word starting with each query word.
+
+        Returns:
+            (term ids, scores): 1.0 for the value itself, 0.9 for values
+            starting with the query, 0.8 for word matches
+        """
+        norm = normalize_text(query)
+        if not norm:
+            return np.empty(0, np.int64), np.empty(0)
+        found = None
+        for word in set(norm.split()):
+            lo, hi = np.searchsorted(self._words, [word, word + '\uffff'])
+            matched = np.unique(self._word_terms[lo:hi])
+            found = matched if found is None else np.intersect1d(found, matched, assume_unique=True)
+            if not len(found):
+                break
+        found = self._in_fields(found, fields)
+        norms = self._norms[found]
+        scores = np.where(norms == norm, 1.0,
+                          np.where(np.char.startswith(norms.astype(str), norm), 0.9, 0.8)) if len(found) else np.empty(0)
+        return found, scores
+
+    def fuzzy(self, query: str, fields: Optional[List[str]] = None,
+              threshold: float = FUZZY_THRESHOLD) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Terms sharing at least `threshold` of the query's trigrams.
+
+        Returns:
+            (term ids, scores): mean of the share of the query's trigrams
+            found and the trigram similarity (which favours closer lengths)
+        """
+        grams = trigrams(normalize_text(query))
+        ranges = [self._grams[g] for g in grams if g in self._grams]
+        if not ranges:
+            return np.empty(0, np.int64), np.empty(0)
+        hits = np.concatenate([self._gram_terms[s:e] for s, e in ranges])
+        shared = np.bincount(hits, minlength=len(self.values))
+        found = np.flatnonzero(shared >= threshold * len(grams))
+        found = self._in_fields(found, fields)
+        shared = shared[found]
+        similarity = shared / (len(grams) + self._trigram_counts[found] - shared)
+        return found, (shared / len(grams) + similarity) / 2
+
+    def locators(self, term: int, limit: int) -> List[Dict[str, Any]]:
+        """Row locators of a term, grouped by file and row group: [{file, table, row_group, rows}]"""
+        start = self._offsets[term]
+        end = min(self._offsets[term + 1], start + limit)
+        files, row_groups, rows = self._file[start:end], self._row_group[start:end], self._row[start:end]
+        boundaries = np.flatnonzero((files[1:] != files[:-1]) | (row_groups[1:] != row_groups[:-1])) + 1
+        result = []
+        for lo, hi in zip(np.concatenate([[0], boundaries]), np.append(boundaries, len(rows))):
+            if hi <= lo:
+                continue
+            info = self.manifest['files'][files[lo]]
+            result.append({'file': info['path'], 'table': info['table'], 'row_group': int(row_groups[lo]),
+                           'rows': rows[lo:hi].tolist()})
+        return result
+
+
+def get_index(name: str, token: Any = None, data_root: Path = DATA_ROOT,
+              search_dir: Path = SEARCH_DIR) -> Optional[SearchIndex]:
+    """
+    Load a dataset's search index, building it if it is missing or stale.
+
+    Args:
+        name: Key in WELL_DATASETS
+        token: Cheap version token of the dataset; while it is unchanged the
+               loaded index is reused without checking files
+    """
+    cached = _loaded.get(name)
+    if cached is not None and token is not None and cached[0] == token:
+        return cached[1]
+
+    with _lock:
+        cached = _loaded.get(name)
+        if cached is not None and token is not None and cached[0] == token:
+            return cached[1]
+        if name not in WELL_DATASETS or not dataset_files(name, data_root):
+            _loaded.pop(name, None)
+            return None
+
+        import pyarrow.parquet as pq
+
+        if not is_current(name, data_root, search_dir):
+            build_index(name, data_root, search_dir)
+        paths = _paths(name, search_dir)
+        postings = pa.ipc.open_file(pa.memory_map(str(paths['postings']), 'r')).read_all()
+        index = SearchIndex(name, postings, pq.read_table(paths['terms']),
+                            pq.read_table(paths['words']), pq.read_table(paths['trigrams']),
+                            read_manifest(name, search_dir))
+        _loaded[name] = (token, index)
+        return index
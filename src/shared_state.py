@@ -11,30 +11,62 @@ This module handles:
 - User preferences storage
 """
 
+import copy
 import json
+import sqlite3
+import uuid
+import zlib
+from contextlib import contextmanager
 from pathlib import Path
 from datetime import datetime, timedelta
-from typing import Dict, Optional, Any, List
+from typing import Dict, Optional, Any, List, Iterable
 import os
 
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+
 class PipelineState:
     """
     Shared state manager for pipeline context and UI tools communication.
 
     Uses a simple file-based approach for maximum compatibility and simplicity.
-    State is stored in user home directory to persist across sessions.
+    State is stored in user home directory to persist across sessions; the
+    pipeline context lives in a compact SQLite store with lazy per-source reads.
     """
 
     # State file location - in user home for persistence
     STATE_DIR = Path.home() / '.apex_eor'
+    STORE_FILE = STATE_DIR / 'pipeline_context.db'
+    PREFERENCES_FILE = STATE_DIR / 'user_preferences.json'
+
+    # Legacy JSON context files (read-only fallback for older installs)
     STATE_FILE = STATE_DIR / 'pipeline_state.json'
     CONTEXT_FILE = STATE_DIR / 'pipeline_context.json'
-    PREFERENCES_FILE = STATE_DIR / 'user_preferences.json'
+
+    # Context store format version
+    STORE_VERSION = '3.0'
 
     # Stale threshold - context older than this is considered stale
     STALE_HOURS = 24
 
+    # Seconds a writer waits for another process to finish saving
+    WRITE_LOCK_TIMEOUT = 60.0
+
+    # Memoized store index (see _read_store)
+    _store_cache: Dict[str, Any] = {}
+
     @classmethod
     def ensure_directories(cls):
         """Ensure state directories exist"""
@@ -45,6 +77,12 @@ class PipelineState:
         """
         Save pipeline context for UI tools to consume.
 
+        The context is written to a compact SQLite store: one compressed
+        entry per data source plus one per top-level key. The file is built
+        next to the live store and swapped in atomically, so readers never
+        see a partial write. Writers (e.g. the catalog watchers of several
+        API workers) take turns, see _write_lock().
+
         Args:
             context: Pipeline context dictionary
 
@@ -52,27 +90,73 @@ class PipelineState:
             True if saved successfully, False otherwise
         """
         cls.ensure_directories()
+        try:
+            with cls._write_lock():
+                return cls._write_store(context)
+        except sqlite3.Error as e:
+            print(f"[ERROR] Error saving context: {e}")
+            return False
 
+    @classmethod
+    @contextmanager
+    def _write_lock(cls):
+        """
+        Hold the context write lock, shared by all processes.
+
+        An exclusive transaction on a SQLite lock file next to the store:
+        portable, and released by the OS if its holder dies.
+        """
+        cls.ensure_directories()
+        conn = sqlite3.connect(str(cls.STORE_FILE.with_suffix('.lock')),
+                               timeout=cls.WRITE_LOCK_TIMEOUT, isolation_level=None)
         try:
-            # Add metadata
-            state = {
-                'context': context,
+            conn.execute('BEGIN EXCLUSIVE')
+            yield
+        finally:
+            conn.close()
+
+    @classmethod
+    def _write_store(cls, context: Dict) -> bool:
+        """Build the store in a private temporary file and swap it in (hold _write_lock)"""
+        tmp_file = cls.STORE_FILE.with_name(f"{cls.STORE_FILE.name}.{os.getpid()}.{uuid.uuid4().hex[:8]}.tmp")
+        try:
+            codec = _default_codec()
+            rows = [
+                ('context', key, _encode(value, codec))
+                for key, value in context.items() if key != 'data_sources'
+            ]
+            rows += [
+                ('source', name, _encode(source, codec))
+                for name, source in context.get('data_sources', {}).items()
+            ]
+            meta = {
                 'timestamp': datetime.now().isoformat(),
-                'version': '2.0'
+                'version': cls.STORE_VERSION,
+                'codec': codec
             }
 
-            # Save to both files for compatibility
-            with open(cls.STATE_FILE, 'w') as f:
-                json.dump(state, f, indent=2)
-
-            with open(cls.CONTEXT_FILE, 'w') as f:
-                json.dump(context, f, indent=2)
-
-            print(f"[OK] Context saved to {cls.STATE_FILE}")
+            conn = sqlite3.connect(str(tmp_file))
+            try:
+                conn.execute('CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)')
+                conn.execute(
+                    'CREATE TABLE entries (section TEXT, name TEXT, payload BLOB, '
+                    'PRIMARY KEY (section, name))'
+                )
+                conn.executemany('INSERT INTO meta VALUES (?, ?)', meta.items())
+                conn.executemany('INSERT INTO entries VALUES (?, ?, ?)', rows)
+                conn.commit()
+            finally:
+                conn.close()
+
+            os.replace(tmp_file, cls.STORE_FILE)
+
+            print(f"[OK] Context saved to {cls.STORE_FILE}")
             return True
 
         except Exception as e:
             print(f"[ERROR] Error saving context: {e}")
+            if tmp_file.exists():
+                tmp_file.unlink()
             return False
 
     @classmethod
@@ -80,43 +164,81 @@ class PipelineState:
         """
         Load pipeline context for UI tools.
 
+        Reads are memoized per process and keyed on the store's mtime/size,
+        so repeated calls only hit the disk after the context is re-saved.
+        The returned source dictionaries are shared with the cache - copy
+        them before mutating.
+
         Args:
             check_freshness: If True, warn about stale context
 
         Returns:
             Context dictionary or None if not found/error
         """
-        if not cls.STATE_FILE.exists():
-            # Try legacy location for backward compatibility
-            if cls.CONTEXT_FILE.exists():
-                try:
-                    with open(cls.CONTEXT_FILE, 'r') as f:
-                        return json.load(f)
-                except:
-                    pass
+        try:
+            store = cls._read_store()
+        except Exception as e:
+            print(f"[ERROR] Error loading context: {e}")
+            return None
+
+        if store is None:
+            return cls._load_legacy_context(check_freshness)
+
+        if check_freshness:
+            cls._report_freshness(store['meta']['timestamp'])
+
+        try:
+            context = dict(store['context'])
+            context['data_sources'] = {
+                name: cls._read_source(store, name) for name in store['source_names']
+            }
+            return context
+        except Exception as e:
+            print(f"[ERROR] Error loading context: {e}")
             return None
 
+    @classmethod
+    def list_sources(cls) -> List[str]:
+        """
+        List data source names in the saved context without decoding them.
+
+        Returns:
+            Source names (empty list if no context exists)
+        """
         try:
-            with open(cls.STATE_FILE, 'r') as f:
-                state = json.load(f)
+            store = cls._read_store()
+        except Exception:
+            return []
+
+        if store is None:
+            context = cls._load_legacy_context(check_freshness=False) or {}
+            return list(context.get('data_sources', {}).keys())
+
+        return list(store['source_names'])
 
-            # Check freshness if requested
-            if check_freshness:
-                timestamp = datetime.fromisoformat(state['timestamp'])
-                age = datetime.now() - timestamp
+    @classmethod
+    def load_source(cls, name: str) -> Optional[Dict]:
+        """
+        Load a single data source entry from the saved context.
 
-                if age > timedelta(hours=cls.STALE_HOURS):
-                    hours_old = int(age.total_seconds() / 3600)
-                    print(f"[WARNING] Context is {hours_old} hours old (threshold: {cls.STALE_HOURS} hours)")
-                    print(f"   Consider running: python run_ingestion.py --generate-context")
-                else:
-                    hours_old = int(age.total_seconds() / 3600)
-                    print(f"[OK] Context loaded ({hours_old} hours old)")
+        Only that source's payload is read and decoded.
 
-            return state.get('context')
+        Args:
+            name: Data source name (key in context['data_sources'])
 
+        Returns:
+            Source dictionary or None if not found
+        """
+        try:
+            store = cls._read_store()
+            if store is None:
+                context = cls._load_legacy_context(check_freshness=False) or {}
+                return context.get('data_sources', {}).get(name)
+            if name not in store['source_names']:
+                return None
+            return cls._read_source(store, name)
         except Exception as e:
-            print(f"[ERROR] Error loading context: {e}")
+            print(f"[ERROR] Error loading source {name}: {e}")
             return None
 
     @classmethod
@@ -127,19 +249,141 @@ class PipelineState:
         Returns:
             Age as timedelta or None if no context exists
         """
-        if not cls.STATE_FILE.exists():
+        try:
+            store = cls._read_store()
+            if store is not None:
+                timestamp = store['meta']['timestamp']
+            else:
+                state = cls._load_legacy_state()
+                if state is None:
+                    return None
+                timestamp = state['timestamp']
+
+            return datetime.now() - datetime.fromisoformat(timestamp)
+
+        except Exception:
             return None
 
+    @classmethod
+    def has_context(cls) -> bool:
+        """Check whether any saved context exists (store or legacy JSON)"""
+        return cls.STORE_FILE.exists() or cls.STATE_FILE.exists() or cls.CONTEXT_FILE.exists()
+
+    # ------------------------------------------------------------------
+    # Store internals
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def _read_store(cls) -> Optional[Dict[str, Any]]:
+        """
+        Return the memoized store index, re-reading it if the file changed.
+
+        Only metadata, source names and the (small) top-level keys are read
+        here; source payloads are decoded lazily by _read_source().
+        """
         try:
-            with open(cls.STATE_FILE, 'r') as f:
-                state = json.load(f)
+            stat = cls.STORE_FILE.stat()
+        except OSError:
+            cls._store_cache = {}
+            return None
+
+        # The inode changes on every save (os.replace), even within the mtime resolution
+        signature = (str(cls.STORE_FILE), stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        if cls._store_cache.get('signature') == signature:
+            return cls._store_cache
+
+        conn = cls._connect_store()
+        try:
+            meta = dict(conn.execute('SELECT key, value FROM meta'))
+            codec = meta.get('codec', 'zlib')
+            context = {
+                name: _decode(payload, codec)
+                for name, payload in conn.execute(
+                    "SELECT name, payload FROM entries WHERE section = 'context'"
+                )
+            }
+            source_names = [
+                row[0] for row in conn.execute(
+                    "SELECT name FROM entries WHERE section = 'source' ORDER BY rowid"
+                )
+            ]
+        finally:
+            conn.close()
+
+        cls._store_cache = {
+            'signature': signature,
+            'meta': meta,
+            'context': context,
+            'source_names': source_names,
+            'sources': {}
+        }
+        return cls._store_cache
+
+    @classmethod
+    def _read_source(cls, store: Dict[str, Any], name: str) -> Optional[Dict]:
+        """Decode one source payload, memoized on the store index"""
+        if name in store['sources']:
+            return store['sources'][name]
+
+        conn = cls._connect_store()
+        try:
+            row = conn.execute(
+                "SELECT payload FROM entries WHERE section = 'source' AND name = ?", (name,)
+            ).fetchone()
+        finally:
+            conn.close()
+
+        source = _decode(row[0], store['meta'].get('codec', 'zlib')) if row else None
+        store['sources'][name] = source
+        return source
 
-            timestamp = datetime.fromisoformat(state['timestamp'])
-            return datetime.now() - timestamp
+    @classmethod
+    def _connect_store(cls) -> sqlite3.Connection:
+        """Open the context store read-only"""
+        return sqlite3.connect(f"{cls.STORE_FILE.resolve().as_uri()}?mode=ro", uri=True)
 
+    @classmethod
+    def _load_legacy_state(cls) -> Optional[Dict]:
+        """Read the pre-store JSON state file ({'context', 'timestamp', ...})"""
+        if not cls.STATE_FILE.exists():
+            return None
+        try:
+            with open(cls.STATE_FILE, 'r') as f:
+                return json.load(f)
         except Exception:
             return None
 
+    @classmethod
+    def _load_legacy_context(cls, check_freshness: bool) -> Optional[Dict]:
+        """Load context from the JSON files written by older versions"""
+        state = cls._load_legacy_state()
+        if state is None:
+            # Try legacy location for backward compatibility
+            if cls.CONTEXT_FILE.exists():
+                try:
+                    with open(cls.CONTEXT_FILE, 'r') as f:
+                        return json.load(f)
+                except:
+                    pass
+            return None
+
+        if check_freshness and 'timestamp' in state:
+            cls._report_freshness(state['timestamp'])
+
+        return state.get('context')
+
+    @classmethod
+    def _report_freshness(cls, timestamp: str):
+        """Print a freshness warning/confirmation for a context timestamp"""
+        age = datetime.now() - datetime.fromisoformat(timestamp)
+        hours_old = int(age.total_seconds() / 3600)
+
+        if age > timedelta(hours=cls.STALE_HOURS):
+            print(f"[WARNING] Context is {hours_old} hours old (threshold: {cls.STALE_HOURS} hours)")
+            print(f"   Consider running: python run_ingestion.py --generate-context")
+        else:
+            print(f"[OK] Context loaded ({hours_old} hours old)")
+
     @classmethod
     def is_context_fresh(cls, max_age_hours: int = None) -> bool:
         """
@@ -160,6 +404,67 @@ class PipelineState:
 
         return age < timedelta(hours=max_age_hours)
 
+    @classmethod
+    def apply_path_changes(cls, changed_paths: Iterable[Path]) -> bool:
+        """
+        Apply filesystem changes to the saved context without a full rescan.
+
+        Only the directory-structure nodes on the changed paths are touched,
+        and a changed metadata.json is re-read for its own dataset. Brand new
+        datasets still require `run_ingestion.py --generate-context`.
+
+        The read and the save happen under the write lock, so processes
+        applying changes at the same time don't overwrite each other's.
+
+        Args:
+            changed_paths: Absolute paths that were created, modified or deleted
+
+        Returns:
+            True if the context changed and was saved, False otherwise
+        """
+        with cls._write_lock():
+            return cls._apply_path_changes(changed_paths)
+
+    @classmethod
+    def _apply_path_changes(cls, changed_paths: Iterable[Path]) -> bool:
+        """apply_path_changes() body (hold _write_lock)"""
+        context = cls.load_context(check_freshness=False)
+        if context is None:
+            return False
+
+        # load_context() shares source dicts with the read cache
+        context = copy.deepcopy(context)
+        changed_paths = [Path(p).resolve() for p in changed_paths]
+        changed = False
+
+        for source_data in context.get('data_sources', {}).values():
+            if not isinstance(source_data, dict) or not source_data.get('path'):
+                continue
+
+            source_root = Path(source_data['path'])
+            if not source_root.is_absolute():
+                source_root = PROJECT_ROOT / source_root
+            source_root = source_root.resolve()
+
+            for path in changed_paths:
+                try:
+                    parts = path.relative_to(source_root).parts
+                except ValueError:
+                    continue
+                if not parts:
+                    continue
+
+                if parts == ('metadata.json',):
+                    changed |= _reload_source_metadata(source_data, path)
+
+                tree = source_data.get('directory_structure')
+                if isinstance(tree, dict) and 'subdirs' in tree:
+                    changed |= _patch_directory_tree(tree, parts, path)
+
+        if not changed:
+            return False
+        return cls._write_store(context)
+
     @classmethod
     def save_preferences(cls, preferences: Dict) -> bool:
         """
@@ -220,10 +525,10 @@ class PipelineState:
             True if cleared successfully, False otherwise
         """
         try:
-            if cls.STATE_FILE.exists():
-                cls.STATE_FILE.unlink()
-            if cls.CONTEXT_FILE.exists():
-                cls.CONTEXT_FILE.unlink()
+            for state_file in (cls.STORE_FILE, cls.STATE_FILE, cls.CONTEXT_FILE):
+                if state_file.exists():
+                    state_file.unlink()
+            cls._store_cache = {}
             print("[OK] State cleared")
             return True
         except Exception as e:
@@ -239,7 +544,7 @@ class PipelineState:
             Dictionary with state summary
         """
         summary = {
-            'has_context': cls.STATE_FILE.exists() or cls.CONTEXT_FILE.exists(),
+            'has_context': cls.has_context(),
             'context_age': None,
             'is_fresh': False,
             'has_preferences': cls.PREFERENCES_FILE.exists(),
@@ -440,6 +745,146 @@ class SessionState:
         return cls.save_session(session)
 
 
+def _default_codec() -> str:
+    """Pick the best available compression for new context stores"""
+    return 'zstd' if zstandard is not None else 'zlib'
+
+
+def _encode(value: Any, codec: str) -> bytes:
+    """Serialize a context entry to compact, compressed bytes"""
+    if orjson is not None:
+        data = orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS)
+    else:
+        data = json.dumps(value, separators=(',', ':'), default=str).encode('utf-8')
+
+    if codec == 'zstd':
+        return zstandard.ZstdCompressor(level=6).compress(data)
+    return zlib.compress(data, 6)
+
+
+def _decode(payload: bytes, codec: str) -> Any:
+    """Inverse of _encode()"""
+    if codec == 'zstd':
+        if zstandard is None:
+            raise RuntimeError("Context store is zstd-compressed but zstandard is not installed")
+        data = zstandard.ZstdDecompressor().decompress(payload)
+    else:
+        data = zlib.decompress(payload)
+
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _format_bytes(size: float) -> str:
+    """Format bytes to human readable string (matches IngestionPipeline)"""
+    for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
+        if size < 1024.0:
+            return f"{size:.2f} {unit}"
+        size /= 1024.0
+    return f"{size:.2f} PB"
+
+
+def _reload_source_metadata(source_data: Dict, metadata_file: Path) -> bool:
+    """Refresh a dataset's context entry from its metadata.json"""
+    if not metadata_file.exists():
+        return False
+
+    try:
+        with open(metadata_file, 'r') as f:
+            metadata = json.load(f)
+    except Exception as e:
+        print(f"[WARNING] Could not reload {metadata_file}: {e}")
+        return False
+
+    # Keep the keys added by context generation, replace everything else
+    preserved = {key: source_data[key]
+                 for key in ('display_name', 'path', 'status', 'directory_structure')
+                 if key in source_data}
+    source_data.clear()
+    source_data.update(metadata)
+    source_data.update(preserved)
+    return True
+
+
+def _patch_directory_tree(tree: Dict, parts: tuple, abs_path: Path) -> bool:
+    """
+    Patch a scan_directory_structure() tree for one changed path.
+
+    Args:
+        tree: Root node ({'subdirs': {...}, 'files': [...], ...})
+        parts: Path components relative to the tree root
+        abs_path: Absolute path on disk (used to stat the new state)
+
+    Returns:
+        True if the tree was modified
+    """
+    node = tree
+    for part in parts[:-1]:
+        if node.get('_truncated'):
+            return False
+        subdirs = node.setdefault('subdirs', {})
+        if part not in subdirs:
+            if not abs_path.exists():
+                return False
+            subdirs[part] = _new_directory_node(node, part)
+            node['dir_count'] = len(subdirs)
+        node = subdirs[part]
+
+    if node.get('_truncated'):
+        return False
+
+    name = parts[-1]
+    subdirs = node.setdefault('subdirs', {})
+    files = node.setdefault('files', [])
+
+    existed = any(f.get('name') == name for f in files)
+    files[:] = [f for f in files if f.get('name') != name]
+
+    if abs_path.is_dir():
+        if name in subdirs:
+            return False
+        subdirs[name] = _new_directory_node(node, name)
+    else:
+        removed_dir = subdirs.pop(name, None) is not None
+        if abs_path.is_file():
+            try:
+                size = abs_path.stat().st_size
+            except OSError:
+                return existed
+            files.append({
+                'name': name,
+                'size_bytes': size,
+                'size_human': _format_bytes(size),
+                'extension': abs_path.suffix
+            })
+            # Truncation markers stay at the end of the listing
+            files.sort(key=lambda f: (f.get('_truncated', False), f.get('name', '')))
+            if not existed:
+                node['file_count'] = node.get('file_count', 0) + 1
+        elif existed:
+            node['file_count'] = max(node.get('file_count', 1) - 1, 0)
+        elif not removed_dir:
+            return False
+
+    node['dir_count'] = len(subdirs)
+    return True
+
+
+def _new_directory_node(parent: Dict, name: str) -> Dict:
+    """Create an empty directory node in scan_directory_structure() format"""
+    parent_path = parent.get('path', '.')
+    return {
+        'type': 'directory',
+        'name': name,
+        'path': name if parent_path in ('', '.') else f"{parent_path}/{name}",
+        'subdirs': {},
+        'files': [],
+        'file_count': 0,
+        'dir_count': 0
+    }
+
+
 def print_state_info():
     """Print current state information (useful for debugging)"""
     print("\n" + "="*60)
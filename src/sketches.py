@@ -0,0 +1,481 @@
+"""
+Approximate Query Sketches
+
+Load-time summaries of analytical-store tables, so exploratory
+/api/aggregate requests (approximate=true) are answered in milliseconds
+with error bounds instead of scanning the whole table:
+
+- A uniform sample of SAMPLE_ROWS rows answers any group_by/filter
+  combination. Counts and sums are scaled by rows / sample rows, with a
+  normal-approximation interval of the scaled estimator; averages get the
+  interval of the mean, and quantiles (median, p90, ...) a
+  distribution-free order-statistic interval. Sample minima, maxima and
+  distinct counts only bound one side.
+- A HyperLogLog sketch per column gives whole-table distinct counts.
+- A Count-Min sketch per (non-float) column gives whole-table counts of
+  its most frequent values, whose candidates come from the sample. Counts
+  never undercount and overcount by at most e / width of the rows with
+  probability 1 - e**-depth.
+
+Every answer carries {metric}_low / {metric}_high bounds at CONFIDENCE
+(None where a side is unbounded). Tables no larger than the sample are
+kept whole and answered exactly.
+
+Sketches are built in one scan plus one sampling query when a table is
+loaded (scripts/pipeline/load.py); the manifest ({table}.json) records
+the table's loaded_at, and the API only uses sketches of the table that
+is currently loaded.
+"""
+
+import os
+import json
+import math
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+SKETCH_DIR = PROJECT_ROOT / "data" / "processed" / "sketches"
+
+# HyperLogLog registers = 2**precision (relative error ~1.04 / sqrt(registers))
+HLL_PRECISION = 14
+
+# Count-Min cells per row and rows: overcount <= e / width * rows with
+# probability 1 - e**-depth
+CM_WIDTH = 1 << 16
+CM_DEPTH = 5
+
+# Uniform sample kept per table
+SAMPLE_ROWS = 200_000
+SAMPLE_SEED = 0
+
+# Frequent values kept per column
+TOP_VALUES = 100
+
+SCAN_BATCH_ROWS = 1_000_000
+
+# Coverage of the reported bounds, and the matching normal quantile
+CONFIDENCE = 0.95
+Z = 1.959963984540054
+
+# Quantile aggregates (approximate mode only)
+QUANTILE_FUNCTIONS = {
+    'p01': 0.01, 'p05': 0.05, 'p10': 0.1, 'p25': 0.25, 'median': 0.5,
+    'p75': 0.75, 'p90': 0.9, 'p95': 0.95, 'p99': 0.99,
+}
+
+# Functions of approximate aggregations (/api/aggregate names plus quantiles)
+APPROXIMATE_FUNCTIONS = ('sum', 'avg', 'min', 'max', 'count', 'count_distinct') + tuple(QUANTILE_FUNCTIONS)
+
+_manifest_cache: Dict[Path, Tuple[Any, Optional[Dict[str, Any]]]] = {}
+
+
+def _quote(identifier: str) -> str:
+    """Quote a SQL identifier"""
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def _output_name(column: str, func: str) -> str:
+    """Output column of a metric ("sum_LEASE_OIL_PROD_VOL", "count")"""
+    return func if column == '*' else f"{func}_{column}"
+
+
+def value_counts(values: pa.Array) -> Tuple[pa.Array, np.ndarray]:
+    """Distinct non-null values of an array and how often each occurs"""
+    if pa.types.is_dictionary(values.type):
+        values = values.dictionary_decode()
+    counts = pc.value_counts(values.drop_null())
+    return counts.field('values'), counts.field('counts').to_numpy()
+
+
+def hash_values(values: pa.Array) -> np.ndarray:
+    """uint64 hashes of an array's values (stable across processes)"""
+    return pd.util.hash_array(values.to_numpy(zero_copy_only=False))
+
+
+# ----------------------------------------------------------------------
+# HyperLogLog
+# ----------------------------------------------------------------------
+
+def _sigma(x: float) -> float:
+    if x == 1:
+        return math.inf
+    y, z = 1.0, x
+    while True:
+        x *= x
+        previous = z
+        z += x * y
+        y += y
+        if z == previous:
+            return z
+
+
+def _tau(x: float) -> float:
+    if x == 0 or x == 1:
+        return 0.0
+    y, z = 1.0, 1 - x
+    while True:
+        x = math.sqrt(x)
+        previous = z
+        y *= 0.5
+        z -= (1 - x) ** 2 * y
+        if z == previous:
+            return z / 3
+
+
+class HyperLogLog:
+    """HyperLogLog distinct-count sketch over 64-bit hashes"""
+
+    def __init__(self, precision: int = HLL_PRECISION):
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def add_hashes(self, hashes: np.ndarray):
+        """Add uint64 hashes (duplicates are harmless)"""
+        if len(hashes) == 0:
+            return
+        hashes = hashes.astype(np.uint64, copy=False)
+        width = 64 - self.precision
+        index = (hashes >> np.uint64(width)).astype(np.int64)
+        rest = hashes & np.uint64((1 << width) - 1)
+
+        # Exact bit length of the remaining bits (float log2 rounds near 2**k)
+        bits = np.zeros(len(rest), dtype=np.int64)
+        for shift in (32, 16, 8, 4, 2, 1):
+            high = rest >= np.uint64(1 << shift)
+            bits[high] += shift
+            rest = np.where(high, rest >> np.uint64(shift), rest)
+        bits += (rest > 0)
+        rank = (width - bits + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+
+    def add(self, values: pa.Array):
+        """Add the distinct non-null values of an Arrow array"""
+        values = pc.unique(values.drop_null())
+        if len(values) == 0:
+            return
+        if pa.types.is_dictionary(values.type):
+            values = values.dictionary_decode()
+        self.add_hashes(hash_values(values))
+
+    def estimate(self) -> int:
+        """
+        Distinct count via Ertl's improved estimator ("New cardinality
+        estimation algorithms for HyperLogLog sketches", 2017), which is
+        unbiased across the whole range without empirical bias tables.
+        """
+        m = len(self.registers)
+        q = 64 - self.precision
+        counts = np.bincount(self.registers, minlength=q + 2).astype(np.float64)
+        if counts[0] == m:
+            return 0
+
+        z = m * _tau(1 - counts[q + 1] / m)
+        for k in range(q, 0, -1):
+            z = 0.5 * (z + counts[k])
+        z += m * _sigma(counts[0] / m)
+        return int(round(m * m / (2 * math.log(2)) / z))
+
+    @property
+    def relative_error(self) -> float:
+        return 1.04 / math.sqrt(len(self.registers))
+
+
+# ----------------------------------------------------------------------
+# Count-Min
+# ----------------------------------------------------------------------
+
+class CountMin:
+    """Count-Min frequency sketch over 64-bit hashes"""
+
+    def __init__(self, width: int = CM_WIDTH, depth: int = CM_DEPTH):
+        self.width = width
+        self.counts = np.zeros((depth, width), dtype=np.int64)
+        self.total = 0
+
+    def _cells(self, hashes: np.ndarray) -> np.ndarray:
+        """Cell of each hash in each row (double hashing over the two 32-bit halves)"""
+        hashes = hashes.astype(np.uint64, copy=False)
+        low = hashes & np.uint64(0xFFFFFFFF)
+        high = (hashes >> np.uint64(32)) | np.uint64(1)
+        rows = np.arange(len(self.counts), dtype=np.uint64)[:, None]
+        return ((low + rows * high) % np.uint64(self.width)).astype(np.int64)
+
+    def add_hashes(self, hashes: np.ndarray, counts: np.ndarray):
+        """Add `counts` occurrences of each hash"""
+        if len(hashes) == 0:
+            return
+        for row, cells in enumerate(self._cells(hashes)):
+            self.counts[row] += np.bincount(cells, weights=counts, minlength=self.width).astype(np.int64)
+        self.total += int(counts.sum())
+
+    def estimate(self, hashes: np.ndarray) -> np.ndarray:
+        """Counts of the hashed values (never below the true count)"""
+        cells = self._cells(hashes)
+        return self.counts[np.arange(len(cells))[:, None], cells].min(axis=0)
+
+    @property
+    def error(self) -> int:
+        """Overcount bound in rows, holding with probability 1 - e**-depth"""
+        return int(math.ceil(math.e / self.width * self.total))
+
+
+# ----------------------------------------------------------------------
+# Build (pipeline side)
+# ----------------------------------------------------------------------
+
+def _top_values(sample: pa.ChunkedArray, sketch: CountMin, complete: bool) -> Dict[str, Any]:
+    """Most frequent values: candidates from the sample, counts from the sketch"""
+    values, counts = value_counts(sample.combine_chunks())
+    candidates = np.argsort(-counts, kind='stable')[:2 * TOP_VALUES]
+    values = values.take(pa.array(candidates))
+    if complete:
+        estimates, error = counts[candidates], 0
+    else:
+        estimates, error = sketch.estimate(hash_values(values)), sketch.error
+    keep = np.argsort(-estimates, kind='stable')[:TOP_VALUES]
+    return {
+        'values': values.take(pa.array(keep)).to_pylist(),
+        'counts': [int(c) for c in estimates[keep]],
+        'error': error
+    }
+
+
+def build_sketches(conn, table: str, sketch_dir: Path = SKETCH_DIR) -> Dict[str, Any]:
+    """
+    Build a store table's sample and sketches from an open store connection.
+
+    Args:
+        conn: DuckDB connection to the analytical store
+        table: Loaded store table
+        sketch_dir: Output directory
+
+    Returns:
+        The manifest: {'table', 'source_loaded_at', 'rows', 'sample_rows',
+        'columns': {name: {'distinct': {...}, 'top': {...}}}, ...}
+    """
+    import pyarrow.parquet as pq
+
+    row = conn.execute("SELECT loaded_at FROM apex_catalog WHERE table_name = ?", [table]).fetchone()
+    if row is None:
+        raise ValueError(f"table {table} is not loaded")
+    loaded_at = str(row[0])
+
+    # One scan feeds the distinct-count and frequency sketches of every column
+    reader = conn.execute(f"SELECT * FROM {_quote(table)}").fetch_record_batch(SCAN_BATCH_ROWS)
+    schema = reader.schema
+    distinct = {f.name: HyperLogLog() for f in schema if not pa.types.is_nested(f.type)}
+    frequent = {f.name: CountMin() for f in schema
+                if f.name in distinct and not pa.types.is_floating(f.type)}
+    rows = 0
+    for batch in reader:
+        rows += batch.num_rows
+        for name, sketch in distinct.items():
+            values, counts = value_counts(batch.column(name))
+            hashes = hash_values(values)
+            sketch.add_hashes(hashes)
+            if name in frequent:
+                frequent[name].add_hashes(hashes, counts)
+
+    sample = conn.execute(
+        f"SELECT * FROM {_quote(table)} USING SAMPLE reservoir({SAMPLE_ROWS} ROWS) REPEATABLE ({SAMPLE_SEED})"
+    ).fetch_arrow_table()
+    complete = sample.num_rows >= rows
+
+    columns = {}
+    for name, sketch in distinct.items():
+        if complete:
+            estimate, error = pc.count_distinct(sample.column(name)).as_py(), 0
+        else:
+            estimate = sketch.estimate()
+            error = int(math.ceil(Z * sketch.relative_error * estimate))
+        entry: Dict[str, Any] = {'distinct': {'estimate': estimate, 'error': error}}
+        if name in frequent:
+            entry['top'] = _top_values(sample.column(name), frequent[name], complete)
+        columns[name] = entry
+
+    sketch_dir = Path(sketch_dir)
+    sketch_dir.mkdir(parents=True, exist_ok=True)
+
+    # Write next to the targets and swap, so readers never see partial files
+    data_path = sketch_dir / f"{table}.parquet"
+    staging = data_path.with_suffix('.parquet.tmp')
+    pq.write_table(sample, staging)
+    os.replace(staging, data_path)
+
+    manifest = {
+        'table': table,
+        'source_loaded_at': loaded_at,
+        'rows': rows,
+        'sample_rows': sample.num_rows,
+        'seed': SAMPLE_SEED,
+        'confidence': CONFIDENCE,
+        'hll_precision': HLL_PRECISION,
+        'count_min': {'width': CM_WIDTH, 'depth': CM_DEPTH},
+        'columns': columns,
+        'built_at': datetime.now().isoformat()
+    }
+    staging = data_path.with_suffix('.json.tmp')
+    with open(staging, 'w') as f:
+        json.dump(manifest, f, indent=2, default=str)
+    os.replace(staging, sketch_dir / f"{table}.json")
+    return manifest
+
+
+# ----------------------------------------------------------------------
+# Answers (API side)
+# ----------------------------------------------------------------------
+
+def read_manifest(table: str, sketch_dir: Path = SKETCH_DIR) -> Optional[Dict[str, Any]]:
+    """A table's sketch manifest, or None if none was built"""
+    path = Path(sketch_dir) / f"{table}.json"
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    signature = (stat.st_mtime_ns, stat.st_size)
+    cached = _manifest_cache.get(path)
+    if cached and cached[0] == signature:
+        return cached[1]
+    try:
+        with open(path, 'r') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = None
+    _manifest_cache[path] = (signature, manifest)
+    return manifest
+
+
+def sample_path(table: str, sketch_dir: Path = SKETCH_DIR) -> Path:
+    """Parquet file holding a table's sample"""
+    return Path(sketch_dir) / f"{table}.parquet"
+
+
+def current_sketches(table: str, loaded_at: Optional[str],
+                     sketch_dir: Path = SKETCH_DIR) -> Optional[Dict[str, Any]]:
+    """The table's manifest if its sketches match the loaded table, else None"""
+    if loaded_at is None:
+        return None
+    manifest = read_manifest(table, sketch_dir)
+    if (manifest is None or manifest.get('source_loaded_at') != loaded_at
+            or not sample_path(table, sketch_dir).exists()):
+        return None
+    return manifest
+
+
+def _metric_sql(column: str, func: str, rows: int, sample_rows: int) -> Tuple[str, str, str]:
+    """(estimate, low, high) SQL of one metric over the sample"""
+    target = '*' if column == '*' else _quote(column)
+    n = float(max(sample_rows, 1))
+    scale = rows / n if sample_rows else 1.0
+    # Finite-population correction: 0 when the sample is the whole table
+    fpc = math.sqrt(max(0.0, 1.0 - sample_rows / rows)) if rows else 0.0
+    exact = fpc == 0.0
+
+    if func == 'count':
+        count = f"COUNT({target})"
+        estimate = f"CAST(round({count} * {scale!r}) AS BIGINT)"
+        half = f"{Z * scale * fpc!r} * sqrt({count} * (1 - {count} / {n!r}))"
+        return estimate, f"greatest({estimate} - {half}, 0)", f"{estimate} + {half}"
+
+    value = f"CAST({target} AS DOUBLE)"
+    if func == 'sum':
+        total = f"SUM({value})"
+        estimate = f"{total} * {scale!r}"
+        variance = f"greatest(SUM({value} * {value}) / {n!r} - power({total} / {n!r}, 2), 0)"
+        half = f"{Z * rows * fpc!r} * sqrt({variance} / {n!r})"
+        return estimate, f"{estimate} - {half}", f"{estimate} + {half}"
+    if func == 'avg':
+        estimate = f"AVG({value})"
+        half = f"{Z * fpc!r} * STDDEV_SAMP({value}) / sqrt(COUNT({target}))"
+        return estimate, f"{estimate} - {half}", f"{estimate} + {half}"
+
+    # One-sided: the sample's extremes and distinct values are within the table's
+    if func == 'min':
+        estimate = f"MIN({target})"
+        return estimate, estimate if exact else "NULL", estimate
+    if func == 'max':
+        estimate = f"MAX({target})"
+        return estimate, estimate, estimate if exact else "NULL"
+    if func == 'count_distinct':
+        estimate = f"COUNT(DISTINCT {target})"
+        return estimate, estimate, estimate if exact else f"{estimate} + {rows - sample_rows}"
+
+    # Quantile: order statistics around rank n*q (normal approximation of
+    # the binomial count of sample values below the true quantile)
+    q = QUANTILE_FUNCTIONS[func]
+    estimate = f"quantile_cont({target}, {q!r})"
+    if exact:
+        return estimate, estimate, estimate
+    count = f"COUNT({target})"
+    spread = f"{Z!r} * sqrt({count} * {q * (1 - q)!r})"
+    ordered = f"list_sort(list({target}) FILTER (WHERE {target} IS NOT NULL))"
+    low_rank = f"CAST(greatest(floor({count} * {q!r} - {spread}), 1) AS BIGINT)"
+    high_rank = f"CAST(least(ceil({count} * {q!r} + {spread}) + 1, {count}) AS BIGINT)"
+    return estimate, f"{ordered}[{low_rank}]", f"{ordered}[{high_rank}]"
+
+
+def approximate_select(metrics: Dict[str, str], rows: int, sample_rows: int) -> Dict[str, str]:
+    """
+    {output column: SQL over the sample} for the requested metrics.
+
+    Each metric "{func}_{column}" gets "{func}_{column}_low" and
+    "{func}_{column}_high" bound columns next to it.
+    """
+    select = {}
+    for column, func in metrics.items():
+        name = _output_name(column, func)
+        estimate, low, high = _metric_sql(column, func, rows, sample_rows)
+        select[name] = estimate
+        select[f"{name}_low"] = low
+        select[f"{name}_high"] = high
+    return select
+
+
+def whole_table_metrics(manifest: Dict[str, Any], metrics: Dict[str, str]) -> Dict[str, Tuple[Any, Any, Any]]:
+    """
+    Metrics the whole-table sketches answer better than the sample
+    (requests without group_by or filters).
+
+    Returns:
+        {output column: (estimate, low, high)}
+    """
+    rows = manifest['rows']
+    result = {}
+    for column, func in metrics.items():
+        name = _output_name(column, func)
+        if func == 'count' and column == '*':
+            result[name] = (rows, rows, rows)
+        elif func == 'count_distinct' and column in manifest['columns']:
+            distinct = manifest['columns'][column]['distinct']
+            estimate, error = distinct['estimate'], distinct['error']
+            result[name] = (estimate, max(estimate - error, 0), min(estimate + error, rows))
+    return result
+
+
+def top_values(manifest: Dict[str, Any], group_by: List[str], metrics: Dict[str, str],
+               order_by: Optional[List[str]], limit: Optional[int]) -> Optional[pd.DataFrame]:
+    """
+    Most frequent values of one column from its Count-Min sketch.
+
+    Answers group_by=[column], metrics={"*": "count"}, order_by=["-count"]
+    with a limit up to TOP_VALUES (and no filters); None otherwise.
+    """
+    if len(group_by) != 1 or metrics != {'*': 'count'} or order_by != ['-count'] or limit is None:
+        return None
+    top = manifest['columns'].get(group_by[0], {}).get('top')
+    if top is None or limit > len(top['values']):
+        return None
+    counts = np.asarray(top['counts'][:limit], dtype=np.int64)
+    return pd.DataFrame({
+        group_by[0]: top['values'][:limit],
+        'count': counts,
+        'count_low': np.maximum(counts - top['error'], 0),
+        'count_high': counts
+    })
@@ -0,0 +1,324 @@
+"""
+Spatial Well Index
+
+Grid index of well locations for map dashboards: bounding-box and radius
+queries that touch only the wells near the viewport, and server-side
+clustering for low zoom levels.
+
+Points are one per well (API-10; the latest job wins when a well has
+several disclosures) from the parsed files of a well dataset that carry
+latitude/longitude (FracFocus today). Rows without a usable location
+(missing, out of range, 0/0) are left out. Coordinates are used as
+reported (FracFocus mixes NAD27/NAD83/WGS84; the differences are tens of
+metres, below map resolution).
+
+Layout: points are sorted by a fixed grid cell, GRID_SIZE x GRID_SIZE cells
+over lon/lat, numbered row-major:
+
+    cell = row * GRID_SIZE + column
+
+so each grid row of a bounding box is one contiguous key range. A query
+binary-searches one range per grid row, then filters those candidates
+exactly. Persisted alongside the other derived indexes:
+
+    data/processed/spatial/{dataset}.parquet   (points sorted by cell)
+    data/processed/spatial/{dataset}.json      (manifest: source file versions)
+
+Clustering bins the visible points into cells of about
+1 / CLUSTER_CELLS_PER_TILE of a web-map tile at the requested zoom and
+returns one centroid and count per bin.
+"""
+
+import os
+import json
+import math
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from src.well_index import (
+    DATA_ROOT, WELL_DATASETS, api_source, api_values, dataset_files, dataset_signature,
+    file_columns, normalize_api, scan_columns
+)
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+SPATIAL_DIR = PROJECT_ROOT / "data" / "processed" / "spatial"
+
+# Grid cells per axis (2^12: ~0.09 deg of longitude, ~0.04 deg of latitude)
+GRID_SIZE = 4096
+
+# Latitude/longitude columns, first match wins
+LATITUDE_COLUMNS = ['Latitude', 'LATITUDE', 'latitude', 'SURFACE_LATITUDE', 'lat']
+LONGITUDE_COLUMNS = ['Longitude', 'LONGITUDE', 'longitude', 'SURFACE_LONGITUDE', 'lon']
+
+# Attributes carried with each point when the dataset has them
+POINT_ATTRIBUTES = ['OperatorName', 'WellName', 'StateName', 'CountyName', 'JobStartDate',
+                    'TotalBaseWaterVolume']
+
+# Column deciding which row represents a well (latest wins)
+LATEST_BY = 'JobStartDate'
+
+# Clusters per tile width at a zoom level (256px tiles -> ~64px clusters)
+CLUSTER_CELLS_PER_TILE = 4
+
+EARTH_RADIUS_KM = 6371.0088
+
+_lock = threading.Lock()
+_loaded: Dict[str, Tuple[Any, 'SpatialIndex']] = {}
+
+
+def _first(names: List[str], candidates: List[str]) -> Optional[str]:
+    return next((c for c in candidates if c in names), None)
+
+
+def grid_cells(lat: np.ndarray, lon: np.ndarray) -> np.ndarray:
+    """Grid cell number of each point"""
+    row = np.clip(((lat + 90.0) / 180.0 * GRID_SIZE).astype(np.int64), 0, GRID_SIZE - 1)
+    column = np.clip(((lon + 180.0) / 360.0 * GRID_SIZE).astype(np.int64), 0, GRID_SIZE - 1)
+    return row * GRID_SIZE + column
+
+
+# ----------------------------------------------------------------------
+# Build
+# ----------------------------------------------------------------------
+
+def _points(block: pa.Table, lat_column: str, lon_column: str, api: Optional[List[str]],
+            attributes: List[str]) -> pd.DataFrame:
+    """One block of a file as located points (api10, lat, lon, attributes)"""
+    df = pd.DataFrame({
+        'lat': pd.to_numeric(block.column(lat_column).to_pandas(), errors='coerce'),
+        'lon': pd.to_numeric(block.column(lon_column).to_pandas(), errors='coerce'),
+    })
+    df['api10'] = normalize_api(api_values(block, api))[0].to_pandas() if api else None
+    for column in attributes:
+        df[column] = block.column(column).to_pandas()
+
+    located = (df['lat'].between(-90, 90) & df['lon'].between(-180, 180)
+               & ~((df['lat'] == 0) & (df['lon'] == 0)))
+    return df[located]
+
+
+def _latest_per_well(df: pd.DataFrame) -> pd.DataFrame:
+    """One row per well: the latest by LATEST_BY (wells without an API number by location)"""
+    if LATEST_BY in df.columns:
+        df = df.assign(_order=pd.to_datetime(df[LATEST_BY], errors='coerce')).sort_values('_order', kind='stable')
+        df = df.drop(columns='_order')
+    has_api = df['api10'].notna().to_numpy()
+    duplicate = np.where(has_api, df.duplicated(subset=['api10'], keep='last').to_numpy(),
+                         df.duplicated(subset=['lat', 'lon'], keep='last').to_numpy())
+    return df[~duplicate]
+
+
+def build_index(name: str, data_root: Path = DATA_ROOT, spatial_dir: Path = SPATIAL_DIR) -> Dict[str, Any]:
+    """
+    Build a dataset's spatial index from its parsed files.
+
+    Only the location, API number and attribute columns are read.
+
+    Returns:
+        Manifest {'dataset', 'files', 'points', 'bounds', 'built_at'}
+    """
+    import pyarrow.parquet as pq
+
+    parts = []
+    for path, _ in dataset_files(name, data_root):
+        names = file_columns(path)
+        lat_column, lon_column = _first(names, LATITUDE_COLUMNS), _first(names, LONGITUDE_COLUMNS)
+        if lat_column is None or lon_column is None:
+            continue
+        api = api_source(names)
+        attributes = [c for c in POINT_ATTRIBUTES if c in names]
+        columns = list(dict.fromkeys([lat_column, lon_column] + (api or []) + attributes))
+        for _, _, block in scan_columns(path, columns):
+            points = _points(block, lat_column, lon_column, api, attributes)
+            if len(points):
+                # Dedupe per block too, so memory follows wells rather than rows
+                parts.append(_latest_per_well(points))
+
+    if parts:
+        points = _latest_per_well(pd.concat(parts, ignore_index=True))
+    else:
+        points = pd.DataFrame({'lat': pd.Series(dtype='float64'), 'lon': pd.Series(dtype='float64'),
+                               'api10': pd.Series(dtype='object')})
+    points = points.assign(cell=grid_cells(points['lat'].to_numpy(), points['lon'].to_numpy()))
+    points = points.sort_values(['cell', 'lat', 'lon'], kind='stable')
+    columns = ['api10', 'lat', 'lon', 'cell'] + [c for c in points.columns if c not in ('api10', 'lat', 'lon', 'cell')]
+    table = pa.Table.from_pandas(points[columns], preserve_index=False)
+
+    spatial_dir = Path(spatial_dir)
+    spatial_dir.mkdir(parents=True, exist_ok=True)
+    staging = spatial_dir / f"{name}.parquet.tmp"
+    pq.write_table(table, staging)
+    os.replace(staging, spatial_dir / f"{name}.parquet")
+
+    manifest = {
+        'dataset': name,
+        'files': dataset_signature(name, data_root),
+        'points': table.num_rows,
+        'bounds': ([float(points['lon'].min()), float(points['lat'].min()),
+                    float(points['lon'].max()), float(points['lat'].max())] if len(points) else None),
+        'built_at': datetime.now().isoformat()
+    }
+    staging = spatial_dir / f"{name}.json.tmp"
+    with open(staging, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(staging, spatial_dir / f"{name}.json")
+    return manifest
+
+
+def read_manifest(name: str, spatial_dir: Path = SPATIAL_DIR) -> Optional[Dict[str, Any]]:
+    """A dataset's spatial manifest, or None if it hasn't been built"""
+    try:
+        with open(Path(spatial_dir) / f"{name}.json", 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def is_current(name: str, data_root: Path = DATA_ROOT, spatial_dir: Path = SPATIAL_DIR) -> bool:
+    """True if the spatial index exists and covers the dataset's current files"""
+    manifest = read_manifest(name, spatial_dir)
+    if manifest is None or not (Path(spatial_dir) / f"{name}.parquet").exists():
+        return False
+    try:
+        return dataset_signature(name, data_root) == manifest['files']
+    except OSError:
+        return False
+
+
+# ----------------------------------------------------------------------
+# Queries
+# ----------------------------------------------------------------------
+
+class SpatialIndex:
+    """In-memory grid index of one dataset's well locations"""
+
+    def __init__(self, points: pa.Table):
+        self.points = points
+        self._lat = points.column('lat').to_numpy()
+        self._lon = points.column('lon').to_numpy()
+        self._cells = points.column('cell').to_numpy()
+
+    def __len__(self) -> int:
+        return len(self._cells)
+
+    def _candidates(self, min_lon: float, min_lat: float, max_lon: float, max_lat: float) -> np.ndarray:
+        """Positions in grid cells overlapping a box (one key range per grid row)"""
+        corners = grid_cells(np.array([min_lat, max_lat]), np.array([min_lon, max_lon]))
+        row0, column0 = divmod(int(corners[0]), GRID_SIZE)
+        row1, column1 = divmod(int(corners[1]), GRID_SIZE)
+        rows = np.arange(row0, row1 + 1, dtype=np.int64) * GRID_SIZE
+        starts = np.searchsorted(self._cells, rows + column0, side='left')
+        ends = np.searchsorted(self._cells, rows + column1, side='right')
+        ranges = [np.arange(a, b) for a, b in zip(starts, ends) if b > a]
+        return np.concatenate(ranges) if ranges else np.empty(0, dtype=np.int64)
+
+    def bbox(self, min_lon: float, min_lat: float, max_lon: float, max_lat: float) -> np.ndarray:
+        """
+        Positions of points inside a box (min_lon > max_lon crosses the antimeridian).
+
+        Returns:
+            Positions in cell order
+        """
+        if min_lon > max_lon:
+            return np.concatenate([self.bbox(min_lon, min_lat, 180.0, max_lat),
+                                   self.bbox(-180.0, min_lat, max_lon, max_lat)])
+        found = self._candidates(min_lon, min_lat, max_lon, max_lat)
+        lat, lon = self._lat[found], self._lon[found]
+        return found[(lat >= min_lat) & (lat <= max_lat) & (lon >= min_lon) & (lon <= max_lon)]
+
+    def radius(self, lat: float, lon: float, radius_km: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Positions of points within `radius_km` of a point, nearest first.
+
+        Returns:
+            (positions, distances in km)
+        """
+        angle = radius_km / EARTH_RADIUS_KM
+        dlat = math.degrees(angle)
+        # Widest longitude offset of the circle (at the latitude where its
+        # edge is tangent to a meridian); a circle reaching a pole spans
+        # every longitude
+        sin_angle, cos_lat = math.sin(angle), math.cos(math.radians(lat))
+        if angle >= math.pi / 2 or sin_angle >= cos_lat:
+            dlon = 180.0
+        else:
+            dlon = math.degrees(math.asin(sin_angle / cos_lat))
+        min_lat, max_lat = max(-90.0, lat - dlat), min(90.0, lat + dlat)
+        if dlon >= 180.0 or max_lat >= 90.0 or min_lat <= -90.0:
+            found = self.bbox(-180.0, min_lat, 180.0, max_lat)
+        else:
+            min_lon = (lon - dlon + 180.0) % 360.0 - 180.0
+            max_lon = (lon + dlon + 180.0) % 360.0 - 180.0
+            found = self.bbox(min_lon, min_lat, max_lon, max_lat)
+
+        distance = haversine_km(lat, lon, self._lat[found], self._lon[found])
+        keep = distance <= radius_km
+        found, distance = found[keep], distance[keep]
+        order = np.argsort(distance, kind='stable')
+        return found[order], distance[order]
+
+    def cluster(self, positions: np.ndarray, zoom: int) -> pa.Table:
+        """
+        Bin points into clusters sized for a web-map zoom level.
+
+        Returns:
+            Table of (lat, lon) centroids and counts, largest first
+        """
+        size = 360.0 / (2 ** zoom * CLUSTER_CELLS_PER_TILE)
+        lat, lon = self._lat[positions], self._lon[positions]
+        keys = (np.floor((lat + 90.0) / size).astype(np.int64) * (2 ** 40)
+                + np.floor((lon + 180.0) / size).astype(np.int64))
+        _, inverse, counts = np.unique(keys, return_inverse=True, return_counts=True)
+        order = np.argsort(-counts, kind='stable')
+        return pa.table({
+            'lat': (np.bincount(inverse, weights=lat) / counts)[order],
+            'lon': (np.bincount(inverse, weights=lon) / counts)[order],
+            'count': counts[order],
+        })
+
+
+def haversine_km(lat: float, lon: float, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+    """Great-circle distances (km) from one point to many"""
+    lat1, lat2 = math.radians(lat), np.radians(lats)
+    dlat = lat2 - lat1
+    dlon = np.radians(lons) - math.radians(lon)
+    a = np.sin(dlat / 2) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def get_index(name: str, token: Any = None, data_root: Path = DATA_ROOT,
+              spatial_dir: Path = SPATIAL_DIR) -> Optional[SpatialIndex]:
+    """
+    Load a dataset's spatial index, building it if it is missing or stale.
+
+    Args:
+        name: Key in WELL_DATASETS
+        token: Cheap version token of the dataset; while it is unchanged the
+               loaded index is reused without checking files
+    """
+    cached = _loaded.get(name)
+    if cached is not None and token is not None and cached[0] == token:
+        return cached[1]
+
+    with _lock:
+        cached = _loaded.get(name)
+        if cached is not None and token is not None and cached[0] == token:
+            return cached[1]
+        if name not in WELL_DATASETS or not dataset_files(name, data_root):
+            _loaded.pop(name, None)
+            return None
+
+        import pyarrow.parquet as pq
+
+        if not is_current(name, data_root, spatial_dir):
+            build_index(name, data_root, spatial_dir)
+        index = SpatialIndex(pq.read_table(Path(spatial_dir) / f"{name}.parquet"))
+        _loaded[name] = (token, index)
+        return index
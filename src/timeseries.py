@@ -0,0 +1,205 @@
+"""
+Production Time Series
+
+Server-side cumulative production, rolling averages and period-over-period
+changes over monthly production in the analytical store, per lease, well,
+operator or for the whole state:
+
+    group -> resample (month/quarter/year) -> cumsum / rolling / change
+
+The store sums the value columns per group and period while it scans
+(only the grouped series are materialized) and hands them over in Arrow
+batches sorted by (group, period). Batches are regrouped into chunks that
+never split a group, and each chunk is transformed with numpy over the
+whole chunk at once: group boundaries come from comparing neighbouring
+keys, running sums are one cumsum minus the total before each group.
+
+Periods are calendar-aware: a rolling window covers the last `window`
+periods (averaging the periods that have rows), and a change is only
+computed against the immediately preceding period (null after a gap).
+
+Output columns per value column `v`:
+    v                summed volume in the period
+    cum_v            cumulative volume of the group up to the period
+    rolling_v        mean over the last `window` periods
+    change_v         difference from the previous period
+    pct_change_v     relative change from the previous period
+"""
+
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+import pyarrow as pa
+
+# Monthly production of RRC leases (PDQ lease cycle table)
+DEFAULT_TABLE = 'rrc_production__og_lease_cycle_data_table'
+DEFAULT_VALUES = ['LEASE_OIL_PROD_VOL', 'LEASE_GAS_PROD_VOL']
+PERIOD_COLUMN = 'CYCLE_YEAR_MONTH'  # YYYYMM
+
+# Output period column (first month of the bin, YYYYMM)
+PERIOD = 'period'
+
+# Resampling frequencies: months per period
+FREQUENCIES = {'month': 1, 'quarter': 3, 'year': 12}
+
+OPERATIONS = ('cumsum', 'rolling', 'change', 'pct_change')
+
+# Rows per transformed chunk
+CHUNK_ROWS = 1_000_000
+
+
+def _quote(identifier: str) -> str:
+    """Quote a SQL identifier"""
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+# ----------------------------------------------------------------------
+# Periods
+# ----------------------------------------------------------------------
+
+def period_months(periods: np.ndarray) -> np.ndarray:
+    """YYYYMM -> months since year 0"""
+    periods = periods.astype(np.int64)
+    return (periods // 100) * 12 + (periods % 100 - 1)
+
+
+def month_period(months: np.ndarray) -> np.ndarray:
+    """Months since year 0 -> YYYYMM"""
+    return (months // 12) * 100 + months % 12 + 1
+
+
+def period_sql(column: str, freq: str) -> str:
+    """SQL for the YYYYMM label of a YYYYMM column's period at `freq`"""
+    months = FREQUENCIES[freq]
+    value = f"CAST({column} AS BIGINT)"
+    index = f"(({value} // 100) * 12 + {value} % 100 - 1)"
+    start = f"({index} - {index} % {months})" if months > 1 else index
+    return f"(({start} // 12) * 100 + {start} % 12 + 1)"
+
+
+# ----------------------------------------------------------------------
+# Groups
+# ----------------------------------------------------------------------
+
+def group_ids(keys: pa.Table) -> np.ndarray:
+    """Dense ids of consecutive equal key rows (one group if there are no keys)"""
+    changed = np.zeros(keys.num_rows, dtype=bool)
+    if keys.num_rows:
+        changed[0] = True
+    for column in keys.columns:
+        values = column.to_numpy(zero_copy_only=False)
+        if len(values) > 1:
+            changed[1:] |= values[1:] != values[:-1]
+    return np.cumsum(changed) - 1
+
+
+def group_chunks(batches: Iterable[pa.RecordBatch], keys: List[str],
+                 chunk_rows: int = CHUNK_ROWS) -> Iterator[pa.Table]:
+    """Regroup batches sorted by `keys` into chunks that never split a group"""
+    pending: List[pa.RecordBatch] = []
+    rows = 0
+    for batch in batches:
+        pending.append(batch)
+        rows += batch.num_rows
+        if rows < chunk_rows or not keys:
+            continue
+        table = pa.Table.from_batches(pending)
+        ids = group_ids(table.select(keys))
+        cut = int(np.searchsorted(ids, ids[-1]))
+        if cut == 0:
+            continue
+        yield table.slice(0, cut)
+        rest = table.slice(cut)
+        pending, rows = rest.to_batches(), rest.num_rows
+    if rows:
+        yield pa.Table.from_batches(pending)
+
+
+# ----------------------------------------------------------------------
+# Transforms
+# ----------------------------------------------------------------------
+
+def _running_sum(values: np.ndarray, starts: np.ndarray, group: np.ndarray) -> np.ndarray:
+    """Cumulative sum restarting at each group"""
+    total = np.cumsum(values)
+    before = np.concatenate([[0.0], total])[starts]
+    return total - before[group]
+
+
+def transform(chunk: pa.Table, keys: List[str], values: List[str], operations: List[str],
+              window: int = 3, freq: str = 'month') -> pa.Table:
+    """
+    Time-series columns for a chunk sorted by (keys, PERIOD).
+
+    Args:
+        chunk: Group keys, PERIOD and value columns; groups are complete
+        values: Value columns to transform
+        operations: Subset of OPERATIONS
+        window: Rolling window in periods
+        freq: Key in FREQUENCIES (spacing of consecutive periods)
+
+    Returns:
+        The chunk with the requested columns appended after each value
+    """
+    if chunk.num_rows == 0:
+        return chunk
+    group = group_ids(chunk.select(keys))
+    starts = np.flatnonzero(np.r_[True, group[1:] != group[:-1]])
+    index = period_months(chunk.column(PERIOD).to_numpy()) // FREQUENCIES[freq]
+
+    # Position of the first row inside each row's rolling window, and
+    # whether the previous row is the previous period of the same group
+    sequence = group.astype(np.int64) * (1 << 32) + (index - index.min())
+    window_start = np.searchsorted(sequence, sequence - (window - 1), side='left')
+    follows = np.zeros(len(group), dtype=bool)
+    follows[1:] = (group[1:] == group[:-1]) & (index[1:] == index[:-1] + 1)
+
+    result = chunk.select(keys + [PERIOD])
+    for name in values:
+        volume = chunk.column(name).to_numpy(zero_copy_only=False).astype(np.float64)
+        present = np.nan_to_num(volume, nan=0.0)
+        result = result.append_column(name, pa.array(volume, from_pandas=True))
+        if 'cumsum' in operations:
+            result = result.append_column(f"cum_{name}", pa.array(_running_sum(present, starts, group)))
+        if 'rolling' in operations:
+            total = np.concatenate([[0.0], np.cumsum(present)])
+            periods = np.arange(1, len(group) + 1) - window_start
+            rolling = (total[1:] - total[window_start]) / periods
+            result = result.append_column(f"rolling_{name}", pa.array(rolling))
+        if 'change' in operations or 'pct_change' in operations:
+            previous = np.full(len(group), np.nan)
+            previous[1:] = volume[:-1]
+            previous[~follows] = np.nan
+            with np.errstate(divide='ignore', invalid='ignore'):
+                if 'change' in operations:
+                    result = result.append_column(f"change_{name}", pa.array(volume - previous, from_pandas=True))
+                if 'pct_change' in operations:
+                    pct = np.where(previous > 0, volume / previous - 1.0, np.nan)
+                    result = result.append_column(f"pct_change_{name}", pa.array(pct, from_pandas=True))
+    return result
+
+
+def stream_series(batches: Iterable[pa.RecordBatch], keys: List[str], values: List[str],
+                  operations: List[str], window: int = 3, freq: str = 'month',
+                  chunk_rows: int = CHUNK_ROWS) -> Iterator[pa.Table]:
+    """
+    Transform grouped series chunk by chunk.
+
+    Args:
+        batches: Record batches of (keys, PERIOD, values) sorted by keys and PERIOD
+
+    Yields:
+        Transformed chunks (see transform), in order
+    """
+    for chunk in group_chunks(batches, keys, chunk_rows):
+        yield transform(chunk, keys, values, operations, window, freq)
+
+
+def series_select(values: List[str]) -> Dict[str, str]:
+    """{value column: SQL sum} for the store's grouped scan"""
+    return {name: f"SUM({_quote(name)})::DOUBLE" for name in values}
+
+
+def resample_column(freq: str, column: Optional[str] = None) -> Dict[str, str]:
+    """{PERIOD: SQL} derived column for the store's grouped scan"""
+    return {PERIOD: period_sql(_quote(column or PERIOD_COLUMN), freq)}
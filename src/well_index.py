@@ -0,0 +1,476 @@
+"""
+Well Index
+
+API-number index over parsed datasets, so single-well lookups and
+well-set joins across FracFocus and RRC read only the rows of the wells
+asked for instead of scanning whole sources.
+
+API numbers are normalized to API-10 (state + county + well) as the join
+key, with API-14 (+ sidetrack + event) kept for exact matches:
+
+    "42-317-40186-00-00", 42317401860000, "4231740186"  -> 4231740186
+    "31740186" (RRC, no state code)                      -> 4231740186
+    API_COUNTY_CODE=317, API_UNIQUE_NO=40186             -> 4231740186
+
+Integer columns that lost a leading zero (state codes 01-09) are padded
+back. Values that don't normalize to 10/12/14 digits are not indexed.
+
+Per dataset (e.g. 'fracfocus', 'rrc_permits') the index is one Parquet
+file of (api10, api14, file, row_group, row) entries sorted by api10,
+plus a manifest of the indexed files and their versions:
+
+    data/processed/well_index/{dataset}.parquet
+    data/processed/well_index/{dataset}.json
+
+Loaded, the distinct API-10s go into a hash index (pandas Index) with
+offsets into the entry arrays, so a lookup is a hash probe plus slices.
+Rows are then read per parquet row group, only the groups holding hits.
+CSV files have no row groups: their rows are streamed up to the last
+hit (converting a source to parquet gives it random access).
+
+The pipeline's load phase rebuilds indexes; the API rebuilds a stale or
+missing one on first use.
+"""
+
+import os
+import re
+import json
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from src.partitioning import is_partitioned_dataset
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+DATA_ROOT = PROJECT_ROOT / "data" / "raw"
+INDEX_DIR = PROJECT_ROOT / "data" / "processed" / "well_index"
+
+# Datasets with well-level rows (keys match the pipeline's LOAD_TARGETS)
+WELL_DATASETS = {
+    'fracfocus': {'path': 'fracfocus', 'source': 'fracfocus'},
+    'rrc_permits': {'path': 'rrc/horizontal_drilling_permits', 'source': 'rrc'},
+    'rrc_completions': {'path': 'rrc/completions_data', 'source': 'rrc'},
+    'rrc_production': {'path': 'rrc/production', 'source': 'rrc'},
+}
+
+# API number columns, first match wins
+API_COLUMNS = ['APINumber', 'API_NUMBER', 'api_number', 'API_NO', 'api_no', 'API', 'api']
+
+# Split API numbers (RRC PDQ well tables): county + unique number, Texas
+COMPOSITE_API_COLUMNS = [('API_COUNTY_CODE', 'API_UNIQUE_NO')]
+
+TEXAS_STATE_CODE = '42'
+
+_lock = threading.Lock()
+_loaded: Dict[str, Tuple[Any, 'WellIndex']] = {}
+
+
+# ----------------------------------------------------------------------
+# Normalization
+# ----------------------------------------------------------------------
+
+def _prefix(prefix: str, values: pa.Array) -> pa.Array:
+    return pc.binary_join_element_wise(pa.scalar(prefix, pa.string()), values, pa.scalar('', pa.string()))
+
+
+def normalize_api(values: pa.Array) -> Tuple[pa.Array, pa.Array]:
+    """
+    Normalize API numbers (vectorized).
+
+    Args:
+        values: API numbers as strings or integers
+
+    Returns:
+        (api10, api14) string arrays, null where a value isn't an API number
+    """
+    if isinstance(values, pa.ChunkedArray):
+        values = values.combine_chunks()
+    integer = pa.types.is_integer(values.type) or pa.types.is_floating(values.type)
+    if pa.types.is_floating(values.type):
+        values = pc.cast(values, pa.int64(), safe=False)
+    digits = pc.replace_substring_regex(pc.cast(values, pa.string()), pattern=r'[^0-9]', replacement='')
+
+    if integer:
+        lost_zero = pc.is_in(pc.utf8_length(digits), value_set=pa.array([7, 9, 11, 13], pa.int32()))
+        digits = pc.if_else(lost_zero, _prefix('0', digits), digits)
+    texas = pc.equal(pc.utf8_length(digits), 8)
+    digits = pc.if_else(texas, _prefix(TEXAS_STATE_CODE, digits), digits)
+
+    valid = pc.and_(
+        pc.is_in(pc.utf8_length(digits), value_set=pa.array([10, 12, 14], pa.int32())),
+        pc.invert(pc.match_substring_regex(digits, pattern=r'^0+$'))
+    )
+    null = pa.scalar(None, pa.string())
+    api10 = pc.if_else(valid, pc.utf8_slice_codeunits(digits, 0, 10), null)
+    api14 = pc.if_else(valid, pc.utf8_rpad(digits, width=14, padding='0'), null)
+    return api10, api14
+
+
+def normalize_api_number(value: str) -> Optional[Tuple[str, str]]:
+    """(api10, api14) for one API number, or None if it isn't one"""
+    api10, api14 = normalize_api(pa.array([str(value)], pa.string()))
+    if not api10[0].is_valid:
+        return None
+    return api10[0].as_py(), api14[0].as_py()
+
+
+def api_source(names: List[str]) -> Optional[List[str]]:
+    """API column(s) of a table: [column] or [county, unique], None if none"""
+    for column in API_COLUMNS:
+        if column in names:
+            return [column]
+    for county, unique in COMPOSITE_API_COLUMNS:
+        if county in names and unique in names:
+            return [county, unique]
+    return None
+
+
+def api_values(table: pa.Table, api: List[str]) -> pa.Array:
+    """API numbers of a table from its API column(s)"""
+    if len(api) == 1:
+        return table.column(api[0]).combine_chunks()
+    county, unique = (pc.cast(table.column(c).combine_chunks(), pa.string()) for c in api)
+    county = pc.utf8_lpad(pc.replace_substring_regex(county, pattern=r'\.0$', replacement=''), width=3, padding='0')
+    unique = pc.utf8_lpad(pc.replace_substring_regex(unique, pattern=r'\.0$', replacement=''), width=5, padding='0')
+    return pc.binary_join_element_wise(county, unique, pa.scalar('', pa.string()))
+
+
+# ----------------------------------------------------------------------
+# Files
+# ----------------------------------------------------------------------
+
+def _table_name(parsed_dir: Path, file_path: Path) -> str:
+    """Table a file belongs to: partitioned dataset name, or the stem without a split number"""
+    relative = file_path.relative_to(parsed_dir)
+    if len(relative.parts) > 1:
+        return relative.parts[0]
+    return re.sub(r'_\d+$', '', file_path.stem)
+
+
+def dataset_files(name: str, data_root: Path = DATA_ROOT) -> List[Tuple[Path, str]]:
+    """
+    Parsed files of a dataset, as (path, table) in a stable order.
+
+    Parquet files are preferred; CSVs are used for tables without parquet.
+    """
+    parsed_dir = Path(data_root) / WELL_DATASETS[name]['path'] / 'parsed'
+    if not parsed_dir.exists():
+        return []
+
+    files = []
+    for entry in sorted(parsed_dir.iterdir()):
+        if is_partitioned_dataset(entry):
+            files += sorted(entry.rglob('*.parquet'))
+    files += sorted(parsed_dir.glob('*.parquet'))
+    tables = {_table_name(parsed_dir, f) for f in files}
+    files += [f for f in sorted(parsed_dir.glob('*.csv')) if _table_name(parsed_dir, f) not in tables]
+    return [(f, _table_name(parsed_dir, f)) for f in files]
+
+
+def _file_version(path: Path) -> List[int]:
+    stat = path.stat()
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def dataset_signature(name: str, data_root: Path = DATA_ROOT) -> List[List[Any]]:
+    """[[relative path, [mtime_ns, size]], ...] of a dataset's parsed files"""
+    dataset_dir = Path(data_root) / WELL_DATASETS[name]['path']
+    return [[str(f.relative_to(dataset_dir)), _file_version(f)] for f, _ in dataset_files(name, data_root)]
+
+
+def _csv_reader(path: Path, columns: Optional[List[str]] = None):
+    """Stream a CSV with every column as text (types can't drift between blocks)"""
+    import pyarrow.csv as csv
+
+    return csv.open_csv(str(path), convert_options=csv.ConvertOptions(
+        include_columns=columns or [], column_types={c: pa.string() for c in file_columns(path)}
+    ))
+
+
+def file_columns(path: Path) -> List[str]:
+    """Column names of a parsed parquet or CSV file"""
+    if path.suffix == '.parquet':
+        import pyarrow.parquet as pq
+
+        return pq.read_schema(str(path)).names
+    import pyarrow.csv as csv
+
+    return csv.open_csv(str(path)).schema.names
+
+
+def scan_columns(path: Path, columns: List[str]) -> Iterator[Tuple[int, int, pa.Table]]:
+    """
+    Read some columns of a file block by block.
+
+    Yields:
+        (row_group, first row within it, table); a CSV file is one group,
+        read in blocks with every column as text
+    """
+    if path.suffix == '.parquet':
+        import pyarrow.parquet as pq
+
+        parquet_file = pq.ParquetFile(str(path))
+        for row_group in range(parquet_file.num_row_groups):
+            yield row_group, 0, parquet_file.read_row_group(row_group, columns=columns)
+    else:
+        start = 0
+        for batch in _csv_reader(path, columns):
+            yield 0, start, pa.Table.from_batches([batch])
+            start += batch.num_rows
+
+
+# ----------------------------------------------------------------------
+# Build
+# ----------------------------------------------------------------------
+
+def _index_paths(name: str, index_dir: Path) -> Tuple[Path, Path]:
+    return Path(index_dir) / f"{name}.parquet", Path(index_dir) / f"{name}.json"
+
+
+def read_manifest(name: str, index_dir: Path = INDEX_DIR) -> Optional[Dict[str, Any]]:
+    """A dataset index's manifest, or None if it hasn't been built"""
+    _, manifest_path = _index_paths(name, index_dir)
+    try:
+        with open(manifest_path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def is_current(name: str, data_root: Path = DATA_ROOT, index_dir: Path = INDEX_DIR) -> bool:
+    """True if the index exists and covers the dataset's current files"""
+    manifest = read_manifest(name, index_dir)
+    if manifest is None or not _index_paths(name, index_dir)[0].exists():
+        return False
+    try:
+        current = dataset_signature(name, data_root)
+    except OSError:
+        return False
+    return current == [[f['path'], f['version']] for f in manifest['files']]
+
+
+def build_index(name: str, data_root: Path = DATA_ROOT, index_dir: Path = INDEX_DIR) -> Dict[str, Any]:
+    """
+    Build a dataset's index from its parsed files.
+
+    Only the API column(s) are read. Files without an API column are
+    listed in the manifest (so it stays comparable) but get no entries.
+
+    Returns:
+        Manifest {'dataset', 'files': [{'path', 'table', 'api', 'version'}],
+                  'entries', 'wells', 'built_at'}
+    """
+    import pyarrow.parquet as pq
+
+    dataset_dir = Path(data_root) / WELL_DATASETS[name]['path']
+    files, parts = [], []
+    for file_id, (path, table) in enumerate(dataset_files(name, data_root)):
+        version = _file_version(path)
+        api = api_source(file_columns(path))
+        files.append({'path': str(path.relative_to(dataset_dir)), 'table': table, 'api': api, 'version': version})
+        if api is None:
+            continue
+
+        for row_group, start, block in scan_columns(path, api):
+            api10, api14 = normalize_api(api_values(block, api))
+            valid = np.flatnonzero(pc.is_valid(api10).to_numpy(zero_copy_only=False))
+            if not len(valid):
+                continue
+            positions = pa.array(valid)
+            parts.append(pa.table({
+                'api10': api10.take(positions),
+                'api14': api14.take(positions),
+                'file': pa.array(np.full(len(valid), file_id, dtype=np.int32)),
+                'row_group': pa.array(np.full(len(valid), row_group, dtype=np.int32)),
+                'row': pa.array(valid.astype(np.int64) + start),
+            }))
+
+    schema = pa.schema([('api10', pa.string()), ('api14', pa.string()), ('file', pa.int32()),
+                        ('row_group', pa.int32()), ('row', pa.int64())])
+    entries = pa.concat_tables(parts) if parts else schema.empty_table()
+    entries = entries.sort_by([('api10', 'ascending'), ('file', 'ascending'),
+                               ('row_group', 'ascending'), ('row', 'ascending')])
+
+    index_path, manifest_path = _index_paths(name, index_dir)
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    staging = index_path.with_suffix('.parquet.tmp')
+    pq.write_table(entries, staging)
+    os.replace(staging, index_path)
+
+    manifest = {
+        'dataset': name,
+        'files': files,
+        'entries': entries.num_rows,
+        'wells': len(pc.unique(entries.column('api10'))),
+        'built_at': datetime.now().isoformat()
+    }
+    staging = manifest_path.with_suffix('.json.tmp')
+    with open(staging, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(staging, manifest_path)
+    return manifest
+
+
+# ----------------------------------------------------------------------
+# Lookup
+# ----------------------------------------------------------------------
+
+class WellIndex:
+    """In-memory index of one dataset: API-10 hash lookup to row locations"""
+
+    def __init__(self, name: str, entries: pa.Table, manifest: Dict[str, Any], data_root: Path = DATA_ROOT):
+        self.name = name
+        self.manifest = manifest
+        self.dataset_dir = Path(data_root) / WELL_DATASETS[name]['path']
+
+        api10 = entries.column('api10').to_numpy(zero_copy_only=False)
+        boundaries = np.flatnonzero(api10[1:] != api10[:-1]) + 1 if len(api10) else np.empty(0, np.int64)
+        starts = np.concatenate([[0], boundaries]).astype(np.int64) if len(api10) else boundaries
+        self._keys = pd.Index(api10[starts])
+        self._bounds = np.append(starts, len(api10))
+        self._api14 = entries.column('api14').to_numpy(zero_copy_only=False)
+        self._file = entries.column('file').to_numpy()
+        self._row_group = entries.column('row_group').to_numpy()
+        self._row = entries.column('row').to_numpy()
+
+    @property
+    def wells(self) -> int:
+        return len(self._keys)
+
+    def locate(self, api10s: List[str], api14s: Optional[List[Optional[str]]] = None) -> np.ndarray:
+        """
+        Entry positions for a set of wells.
+
+        Args:
+            api10s: Normalized API-10 numbers
+            api14s: Optional API-14 per well; when given, only entries with
+                    that exact API-14 match
+
+        Returns:
+            Sorted entry positions
+        """
+        slots = self._keys.get_indexer(api10s)
+        positions = []
+        for i, slot in enumerate(slots):
+            if slot < 0:
+                continue
+            found = np.arange(self._bounds[slot], self._bounds[slot + 1])
+            if api14s is not None and api14s[i] is not None:
+                found = found[self._api14[found] == api14s[i]]
+            positions.append(found)
+        return np.sort(np.concatenate(positions)) if positions else np.empty(0, dtype=np.int64)
+
+    def read(self, positions: np.ndarray, columns: Optional[Dict[str, List[str]]] = None,
+             limit: Optional[int] = None) -> Dict[str, Tuple[pa.Table, int]]:
+        """
+        Read the rows at entry positions, grouped by table.
+
+        Each table gets an 'api10' column (first) to join on.
+
+        Args:
+            positions: From locate()
+            columns: Optional {table: [columns]} to project
+            limit: Max rows per table
+
+        Returns:
+            {table: (rows, total matching rows)}
+        """
+        files = self.manifest['files']
+        by_table: Dict[str, List[int]] = {}
+        for file_id in np.unique(self._file[positions]):
+            by_table.setdefault(files[file_id]['table'], []).append(int(file_id))
+
+        result = {}
+        for table, file_ids in by_table.items():
+            wanted = positions[np.isin(self._file[positions], file_ids)]
+            total = len(wanted)
+            if limit is not None:
+                wanted = wanted[:limit]
+            pieces = []
+            for file_id in file_ids:
+                hits = wanted[self._file[wanted] == file_id]
+                if len(hits):
+                    pieces.append(self._read_file(file_id, hits, (columns or {}).get(table)))
+            rows = pa.concat_tables(pieces, promote_options='permissive') if pieces else pa.table({})
+            result[table] = (rows, total)
+        return result
+
+    def _read_file(self, file_id: int, hits: np.ndarray, columns: Optional[List[str]]) -> pa.Table:
+        """Rows of one file at entry positions `hits`, in file order"""
+        info = self.manifest['files'][file_id]
+        path = self.dataset_dir / info['path']
+        hits = hits[np.lexsort((self._row[hits], self._row_group[hits]))]
+        row_groups, rows = self._row_group[hits], self._row[hits]
+
+        pieces = []
+        if path.suffix == '.parquet':
+            import pyarrow.parquet as pq
+
+            parquet_file = pq.ParquetFile(str(path))
+            names = parquet_file.schema_arrow.names
+            read_columns = [c for c in columns if c in names] if columns else None
+            for row_group in np.unique(row_groups):
+                take = pa.array(rows[row_groups == row_group])
+                pieces.append(parquet_file.read_row_group(int(row_group), columns=read_columns).take(take))
+        else:
+            names = file_columns(path)
+            read_columns = [c for c in columns if c in names] if columns else None
+            start = 0
+            for batch in _csv_reader(path, read_columns):
+                end = start + batch.num_rows
+                lo, hi = np.searchsorted(rows, [start, end])
+                if hi > lo:
+                    pieces.append(pa.Table.from_batches([batch.take(pa.array(rows[lo:hi] - start))]))
+                start = end
+                if hi == len(rows):
+                    break
+
+        table = pa.concat_tables(pieces, promote_options='permissive')
+        return table.add_column(0, 'api10', pa.array(self._api10_at(hits), pa.string()))
+
+    def well_counts(self, positions: np.ndarray) -> Dict[str, int]:
+        """{api10: entries} over entry positions"""
+        return pd.Series(self._api10_at(positions)).value_counts().to_dict()
+
+    def _api10_at(self, positions: np.ndarray) -> np.ndarray:
+        slots = np.searchsorted(self._bounds, positions, side='right') - 1
+        return np.asarray(self._keys)[slots]
+
+
+def get_index(name: str, token: Any = None, data_root: Path = DATA_ROOT,
+              index_dir: Path = INDEX_DIR) -> Optional[WellIndex]:
+    """
+    Load a dataset's index, building it if it is missing or stale.
+
+    Args:
+        name: Key in WELL_DATASETS
+        token: Cheap version token of the dataset; while it is unchanged the
+               loaded index is reused without checking files
+    """
+    cached = _loaded.get(name)
+    if cached is not None and token is not None and cached[0] == token:
+        return cached[1]
+
+    with _lock:
+        cached = _loaded.get(name)
+        if cached is not None and token is not None and cached[0] == token:
+            return cached[1]
+        if not dataset_files(name, data_root):
+            _loaded.pop(name, None)
+            return None
+
+        import pyarrow.parquet as pq
+
+        if not is_current(name, data_root, index_dir):
+            build_index(name, data_root, index_dir)
+        index_path, _ = _index_paths(name, index_dir)
+        index = WellIndex(name, pq.read_table(index_path), read_manifest(name, index_dir), data_root)
+        _loaded[name] = (token, index)
+        return index